@@ -0,0 +1,558 @@
+"""API HTTP JSON : classement des recettes, détail et avis d'une recette.
+
+Les autres services obtiennent les mêmes résultats que la page des recettes
+sans passer par Streamlit. L'API interroge le même jeu de données
+(``get_data_watcher``) et les mêmes moteurs (``Dataset.analyzer``, cache des
+classements partagé) que la page :
+
+    GET /api/version
+    GET /api/ranking?m=10&limit=20&offset=0
+        [&<colonne>_min=..][&<colonne>_max=..]   (colonnes de l'index de plages)
+        [&period_start=AAAA-MM][&period_end=AAAA-MM]
+    GET /api/recipes/<id>
+    GET /api/recipes/<id>/reviews?limit=20&offset=0
+
+Le serveur (``http.server``, un thread par connexion) parle HTTP/1.1 avec
+connexions persistantes. Chaque réponse sérialisée (JSON et sa version gzip)
+est gardée dans un cache borné (``API_CACHE_MAX_MB``) indexé par la version
+des données, le chemin et les paramètres : une requête déjà servie ne coûte
+qu'une recherche dans ce cache. L'ETag (faible) est la version des données :
+un client qui renvoie ``If-None-Match`` reçoit 304 tant qu'elles n'ont pas
+changé. Les réponses de plus de ``GZIP_MIN_BYTES`` octets sont compressées
+pour les clients qui acceptent gzip.
+
+Lancement : ``food-analysis api [--host H] [--port P]``, ou avec
+``food-analysis serve`` si ``API_PORT`` est non nul (même processus que
+Streamlit, donc mêmes caches).
+"""
+
+import gzip
+import json
+import logging
+import math
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from food_analysis.core.dataset import Dataset
+from food_analysis.core.range_index import RangeFilter
+from food_analysis.core.rating_buckets import month_label
+from food_analysis.server import get_data_watcher, warm_up
+from food_analysis.utils.config import Config
+from food_analysis.utils.result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+# Port de ``food-analysis api`` si API_PORT vaut 0
+DEFAULT_PORT = 8503
+
+# Pagination (classement et avis)
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 1000
+
+# Le classement est demandé par blocs de RANKING_BLOCK recettes : les pages
+# successives réutilisent le même classement en cache
+RANKING_BLOCK = 100
+
+# Taille minimale (octets) d'une réponse compressée
+GZIP_MIN_BYTES = 1024
+
+# Durée (secondes) au-delà de laquelle une connexion inactive est fermée
+KEEP_ALIVE_TIMEOUT_S = 30
+
+_MONTH = re.compile(r"^(\d{4})-(\d{2})$")
+_RECIPE_PATH = re.compile(r"^/api/recipes/(-?\d+)(/reviews)?$")
+
+
+class ApiError(Exception):
+    """Requête invalide ou ressource absente."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class Response(NamedTuple):
+    """Réponse sérialisée, mise en cache telle quelle."""
+
+    status: int
+    body: bytes
+    gzipped: Optional[bytes]  # None si la réponse est trop petite
+
+
+class Params:
+    """Paramètres d'une requête, lus un à un puis vérifiés (aucun inconnu)."""
+
+    def __init__(self, query: str) -> None:
+        self._values = dict(parse_qsl(query, keep_blank_values=True))
+        self._used: set = set()
+
+    def _get(self, name: str) -> Optional[str]:
+        self._used.add(name)
+        value = self._values.get(name)
+        return value if value else None
+
+    def integer(
+        self,
+        name: str,
+        default: int,
+        minimum: int = 0,
+        maximum: Optional[int] = None,
+    ) -> int:
+        """
+        Lit un paramètre entier.
+
+        Args:
+            name: Nom du paramètre
+            default: Valeur si le paramètre est absent
+            minimum: Valeur minimale acceptée
+            maximum: Valeur maximale acceptée (None : pas de limite)
+
+        Returns:
+            int: valeur du paramètre
+
+        Raises:
+            ApiError: Si la valeur n'est pas un entier de l'intervalle (400)
+        """
+        raw = self._get(name)
+        if raw is None:
+            return default
+        try:
+            value = int(raw)
+        except ValueError:
+            raise ApiError(400, f"{name} doit être un entier : {raw}") from None
+        if value < minimum or (maximum is not None and value > maximum):
+            bounds = (
+                f"[{minimum}, {maximum}]" if maximum is not None else f">= {minimum}"
+            )
+            raise ApiError(400, f"{name} hors limites {bounds} : {value}")
+        return value
+
+    def number(self, name: str) -> Optional[float]:
+        """Lit un paramètre numérique facultatif (ApiError 400 s'il est invalide)."""
+        raw = self._get(name)
+        if raw is None:
+            return None
+        try:
+            value = float(raw)
+        except ValueError:
+            value = math.nan
+        if not math.isfinite(value):
+            raise ApiError(400, f"{name} doit être un nombre : {raw}")
+        return value
+
+    def month(self, name: str) -> Optional[int]:
+        """Lit un mois "AAAA-MM" facultatif (numéro de mois, voir to_month)."""
+        raw = self._get(name)
+        if raw is None:
+            return None
+        match = _MONTH.match(raw)
+        if match is None or not 1 <= int(match.group(2)) <= 12:
+            raise ApiError(400, f"{name} doit être un mois AAAA-MM : {raw}")
+        return int(match.group(1)) * 12 + int(match.group(2)) - 1
+
+    def check(self) -> None:
+        """
+        Vérifie que tous les paramètres reçus ont été lus.
+
+        Raises:
+            ApiError: Si un paramètre est inconnu (400)
+        """
+        unknown = sorted(set(self._values) - self._used)
+        if unknown:
+            raise ApiError(400, f"Paramètres inconnus : {', '.join(unknown)}")
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Lignes d'un DataFrame en objets JSON (NaN -> null, dates ISO 8601)."""
+    return json.loads(df.to_json(orient="records", date_format="iso"))  # type: ignore[no-any-return]
+
+
+def _pagination(params: Params) -> Tuple[int, int]:
+    """Lit limit et offset."""
+    limit = params.integer("limit", DEFAULT_LIMIT, minimum=1, maximum=MAX_LIMIT)
+    offset = params.integer("offset", 0)
+    return limit, offset
+
+
+def _ranking_filters(dataset: Dataset, params: Params) -> Dict[str, RangeFilter]:
+    """Lit les filtres <colonne>_min et <colonne>_max des colonnes indexées."""
+    filters: Dict[str, RangeFilter] = {}
+    for column in dataset.range_index.columns:
+        low = params.number(f"{column}_min")
+        high = params.number(f"{column}_max")
+        if low is not None or high is not None:
+            filters[column] = (low, high)
+    return filters
+
+
+def _ranking_period(dataset: Dataset, params: Params) -> Optional[Tuple[int, int]]:
+    """Lit la période ; None pour toute la plage des données (comme la page)."""
+    start = params.month("period_start")
+    end = params.month("period_end")
+    if start is None and end is None:
+        return None
+    buckets = dataset.rating_buckets
+    if len(buckets) == 0:
+        raise ApiError(400, "Aucun avis daté : période indisponible")
+    first_month, last_month = buckets.month_range
+    period = (
+        first_month if start is None else start,
+        last_month if end is None else end,
+    )
+    if period[0] > period[1]:
+        raise ApiError(400, "period_start est postérieur à period_end")
+    if period == (first_month, last_month):
+        return None
+    return period
+
+
+def ranking_payload(dataset: Dataset, params: Params) -> Dict[str, Any]:
+    """
+    Classement des recettes par note pondérée, page par page.
+
+    Args:
+        dataset: Jeu de données servi
+        params: Paramètres (m, limit, offset, filtres, période)
+
+    Returns:
+        Dict[str, Any]: paramètres retenus, recettes de la page (rang,
+        recipe_id, name, avg_rating, n_reviews, weighted_rating) et
+        next_offset (None sur la dernière page)
+    """
+    m = params.integer("m", 10)
+    limit, offset = _pagination(params)
+    filters = _ranking_filters(dataset, params)
+    period = _ranking_period(dataset, params)
+    params.check()
+
+    n_recipes = math.ceil((offset + limit + 1) / RANKING_BLOCK) * RANKING_BLOCK
+    ranking = dataset.analyzer.get_ranking(
+        m=m, n_recipes=n_recipes, filters=filters, period=period
+    )
+    page = ranking.iloc[offset : offset + limit]
+    items = page.assign(rank=np.arange(offset + 1, offset + 1 + len(page)))
+    return {
+        "version": dataset.version,
+        "m": m,
+        "filters": {
+            column: {"min": low, "max": high}
+            for column, (low, high) in sorted(filters.items())
+        },
+        "period": (
+            None
+            if period is None
+            else {"start": month_label(period[0]), "end": month_label(period[1])}
+        ),
+        "offset": offset,
+        "limit": limit,
+        "items": _records(
+            items[
+                [
+                    "rank",
+                    "recipe_id",
+                    "name",
+                    "avg_rating",
+                    "n_reviews",
+                    "weighted_rating",
+                ]
+            ]
+        ),
+        "next_offset": offset + limit if len(ranking) > offset + limit else None,
+    }
+
+
+def _recipe_or_404(dataset: Dataset, recipe_id: int) -> pd.Series:
+    recipe = dataset.analyzer.get_recipe(recipe_id)
+    if recipe is None:
+        raise ApiError(404, f"Recette inconnue : {recipe_id}")
+    return recipe
+
+
+def recipe_payload(dataset: Dataset, recipe_id: int, params: Params) -> Dict[str, Any]:
+    """
+    Détail d'une recette : ligne de la table, note moyenne et distribution.
+
+    Args:
+        dataset: Jeu de données servi
+        recipe_id: ID de la recette
+        params: Paramètres (aucun)
+
+    Returns:
+        Dict[str, Any]: recipe, n_reviews, avg_rating et rating_distribution
+
+    Raises:
+        ApiError: Si la recette est inconnue (404)
+    """
+    params.check()
+    recipe = _recipe_or_404(dataset, recipe_id)
+    distribution = dataset.analyzer.get_rating_distribution(recipe_id)
+    n_reviews = int(distribution.sum())
+    total = float((distribution.index.to_numpy() * distribution.to_numpy()).sum())
+    return {
+        "version": dataset.version,
+        "recipe": json.loads(recipe.to_json(date_format="iso")),
+        "n_reviews": n_reviews,
+        "avg_rating": total / n_reviews if n_reviews else None,
+        "rating_distribution": {
+            str(rating): int(count) for rating, count in distribution.items()
+        },
+    }
+
+
+def reviews_payload(dataset: Dataset, recipe_id: int, params: Params) -> Dict[str, Any]:
+    """
+    Avis d'une recette, du plus récent au plus ancien, page par page.
+
+    Args:
+        dataset: Jeu de données servi
+        recipe_id: ID de la recette
+        params: Paramètres (limit, offset)
+
+    Returns:
+        Dict[str, Any]: total, avis de la page et next_offset
+
+    Raises:
+        ApiError: Si la recette est inconnue (404)
+    """
+    limit, offset = _pagination(params)
+    params.check()
+    _recipe_or_404(dataset, recipe_id)
+    total = len(dataset.review_index.rows(recipe_id))
+    reviews = dataset.analyzer.get_recipe_reviews(recipe_id, offset=offset, limit=limit)
+    return {
+        "version": dataset.version,
+        "recipe_id": recipe_id,
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "items": _records(reviews),
+        "next_offset": offset + limit if total > offset + limit else None,
+    }
+
+
+def render(dataset: Dataset, path: str, query: str) -> Response:
+    """
+    Calcule et sérialise la réponse d'une requête.
+
+    Args:
+        dataset: Jeu de données servi
+        path: Chemin de l'URL
+        query: Chaîne de requête
+
+    Returns:
+        Response: statut, corps JSON et corps compressé ; les erreurs de la
+        requête donnent un corps {"error": message}
+    """
+    params = Params(query)
+    try:
+        if path == "/api/version":
+            params.check()
+            payload: Dict[str, Any] = {"version": dataset.version}
+        elif path == "/api/ranking":
+            payload = ranking_payload(dataset, params)
+        else:
+            match = _RECIPE_PATH.match(path)
+            if match is None:
+                raise ApiError(404, f"Ressource inconnue : {path}")
+            recipe_id = int(match.group(1))
+            if match.group(2):
+                payload = reviews_payload(dataset, recipe_id, params)
+            else:
+                payload = recipe_payload(dataset, recipe_id, params)
+    except ApiError as e:
+        return serialize(e.status, {"error": str(e)})
+    return serialize(200, payload)
+
+
+def serialize(status: int, payload: Dict[str, Any]) -> Response:
+    """Encode une réponse en JSON (UTF-8) et la compresse si elle est assez grande."""
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+    gzipped = (
+        gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+    )
+    return Response(status, body, gzipped)
+
+
+_response_cache: Optional[ResultCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResultCache:
+    """Cache des réponses sérialisées du processus."""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResultCache(
+                int(Config.API_CACHE_MAX_MB * 1024 * 1024), name="api"
+            )
+        return _response_cache
+
+
+def get_response(dataset: Dataset, path: str, query: str) -> Response:
+    """
+    Retourne la réponse d'une requête, depuis le cache si elle y est.
+
+    Les paramètres sont normalisés (ordre indifférent) ; un jeu de données
+    sans version n'est pas mis en cache.
+
+    Args:
+        dataset: Jeu de données servi
+        path: Chemin de l'URL
+        query: Chaîne de requête
+
+    Returns:
+        Response: réponse sérialisée
+    """
+    if not dataset.version:
+        return render(dataset, path, query)
+    key = (
+        "api",
+        dataset.version,
+        path,
+        tuple(sorted(parse_qsl(query, keep_blank_values=True))),
+    )
+    return get_response_cache().get_or_compute(
+        key, lambda: render(dataset, path, query)
+    )
+
+
+def etag_of(version: str) -> str:
+    """ETag faible d'une version des données."""
+    return f'W/"{version}"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Indique si If-None-Match désigne l'ETag (comparaison faible)."""
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def accepts_gzip(header: Optional[str]) -> bool:
+    """Indique si Accept-Encoding autorise gzip (q=0 le refuse)."""
+    for part in (header or "").split(","):
+        coding, _, quality = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return quality.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00")
+    return False
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Requêtes GET et HEAD de l'API, sur connexions persistantes."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "food-analysis-api"
+    # Réponse courte écrite en deux fois (en-têtes, corps) : sans TCP_NODELAY,
+    # le second envoi attendrait l'acquittement retardé du client
+    disable_nagle_algorithm = True
+    timeout = KEEP_ALIVE_TIMEOUT_S
+
+    def do_GET(self) -> None:
+        self._handle(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self._handle(send_body=False)
+
+    def _handle(self, send_body: bool) -> None:
+        url = urlsplit(self.path)
+        etag = None
+        try:
+            dataset = get_data_watcher().current()
+            response = get_response(dataset, url.path, url.query)
+            etag = etag_of(dataset.version) if dataset.version else None
+        except FileNotFoundError as e:
+            response = serialize(503, {"error": str(e)})
+        except Exception:
+            logger.exception("Erreur de l'API sur %s", self.path)
+            response = serialize(500, {"error": "erreur interne"})
+
+        if response.status != 200:
+            etag = None
+        if etag is not None and etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(304)
+            self._send_cache_headers(etag)
+            self.end_headers()
+            return
+
+        body = response.body
+        use_gzip = response.gzipped is not None and accepts_gzip(
+            self.headers.get("Accept-Encoding")
+        )
+        if use_gzip:
+            body = response.gzipped  # type: ignore[assignment]
+
+        self.send_response(response.status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self._send_cache_headers(etag)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_cache_headers(self, etag: Optional[str]) -> None:
+        if etag is not None:
+            self.send_header("ETag", etag)
+            # Le client garde la réponse mais la revalide (304 si inchangée)
+            self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class ApiServer(ThreadingHTTPServer):
+    """Serveur de l'API : un thread par connexion."""
+
+    daemon_threads = True
+    # File d'attente des connexions (5 par défaut) : absorbe les rafales
+    request_queue_size = 128
+
+
+def start_api_server(port: int, host: str = "0.0.0.0") -> ApiServer:
+    """
+    Lance l'API dans un thread.
+
+    Args:
+        port: Port d'écoute (0 : port libre choisi par le système)
+        host: Adresse d'écoute
+
+    Returns:
+        ApiServer: serveur démarré (server_address donne le port)
+    """
+    server = ApiServer((host, port), ApiHandler)
+    threading.Thread(
+        target=server.serve_forever, name="api-server", daemon=True
+    ).start()
+    return server
+
+
+def serve_api(host: str = "0.0.0.0", port: int = DEFAULT_PORT) -> int:
+    """
+    Sert l'API au premier plan, après avoir lancé le préchauffage des données.
+
+    Args:
+        host: Adresse d'écoute
+        port: Port d'écoute
+
+    Returns:
+        int: code de sortie (0 après une interruption au clavier)
+    """
+    threading.Thread(
+        target=warm_up, kwargs={"prerender": False}, name="warm-up", daemon=True
+    ).start()
+    with ApiServer((host, port), ApiHandler) as server:
+        logger.info("API sur http://%s:%d/api/", host, server.server_address[1])
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
@@ -1,12 +1,20 @@
 """Main Streamlit application."""
 
-from typing import Tuple
-
 import pandas as pd
 import streamlit as st
 
-from food_analysis.core.data_loader import DataLoader
-from food_analysis.pages.recipe_ratings import show_recipe_ratings_page
+from food_analysis.core.analyzer import DataAnalyzer
+from food_analysis.core.dataset import Dataset
+from food_analysis.core.rating_buckets import MonthlyRatingBuckets
+from food_analysis.core.sketches import HLL_RELATIVE_ERROR
+from food_analysis.pages.contributors import show_contributors_page
+from food_analysis.pages.recipe_ratings import (
+    show_period_filter,
+    show_recipe_ratings_page,
+)
+from food_analysis.pages.user_profile import show_user_profile_page
+from food_analysis.server import get_data_watcher
+from food_analysis.utils.profiler import run_with_profiler
 
 
 def main() -> None:
@@ -25,17 +33,15 @@ def main() -> None:
     st.markdown("---")
 
     # === CHARGEMENT DES DONNÉES ===
-    @st.cache_data
-    def load_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
-        """Charge les données depuis les CSV."""
-        loader = DataLoader()
-        recipes = loader.load_recipes()
-        interactions = loader.load_interactions()
-        return recipes, interactions
-
+    # Un seul DatasetWatcher par processus (voir server.py, déjà chargé si le
+    # serveur a été préchauffé), partagé sans copie entre les sessions : les
+    # pages reçoivent le Dataset et lisent ses index et agrégats. Quand la
+    # version des données change, le nouveau jeu est préparé en arrière-plan et
+    # servi aux reruns suivants.
     try:
         with st.spinner("Chargement des données..."):
-            recipes_df, interactions_df = load_data()
+            watcher = get_data_watcher()
+            dataset = watcher.current()
 
         # === SIDEBAR : NAVIGATION ===
         with st.sidebar:
@@ -43,21 +49,35 @@ def main() -> None:
 
             page = st.radio(
                 "Sélectionnez une page :",
-                ["🏠 Accueil", "🏆 Recettes les Mieux Notées", "ℹ️ À propos"],
+                [
+                    "🏠 Accueil",
+                    "🏆 Recettes les Mieux Notées",
+                    "👤 Profils Utilisateurs",
+                    "🧑‍🍳 Contributeurs",
+                    "ℹ️ À propos",
+                ],
                 index=0,
             )
 
             st.markdown("---")
             st.markdown("### 📊 Informations")
-            st.metric("Nombre de recettes", f"{len(recipes_df):,}")
-            st.metric("Nombre d'interactions", f"{len(interactions_df):,}")
+            st.metric("Nombre de recettes", f"{len(dataset.recipes):,}")
+            st.metric("Nombre d'interactions", f"{len(dataset.interactions):,}")
+            if watcher.refreshing:
+                st.caption("🔄 Nouvelles données en préparation...")
 
         # === ROUTING DES PAGES ===
         if page == "🏠 Accueil":
-            show_home_page(recipes_df, interactions_df)
+            show_home_page(dataset)
 
         elif page == "🏆 Recettes les Mieux Notées":
-            show_recipe_ratings_page(recipes_df, interactions_df)
+            show_recipe_ratings_page(dataset)
+
+        elif page == "👤 Profils Utilisateurs":
+            show_user_profile_page(dataset)
+
+        elif page == "🧑‍🍳 Contributeurs":
+            show_contributors_page(dataset)
 
         else:  # À propos
             show_about_page()
@@ -80,7 +100,7 @@ def main() -> None:
         st.exception(e)
 
 
-def show_home_page(recipes_df: pd.DataFrame, interactions_df: pd.DataFrame) -> None:
+def show_home_page(dataset: Dataset) -> None:
     """Affiche la page d'accueil."""
     st.header("Bienvenue sur l'application d'analyse Food.com")
 
@@ -93,26 +113,80 @@ def show_home_page(recipes_df: pd.DataFrame, interactions_df: pd.DataFrame) -> N
     ### 📊 Fonctionnalités
 
     - **🏆 Recettes les Mieux Notées** : Découvrez les recettes les plus populaires avec un système de notation pondérée
+    - **👤 Profils Utilisateurs** : Consultez les avis d'un utilisateur et le classement des plus actifs
+    - **🧑‍🍳 Contributeurs** : Comparez les auteurs de recettes (recettes publiées, avis reçus, notes)
 
     ### 🚀 Comment utiliser
 
     Utilisez le menu de navigation à gauche pour explorer les différentes sections.
     """)
 
-    # Quelques statistiques rapides
+    # Quelques statistiques rapides (précalculées avec le jeu de données)
+    analyzer = dataset.analyzer
+    stats = analyzer.get_basic_stats()
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        avg_rating = interactions_df[interactions_df["rating"] > 0]["rating"].mean()
-        st.metric("📊 Note Moyenne Globale", f"{avg_rating:.2f}/5")
+        st.metric("📊 Note Moyenne Globale", f"{stats['avg_rating']:.2f}/5")
 
     with col2:
-        avg_reviews = interactions_df.groupby("recipe_id").size().mean()
-        st.metric("💬 Moyenne d'Avis par Recette", f"{avg_reviews:.1f}")
+        st.metric(
+            "💬 Moyenne d'Avis par Recette", f"{stats['avg_reviews_per_recipe']:.1f}"
+        )
+
+    with col3:
+        st.metric("👥 Utilisateurs Actifs", f"{stats['total_users']:,}")
+
+    show_activity_metrics(analyzer, dataset.rating_buckets)
+
 
+# Libellés des quantiles d'activité
+QUANTILE_LABELS = {0.5: "Médiane", 0.9: "90e centile", 0.99: "99e centile"}
+
+
+def show_activity_metrics(
+    analyzer: DataAnalyzer, buckets: MonthlyRatingBuckets
+) -> None:
+    """
+    Affiche l'activité sur une période choisie (avis, utilisateurs, quantiles).
+
+    Args:
+        analyzer: Moteur d'analyse du jeu de données
+        buckets: Seaux mensuels des notes (plage de mois proposée)
+    """
+    if not len(buckets):
+        return  # pas de dates d'avis
+
+    st.markdown("### 📅 Activité sur une période")
+    period = show_period_filter(buckets, key="home_period")
+    activity = analyzer.get_activity_metrics(period)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("💬 Avis", f"{activity['n_reviews']:,}")
+    with col2:
+        avg_rating = activity["avg_rating"]
+        st.metric(
+            "📊 Note Moyenne", "—" if avg_rating is None else f"{avg_rating:.2f}/5"
+        )
     with col3:
-        unique_users = interactions_df["user_id"].nunique()
-        st.metric("👥 Utilisateurs Actifs", f"{unique_users:,}")
+        st.metric("👥 Utilisateurs", f"≈ {activity['n_users']:,}")
+    with col4:
+        st.metric("🍽️ Recettes Notées", f"≈ {activity['n_recipes']:,}")
+
+    quantiles = pd.DataFrame(
+        {
+            "Avis par recette": activity["reviews_per_recipe"],
+            "Notes par utilisateur": activity["ratings_per_user"],
+        }
+    ).T.rename(columns=QUANTILE_LABELS)
+    if not quantiles.empty:
+        st.dataframe(quantiles, use_container_width=True)
+    error = f"{HLL_RELATIVE_ERROR * 100:.1f}".replace(".", ",")
+    st.caption(
+        f"Utilisateurs et recettes distincts : estimations (HyperLogLog, ~{error} % "
+        "près) ; quantiles exacts."
+    )
 
 
 def show_about_page() -> None:
@@ -137,4 +211,4 @@ def show_about_page() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    run_with_profiler(main)
@@ -0,0 +1,280 @@
+"""Interface en ligne de commande.
+
+Usage :
+    food-analysis precompute [--raw DOSSIER] [--out DOSSIER] [--force]
+                             [--content-hash] [--dedup] [--threshold SIMILARITE]
+                             [--workers N]
+    food-analysis serve [options de streamlit run]
+    food-analysis api [--host ADRESSE] [--port PORT]
+    food-analysis dedup [--threshold SIMILARITE] [--workers N]
+    food-analysis loadtest [--sessions N] [--actions N] [--data synthetic|raw]
+                           [--url URL] [--out DOSSIER] [--compare RAPPORT]
+
+``precompute`` lit les CSV bruts, construit toutes les structures dérivées et
+publie un bundle versionné dans le dossier des données traitées (voir
+core/bundle.py). L'application le charge avec ``DATA_MODE=bundle``. Avec
+``--dedup``, les recettes quasi identiques sont cherchées pendant la
+construction et leurs groupes rangés dans le bundle (voir core/duplicates.py).
+
+``serve`` lance l'application après avoir démarré le préchauffage des données
+et les sondes de santé (voir server.py).
+
+``api`` sert l'API JSON du classement et des recettes, sans Streamlit (voir
+api.py).
+
+``dedup`` reconstruit le bundle des CSV de DATA_RAW_PATH avec les groupes de
+doublons (équivalent de ``precompute --force --dedup``) : la page des recettes
+peut alors regrouper leurs avis. Les serveurs déjà lancés gardent les données
+chargées jusqu'à leur redémarrage (la version des données est inchangée).
+
+``loadtest`` simule des sessions simultanées et mesure la latence des reruns
+(voir loadtest.py).
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from food_analysis.core.bundle import build_bundle, read_manifest
+from food_analysis.core.duplicates import SIMILARITY_THRESHOLD
+from food_analysis.utils.config import Config
+from food_analysis.utils.logger import setup_logger
+
+
+def precompute(args: argparse.Namespace) -> int:
+    """Construit et publie le bundle de données."""
+    logger = setup_logger("food_analysis.cli", log_file=Path("precompute.log"))
+    logger.info("Construction du bundle depuis %s", args.raw)
+
+    start = time.perf_counter()
+    try:
+        directory = build_bundle(
+            args.raw,
+            args.out,
+            force=args.force,
+            content_hash=args.content_hash,
+            dedup_threshold=args.threshold if args.dedup else None,
+            dedup_workers=args.workers,
+        )
+    except FileNotFoundError as e:
+        logger.error("%s", e)
+        return 1
+
+    manifest = read_manifest(directory)
+    size = sum(a["bytes"] for a in manifest["artifacts"].values())
+    logger.info(
+        "Bundle %s publié dans %s (%.1f Mo, %.1f s)",
+        manifest["version"],
+        directory,
+        size / 1e6,
+        time.perf_counter() - start,
+    )
+    return 0
+
+
+def serve(args: argparse.Namespace) -> int:
+    """Lance l'application préchauffée."""
+    from food_analysis.server import serve as serve_app
+
+    setup_logger("food_analysis")
+    return serve_app(args.streamlit_args)
+
+
+def api(args: argparse.Namespace) -> int:
+    """Lance l'API JSON."""
+    from food_analysis.api import DEFAULT_PORT, serve_api
+
+    setup_logger("food_analysis")
+    return serve_api(args.host, args.port or Config.API_PORT or DEFAULT_PORT)
+
+
+def dedup(args: argparse.Namespace) -> int:
+    """Reconstruit le bundle des CSV avec les groupes de recettes en double."""
+    return precompute(
+        argparse.Namespace(
+            raw=Config.DATA_RAW_PATH,
+            out=Config.DATA_PROCESSED_PATH,
+            force=True,
+            content_hash=Config.DATA_CONTENT_HASH,
+            dedup=True,
+            threshold=args.threshold,
+            workers=args.workers,
+        )
+    )
+
+
+def loadtest(args: argparse.Namespace) -> int:
+    """Lance un test de charge et enregistre son rapport."""
+    from food_analysis.loadtest import (
+        LoadTestConfig,
+        compare_reports,
+        format_report,
+        run_load_test,
+        write_report,
+    )
+
+    logger = setup_logger("food_analysis.cli")
+    config = LoadTestConfig(
+        sessions=args.sessions,
+        actions=args.actions,
+        seed=args.seed,
+        data=args.data,
+        n_recipes=args.recipes,
+        n_interactions=args.interactions,
+        think_time_s=args.think_ms / 1000,
+        url=args.url,
+    )
+    logger.info("Test de charge : %s", config)
+    report = run_load_test(config)
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        report["comparison"] = compare_reports(report, baseline)
+
+    path = write_report(report, args.out)
+    print(format_report(report))
+    for metric, values in report.get("comparison", {}).items():
+        if "change_pct" in values:
+            print(
+                f"{metric:<20}{values['baseline']!s:>14} -> {values['current']!s:<14}"
+                f"({values['change_pct']}%)"
+            )
+    logger.info("Rapport enregistré dans %s", path)
+    return 1 if report["results"]["errors"] else 0
+
+
+def add_dedup_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options de la recherche des recettes en double."""
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=SIMILARITY_THRESHOLD,
+        help=f"Similarité minimale de deux recettes (défaut : {SIMILARITY_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Processus de calcul des signatures (défaut : nombre de cœurs)",
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée de la commande food-analysis."""
+    parser = argparse.ArgumentParser(
+        prog="food-analysis", description="Outils hors ligne de Food Analysis"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    precompute_parser = subparsers.add_parser(
+        "precompute", help="Construit le bundle de données précalculé"
+    )
+    precompute_parser.add_argument(
+        "--raw", type=Path, default=Config.DATA_RAW_PATH, help="Dossier des CSV"
+    )
+    precompute_parser.add_argument(
+        "--out",
+        type=Path,
+        default=Config.DATA_PROCESSED_PATH,
+        help="Dossier des données traitées",
+    )
+    precompute_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reconstruit même si le bundle de cette version existe",
+    )
+    precompute_parser.add_argument(
+        "--content-hash",
+        action=argparse.BooleanOptionalAction,
+        default=Config.DATA_CONTENT_HASH,
+        help="Version fondée sur le contenu des CSV plutôt que leurs métadonnées",
+    )
+    precompute_parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Cherche les recettes en double et les range dans le bundle",
+    )
+    add_dedup_arguments(precompute_parser)
+    precompute_parser.set_defaults(func=precompute)
+
+    # Les options inconnues de serve sont transmises à streamlit run
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Lance l'application avec préchauffage et sondes de santé",
+        usage="food-analysis serve [options de streamlit run]",
+    )
+    serve_parser.set_defaults(func=serve)
+
+    api_parser = subparsers.add_parser(
+        "api", help="Sert l'API JSON du classement et des recettes"
+    )
+    api_parser.add_argument(
+        "--host", default="0.0.0.0", help="Adresse d'écoute (défaut : 0.0.0.0)"
+    )
+    api_parser.add_argument(
+        "--port",
+        type=int,
+        help="Port d'écoute (défaut : API_PORT, sinon 8503)",
+    )
+    api_parser.set_defaults(func=api)
+
+    dedup_parser = subparsers.add_parser(
+        "dedup",
+        help="Reconstruit le bundle avec les recettes en double (MinHash/LSH)",
+    )
+    add_dedup_arguments(dedup_parser)
+    dedup_parser.set_defaults(func=dedup)
+
+    loadtest_parser = subparsers.add_parser(
+        "loadtest", help="Mesure la latence des reruns sous charge"
+    )
+    loadtest_parser.add_argument(
+        "--sessions", type=int, default=10, help="Sessions simultanées"
+    )
+    loadtest_parser.add_argument(
+        "--actions", type=int, default=20, help="Actions par session"
+    )
+    loadtest_parser.add_argument(
+        "--seed", type=int, default=0, help="Graine du scénario"
+    )
+    loadtest_parser.add_argument(
+        "--data",
+        choices=("synthetic", "raw"),
+        default="synthetic",
+        help="Jeu de données synthétique ou CSV de DATA_RAW_PATH",
+    )
+    loadtest_parser.add_argument(
+        "--recipes", type=int, default=20_000, help="Recettes du jeu synthétique"
+    )
+    loadtest_parser.add_argument(
+        "--interactions",
+        type=int,
+        default=200_000,
+        help="Interactions du jeu synthétique",
+    )
+    loadtest_parser.add_argument(
+        "--think-ms", type=float, default=0.0, help="Pause entre deux actions (ms)"
+    )
+    loadtest_parser.add_argument(
+        "--url", help="Serveur déjà lancé (sinon un serveur est démarré)"
+    )
+    loadtest_parser.add_argument(
+        "--out",
+        type=Path,
+        default=Config.LOGS_PATH / "loadtest",
+        help="Dossier des rapports",
+    )
+    loadtest_parser.add_argument(
+        "--compare", type=Path, help="Rapport de référence à comparer"
+    )
+    loadtest_parser.set_defaults(func=loadtest)
+
+    args, extra = parser.parse_known_args(argv)
+    if args.command != "serve" and extra:
+        parser.error(f"arguments non reconnus : {' '.join(extra)}")
+    args.streamlit_args = extra
+    return int(args.func(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
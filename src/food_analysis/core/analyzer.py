@@ -1,56 +1,570 @@
 """Module d'analyse des données Food.com.
 
-Version simple pour démarrer. L'équipe pourra ajouter plus de méthodes.
+Le ``DataAnalyzer`` est le point d'entrée des pages pour toutes les
+statistiques : il est construit une fois par version des données
+(``Dataset.analyzer``), calcule ses agrégats au premier appel et les garde.
+Il retourne des données (DataFrames, Series, dictionnaires) que les pages
+mettent en forme ; il ne trace rien lui-même, sauf ``plot_rating_distribution``
+conservée pour l'exploration en notebook.
 """
 
-import matplotlib.pyplot as plt
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+import numpy as np
 import pandas as pd
 
+from food_analysis.core.backends import get_backend
+from food_analysis.core.duplicates import DuplicateGroups
+from food_analysis.core.note_et_avis import (
+    add_weighted_rating,
+    compute_recipe_stats,
+    compute_windowed_recipe_stats,
+    recipe_reviews,
+)
+from food_analysis.core.range_index import RangeFilter
+from food_analysis.core.review_store import select_reviews
+from food_analysis.utils.lazy_import import lazy_module
+from food_analysis.utils.locks import SingleFlight
+from food_analysis.utils.result_cache import get_ranking_cache, ranking_key
+
+if TYPE_CHECKING:
+    from food_analysis.core.dataset import Dataset
+
+# matplotlib n'est importé qu'au premier tracé (inutile pour l'application web)
+plt = lazy_module("matplotlib.pyplot")
+
+T = TypeVar("T")
+
+# Notes possibles (0 : avis sans note)
+RATINGS = range(6)
+
+# Quantiles des indicateurs d'activité (avis par recette, notes par utilisateur)
+ACTIVITY_QUANTILES = (0.5, 0.9, 0.99)
+
+# Calculs de classement lancés en arrière-plan (classement progressif)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+# Dernier calcul demandé par chaque session (voir submit_ranking)
+_pending: Dict[Hashable, "Future[pd.DataFrame]"] = {}
+
+
+def _background() -> ThreadPoolExecutor:
+    """Threads des calculs en arrière-plan, partagés par toutes les sessions."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ranking")
+        return _executor
+
+
+def _forget_pending(session_key: Hashable, future: "Future[pd.DataFrame]") -> None:
+    """Retire le calcul terminé d'une session, s'il est toujours le dernier."""
+    with _executor_lock:
+        if _pending.get(session_key) is future:
+            del _pending[session_key]
+
+
+@dataclass
+class ApproximateRanking:
+    """Classement approché, affiché en attendant le classement exact."""
+
+    ranking: pd.DataFrame
+    # "stale" : mêmes paramètres sur une version précédente des données ;
+    # "sample" : estimation sur l'échantillon fixe du jeu de données
+    source: str
+    # Part des avis utilisée par l'estimation
+    sample_fraction: float = 1.0
+
 
 class DataAnalyzer:
-    """Classe pour analyser les données de recettes et interactions."""
-
-    # def __init__(self, recipes: pd.DataFrame, interactions: pd.DataFrame) -> None:
-    #     """Initialise l'analyseur avec les données."""
-    #     self.recipes = recipes
-    #     self.interactions = interactions
-
-    # def get_basic_stats(self) -> Dict[str, Any]:
-    #     """Retourne des statistiques de base sur les données."""
-    #     stats = {
-    #         "total_recipes": len(self.recipes),
-    #         "total_interactions": len(self.interactions),
-    #         "total_users": self.interactions["user_id"].nunique()
-    #         if "user_id" in self.interactions.columns
-    #         else 0,
-    #     }
-    #     return stats
-
-    # def get_top_recipes(self, n: int = 10) -> pd.DataFrame:
-    #     """Retourne les N recettes avec le plus d'interactions."""
-    #     if self.interactions.empty:
-    #         return pd.DataFrame()
-
-    #     recipe_counts = self.interactions["recipe_id"].value_counts().head(n)
-    #     top_recipes = self.recipes[self.recipes["id"].isin(recipe_counts.index)]
-    #     return top_recipes
-
-    # def get_average_rating(self) -> float:
-    #     """Calcule la note moyenne de toutes les recettes."""
-    #     if "rating" not in self.interactions.columns:
-    #         return 0.0
-
-    #     valid_ratings = self.interactions[self.interactions["rating"] > 0]["rating"]
-    #     if len(valid_ratings) == 0:
-    #         return 0.0
-
-    #     return float(valid_ratings.mean())
+    """Statistiques d'un jeu de données, calculées à la demande et mémorisées."""
+
+    def __init__(self, dataset: Optional["Dataset"] = None) -> None:
+        """
+        Initialise l'analyseur (sans rien calculer).
+
+        Args:
+            dataset: Jeu de données analysé ; facultatif pour les seules
+                fonctions de tracé sur un DataFrame
+        """
+        self._dataset = dataset
+        self._memo: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+
+    @property
+    def dataset(self) -> "Dataset":
+        """Jeu de données analysé."""
+        if self._dataset is None:
+            raise ValueError("DataAnalyzer construit sans jeu de données")
+        return self._dataset
+
+    def _memoize(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Calcule une seule fois la valeur d'une clé, même en accès simultanés."""
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]  # type: ignore[no-any-return]
+
+        def compute_and_store() -> T:
+            value = compute()
+            with self._lock:
+                self._memo[key] = value
+            return value
+
+        return self._flights.do(key, compute_and_store)
+
+    # === Indicateurs globaux ===
+
+    def get_basic_stats(self) -> Dict[str, Any]:
+        """
+        Retourne des statistiques de base sur les données.
+
+        Returns:
+            Dict[str, Any]: total_recipes, total_interactions, total_users,
+            avg_rating, avg_reviews_per_recipe et rating_counts
+        """
+
+        def compute() -> Dict[str, Any]:
+            metrics = self.dataset.metrics
+            return {
+                "total_recipes": len(self.dataset.recipes),
+                "total_interactions": len(self.dataset.interactions),
+                "total_users": metrics["n_users"],
+                "avg_rating": metrics["avg_rating"],
+                "avg_reviews_per_recipe": metrics["avg_reviews_per_recipe"],
+                "rating_counts": metrics["rating_counts"],
+            }
+
+        return self._memoize("basic_stats", compute)
+
+    def get_average_rating(self) -> float:
+        """Note moyenne de tous les avis notés (notes > 0)."""
+        return float(self.get_basic_stats()["avg_rating"])
+
+    def get_activity_metrics(
+        self, period: Optional[Tuple[int, int]] = None
+    ) -> Dict[str, Any]:
+        """
+        Retourne les indicateurs d'activité d'une période, sans relire les
+        interactions.
+
+        Les totaux et les nombres d'utilisateurs et de recettes distincts
+        (estimations HyperLogLog, à ~1,6 % près, voir
+        sketches.HLL_RELATIVE_ERROR) fusionnent les esquisses mensuelles ; les
+        quantiles d'avis par recette et de notes par utilisateur sont exacts,
+        tirés des seaux mensuels.
+
+        Args:
+            period: (premier mois, dernier mois) inclus, ou None pour toute la
+                plage des données
+
+        Returns:
+            Dict[str, Any]: n_reviews, avg_rating (notes > 0), n_users,
+            n_recipes, avg_reviews_per_recipe, et reviews_per_recipe /
+            ratings_per_user ({quantile: valeur}, vides sans avis)
+        """
+
+        def compute() -> Dict[str, Any]:
+            sketches = self.dataset.activity_sketches
+            start, end = period or sketches.month_range
+            metrics = sketches.window(start, end)
+            metrics["avg_reviews_per_recipe"] = (
+                metrics["n_reviews"] / metrics["n_recipes"]
+                if metrics["n_recipes"]
+                else 0.0
+            )
+            for name, buckets in (
+                ("reviews_per_recipe", self.dataset.rating_buckets),
+                ("ratings_per_user", self.dataset.user_buckets),
+            ):
+                counts = buckets.window_counts(start, end)
+                values = np.quantile(counts, ACTIVITY_QUANTILES) if len(counts) else []
+                metrics[name] = {
+                    q: float(value) for q, value in zip(ACTIVITY_QUANTILES, values)
+                }
+            return metrics
+
+        return self._memoize(("activity", period), compute)
+
+    def get_top_recipes(self, n: int = 10) -> pd.DataFrame:
+        """
+        Retourne les N recettes qui ont reçu le plus d'avis.
+
+        Args:
+            n: Nombre de recettes
+
+        Returns:
+            pd.DataFrame: id, name, n_reviews et avg_rating, par nombre d'avis
+            décroissant
+        """
+
+        def compute() -> pd.DataFrame:
+            top = self.dataset.recipe_aggregates.nlargest(n, "n_reviews")
+            named: pd.DataFrame = top.merge(
+                self.dataset.recipes[["id", "name"]],
+                left_on="recipe_id",
+                right_on="id",
+                how="left",
+            )[["id", "name", "n_reviews", "avg_rating"]].reset_index(drop=True)
+            return named
+
+        return self._memoize(("top_recipes", n), compute)
+
+    # === Classement des recettes ===
+
+    def get_ranking(
+        self,
+        m: int = 10,
+        n_recipes: int = 20,
+        filters: Optional[Dict[str, RangeFilter]] = None,
+        period: Optional[Tuple[int, int]] = None,
+        merge_duplicates: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Retourne les recettes les mieux notées (note pondérée bayésienne).
+
+        Les classements d'une version de données identifiée sont partagés entre
+        les sessions (voir utils/result_cache.py).
+
+        Args:
+            m: Nombre minimal d'avis pour la pondération
+            n_recipes: Nombre de recettes retournées
+            filters: Filtres par plage sur les recettes {colonne: (min, max)}
+            period: (premier mois, dernier mois) des avis pris en compte, ou None
+            merge_duplicates: Regroupe les avis des recettes en double sur leur
+                représentant (sans effet si les doublons ne sont pas calculés)
+
+        Returns:
+            pd.DataFrame: recipe_id, name, avg_rating, n_reviews et weighted_rating
+        """
+        filters = filters or {}
+        merge_duplicates = self._merges_duplicates(merge_duplicates)
+
+        def compute() -> pd.DataFrame:
+            ranking: pd.DataFrame = self.get_full_ranking(
+                m=m, filters=filters, period=period, merge_duplicates=merge_duplicates
+            ).head(n_recipes)
+            return ranking
+
+        # Sans version, deux jeux de données différents auraient la même clé
+        if not self.dataset.version:
+            return compute()
+        return get_ranking_cache().get_or_compute(
+            ranking_key(
+                self.dataset.version, m, n_recipes, filters, period, merge_duplicates
+            ),
+            compute,
+        )
+
+    def get_full_ranking(
+        self,
+        m: int = 10,
+        filters: Optional[Dict[str, RangeFilter]] = None,
+        period: Optional[Tuple[int, int]] = None,
+        merge_duplicates: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Retourne le classement de toutes les recettes retenues (ex. export).
+
+        Contrairement à get_ranking, le résultat n'est pas mis en cache : il
+        peut compter des centaines de milliers de lignes.
+
+        Args:
+            m: Nombre minimal d'avis pour la pondération
+            filters: Filtres par plage sur les recettes {colonne: (min, max)}
+            period: (premier mois, dernier mois) des avis pris en compte, ou None
+            merge_duplicates: Regroupe les avis des recettes en double sur leur
+                représentant (sans effet si les doublons ne sont pas calculés)
+
+        Returns:
+            pd.DataFrame: recipe_id, name, avg_rating, n_reviews et weighted_rating
+        """
+        recipe_ids = self.dataset.range_index.filter(filters or {})
+        groups = self.dataset.duplicate_groups if merge_duplicates else None
+        if groups is not None:
+            return get_backend().rank_recipes(
+                self._merged_aggregates(groups, period),
+                self.dataset.recipes,
+                m=m,
+                recipe_ids=recipe_ids,
+                parquet_dir=self.dataset.parquet_dir,
+            )
+        if period is None:
+            return compute_recipe_stats(
+                self.dataset.recipes,
+                self.dataset.interactions,
+                m=m,
+                recipe_ids=recipe_ids,
+                aggregates=self.dataset.recipe_aggregates,
+                backend=get_backend(),
+                parquet_dir=self.dataset.parquet_dir,
+            )
+        return compute_windowed_recipe_stats(
+            self.dataset.recipes,
+            self.dataset.rating_buckets,
+            start_month=period[0],
+            end_month=period[1],
+            m=m,
+            recipe_ids=recipe_ids,
+            backend=get_backend(),
+            parquet_dir=self.dataset.parquet_dir,
+        )
+
+    def submit_ranking(
+        self,
+        m: int = 10,
+        n_recipes: int = 20,
+        filters: Optional[Dict[str, RangeFilter]] = None,
+        period: Optional[Tuple[int, int]] = None,
+        merge_duplicates: bool = False,
+        session_key: Optional[Hashable] = None,
+    ) -> "Future[pd.DataFrame]":
+        """
+        Lance get_ranking en arrière-plan.
+
+        Un calcul déjà démarré se poursuit même si la session qui l'a demandé
+        passe à autre chose ; son résultat reste dans le cache des classements.
+        En revanche, un calcul encore en file d'attente est annulé dès que la
+        même session en demande un autre : les threads partagés ne traitent
+        pas des classements que plus personne n'attend.
+
+        Args:
+            m: Nombre minimal d'avis pour la pondération
+            n_recipes: Nombre de recettes retournées
+            filters: Filtres par plage sur les recettes {colonne: (min, max)}
+            period: (premier mois, dernier mois) des avis pris en compte, ou None
+            merge_duplicates: Regroupe les avis des recettes en double sur leur
+                représentant (sans effet si les doublons ne sont pas calculés)
+            session_key: Identifiant de la session demandeuse (None : le calcul
+                n'est jamais annulé)
+
+        Returns:
+            Future[pd.DataFrame]: classement exact à venir (annulé si la session
+            a demandé un autre classement avant son démarrage)
+        """
+        future = _background().submit(
+            self.get_ranking,
+            m=m,
+            n_recipes=n_recipes,
+            filters=filters,
+            period=period,
+            merge_duplicates=merge_duplicates,
+        )
+        if session_key is None:
+            return future
+
+        with _executor_lock:
+            previous = _pending.get(session_key)
+            _pending[session_key] = future
+        if previous is not None:
+            # Sans effet si le calcul précédent a déjà démarré
+            previous.cancel()
+        future.add_done_callback(lambda done: _forget_pending(session_key, done))
+        return future
+
+    def get_approximate_ranking(
+        self,
+        m: int = 10,
+        n_recipes: int = 20,
+        filters: Optional[Dict[str, RangeFilter]] = None,
+        period: Optional[Tuple[int, int]] = None,
+        merge_duplicates: bool = False,
+    ) -> Optional[ApproximateRanking]:
+        """
+        Retourne un classement approché, sans regrouper toutes les interactions.
+
+        Par ordre de préférence : le classement des mêmes paramètres calculé
+        sur une version précédente des données (cache des classements), sinon
+        une estimation sur l'échantillon fixe du jeu de données, dont le coût
+        ne dépend que de Config.RANKING_SAMPLE_SIZE.
+
+        Args:
+            m: Nombre minimal d'avis pour la pondération
+            n_recipes: Nombre de recettes retournées
+            filters: Filtres par plage sur les recettes {colonne: (min, max)}
+            period: (premier mois, dernier mois) des avis pris en compte, ou None
+            merge_duplicates: Regroupe les avis des recettes en double sur leur
+                représentant (sans effet si les doublons ne sont pas calculés)
+
+        Returns:
+            Optional[ApproximateRanking]: classement au format de get_ranking,
+            ou None si aucune estimation n'est possible (aucun avis)
+        """
+        filters = filters or {}
+        merge_duplicates = self._merges_duplicates(merge_duplicates)
+        if self.dataset.version:
+            key = ranking_key(
+                self.dataset.version, m, n_recipes, filters, period, merge_duplicates
+            )
+            stale = get_ranking_cache().latest(
+                lambda other: (
+                    isinstance(other, tuple)
+                    and other[0] == key[0]
+                    and other[1] != key[1]
+                    and other[2:] == key[2:]
+                )
+            )
+            if stale is not None:
+                return ApproximateRanking(stale, "stale")
+
+        sample = self.dataset.ranking_sample
+        if len(sample) == 0:
+            return None
+        # Pondération sur le nombre d'avis réellement tirés (m / fraction sur
+        # les comptes extrapolés) : une moyenne estimée sur un ou deux avis de
+        # l'échantillon ne passe pas devant les recettes les plus sûres
+        aggregates = sample.aggregates(period)
+        groups = self.dataset.duplicate_groups
+        if merge_duplicates and groups is not None:
+            aggregates = groups.merge_aggregates(aggregates)
+        recipe_stats = add_weighted_rating(aggregates, m=m / sample.fraction)
+        recipe_ids = self.dataset.range_index.filter(filters)
+        if recipe_ids is not None:
+            recipe_stats = recipe_stats[recipe_stats["recipe_id"].isin(recipe_ids)]
+        top = recipe_stats.nlargest(n_recipes, "weighted_rating")
+        names = self._memoize("recipe_names", self._recipe_names)
+        ranking = top.assign(name=top["recipe_id"].map(names)).reset_index(drop=True)
+        return ApproximateRanking(
+            ranking[
+                ["recipe_id", "name", "avg_rating", "n_reviews", "weighted_rating"]
+            ],
+            "sample",
+            sample.fraction,
+        )
+
+    def _merges_duplicates(self, merge_duplicates: bool) -> bool:
+        """Regroupement des doublons demandé et possible (doublons calculés)."""
+        return merge_duplicates and self.dataset.duplicate_groups is not None
+
+    def _merged_aggregates(
+        self, groups: DuplicateGroups, period: Optional[Tuple[int, int]]
+    ) -> pd.DataFrame:
+        """Agrégats par recette (ou d'une période), doublons regroupés."""
+        if period is not None:
+            return groups.merge_aggregates(
+                self.dataset.rating_buckets.window_stats(period[0], period[1])
+            )
+        return self._memoize(
+            "merged_aggregates",
+            lambda: groups.merge_aggregates(self.dataset.recipe_aggregates),
+        )
+
+    def _recipe_names(self) -> pd.Series:
+        recipes = self.dataset.recipes
+        names = pd.Series(recipes["name"].to_numpy(), index=recipes["id"].to_numpy())
+        unique: pd.Series = names[~names.index.duplicated()]
+        return unique
+
+    # === Détail d'une recette ===
+
+    def get_recipe(self, recipe_id: int) -> Optional[pd.Series]:
+        """
+        Retourne la ligne d'une recette.
+
+        Args:
+            recipe_id: ID de la recette
+
+        Returns:
+            Optional[pd.Series]: ligne de la table des recettes, None si absente
+        """
+        # id -> position dans la table (table de hachage construite une fois)
+        positions = self._memoize("recipe_positions", self._recipe_positions)
+        position = positions.get(recipe_id)
+        if position is None:
+            return None
+        return self.dataset.recipes.iloc[int(position)]
+
+    def _recipe_positions(self) -> pd.Series:
+        ids = self.dataset.recipes["id"]
+        positions = pd.Series(np.arange(len(ids)), index=ids.to_numpy())
+        unique: pd.Series = positions[~positions.index.duplicated()]
+        return unique
+
+    def get_recipe_reviews(
+        self, recipe_id: int, offset: int = 0, limit: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Retourne les avis d'une recette, du plus récent au plus ancien.
+
+        Args:
+            recipe_id: ID de la recette
+            offset: Nombre d'avis récents sautés (pagination)
+            limit: Nombre maximal d'avis retournés (None : tous)
+
+        Returns:
+            pd.DataFrame: user_id, rating, date et review
+        """
+        if offset or limit is not None:
+            # Seuls les textes de la page sont lus dans le store
+            rows = self.dataset.review_index.rows(recipe_id)
+            stop = None if limit is None else offset + limit
+            return select_reviews(
+                self.dataset.interactions,
+                rows[offset:stop],
+                ["user_id", "rating", "date", "review"],
+                self.dataset.review_store,
+            )
+        return recipe_reviews(
+            recipe_id,
+            self.dataset.interactions,
+            index=self.dataset.review_index,
+            store=self.dataset.review_store,
+        )
+
+    def get_rating_distribution(self, recipe_id: int) -> pd.Series:
+        """
+        Compte les avis d'une recette par note.
+
+        Args:
+            recipe_id: ID de la recette
+
+        Returns:
+            pd.Series: nombre d'avis indexé par note (0 à 5, 0 : sans note)
+        """
+        return self._rating_counts(self.dataset.review_index.rows(recipe_id))
+
+    def get_user_rating_distribution(self, user_id: int) -> pd.Series:
+        """
+        Compte les notes données par un utilisateur.
+
+        Args:
+            user_id: ID de l'utilisateur
+
+        Returns:
+            pd.Series: nombre d'avis indexé par note (0 à 5, 0 : sans note)
+        """
+        return self._rating_counts(self.dataset.user_index.rows(user_id))
+
+    def _rating_counts(self, rows: np.ndarray) -> pd.Series:
+        ratings = self.dataset.interactions["rating"].iloc[rows]
+        counts: pd.Series = (
+            ratings.value_counts()
+            .reindex(RATINGS, fill_value=0)
+            .rename("n_reviews")
+            .rename_axis("rating")
+        )
+        return counts
 
     def plot_rating_distribution(
         self, interaction_df: pd.DataFrame, recipe_id: int
     ) -> None:
         """
         Affiche la distribution des notes pour une recette spécifique.
+
+        Réservé à l'exploration (matplotlib, bloquant) ; l'application utilise
+        get_rating_distribution.
         """
 
         ratings = interaction_df.loc[interaction_df["recipe_id"] == recipe_id, "rating"]
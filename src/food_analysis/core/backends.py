@@ -0,0 +1,419 @@
+"""Moteurs de calcul interchangeables pour le classement et les agrégats.
+
+Les mêmes requêtes (agrégats par recette, classement pondéré, avis d'une
+recette) peuvent s'exécuter sur :
+
+- ``pandas`` : implémentation de référence (note_et_avis.py), toujours
+  disponible ;
+- ``duckdb`` : moteur SQL embarqué, multi-thread ;
+- ``polars`` : moteur multi-thread à exécution paresseuse.
+
+Quand le jeu de données provient d'un bundle (``parquet_dir``), DuckDB et
+Polars lisent les tables des recettes et des interactions directement dans
+ses fichiers Parquet (``read_parquet``, ``scan_parquet``) : seules les
+colonnes utiles sont lues, par blocs, sans copie des DataFrames chargés. Sans
+bundle (mode raw), ils interrogent les DataFrames en mémoire : DuckDB les lit
+en place, Polars convertit les colonnes utiles à chaque appel. La référence
+pandas travaille toujours en mémoire.
+
+Les avis d'une recette sont toujours lus en mémoire : dans un bundle, leurs
+textes sont dans le store compressé (voir review_store.py), pas dans le
+Parquet des interactions.
+
+Le moteur est choisi par ``COMPUTE_BACKEND``. DuckDB et Polars sont des
+dépendances optionnelles (``pip install "food-analysis-webapp[duckdb]"``) :
+si le moteur demandé n'est pas installé, la référence pandas est utilisée.
+
+Tous les moteurs produisent les mêmes colonnes, dans le même ordre, que la
+référence.
+"""
+
+import importlib
+import logging
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Type
+
+import numpy as np
+import pandas as pd
+
+from food_analysis.core.note_et_avis import (
+    compute_recipe_aggregates,
+    rank_recipe_stats,
+    recipe_reviews,
+)
+from food_analysis.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+REVIEW_COLUMNS = ["user_id", "rating", "date", "review"]
+RANKING_COLUMNS = ["recipe_id", "name", "avg_rating", "n_reviews", "weighted_rating"]
+
+# Fichiers Parquet des tables dans un bundle (voir bundle.py)
+RECIPES_FILE = "recipes.parquet"
+INTERACTIONS_FILE = "interactions.parquet"
+
+
+def parquet_file(parquet_dir: Optional[Path], file_name: str) -> Optional[Path]:
+    """
+    Fichier Parquet d'une table du bundle, s'il existe.
+
+    Args:
+        parquet_dir: Dossier du bundle (None : données en mémoire seulement)
+        file_name: Nom du fichier de la table
+
+    Returns:
+        Optional[Path]: None sans bundle, ou si le bundle a été supprimé depuis
+            son chargement (voir bundle.prune_bundles)
+    """
+    if parquet_dir is None:
+        return None
+    path = parquet_dir / file_name
+    return path if path.exists() else None
+
+
+class ComputeBackend(ABC):
+    """Interface commune des moteurs de calcul."""
+
+    name: str = ""
+
+    @abstractmethod
+    def recipe_aggregates(
+        self, interaction_df: pd.DataFrame, parquet_dir: Optional[Path] = None
+    ) -> pd.DataFrame:
+        """
+        Calcule la note moyenne et le nombre d'avis par recette.
+
+        Args:
+            interaction_df: DataFrame des interactions
+            parquet_dir: Dossier du bundle dont interaction_df est la table
+
+        Returns:
+            pd.DataFrame: recipe_id, avg_rating et n_reviews, trié par recipe_id
+        """
+
+    @abstractmethod
+    def rank_recipes(
+        self,
+        recipe_stats: pd.DataFrame,
+        recipe_df: pd.DataFrame,
+        m: int = 10,
+        recipe_ids: Optional[np.ndarray] = None,
+        parquet_dir: Optional[Path] = None,
+    ) -> pd.DataFrame:
+        """
+        Calcule la note pondérée et trie les recettes (voir rank_recipe_stats).
+
+        Args:
+            recipe_stats: recipe_id, avg_rating et n_reviews
+            recipe_df: DataFrame des recettes
+            m: Nombre minimal d'avis pour la pondération
+            recipe_ids: Si fourni, seules ces recettes sont classées
+            parquet_dir: Dossier du bundle dont recipe_df est la table
+
+        Returns:
+            pd.DataFrame: recipe_id, name, avg_rating, n_reviews et weighted_rating
+        """
+
+    @abstractmethod
+    def recipe_reviews(
+        self, recipe_id: int, interaction_df: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Récupère les avis d'une recette, du plus récent au plus ancien.
+
+        Args:
+            recipe_id: ID de la recette
+            interaction_df: DataFrame des interactions
+
+        Returns:
+            pd.DataFrame: user_id, rating, date et review
+        """
+
+
+class PandasBackend(ComputeBackend):
+    """Implémentation de référence (pandas, un seul thread, en mémoire)."""
+
+    name = "pandas"
+
+    def recipe_aggregates(
+        self, interaction_df: pd.DataFrame, parquet_dir: Optional[Path] = None
+    ) -> pd.DataFrame:
+        return compute_recipe_aggregates(interaction_df)
+
+    def rank_recipes(
+        self,
+        recipe_stats: pd.DataFrame,
+        recipe_df: pd.DataFrame,
+        m: int = 10,
+        recipe_ids: Optional[np.ndarray] = None,
+        parquet_dir: Optional[Path] = None,
+    ) -> pd.DataFrame:
+        return rank_recipe_stats(recipe_stats, recipe_df, m=m, recipe_ids=recipe_ids)
+
+    def recipe_reviews(
+        self, recipe_id: int, interaction_df: pd.DataFrame
+    ) -> pd.DataFrame:
+        return recipe_reviews(recipe_id, interaction_df)
+
+
+class DuckDBBackend(ComputeBackend):
+    """
+    Requêtes SQL sur DuckDB, sur les fichiers Parquet du bundle s'il y en a.
+
+    Sans bundle, les DataFrames pandas sont lus en place (via Arrow).
+    """
+
+    name = "duckdb"
+
+    def __init__(self) -> None:
+        """
+        Ouvre une base DuckDB en mémoire.
+
+        Raises:
+            ImportError: Si duckdb n'est pas installé
+        """
+        self._duckdb = importlib.import_module("duckdb")
+        self._con = self._duckdb.connect(":memory:")
+
+    def _cursor(self) -> Any:
+        # Un curseur par requête : une connexion n'est pas partageable entre threads
+        return self._con.cursor()
+
+    def _table(
+        self,
+        cursor: Any,
+        name: str,
+        frame: pd.DataFrame,
+        columns: List[str],
+        path: Optional[Path],
+    ) -> None:
+        """Expose une table : vue sur son Parquet, sinon DataFrame en place."""
+        if path is not None:
+            # Les paramètres ne sont pas acceptés dans une définition de vue
+            quoted = str(path).replace("'", "''")
+            cursor.execute(
+                f"CREATE TEMP VIEW {name} AS "
+                f"SELECT {', '.join(columns)} FROM read_parquet('{quoted}')"
+            )
+        else:
+            cursor.register(name, frame[columns])
+
+    def recipe_aggregates(
+        self, interaction_df: pd.DataFrame, parquet_dir: Optional[Path] = None
+    ) -> pd.DataFrame:
+        cursor = self._cursor()
+        self._table(
+            cursor,
+            "interactions",
+            interaction_df,
+            ["recipe_id", "rating"],
+            parquet_file(parquet_dir, INTERACTIONS_FILE),
+        )
+        result: pd.DataFrame = cursor.execute(
+            """
+            SELECT recipe_id,
+                   AVG(rating) AS avg_rating,
+                   COUNT(rating) AS n_reviews
+            FROM interactions
+            GROUP BY recipe_id
+            ORDER BY recipe_id
+            """
+        ).df()
+        return result
+
+    def rank_recipes(
+        self,
+        recipe_stats: pd.DataFrame,
+        recipe_df: pd.DataFrame,
+        m: int = 10,
+        recipe_ids: Optional[np.ndarray] = None,
+        parquet_dir: Optional[Path] = None,
+    ) -> pd.DataFrame:
+        cursor = self._cursor()
+        cursor.register("stats", recipe_stats[["recipe_id", "avg_rating", "n_reviews"]])
+        self._table(
+            cursor,
+            "recipes",
+            recipe_df,
+            ["id", "name"],
+            parquet_file(parquet_dir, RECIPES_FILE),
+        )
+        where = ""
+        if recipe_ids is not None:
+            cursor.register("selection", pd.DataFrame({"recipe_id": recipe_ids}))
+            where = "WHERE s.recipe_id IN (SELECT recipe_id FROM selection)"
+        # La note moyenne globale C est calculée sur toutes les recettes
+        result: pd.DataFrame = cursor.execute(
+            f"""
+            WITH s AS (
+                SELECT recipe_id, avg_rating, n_reviews,
+                       CAST(n_reviews AS DOUBLE) / (n_reviews + $m) * avg_rating
+                       + CAST($m AS DOUBLE) / (n_reviews + $m)
+                         * AVG(avg_rating) OVER () AS weighted_rating
+                FROM stats
+            )
+            SELECT s.recipe_id, r.name, s.avg_rating, s.n_reviews, s.weighted_rating
+            FROM s LEFT JOIN recipes r ON s.recipe_id = r.id
+            {where}
+            ORDER BY s.weighted_rating DESC
+            """,
+            {"m": m},
+        ).df()
+        return result
+
+    def recipe_reviews(
+        self, recipe_id: int, interaction_df: pd.DataFrame
+    ) -> pd.DataFrame:
+        cursor = self._cursor()
+        cursor.register("interactions", interaction_df)
+        result: pd.DataFrame = cursor.execute(
+            f"""
+            SELECT {", ".join(REVIEW_COLUMNS)}
+            FROM interactions
+            WHERE recipe_id = $recipe_id
+            ORDER BY date DESC
+            """,
+            {"recipe_id": int(recipe_id)},
+        ).df()
+        return result
+
+
+class PolarsBackend(ComputeBackend):
+    """
+    Requêtes paresseuses Polars, sur les fichiers Parquet du bundle s'il y en a.
+
+    Sans bundle, chaque appel convertit les colonnes utiles des DataFrames
+    pandas (copie temporaire de ces colonnes).
+    """
+
+    name = "polars"
+
+    def __init__(self) -> None:
+        """
+        Importe Polars.
+
+        Raises:
+            ImportError: Si polars n'est pas installé
+        """
+        self._pl = importlib.import_module("polars")
+
+    def _scan(
+        self, frame: pd.DataFrame, columns: List[str], path: Optional[Path]
+    ) -> Any:
+        """Table paresseuse : lecture de son Parquet, sinon copie du DataFrame."""
+        if path is not None:
+            return self._pl.scan_parquet(path).select(columns)
+        return self._pl.from_pandas(frame[columns]).lazy()
+
+    def recipe_aggregates(
+        self, interaction_df: pd.DataFrame, parquet_dir: Optional[Path] = None
+    ) -> pd.DataFrame:
+        pl = self._pl
+        result: pd.DataFrame = (
+            self._scan(
+                interaction_df,
+                ["recipe_id", "rating"],
+                parquet_file(parquet_dir, INTERACTIONS_FILE),
+            )
+            .group_by("recipe_id")
+            .agg(
+                pl.col("rating").cast(pl.Float64).mean().alias("avg_rating"),
+                pl.col("rating").count().cast(pl.Int64).alias("n_reviews"),
+            )
+            .sort("recipe_id")
+            .collect()
+            .to_pandas()
+        )
+        return result
+
+    def rank_recipes(
+        self,
+        recipe_stats: pd.DataFrame,
+        recipe_df: pd.DataFrame,
+        m: int = 10,
+        recipe_ids: Optional[np.ndarray] = None,
+        parquet_dir: Optional[Path] = None,
+    ) -> pd.DataFrame:
+        pl = self._pl
+        n_reviews = pl.col("n_reviews")
+        stats = (
+            pl.from_pandas(recipe_stats[["recipe_id", "avg_rating", "n_reviews"]])
+            .lazy()
+            .with_columns(
+                (
+                    n_reviews / (n_reviews + m) * pl.col("avg_rating")
+                    + m / (n_reviews + m) * pl.col("avg_rating").mean()
+                ).alias("weighted_rating")
+            )
+        )
+        if recipe_ids is not None:
+            stats = stats.filter(pl.col("recipe_id").is_in(list(recipe_ids)))
+        recipes = self._scan(
+            recipe_df, ["id", "name"], parquet_file(parquet_dir, RECIPES_FILE)
+        )
+        result: pd.DataFrame = (
+            stats.join(recipes, left_on="recipe_id", right_on="id", how="left")
+            .sort("weighted_rating", descending=True)
+            .select(RANKING_COLUMNS)
+            .collect()
+            .to_pandas()
+        )
+        return result
+
+    def recipe_reviews(
+        self, recipe_id: int, interaction_df: pd.DataFrame
+    ) -> pd.DataFrame:
+        pl = self._pl
+        result: pd.DataFrame = (
+            pl.from_pandas(interaction_df[["recipe_id", *REVIEW_COLUMNS]])
+            .lazy()
+            .filter(pl.col("recipe_id") == int(recipe_id))
+            .sort("date", descending=True)
+            .select(REVIEW_COLUMNS)
+            .collect()
+            .to_pandas()
+        )
+        return result
+
+
+BACKENDS: Dict[str, Type[ComputeBackend]] = {
+    backend.name: backend for backend in (PandasBackend, DuckDBBackend, PolarsBackend)
+}
+
+_INSTANCES: Dict[str, ComputeBackend] = {}
+_instances_lock = threading.Lock()
+
+
+def get_backend(name: Optional[str] = None) -> ComputeBackend:
+    """
+    Retourne le moteur de calcul demandé (une instance par processus).
+
+    Args:
+        name: Nom du moteur (défaut : Config.COMPUTE_BACKEND)
+
+    Returns:
+        ComputeBackend: moteur demandé, ou la référence pandas s'il n'est pas
+        installé
+
+    Raises:
+        ValueError: Si le moteur est inconnu
+    """
+    name = (name or Config.COMPUTE_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Moteur de calcul inconnu : {name} (disponibles : {', '.join(BACKENDS)})"
+        )
+    with _instances_lock:
+        if name not in _INSTANCES:
+            try:
+                _INSTANCES[name] = BACKENDS[name]()
+            except ImportError:
+                logger.warning(
+                    "Moteur de calcul %s non installé : utilisation de pandas", name
+                )
+                _INSTANCES[name] = _INSTANCES.setdefault(
+                    PandasBackend.name, PandasBackend()
+                )
+        return _INSTANCES[name]
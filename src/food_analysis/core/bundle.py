@@ -0,0 +1,508 @@
+"""Bundle de données précalculé.
+
+Un bundle contient tout ce que l'application dérive des CSV bruts : tables
+typées (Parquet), agrégats par recette et par utilisateur, indicateurs
+globaux et histogramme des notes, et les tableaux de tous les index, de
+l'échantillon des classements approchés et des esquisses mensuelles (npz).
+Il est construit hors ligne (``food-analysis precompute``) ; l'application le
+charge alors sans aucun calcul lourd.
+
+Organisation dans ``data/processed/`` ::
+
+    bundles/<version>/manifest.json    version, sources, sommes de contrôle
+    bundles/<version>/*.parquet, *.npz
+    bundles/<version>/reviews.bin      textes des avis (voir review_store.py)
+    bundles/<version>/duplicates.parquet
+                                       recettes en double (optionnel, calculées
+                                       à la construction avec ``--dedup``)
+    CURRENT                            version servie par défaut
+
+Les textes des avis ne sont pas chargés en mémoire : la table des
+interactions du bundle n'a pas de colonne ``review`` et les textes sont lus à
+la demande dans le store compressé du bundle.
+
+La version est l'empreinte des fichiers sources (voir fingerprint.py) :
+tant que les CSV ne changent pas, le bundle existant est réutilisé, y compris
+après un redémarrage. Chaque bundle est écrit dans un dossier temporaire puis
+renommé, et CURRENT est remplacé atomiquement.
+"""
+
+import errno
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from food_analysis.core.backends import INTERACTIONS_FILE, RECIPES_FILE
+from food_analysis.core.csr_index import CsrIndex
+from food_analysis.core.data_loader import (
+    DataLoader,
+    prepare_interactions,
+    prepare_recipes,
+)
+from food_analysis.core.dataset import ARTIFACTS, Dataset
+from food_analysis.core.duplicates import (
+    DUPLICATES_FILE,
+    DuplicateGroups,
+    find_duplicate_groups,
+)
+from food_analysis.core.fingerprint import (
+    describe_sources,
+    file_sha256,
+    fingerprint,
+)
+from food_analysis.core.range_index import NumericRangeIndex
+from food_analysis.core.ranking_sample import RankingSample
+from food_analysis.core.rating_buckets import MonthlyRatingBuckets
+from food_analysis.core.review_store import (
+    REVIEWS_FILE,
+    ReviewStore,
+    split_review_text,
+)
+from food_analysis.core.sketches import MonthlySketches
+from food_analysis.utils.locks import SingleFlight, file_lock
+
+BUNDLE_FORMAT = 2
+BUNDLES_DIR = "bundles"
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+# Bundles conservés sur disque (en plus de la version courante)
+KEEP_BUNDLES = 3
+
+logger = logging.getLogger(__name__)
+
+# Erreurs d'écriture pour lesquelles le Dataset est servi sans bundle
+UNWRITABLE_ERRNOS = (errno.EROFS, errno.ENOSPC, errno.EACCES)
+
+# Tables Parquet du bundle (fichier -> structure du Dataset)
+FRAME_FILES = {
+    RECIPES_FILE: "recipes",
+    INTERACTIONS_FILE: "interactions",
+    "recipe_aggregates.parquet": "recipe_aggregates",
+    "user_stats.parquet": "user_stats",
+}
+INDEX_FILE = "indexes.npz"
+# Verrou entre processus des constructions de bundles (dans data/processed/)
+BUILD_LOCK_FILE = ".build.lock"
+
+# Index sérialisés dans INDEX_FILE (structure du Dataset -> classe)
+INDEX_TYPES: Dict[str, Any] = {
+    "range_index": NumericRangeIndex,
+    "rating_buckets": MonthlyRatingBuckets,
+    "review_index": CsrIndex,
+    "user_index": CsrIndex,
+    "contributor_index": CsrIndex,
+    "ranking_sample": RankingSample,
+    "user_buckets": MonthlyRatingBuckets,
+    "activity_sketches": MonthlySketches,
+}
+
+
+# Chargements/constructions en cours dans ce processus, par (dossier, version)
+_FLIGHTS = SingleFlight()
+
+
+class BundleError(Exception):
+    """Bundle absent, incomplet ou corrompu."""
+
+
+def bundle_path(processed_path: Path, version: str) -> Path:
+    """Dossier d'un bundle."""
+    return processed_path / BUNDLES_DIR / version
+
+
+def current_version(processed_path: Path) -> Optional[str]:
+    """
+    Lit la version servie par défaut.
+
+    Args:
+        processed_path: Dossier des données traitées
+
+    Returns:
+        Optional[str]: version, ou None si aucun bundle n'a été publié
+    """
+    try:
+        version = (processed_path / CURRENT_FILE).read_text().strip()
+    except FileNotFoundError:
+        return None
+    return version or None
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Écrit un fichier texte via un fichier temporaire renommé."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    with os.fdopen(fd, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def publish(processed_path: Path, version: str) -> None:
+    """Fait de version le bundle servi par défaut."""
+    _write_atomic(processed_path / CURRENT_FILE, version + "\n")
+
+
+def write_bundle(dataset: Dataset, directory: Path, sources: Dict[str, Any]) -> None:
+    """
+    Écrit toutes les structures d'un Dataset dans un dossier (existant).
+
+    Args:
+        dataset: Jeu de données, dont les structures sont construites au besoin
+        directory: Dossier de destination
+        sources: Description des fichiers sources (voir describe_sources)
+    """
+    dataset.build()
+
+    for file_name, name in FRAME_FILES.items():
+        frame = getattr(dataset, name)
+        if name == "interactions":
+            # Textes des avis dans un store compressé, par recette et par date
+            frame, _ = split_review_text(frame, dataset.review_index.order, directory)
+        frame.to_parquet(directory / file_name, index=False)
+
+    arrays = {}
+    for name in INDEX_TYPES:
+        index = getattr(dataset, name)
+        if index is not None:
+            for key, values in index.to_arrays().items():
+                arrays[f"{name}.{key}"] = values
+    np.savez(directory / INDEX_FILE, **arrays)
+    if dataset.duplicate_groups is not None:
+        dataset.duplicate_groups.save(directory)
+
+    artifacts = {
+        path.name: {"bytes": path.stat().st_size, "sha256": file_sha256(path)}
+        for path in sorted(directory.iterdir())
+    }
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "version": dataset.version,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "sources": sources,
+        "artifacts": artifacts,
+        "metrics": dataset.metrics,
+    }
+    (directory / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+
+
+def _build(
+    raw_path: Path,
+    processed_path: Path,
+    sources: Dict[str, Any],
+    version: str,
+    dedup_threshold: Optional[float] = None,
+    dedup_workers: Optional[int] = None,
+) -> Dataset:
+    """Lit les CSV, construit le Dataset et l'écrit comme bundle version."""
+    dataset = _read_dataset(raw_path, version)
+    if dedup_threshold is not None:
+        dataset = _with_duplicates(dataset, dedup_threshold, dedup_workers)
+
+    target = bundle_path(processed_path, version)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(dir=target.parent, prefix=f".{version}."))
+    staging.chmod(0o755)
+    try:
+        write_bundle(dataset, staging, sources)
+        if target.exists():
+            shutil.rmtree(target)
+        os.replace(staging, target)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return _served_dataset(dataset, target)
+
+
+def _read_dataset(raw_path: Path, version: str) -> Dataset:
+    """Dataset des CSV bruts, en mémoire seulement."""
+    loader = DataLoader(raw_path)
+    return Dataset(
+        prepare_recipes(loader.load_recipes()),
+        prepare_interactions(loader.load_interactions()),
+        version=version,
+    )
+
+
+def _with_duplicates(
+    dataset: Dataset, threshold: float, workers: Optional[int]
+) -> Dataset:
+    """Dataset complété des groupes de recettes en double (voir duplicates.py)."""
+    groups = find_duplicate_groups(
+        dataset.recipes,
+        dataset.recipe_aggregates,
+        threshold=threshold,
+        workers=workers,
+    )
+    return Dataset(
+        dataset.recipes,
+        dataset.interactions,
+        version=dataset.version,
+        artifacts={
+            "recipe_aggregates": dataset.recipe_aggregates,
+            "duplicate_groups": groups,
+        },
+    )
+
+
+def _served_dataset(dataset: Dataset, directory: Path) -> Dataset:
+    """Dataset servi après construction : tables et textes des avis du bundle."""
+    artifacts = {
+        name: getattr(dataset, name) for name in ARTIFACTS if name != "review_store"
+    }
+    interactions = dataset.interactions
+    if "review" in interactions.columns:
+        artifacts["review_store"] = ReviewStore.open(directory)
+        interactions = interactions.drop(columns="review")
+    return Dataset(
+        dataset.recipes,
+        interactions,
+        version=dataset.version,
+        artifacts=artifacts,
+        parquet_dir=directory,
+    )
+
+
+def build_bundle(
+    raw_path: Path,
+    processed_path: Path,
+    force: bool = False,
+    content_hash: bool = False,
+    dedup_threshold: Optional[float] = None,
+    dedup_workers: Optional[int] = None,
+) -> Path:
+    """
+    Construit le bundle des CSV bruts et le publie comme version courante.
+
+    Args:
+        raw_path: Dossier des CSV bruts
+        processed_path: Dossier des données traitées
+        force: Reconstruit même si un bundle de même version existe
+        content_hash: Version fondée sur le contenu des CSV (voir fingerprint.py)
+        dedup_threshold: Si fourni, cherche les recettes en double (similarité
+            minimale) et range leurs groupes dans le bundle
+        dedup_workers: Processus de calcul des signatures des doublons
+
+    Returns:
+        Path: dossier du bundle publié
+
+    Raises:
+        FileNotFoundError: Si un fichier source n'existe pas
+    """
+    sources = describe_sources(raw_path, content_hash=content_hash)
+    version = fingerprint(sources)
+    target = bundle_path(processed_path, version)
+
+    with file_lock(processed_path / BUILD_LOCK_FILE):
+        if force or not (target / MANIFEST_FILE).exists():
+            _build(
+                raw_path,
+                processed_path,
+                sources,
+                version,
+                dedup_threshold=dedup_threshold,
+                dedup_workers=dedup_workers,
+            )
+        publish(processed_path, version)
+        prune_bundles(processed_path)
+    return target
+
+
+def ensure_bundle(
+    raw_path: Path,
+    processed_path: Path,
+    content_hash: bool = False,
+    verify: bool = True,
+) -> Dataset:
+    """
+    Retourne le jeu de données des CSV bruts, via le bundle de même empreinte.
+
+    Le bundle est chargé s'il existe déjà (ex. après un redémarrage), sinon il
+    est construit, écrit et publié ; le Dataset construit est alors retourné
+    directement. Les appels simultanés (threads de ce processus, autres
+    processus) ne déclenchent qu'une construction. Si le dossier des données
+    traitées est en lecture seule ou plein (voir UNWRITABLE_ERRNOS), le Dataset
+    est construit en mémoire sans être écrit (il sera reconstruit au prochain
+    démarrage) ; les autres erreurs d'entrée-sortie sont propagées.
+
+    Args:
+        raw_path: Dossier des CSV bruts
+        processed_path: Dossier des données traitées
+        content_hash: Version fondée sur le contenu des CSV
+        verify: Vérifie les sommes de contrôle d'un bundle existant
+
+    Returns:
+        Dataset: jeu de données versionné, structures dérivées construites
+
+    Raises:
+        FileNotFoundError: Si un fichier source n'existe pas
+    """
+    sources = describe_sources(raw_path, content_hash=content_hash)
+    version = fingerprint(sources)
+
+    def load_or_build() -> Dataset:
+        dataset = _try_load(processed_path, version, verify)
+        if dataset is not None:
+            return dataset
+        # Un seul processus construit ; les autres attendent puis relisent
+        try:
+            with file_lock(processed_path / BUILD_LOCK_FILE):
+                dataset = _try_load(processed_path, version, verify)
+                if dataset is None:
+                    dataset = _build(raw_path, processed_path, sources, version)
+                publish(processed_path, version)
+                prune_bundles(processed_path)
+        except OSError as e:
+            if not (isinstance(e, PermissionError) or e.errno in UNWRITABLE_ERRNOS):
+                raise
+            logger.warning(
+                "Bundle non écrit dans %s (%s) : données préparées en mémoire",
+                processed_path,
+                e,
+            )
+            return _read_dataset(raw_path, version)
+        return dataset
+
+    key = (str(processed_path.resolve()), version)
+    return _FLIGHTS.do(key, load_or_build)
+
+
+def _try_load(processed_path: Path, version: str, verify: bool) -> Optional[Dataset]:
+    """Charge le bundle d'une version s'il existe et est intègre."""
+    if not (bundle_path(processed_path, version) / MANIFEST_FILE).exists():
+        return None
+    try:
+        return load_bundle(processed_path, version, verify=verify)
+    except BundleError:
+        return None  # bundle corrompu : à reconstruire
+
+
+def prune_bundles(processed_path: Path, keep: int = KEEP_BUNDLES) -> None:
+    """
+    Supprime les bundles les plus anciens.
+
+    La version courante et les keep bundles les plus récents sont conservés.
+    Un bundle est lu entièrement au chargement, sauf les textes des avis dont
+    la projection mémoire reste lisible : le supprimer n'affecte pas les
+    processus qui le servent déjà (les moteurs DuckDB et Polars reviennent
+    alors aux tables en mémoire, voir backends.parquet_file).
+
+    Args:
+        processed_path: Dossier des données traitées
+        keep: Nombre de bundles conservés
+    """
+    root = processed_path / BUNDLES_DIR
+    if not root.exists():
+        return
+    current = current_version(processed_path)
+    bundles = sorted(
+        (p for p in root.iterdir() if p.is_dir() and not p.name.startswith(".")),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    for path in bundles[keep:]:
+        if path.name != current:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def read_manifest(directory: Path) -> Dict[str, Any]:
+    """
+    Lit le manifeste d'un bundle.
+
+    Raises:
+        BundleError: Si le manifeste est absent ou d'un format inconnu
+    """
+    try:
+        manifest: Dict[str, Any] = json.loads((directory / MANIFEST_FILE).read_text())
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        raise BundleError(f"Manifeste illisible dans {directory} : {e}") from e
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise BundleError(
+            f"Format de bundle {manifest.get('format')} non pris en charge "
+            f"(attendu : {BUNDLE_FORMAT})"
+        )
+    return manifest
+
+
+def verify_bundle(directory: Path, manifest: Dict[str, Any]) -> None:
+    """
+    Vérifie les sommes de contrôle des fichiers d'un bundle.
+
+    Raises:
+        BundleError: Si un fichier manque ou a été modifié
+    """
+    for name, expected in manifest["artifacts"].items():
+        path = directory / name
+        if not path.exists():
+            raise BundleError(f"Fichier manquant dans le bundle : {path}")
+        if file_sha256(path) != expected["sha256"]:
+            raise BundleError(f"Somme de contrôle invalide : {path}")
+
+
+def load_bundle(
+    processed_path: Path, version: Optional[str] = None, verify: bool = True
+) -> Dataset:
+    """
+    Charge un bundle précalculé, structures dérivées comprises.
+
+    Args:
+        processed_path: Dossier des données traitées
+        version: Version à charger (défaut : version courante)
+        verify: Vérifie les sommes de contrôle avant lecture
+
+    Returns:
+        Dataset: jeu de données dont toutes les structures sont déjà construites
+
+    Raises:
+        FileNotFoundError: Si aucun bundle n'est disponible
+        BundleError: Si le bundle est incomplet ou corrompu
+    """
+    if version is None:
+        version = current_version(processed_path)
+    directory = bundle_path(processed_path, version) if version else None
+    if directory is None or not directory.exists():
+        raise FileNotFoundError(
+            f"Aucun bundle dans {processed_path} : lancez `food-analysis precompute`"
+        )
+
+    manifest = read_manifest(directory)
+    if verify:
+        verify_bundle(directory, manifest)
+
+    frames = {
+        name: pd.read_parquet(directory / file_name)
+        for file_name, name in FRAME_FILES.items()
+    }
+
+    artifacts: Dict[str, Any] = {
+        "recipe_aggregates": frames["recipe_aggregates"],
+        "user_stats": frames["user_stats"],
+        "metrics": manifest["metrics"],
+        "contributor_index": None,
+    }
+    with np.load(directory / INDEX_FILE) as npz:
+        grouped: Dict[str, Dict[str, np.ndarray]] = {}
+        for key in npz.files:
+            name, _, array_name = key.partition(".")
+            grouped.setdefault(name, {})[array_name] = npz[key]
+    for name, arrays in grouped.items():
+        artifacts[name] = INDEX_TYPES[name].from_arrays(arrays)
+    if (directory / REVIEWS_FILE).exists():
+        try:
+            artifacts["review_store"] = ReviewStore.open(directory)
+        except ImportError as e:
+            raise BundleError(f"Codec des avis non installé : {e}") from e
+    if (directory / DUPLICATES_FILE).exists():
+        artifacts["duplicate_groups"] = DuplicateGroups.load(directory)
+
+    return Dataset(
+        frames["recipes"],
+        frames["interactions"],
+        version=manifest["version"],
+        artifacts=artifacts,
+        parquet_dir=directory,
+    )
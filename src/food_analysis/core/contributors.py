@@ -0,0 +1,68 @@
+"""Statistiques par contributeur (auteur de recettes).
+
+Les agrégats par recette (note moyenne, nombre d'avis, note pondérée) sont
+rattachés aux recettes par une jointure vectorisée sur l'identifiant, puis
+regroupés par ``contributor_id`` de RAW_recipes.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def compute_contributor_stats(
+    recipe_df: pd.DataFrame, recipe_stats: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Calcule les statistiques de chaque contributeur.
+
+    Args:
+        recipe_df (pd.DataFrame): DataFrame des recettes (id, contributor_id,
+            submitted optionnel)
+        recipe_stats (pd.DataFrame): recipe_id, n_reviews et weighted_rating
+            (voir note_et_avis.add_weighted_rating)
+
+    Returns:
+        pd.DataFrame: contributor_id, n_recipes, n_reviews, mean_weighted_rating,
+        first_submitted et last_submitted, triés par nombre de recettes
+    """
+    # Position de chaque recette dans recipe_stats (-1 si aucun avis)
+    positions = pd.Index(recipe_stats["recipe_id"]).get_indexer(recipe_df["id"])
+    has_stats = positions >= 0
+
+    n_reviews = np.zeros(len(recipe_df), dtype=np.int64)
+    n_reviews[has_stats] = recipe_stats["n_reviews"].to_numpy()[positions[has_stats]]
+    weighted = np.full(len(recipe_df), np.nan)
+    weighted[has_stats] = recipe_stats["weighted_rating"].to_numpy()[
+        positions[has_stats]
+    ]
+
+    joined = pd.DataFrame(
+        {
+            "contributor_id": recipe_df["contributor_id"].to_numpy(),
+            "n_reviews": n_reviews,
+            "weighted_rating": weighted,
+        }
+    )
+    if "submitted" in recipe_df.columns:
+        joined["submitted"] = pd.to_datetime(
+            recipe_df["submitted"], errors="coerce"
+        ).to_numpy()
+    else:
+        joined["submitted"] = pd.NaT
+
+    contributor_stats = (
+        joined.groupby("contributor_id")
+        .agg(
+            n_recipes=("n_reviews", "size"),
+            n_reviews=("n_reviews", "sum"),
+            mean_weighted_rating=("weighted_rating", "mean"),
+            first_submitted=("submitted", "min"),
+            last_submitted=("submitted", "max"),
+        )
+        .reset_index()
+    )
+
+    ranked: pd.DataFrame = contributor_stats.sort_values(
+        ["n_recipes", "n_reviews"], ascending=False, kind="stable"
+    ).reset_index(drop=True)
+    return ranked
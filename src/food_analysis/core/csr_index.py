@@ -0,0 +1,115 @@
+"""Index de regroupement des lignes d'une table par clé (format CSR).
+
+Les positions des lignes sont triées par clé (puis par une colonne de tri
+optionnelle) et un tableau d'offsets délimite le bloc de chaque clé : obtenir
+toutes les lignes d'une recette ou d'un utilisateur revient à découper une
+tranche, quel que soit le nombre de lignes concernées.
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class CsrIndex:
+    """Positions de lignes groupées par clé : ``order[indptr[i]:indptr[i + 1]]``."""
+
+    def __init__(self, keys: np.ndarray, order: np.ndarray, indptr: np.ndarray):
+        """
+        Initialise l'index à partir de ses tableaux.
+
+        Args:
+            keys: Clés distinctes, triées
+            order: Positions des lignes, groupées par clé
+            indptr: Offsets des blocs (len(keys) + 1 valeurs)
+        """
+        self.keys = keys
+        self.order = order
+        self.indptr = indptr
+
+    @classmethod
+    def from_keys(
+        cls,
+        keys: pd.Series,
+        sort_by: Optional[pd.Series] = None,
+        descending: bool = False,
+    ) -> "CsrIndex":
+        """
+        Construit l'index à partir de la colonne de clés.
+
+        Args:
+            keys: Clé de chaque ligne (ex. recipe_id)
+            sort_by: Colonne de tri à l'intérieur d'un bloc (ex. date)
+            descending: Tri décroissant de sort_by (valeurs manquantes en dernier)
+
+        Returns:
+            CsrIndex: index des lignes par clé
+        """
+        if sort_by is None:
+            order = np.argsort(keys.to_numpy(), kind="stable")
+        else:
+            frame = pd.DataFrame(
+                {"key": keys.to_numpy(), "sort_by": sort_by.to_numpy()}
+            )
+            order = frame.sort_values(
+                ["key", "sort_by"],
+                ascending=[True, not descending],
+                kind="mergesort",
+                na_position="last",
+            ).index.to_numpy()
+
+        sorted_keys = keys.to_numpy()[order]
+        unique_keys, starts = np.unique(sorted_keys, return_index=True)
+        indptr = np.append(starts, len(sorted_keys)).astype(np.int64)
+        return cls(unique_keys, order.astype(np.int64), indptr)
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "CsrIndex":
+        """Reconstruit l'index à partir de to_arrays (ex. bundle précalculé)."""
+        return cls(arrays["keys"], arrays["order"], arrays["indptr"])
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Tableaux nécessaires pour reconstruire l'index."""
+        return {"keys": self.keys, "order": self.order, "indptr": self.indptr}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: Any) -> bool:
+        return self.position(key) is not None
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Nombre de lignes de chaque clé (aligné sur ``keys``)."""
+        return np.diff(self.indptr)
+
+    def position(self, key: Any) -> Optional[int]:
+        """
+        Position d'une clé dans ``keys``.
+
+        Args:
+            key: Clé recherchée
+
+        Returns:
+            Optional[int]: position, ou None si la clé est absente
+        """
+        pos = int(np.searchsorted(self.keys, key))
+        if pos < len(self.keys) and self.keys[pos] == key:
+            return pos
+        return None
+
+    def rows(self, key: Any) -> np.ndarray:
+        """
+        Positions des lignes associées à une clé.
+
+        Args:
+            key: Clé recherchée
+
+        Returns:
+            np.ndarray: positions (vide si la clé est absente)
+        """
+        pos = self.position(key)
+        if pos is None:
+            return self.order[:0]
+        return self.order[self.indptr[pos] : self.indptr[pos + 1]]
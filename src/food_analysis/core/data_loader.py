@@ -3,6 +3,49 @@ from typing import Optional
 
 import pandas as pd
 
+from food_analysis.core.dataset import Dataset
+from food_analysis.core.fingerprint import dataset_fingerprint
+
+
+def prepare_recipes(recipe_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Type les colonnes des recettes (dates, entiers réduits).
+
+    Args:
+        recipe_df: Recettes telles que lues dans le CSV
+
+    Returns:
+        pd.DataFrame: copie typée
+    """
+    recipe_df = recipe_df.copy()
+    if "submitted" in recipe_df.columns:
+        recipe_df["submitted"] = pd.to_datetime(recipe_df["submitted"], errors="coerce")
+    for column in ("id", "contributor_id", "minutes", "n_steps", "n_ingredients"):
+        if column in recipe_df.columns:
+            recipe_df[column] = pd.to_numeric(recipe_df[column], downcast="integer")
+    return recipe_df
+
+
+def prepare_interactions(interaction_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Type les colonnes des interactions (dates, entiers réduits).
+
+    Args:
+        interaction_df: Interactions telles que lues dans le CSV
+
+    Returns:
+        pd.DataFrame: copie typée
+    """
+    interaction_df = interaction_df.copy()
+    if "date" in interaction_df.columns:
+        interaction_df["date"] = pd.to_datetime(interaction_df["date"], errors="coerce")
+    for column in ("user_id", "recipe_id", "rating"):
+        if column in interaction_df.columns:
+            interaction_df[column] = pd.to_numeric(
+                interaction_df[column], downcast="integer"
+            )
+    return interaction_df
+
 
 class DataLoader:
     """Charge les données Food.com."""
@@ -47,3 +90,36 @@ class DataLoader:
         if not file_path.exists():
             raise FileNotFoundError(f"Fichier non trouvé : {file_path}")
         return pd.read_csv(file_path)
+
+    def fingerprint(self, content_hash: bool = False) -> str:
+        """
+        Calcule l'empreinte (version) des CSV, clé de tous les caches.
+
+        Args:
+            content_hash: Empreinte fondée sur le contenu plutôt que les métadonnées
+
+        Returns:
+            str: empreinte hexadécimale courte
+
+        Raises:
+            FileNotFoundError: Si un fichier n'existe pas
+        """
+        return dataset_fingerprint(self.data_path, content_hash=content_hash)
+
+    def load_dataset(self, content_hash: bool = False) -> Dataset:
+        """
+        Charge recettes et interactions dans un Dataset versionné.
+
+        Les structures dérivées (index, agrégats) sont construites à la demande.
+
+        Args:
+            content_hash: Empreinte fondée sur le contenu plutôt que les métadonnées
+
+        Returns:
+            Dataset: jeu de données brut, versionné par son empreinte
+
+        Raises:
+            FileNotFoundError: Si un fichier n'existe pas
+        """
+        version = self.fingerprint(content_hash=content_hash)
+        return Dataset(self.load_recipes(), self.load_interactions(), version=version)
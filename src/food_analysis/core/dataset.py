@@ -0,0 +1,261 @@
+"""Jeu de données chargé et structures dérivées.
+
+Un ``Dataset`` regroupe les recettes, les interactions et tout ce qui en est
+dérivé (index, agrégats, indicateurs globaux). Chaque structure est construite
+au premier accès puis conservée ; un bundle précalculé (voir bundle.py) les
+fournit directement, sans aucun calcul.
+
+Un Dataset chargé depuis un bundle connaît son dossier (``parquet_dir``) : les
+moteurs DuckDB et Polars y lisent les tables Parquet (voir backends.py).
+
+Les pages reçoivent le Dataset servi (voir server.py) et lisent ses
+structures directement.
+
+Un Dataset est partagé par toutes les sessions : chaque structure n'est
+construite qu'une fois, même si plusieurs sessions la demandent en même temps
+(les autres attendent le résultat).
+"""
+
+import threading
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Mapping,
+    Optional,
+    Type,
+    TypeVar,
+    overload,
+)
+
+import pandas as pd
+
+from food_analysis.core.analyzer import DataAnalyzer
+from food_analysis.core.backends import get_backend
+from food_analysis.core.contributors import compute_contributor_stats
+from food_analysis.core.csr_index import CsrIndex
+from food_analysis.core.duplicates import DuplicateGroups
+from food_analysis.core.note_et_avis import (
+    add_weighted_rating,
+    compute_global_metrics,
+)
+from food_analysis.core.range_index import NumericRangeIndex
+from food_analysis.core.ranking_sample import RankingSample
+from food_analysis.core.rating_buckets import MonthlyRatingBuckets
+from food_analysis.core.review_store import ReviewStore
+from food_analysis.core.sketches import MonthlySketches
+from food_analysis.core.users import build_user_index, compute_user_stats
+from food_analysis.utils.locks import SingleFlight
+
+T = TypeVar("T")
+
+# Structures dérivées indépendantes de tout paramètre (construites par build)
+ARTIFACTS = (
+    "range_index",
+    "rating_buckets",
+    "review_index",
+    "user_index",
+    "contributor_index",
+    "recipe_aggregates",
+    "user_stats",
+    "metrics",
+    "review_store",
+    "ranking_sample",
+    "user_buckets",
+    "activity_sketches",
+    "duplicate_groups",
+)
+
+
+class artifact(Generic[T]):
+    """
+    Structure dérivée construite au premier accès, une seule fois par Dataset.
+
+    Équivalent de functools.cached_property, avec un verrou par structure et
+    par instance : les accès simultanés attendent la construction en cours.
+    """
+
+    def __init__(self, build: Callable[["Dataset"], T]) -> None:
+        self.build = build
+        self.name = build.__name__
+        self.__doc__ = build.__doc__
+
+    @overload
+    def __get__(self, instance: None, owner: Type["Dataset"]) -> "artifact[T]": ...
+
+    @overload
+    def __get__(self, instance: "Dataset", owner: Type["Dataset"]) -> T: ...
+
+    def __get__(self, instance: Optional["Dataset"], owner: Type["Dataset"]) -> Any:
+        if instance is None:
+            return self
+        values = instance.__dict__
+        if self.name not in values:
+            with instance._locks[self.name]:
+                if self.name not in values:
+                    values[self.name] = self.build(instance)
+        return values[self.name]
+
+
+def build_review_index(interaction_df: pd.DataFrame) -> CsrIndex:
+    """Index des interactions par recette, triées par date décroissante."""
+    sort_by = interaction_df["date"] if "date" in interaction_df.columns else None
+    return CsrIndex.from_keys(
+        interaction_df["recipe_id"], sort_by=sort_by, descending=True
+    )
+
+
+def build_contributor_index(recipe_df: pd.DataFrame) -> Optional[CsrIndex]:
+    """Index des recettes par contributeur (None sans colonne contributor_id)."""
+    if "contributor_id" not in recipe_df.columns:
+        return None
+    return CsrIndex.from_keys(recipe_df["contributor_id"])
+
+
+class Dataset:
+    """Recettes, interactions et structures dérivées construites à la demande."""
+
+    def __init__(
+        self,
+        recipes: pd.DataFrame,
+        interactions: pd.DataFrame,
+        version: str = "",
+        artifacts: Optional[Mapping[str, Any]] = None,
+        parquet_dir: Optional[Path] = None,
+    ) -> None:
+        """
+        Initialise le jeu de données.
+
+        Args:
+            recipes: DataFrame des recettes
+            interactions: DataFrame des interactions
+            version: Identifiant de version des données (vide si inconnu)
+            artifacts: Structures déjà construites (nom -> valeur, voir ARTIFACTS)
+            parquet_dir: Dossier du bundle dont proviennent les tables (None si
+                elles ne sont qu'en mémoire)
+        """
+        self.recipes = recipes
+        self.interactions = interactions
+        self.version = version
+        self.parquet_dir = parquet_dir
+        self._weighted_stats: Dict[int, pd.DataFrame] = {}
+        self._contributor_stats: Dict[int, pd.DataFrame] = {}
+        self._locks = {name: threading.Lock() for name in ARTIFACTS}
+        self._flights = SingleFlight()
+        self._analyzer: Optional[DataAnalyzer] = None
+        self._analyzer_lock = threading.Lock()
+
+        for name, value in (artifacts or {}).items():
+            if name not in ARTIFACTS:
+                raise ValueError(f"Structure inconnue : {name}")
+            self.__dict__[name] = value
+
+    @artifact
+    def range_index(self) -> NumericRangeIndex:
+        """Index de plages sur les colonnes numériques des recettes."""
+        return NumericRangeIndex.from_recipes(self.recipes)
+
+    @artifact
+    def rating_buckets(self) -> MonthlyRatingBuckets:
+        """Seaux mensuels de notes par recette (classements par période)."""
+        return MonthlyRatingBuckets.from_interactions(self.interactions)
+
+    @artifact
+    def review_index(self) -> CsrIndex:
+        """Index des interactions par recette, triées par date décroissante."""
+        return build_review_index(self.interactions)
+
+    @artifact
+    def user_index(self) -> CsrIndex:
+        """Index des interactions par utilisateur, triées par date décroissante."""
+        return build_user_index(self.interactions)
+
+    @artifact
+    def contributor_index(self) -> Optional[CsrIndex]:
+        """Index des recettes par contributeur."""
+        return build_contributor_index(self.recipes)
+
+    @artifact
+    def recipe_aggregates(self) -> pd.DataFrame:
+        """Note moyenne et nombre d'avis par recette (moteur COMPUTE_BACKEND)."""
+        return get_backend().recipe_aggregates(
+            self.interactions, parquet_dir=self.parquet_dir
+        )
+
+    @artifact
+    def review_store(self) -> Optional[ReviewStore]:
+        """Textes des avis compressés sur disque (bundle), None s'ils sont en mémoire."""
+        return None
+
+    @artifact
+    def ranking_sample(self) -> RankingSample:
+        """Échantillon fixe d'interactions (classements approchés)."""
+        return RankingSample.from_interactions(self.interactions)
+
+    @artifact
+    def user_buckets(self) -> MonthlyRatingBuckets:
+        """Seaux mensuels de notes par utilisateur (notes par utilisateur et période)."""
+        return MonthlyRatingBuckets.from_interactions(self.interactions, key="user_id")
+
+    @artifact
+    def activity_sketches(self) -> MonthlySketches:
+        """Compteurs et esquisses mensuels (indicateurs de la page d'accueil)."""
+        return MonthlySketches.from_interactions(self.interactions)
+
+    @artifact
+    def duplicate_groups(self) -> Optional[DuplicateGroups]:
+        """Groupes de recettes en double (food-analysis dedup), None sans calcul."""
+        return None
+
+    @artifact
+    def user_stats(self) -> pd.DataFrame:
+        """Agrégats par utilisateur (nombre d'avis, moyenne, indulgence)."""
+        return compute_user_stats(self.interactions, self.user_index)
+
+    @artifact
+    def metrics(self) -> Dict[str, Any]:
+        """Indicateurs globaux (note moyenne, avis par recette, utilisateurs)."""
+        return compute_global_metrics(self.interactions)
+
+    def weighted_recipe_stats(self, m: int = 10) -> pd.DataFrame:
+        """Agrégats par recette avec la note pondérée pour un paramètre m."""
+        if m not in self._weighted_stats:
+            self._weighted_stats[m] = self._flights.do(
+                ("weighted", m),
+                lambda: add_weighted_rating(self.recipe_aggregates, m=m),
+            )
+        return self._weighted_stats[m]
+
+    def contributor_stats(self, m: int = 10) -> pd.DataFrame:
+        """Statistiques par contributeur pour un paramètre de pondération m."""
+        if m not in self._contributor_stats:
+            self._contributor_stats[m] = self._flights.do(
+                ("contributors", m),
+                lambda: compute_contributor_stats(
+                    self.recipes, self.weighted_recipe_stats(m)
+                ),
+            )
+        return self._contributor_stats[m]
+
+    @property
+    def analyzer(self) -> DataAnalyzer:
+        """Moteur d'analyse de ce jeu de données (un seul par Dataset)."""
+        if self._analyzer is None:
+            with self._analyzer_lock:
+                if self._analyzer is None:
+                    self._analyzer = DataAnalyzer(self)
+        return self._analyzer
+
+    def build(self) -> "Dataset":
+        """Construit toutes les structures dérivées qui ne le sont pas encore."""
+        for name in ARTIFACTS:
+            getattr(self, name)
+        return self
+
+    def __repr__(self) -> str:
+        return (
+            f"<Dataset {self.version or '?'} : {len(self.recipes):,} recettes, "
+            f"{len(self.interactions):,} interactions>"
+        )
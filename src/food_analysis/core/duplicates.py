@@ -0,0 +1,512 @@
+"""Détection des recettes quasi identiques (MinHash et LSH).
+
+Food.com compte de nombreuses recettes publiées plusieurs fois, à quelques
+mots près : leurs avis sont dispersés et faussent le classement pondéré. Les
+doublons sont cherchés hors ligne (``food-analysis dedup``), en temps
+sous-quadratique :
+
+1. Chaque recette est réduite à un ensemble d'empreintes (« shingles ») :
+   ses ingrédients normalisés et les triplets de mots consécutifs de ses
+   étapes.
+2. Une signature MinHash de NUM_PERM valeurs résume cet ensemble : la part
+   de valeurs égales entre deux signatures estime la similarité de Jaccard
+   des deux ensembles.
+3. Les signatures sont découpées en BANDS bandes ; deux recettes dont une
+   bande est identique sont candidates (tri des clés de bande, sans
+   comparaison de toutes les paires). Avec 16 bandes de 4 valeurs, une paire
+   de similarité 0,8 est candidate à 99,9 %, une paire à 0,3 à 12 %.
+4. Les candidates dont les signatures concordent au moins à ``threshold``
+   sont reliées ; les composantes connexes forment les groupes.
+5. Le représentant d'un groupe est la recette qui a le plus d'avis ; les
+   membres moins similaires que ``threshold`` au représentant (reliés par
+   une chaîne de recettes voisines) sont retirés du groupe.
+
+Les signatures sont calculées par tranches de recettes dans des processus
+séparés (``workers``). Le résultat est rangé dans le bundle de la version
+(``duplicates.parquet``) et chargé avec lui.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from food_analysis.core.sketches import hash64
+
+# Fichier des groupes dans le dossier d'un bundle
+DUPLICATES_FILE = "duplicates.parquet"
+
+# Taille des signatures MinHash et découpage en bandes (NUM_PERM / BANDS
+# valeurs par bande)
+NUM_PERM = 64
+BANDS = 16
+# Part minimale de valeurs de signature égales pour relier deux recettes
+SIMILARITY_THRESHOLD = 0.8
+# Recettes de moins de MIN_SHINGLES empreintes ignorées (trop peu de texte)
+MIN_SHINGLES = 5
+# Mots consécutifs par empreinte des étapes
+SHINGLE_SIZE = 3
+# Recettes par tranche de calcul des signatures
+CHUNK_SIZE = 5_000
+# Seaux de bande d'au plus SMALL_BUCKET recettes : toutes les paires sont
+# candidates ; au-delà, chaque recette n'est appariée qu'à sa voisine
+SMALL_BUCKET = 8
+
+_WORD = re.compile(r"[a-z0-9]+")
+_ITEM = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+# Distingue les empreintes d'ingrédients de celles des étapes
+_INGREDIENT_SALT = np.uint64(0x9E3779B97F4A7C15)
+# Multiplicateurs (impairs) combinant les mots d'un triplet
+_SHINGLE_MULTIPLIERS = (
+    np.uint64(0xBF58476D1CE4E5B9),
+    np.uint64(0x94D049BB133111EB),
+    np.uint64(1),
+)
+# Combine les valeurs d'une bande en une clé
+_BAND_MULTIPLIER = np.uint64(0xD6E8FEB86659FD93)
+_EMPTY = np.iinfo(np.uint32).max
+
+
+def _text(value: Any) -> str:
+    """Texte d'une cellule (liste sérialisée, liste ou valeur manquante)."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return " ".join(f"'{item}'" for item in value)
+    return ""
+
+
+def _owners(counts: np.ndarray) -> np.ndarray:
+    """Indice de la recette de chaque élément, pour des comptes par recette."""
+    return np.repeat(np.arange(len(counts)), counts)
+
+
+def shingle_hashes(
+    ingredients: Sequence[Any], steps: Sequence[Any]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Empreintes des recettes : ingrédients et triplets de mots des étapes.
+
+    Args:
+        ingredients: Ingrédients de chaque recette (liste sérialisée du CSV)
+        steps: Étapes de chaque recette (même ordre)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: empreintes uint64, groupées par recette
+        dans l'ordre des recettes, et nombre d'empreintes de chaque recette
+    """
+    items: List[str] = []
+    item_counts = np.zeros(len(ingredients), dtype=np.int64)
+    for i, value in enumerate(ingredients):
+        found = [
+            " ".join(_WORD.findall((quoted or double).lower()))
+            for quoted, double in _ITEM.findall(_text(value))
+        ]
+        items.extend(found)
+        item_counts[i] = len(found)
+
+    words: List[str] = []
+    word_counts = np.zeros(len(steps), dtype=np.int64)
+    for i, value in enumerate(steps):
+        found = _WORD.findall(_text(value).lower())
+        words.extend(found)
+        word_counts[i] = len(found)
+
+    item_hashes = hash64(np.array(items, dtype=object)) ^ _INGREDIENT_SALT
+    word_hashes = hash64(np.array(words, dtype=object))
+
+    # Triplets de mots consécutifs d'une même recette
+    n_windows = max(len(word_hashes) - SHINGLE_SIZE + 1, 0)
+    grams = np.zeros(n_windows, dtype=np.uint64)
+    for offset, multiplier in enumerate(_SHINGLE_MULTIPLIERS):
+        grams += word_hashes[offset : offset + n_windows] * multiplier
+    word_owners = _owners(word_counts)
+    within = word_owners[:n_windows] == word_owners[SHINGLE_SIZE - 1 :]
+    gram_counts = np.maximum(word_counts - SHINGLE_SIZE + 1, 0)
+
+    # Regroupement par recette : ingrédients puis triplets de chaque recette
+    owners = np.concatenate([_owners(item_counts), word_owners[:n_windows][within]])
+    order = np.argsort(owners, kind="stable")
+    hashes = np.concatenate([item_hashes, grams[within]])[order]
+    return hashes, item_counts + gram_counts
+
+
+def permutations(num_perm: int = NUM_PERM, seed: int = 0) -> np.ndarray:
+    """
+    Paramètres (a, b) des fonctions de hachage h -> (a * h + b) >> 32.
+
+    Args:
+        num_perm: Nombre de fonctions (taille des signatures)
+        seed: Graine (deux jeux de signatures ne se comparent qu'à même graine)
+
+    Returns:
+        np.ndarray: tableau uint64 (num_perm, 2), multiplicateurs impairs
+    """
+    rng = np.random.default_rng(seed)
+    params = rng.integers(0, np.iinfo(np.uint64).max, (num_perm, 2), dtype=np.uint64)
+    params[:, 0] |= np.uint64(1)
+    return params
+
+
+def minhash(hashes: np.ndarray, counts: np.ndarray, params: np.ndarray) -> np.ndarray:
+    """
+    Signatures MinHash de recettes à partir de leurs empreintes.
+
+    Args:
+        hashes: Empreintes uint64, groupées par recette (voir shingle_hashes)
+        counts: Nombre d'empreintes de chaque recette
+        params: Fonctions de hachage (voir permutations)
+
+    Returns:
+        np.ndarray: signatures uint32 (recettes, fonctions) ; valeur maximale
+        pour une recette sans empreinte
+    """
+    signatures = np.full((len(counts), len(params)), _EMPTY, dtype=np.uint32)
+    nonempty = counts > 0
+    if not nonempty.any():
+        return signatures
+    starts = (np.cumsum(counts) - counts)[nonempty]
+    shift = np.uint64(32)
+    for j, (a, b) in enumerate(params):
+        hashed = ((hashes * a + b) >> shift).astype(np.uint32)
+        signatures[nonempty, j] = np.minimum.reduceat(hashed, starts)
+    return signatures
+
+
+def _chunk_signatures(
+    ingredients: Sequence[Any], steps: Sequence[Any], params: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Signatures et nombre d'empreintes d'une tranche de recettes."""
+    hashes, counts = shingle_hashes(ingredients, steps)
+    return minhash(hashes, counts, params), counts
+
+
+def compute_signatures(
+    recipe_df: pd.DataFrame,
+    num_perm: int = NUM_PERM,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcule les signatures MinHash de toutes les recettes.
+
+    Args:
+        recipe_df: DataFrame des recettes (colonnes ingredients et steps)
+        num_perm: Taille des signatures
+        seed: Graine des fonctions de hachage
+        workers: Processus de calcul (défaut : nombre de cœurs ; 1 : calcul
+            dans le processus courant)
+        chunk_size: Recettes par tranche envoyée à un processus
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: signatures (recettes, num_perm), dans
+        l'ordre de recipe_df, et nombre d'empreintes de chaque recette
+    """
+    params = permutations(num_perm, seed)
+    empty = pd.Series([""] * len(recipe_df), dtype=object)
+    ingredients = (
+        recipe_df["ingredients"] if "ingredients" in recipe_df.columns else empty
+    ).tolist()
+    steps = (recipe_df["steps"] if "steps" in recipe_df.columns else empty).tolist()
+    bounds = range(0, len(recipe_df), chunk_size)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(bounds) <= 1:
+        parts = [
+            _chunk_signatures(
+                ingredients[i : i + chunk_size], steps[i : i + chunk_size], params
+            )
+            for i in bounds
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(bounds))) as pool:
+            parts = list(
+                pool.map(
+                    _chunk_signatures,
+                    [ingredients[i : i + chunk_size] for i in bounds],
+                    [steps[i : i + chunk_size] for i in bounds],
+                    [params] * len(bounds),
+                )
+            )
+
+    if not parts:
+        return np.zeros((0, num_perm), dtype=np.uint32), np.zeros(0, dtype=np.int64)
+    return (
+        np.concatenate([signatures for signatures, _ in parts]),
+        np.concatenate([counts for _, counts in parts]),
+    )
+
+
+def candidate_pairs(signatures: np.ndarray, bands: int = BANDS) -> np.ndarray:
+    """
+    Paires de recettes dont au moins une bande de signature est identique.
+
+    Dans chaque bande, les recettes sont triées par clé de bande. Dans un seau
+    d'au plus SMALL_BUCKET recettes, toutes les paires sont candidates ; dans
+    un seau plus grand, chaque recette n'est appariée qu'à la précédente, ce
+    qui relie tout le seau en un nombre linéaire de paires.
+
+    Args:
+        signatures: Signatures MinHash (recettes, valeurs)
+        bands: Nombre de bandes (doit diviser la taille des signatures)
+
+    Returns:
+        np.ndarray: paires (i, j), i < j, indices de lignes de signatures,
+        sans doublon
+    """
+    n, num_perm = signatures.shape
+    if num_perm % bands:
+        raise ValueError(f"{bands} bandes ne divisent pas {num_perm} valeurs")
+    rows = num_perm // bands
+
+    codes = []
+    for band in range(bands):
+        keys = np.zeros(n, dtype=np.uint64)
+        for column in range(band * rows, (band + 1) * rows):
+            keys = keys * _BAND_MULTIPLIER + signatures[:, column]
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        sizes = np.diff(np.r_[starts, n])
+        bucket = np.repeat(np.arange(len(starts)), sizes)
+        small = np.repeat(sizes <= SMALL_BUCKET, sizes)
+        for offset in range(1, min(SMALL_BUCKET, n)):
+            same = bucket[offset:] == bucket[:-offset]
+            if offset > 1:
+                same &= small[offset:]
+            first, second = order[:-offset][same], order[offset:][same]
+            codes.append(
+                np.minimum(first, second).astype(np.int64) * n
+                + np.maximum(first, second)
+            )
+    unique = np.unique(np.concatenate(codes)) if codes else np.zeros(0, np.int64)
+    return np.column_stack([unique // n, unique % n]) if n else unique.reshape(0, 2)
+
+
+def signature_similarity(
+    signatures: np.ndarray,
+    pairs: np.ndarray,
+    batch_size: int = 100_000,
+) -> np.ndarray:
+    """
+    Similarité de Jaccard estimée de paires de recettes.
+
+    Args:
+        signatures: Signatures MinHash (recettes, valeurs)
+        pairs: Paires (i, j) d'indices de lignes
+        batch_size: Paires comparées à la fois (mémoire)
+
+    Returns:
+        np.ndarray: part des valeurs de signature égales de chaque paire
+    """
+    similarity = np.empty(len(pairs), dtype=np.float64)
+    for start in range(0, len(pairs), batch_size):
+        batch = pairs[start : start + batch_size]
+        similarity[start : start + batch_size] = (
+            signatures[batch[:, 0]] == signatures[batch[:, 1]]
+        ).mean(axis=1)
+    return similarity
+
+
+def connected_components(n: int, pairs: np.ndarray) -> np.ndarray:
+    """
+    Composantes connexes d'un graphe donné par ses arêtes.
+
+    Args:
+        n: Nombre de sommets
+        pairs: Arêtes (i, j)
+
+    Returns:
+        np.ndarray: plus petit sommet de la composante de chaque sommet
+    """
+    labels = np.arange(n)
+    if not len(pairs):
+        return labels
+    first, second = pairs[:, 0], pairs[:, 1]
+    while True:
+        # Chaque racine est rattachée à la plus petite étiquette voisine,
+        # puis les chemins sont raccourcis jusqu'aux racines
+        low = np.minimum(labels[first], labels[second])
+        np.minimum.at(labels, labels[first], low)
+        np.minimum.at(labels, labels[second], low)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        if np.array_equal(labels[first], labels[second]):
+            return labels
+
+
+class DuplicateGroups:
+    """Groupes de recettes en double et leur représentant."""
+
+    def __init__(self, groups: pd.DataFrame) -> None:
+        """
+        Initialise les groupes.
+
+        Args:
+            groups: recipe_id, group_id (ID du représentant) et similarity
+                (similarité estimée avec le représentant), une ligne par
+                recette d'un groupe d'au moins deux recettes
+        """
+        self.groups = groups.reset_index(drop=True)
+        self._representatives = pd.Series(
+            self.groups["group_id"].to_numpy(),
+            index=self.groups["recipe_id"].to_numpy(),
+        )
+
+    @classmethod
+    def load(cls, directory: Path) -> "DuplicateGroups":
+        """Charge les groupes rangés dans un dossier (ex. bundle)."""
+        return cls(pd.read_parquet(directory / DUPLICATES_FILE))
+
+    def save(self, directory: Path) -> Path:
+        """
+        Enregistre les groupes dans un dossier (ex. bundle), atomiquement.
+
+        Args:
+            directory: Dossier de destination
+
+        Returns:
+            Path: fichier écrit
+        """
+        path = directory / DUPLICATES_FILE
+        tmp = path.with_suffix(".tmp")
+        self.groups.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+        return path
+
+    def __len__(self) -> int:
+        """Nombre de groupes."""
+        return int(self.groups["group_id"].nunique())
+
+    @property
+    def n_recipes(self) -> int:
+        """Nombre de recettes appartenant à un groupe."""
+        return len(self.groups)
+
+    def representatives(self, recipe_ids: pd.Series) -> pd.Series:
+        """
+        Représentant de chaque recette (elle-même hors des groupes).
+
+        Args:
+            recipe_ids: ID de recettes
+
+        Returns:
+            pd.Series: ID du représentant, même index que recipe_ids
+        """
+        mapped = recipe_ids.map(self._representatives)
+        return mapped.fillna(recipe_ids).astype(recipe_ids.dtype)
+
+    def merge_aggregates(self, recipe_stats: pd.DataFrame) -> pd.DataFrame:
+        """
+        Regroupe les agrégats des doublons sur leur représentant.
+
+        Args:
+            recipe_stats: recipe_id, avg_rating et n_reviews
+
+        Returns:
+            pd.DataFrame: même format, une ligne par représentant (nombre
+            d'avis additionné, note moyenne pondérée par le nombre d'avis)
+        """
+        codes, recipe_ids = pd.factorize(
+            self.representatives(recipe_stats["recipe_id"]).to_numpy()
+        )
+        n_reviews = recipe_stats["n_reviews"].to_numpy()
+        ratings = np.nan_to_num(recipe_stats["avg_rating"].to_numpy(dtype="float64"))
+        counts = np.bincount(codes, weights=n_reviews, minlength=len(recipe_ids))
+        sums = np.bincount(
+            codes, weights=ratings * n_reviews, minlength=len(recipe_ids)
+        )
+        merged: pd.DataFrame = pd.DataFrame(
+            {
+                "recipe_id": recipe_ids,
+                "avg_rating": sums / np.where(counts > 0, counts, np.nan),
+                "n_reviews": counts.astype(np.int64),
+            }
+        )
+        return merged
+
+
+def find_duplicate_groups(
+    recipe_df: pd.DataFrame,
+    aggregates: Optional[pd.DataFrame] = None,
+    threshold: float = SIMILARITY_THRESHOLD,
+    num_perm: int = NUM_PERM,
+    bands: int = BANDS,
+    workers: Optional[int] = None,
+    seed: int = 0,
+) -> DuplicateGroups:
+    """
+    Cherche les groupes de recettes quasi identiques.
+
+    Args:
+        recipe_df: DataFrame des recettes (id, ingredients, steps)
+        aggregates: Agrégats par recette (recipe_id, n_reviews) : le
+            représentant d'un groupe est la recette qui a le plus d'avis
+            (à égalité, le plus petit ID)
+        threshold: Similarité estimée minimale entre deux recettes reliées,
+            et entre chaque membre d'un groupe et son représentant
+        num_perm: Taille des signatures MinHash
+        bands: Nombre de bandes LSH
+        workers: Processus de calcul des signatures (défaut : nombre de cœurs)
+        seed: Graine des fonctions de hachage
+
+    Returns:
+        DuplicateGroups: groupes d'au moins deux recettes
+    """
+    signatures, counts = compute_signatures(
+        recipe_df, num_perm=num_perm, seed=seed, workers=workers
+    )
+    eligible = np.flatnonzero(counts >= MIN_SHINGLES)
+    signatures = signatures[eligible]
+
+    pairs = candidate_pairs(signatures, bands=bands)
+    pairs = pairs[signature_similarity(signatures, pairs) >= threshold]
+    labels = connected_components(len(eligible), pairs)
+
+    in_group = np.bincount(labels, minlength=len(eligible))[labels] > 1
+    members = pd.DataFrame(
+        {
+            "recipe_id": recipe_df["id"].to_numpy()[eligible[in_group]],
+            "label": labels[in_group],
+            "row": np.flatnonzero(in_group),
+        }
+    )
+    if aggregates is not None:
+        n_reviews = members["recipe_id"].map(
+            aggregates.set_index("recipe_id")["n_reviews"]
+        )
+        members["n_reviews"] = n_reviews.fillna(0).to_numpy()
+    else:
+        members["n_reviews"] = 0
+
+    # Représentant : premier membre du groupe par avis décroissants puis ID
+    ordered = members.sort_values(
+        ["label", "n_reviews", "recipe_id"], ascending=[True, False, True]
+    )
+    leaders = ordered.drop_duplicates("label").set_index("label")
+    group_ids = members["label"].map(leaders["recipe_id"])
+    leader_rows = members["label"].map(leaders["row"]).to_numpy()
+    similarity = signature_similarity(
+        signatures, np.column_stack([members["row"].to_numpy(), leader_rows])
+    )
+
+    groups = pd.DataFrame(
+        {
+            "recipe_id": members["recipe_id"].to_numpy(),
+            "group_id": group_ids.to_numpy(),
+            "similarity": similarity,
+        }
+    )
+    # Composante reliée par une chaîne : seuls restent les membres proches du
+    # représentant, et les groupes dont il reste au moins deux recettes
+    groups = groups[similarity >= threshold]
+    groups = groups[groups.groupby("group_id")["recipe_id"].transform("size") > 1]
+    return DuplicateGroups(groups.sort_values(["group_id", "recipe_id"]))
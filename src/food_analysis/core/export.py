@@ -0,0 +1,202 @@
+"""Export des classements et des avis en CSV ou Parquet, par morceaux.
+
+Un export complet (classement des 230 000 recettes, tous les avis d'une
+recette) ne doit pas doubler la mémoire du worker. Les tables sont donc
+parcourues par tranches de ``EXPORT_CHUNK_ROWS`` lignes (vues, sans copie) et
+encodées tranche par tranche : ``iter_export`` produit le fichier sous forme
+d'une suite de morceaux d'octets, sans jamais formater la table entière d'un
+coup.
+
+- CSV : en-tête avec la première tranche seulement ;
+- Parquet : un groupe de lignes par tranche (``pyarrow.parquet.ParquetWriter``),
+  construit à partir des colonnes Arrow des DataFrames (chaînes pandas
+  adossées à Arrow) sans les recopier.
+
+Les avis d'un bundle sont lus dans le store compressé tranche par tranche
+(voir review_store.py).
+"""
+
+import io
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from food_analysis.core.review_store import ReviewStore, select_reviews
+from food_analysis.utils.lazy_import import lazy_module
+
+# pyarrow n'est importé qu'au premier export Parquet
+pa = lazy_module("pyarrow")
+pq = lazy_module("pyarrow.parquet")
+
+# Nombre de lignes encodées à la fois
+EXPORT_CHUNK_ROWS = 10_000
+
+# Formats d'export (format -> type MIME)
+EXPORT_FORMATS: Dict[str, str] = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Colonnes des avis exportés
+REVIEW_COLUMNS = ["user_id", "rating", "date", "review"]
+
+
+def frame_chunks(
+    df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS
+) -> Iterator[pd.DataFrame]:
+    """
+    Découpe un DataFrame en tranches de lignes consécutives.
+
+    Args:
+        df: Table à exporter
+        chunk_rows: Nombre de lignes par tranche
+
+    Yields:
+        pd.DataFrame: tranches (vues sur df) ; une tranche vide si df est vide,
+        pour que l'export garde ses colonnes
+    """
+    if df.empty:
+        yield df
+        return
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start : start + chunk_rows]
+
+
+def review_chunks(
+    interaction_df: pd.DataFrame,
+    rows: np.ndarray,
+    store: Optional[ReviewStore] = None,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Lit des avis par tranches, texte compris.
+
+    Args:
+        interaction_df: DataFrame des interactions
+        rows: Positions des avis (ex. review_index.rows(recipe_id))
+        store: Store des textes (bundle), sinon textes lus dans interaction_df
+        chunk_rows: Nombre d'avis par tranche
+
+    Yields:
+        pd.DataFrame: avis (REVIEW_COLUMNS) de chaque tranche
+    """
+    for start in range(0, max(len(rows), 1), chunk_rows):
+        yield select_reviews(
+            interaction_df, rows[start : start + chunk_rows], REVIEW_COLUMNS, store
+        )
+
+
+def iter_csv(chunks: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    """
+    Encode des tranches en un seul fichier CSV (UTF-8).
+
+    Args:
+        chunks: Tranches de même schéma
+
+    Yields:
+        bytes: morceaux successifs du fichier
+    """
+    header = True
+    for chunk in chunks:
+        yield chunk.to_csv(index=False, header=header).encode("utf-8")
+        header = False
+
+
+class _Drain(io.RawIOBase):
+    """Flux d'écriture dont les octets sont récupérés au fur et à mesure."""
+
+    def __init__(self) -> None:
+        self.parts: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[no-untyped-def]
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def take(self) -> bytes:
+        """Retourne et oublie les octets écrits depuis le dernier appel."""
+        data = b"".join(self.parts)
+        self.parts.clear()
+        return data
+
+
+def iter_parquet(chunks: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    """
+    Encode des tranches en un seul fichier Parquet (un groupe de lignes chacune).
+
+    Args:
+        chunks: Tranches de même schéma
+
+    Yields:
+        bytes: morceaux successifs du fichier
+    """
+    sink = _Drain()
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(sink, table.schema)
+            writer.write_table(table.cast(writer.schema))
+            yield sink.take()
+    finally:
+        if writer is not None:
+            writer.close()
+    yield sink.take()
+
+
+# Encodeurs par format
+ENCODERS: Dict[str, Callable[[Iterable[pd.DataFrame]], Iterator[bytes]]] = {
+    "csv": iter_csv,
+    "parquet": iter_parquet,
+}
+
+
+def iter_export(chunks: Iterable[pd.DataFrame], fmt: str) -> Iterator[bytes]:
+    """
+    Encode des tranches dans un format d'export.
+
+    Args:
+        chunks: Tranches de même schéma (frame_chunks, review_chunks)
+        fmt: Format (voir EXPORT_FORMATS)
+
+    Yields:
+        bytes: morceaux successifs du fichier
+
+    Raises:
+        ValueError: Si le format est inconnu
+    """
+    if fmt not in ENCODERS:
+        raise ValueError(
+            f"Format d'export inconnu : {fmt} (disponibles : {', '.join(ENCODERS)})"
+        )
+    for part in ENCODERS[fmt](chunks):
+        if part:
+            yield part
+
+
+def write_export(chunks: Iterable[pd.DataFrame], fmt: str, out: BinaryIO) -> int:
+    """
+    Écrit un export dans un flux binaire, morceau par morceau.
+
+    Args:
+        chunks: Tranches de même schéma
+        fmt: Format (voir EXPORT_FORMATS)
+        out: Flux de destination (fichier, io.BytesIO, réponse HTTP...)
+
+    Returns:
+        int: nombre d'octets écrits
+    """
+    written = 0
+    for part in iter_export(chunks, fmt):
+        out.write(part)
+        written += len(part)
+    return written
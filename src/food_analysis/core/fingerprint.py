@@ -0,0 +1,111 @@
+"""Empreinte (version) du jeu de données brut.
+
+L'empreinte identifie les CSV de ``data/raw`` ; tous les caches (chargement,
+agrégats, index, bundles sur disque) sont indexés par elle. Elle est calculée :
+
+- par défaut à partir des métadonnées (nom, taille, date de modification en
+  nanosecondes) : quelques appels à ``stat``, négligeable à chaque rerun ;
+- avec ``content_hash=True``, à partir du SHA-256 du contenu : un fichier
+  recopié ou simplement touché garde la même empreinte. Le hachage n'est
+  refait que si les métadonnées changent.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+SOURCE_FILES = ("RAW_recipes.csv", "RAW_interactions.csv")
+
+# (chemin, taille, mtime_ns) -> SHA-256 déjà calculé dans ce processus
+_HASHES: Dict[Tuple[str, int, int], str] = {}
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """
+    Calcule la somme SHA-256 d'un fichier, par blocs.
+
+    Args:
+        path: Fichier à lire
+        chunk_size: Taille des blocs lus
+
+    Returns:
+        str: empreinte hexadécimale
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def describe_sources(
+    raw_path: Path, content_hash: bool = False
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Décrit les fichiers sources (taille, date de modification, SHA-256).
+
+    Args:
+        raw_path: Dossier des CSV bruts
+        content_hash: Ajoute le SHA-256 du contenu
+
+    Returns:
+        Dict[str, Dict[str, Any]]: description par nom de fichier
+
+    Raises:
+        FileNotFoundError: Si un fichier source n'existe pas
+    """
+    sources: Dict[str, Dict[str, Any]] = {}
+    for name in SOURCE_FILES:
+        path = raw_path / name
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Fichier non trouvé : {path}") from None
+        sources[name] = {"bytes": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if content_hash:
+            key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+            if key not in _HASHES:
+                _HASHES[key] = file_sha256(path)
+            sources[name]["sha256"] = _HASHES[key]
+    return sources
+
+
+def fingerprint(sources: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Calcule l'empreinte d'un ensemble de sources décrites par describe_sources.
+
+    Le contenu (sha256) prime sur les métadonnées lorsqu'il est connu.
+
+    Args:
+        sources: Description des fichiers sources
+
+    Returns:
+        str: empreinte hexadécimale courte
+    """
+    digest = hashlib.sha256()
+    for name in sorted(sources):
+        source = sources[name]
+        if "sha256" in source:
+            digest.update(f"{name}:sha256:{source['sha256']}\n".encode())
+        else:
+            digest.update(
+                f"{name}:stat:{source['bytes']}:{source['mtime_ns']}\n".encode()
+            )
+    return digest.hexdigest()[:16]
+
+
+def dataset_fingerprint(raw_path: Path, content_hash: bool = False) -> str:
+    """
+    Calcule l'empreinte des CSV bruts d'un dossier.
+
+    Args:
+        raw_path: Dossier des CSV bruts
+        content_hash: Empreinte fondée sur le contenu plutôt que sur les métadonnées
+
+    Returns:
+        str: empreinte hexadécimale courte
+
+    Raises:
+        FileNotFoundError: Si un fichier source n'existe pas
+    """
+    return fingerprint(describe_sources(raw_path, content_hash=content_hash))
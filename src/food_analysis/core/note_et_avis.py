@@ -1,6 +1,20 @@
-import matplotlib.pyplot as plt
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+import numpy as np
 import pandas as pd
 
+from food_analysis.core.csr_index import CsrIndex
+from food_analysis.core.rating_buckets import MonthlyRatingBuckets
+from food_analysis.core.review_store import ReviewStore, select_reviews
+from food_analysis.utils.lazy_import import lazy_module
+
+if TYPE_CHECKING:
+    from food_analysis.core.backends import ComputeBackend
+
+# matplotlib n'est importé qu'au premier tracé (inutile pour l'application web)
+plt = lazy_module("matplotlib.pyplot")
+
 # Fonctions pour charger les données
 
 
@@ -36,7 +50,13 @@ def load_interactions(
 
 
 def compute_recipe_stats(
-    recipe_df: pd.DataFrame, interaction_df: pd.DataFrame, m: int = 10
+    recipe_df: pd.DataFrame,
+    interaction_df: pd.DataFrame,
+    m: int = 10,
+    recipe_ids: Optional[np.ndarray] = None,
+    aggregates: Optional[pd.DataFrame] = None,
+    backend: Optional["ComputeBackend"] = None,
+    parquet_dir: Optional[Path] = None,
 ) -> pd.DataFrame:
     """
     Calcule la note moyenne, le nombre d'avis et la note pondérée pour chaque recette.
@@ -45,24 +65,159 @@ def compute_recipe_stats(
         recipe_df (pd.DataFrame): DataFrame des recettes
         interaction_df (pd.DataFrame): DataFrame des interactions
         m (int): Nombre minimal d'avis pour la pondération
+        recipe_ids (np.ndarray, optionnel): Si fourni, seules ces recettes sont
+            classées (la note moyenne globale C reste calculée sur toutes)
+        aggregates (pd.DataFrame, optionnel): Agrégats par recette déjà calculés
+            (voir compute_recipe_aggregates), pour éviter de regrouper les
+            interactions à nouveau
+        backend (ComputeBackend, optionnel): Moteur de calcul (voir
+            core/backends.py) ; par défaut, cette implémentation pandas
+        parquet_dir (Path, optionnel): Dossier du bundle dont proviennent les
+            tables, lues par le moteur dans ses fichiers Parquet
 
     Returns:
-        pd.DataFrame: DataFrame avec id, nom, avg_rating, n_reviews et weighted_rating
+        pd.DataFrame: DataFrame avec recipe_id, nom, avg_rating, n_reviews et
+        weighted_rating
+    """
+    if backend is not None:
+        if aggregates is None:
+            aggregates = backend.recipe_aggregates(
+                interaction_df, parquet_dir=parquet_dir
+            )
+        return backend.rank_recipes(
+            aggregates, recipe_df, m=m, recipe_ids=recipe_ids, parquet_dir=parquet_dir
+        )
+
+    if aggregates is None:
+        aggregates = compute_recipe_aggregates(interaction_df)
+    return rank_recipe_stats(aggregates, recipe_df, m=m, recipe_ids=recipe_ids)
+
+
+def compute_recipe_aggregates(interaction_df: pd.DataFrame) -> pd.DataFrame:
     """
-    # Calculer la note moyenne et le nombre d'avis par recette
-    recipe_stats = (
+    Calcule la note moyenne et le nombre d'avis par recette.
+
+    Args:
+        interaction_df (pd.DataFrame): DataFrame des interactions
+
+    Returns:
+        pd.DataFrame: recipe_id, avg_rating et n_reviews
+    """
+    aggregates: pd.DataFrame = (
         interaction_df.groupby("recipe_id")
         .agg(avg_rating=("rating", "mean"), n_reviews=("rating", "count"))
         .reset_index()
     )
+    return aggregates
+
 
+def compute_global_metrics(interaction_df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Calcule les indicateurs globaux affichés par l'application.
+
+    Args:
+        interaction_df (pd.DataFrame): DataFrame des interactions
+
+    Returns:
+        Dict[str, Any]: avg_rating (notes > 0), avg_reviews_per_recipe, n_users
+            et rating_counts (histogramme des notes, clés en texte)
+    """
+    ratings = interaction_df["rating"]
+    rating_counts = ratings.value_counts().sort_index()
+    n_recipes = interaction_df["recipe_id"].nunique()
+    return {
+        "avg_rating": float(ratings[ratings > 0].mean()),
+        "avg_reviews_per_recipe": len(interaction_df) / n_recipes if n_recipes else 0.0,
+        "n_users": int(interaction_df["user_id"].nunique()),
+        "rating_counts": {str(k): int(v) for k, v in rating_counts.items()},
+    }
+
+
+def add_weighted_rating(recipe_stats: pd.DataFrame, m: float = 10) -> pd.DataFrame:
+    """
+    Ajoute la note pondérée bayésienne aux agrégats par recette.
+
+    Args:
+        recipe_stats (pd.DataFrame): recipe_id, avg_rating et n_reviews
+        m (float): Nombre minimal d'avis pour la pondération
+
+    Returns:
+        pd.DataFrame: copie de recipe_stats avec la colonne weighted_rating
+    """
     # Note moyenne globale
     C = recipe_stats["avg_rating"].mean()
 
     # Calcul de la note pondérée
-    recipe_stats["weighted_rating"] = (
-        recipe_stats["n_reviews"] / (recipe_stats["n_reviews"] + m)
-    ) * recipe_stats["avg_rating"] + (m / (recipe_stats["n_reviews"] + m)) * C
+    weighted: pd.DataFrame = recipe_stats.assign(
+        weighted_rating=(recipe_stats["n_reviews"] / (recipe_stats["n_reviews"] + m))
+        * recipe_stats["avg_rating"]
+        + (m / (recipe_stats["n_reviews"] + m)) * C
+    )
+    return weighted
+
+
+def compute_windowed_recipe_stats(
+    recipe_df: pd.DataFrame,
+    buckets: MonthlyRatingBuckets,
+    start_month: int,
+    end_month: int,
+    m: int = 10,
+    recipe_ids: Optional[np.ndarray] = None,
+    backend: Optional["ComputeBackend"] = None,
+    parquet_dir: Optional[Path] = None,
+) -> pd.DataFrame:
+    """
+    Équivalent de compute_recipe_stats restreint aux avis d'une période.
+
+    Les agrégats sont lus dans les seaux mensuels précalculés : aucune
+    interaction n'est relue.
+
+    Args:
+        recipe_df (pd.DataFrame): DataFrame des recettes
+        buckets (MonthlyRatingBuckets): Seaux mensuels des notes
+        start_month (int): Premier mois inclus (voir rating_buckets.to_month)
+        end_month (int): Dernier mois inclus
+        m (int): Nombre minimal d'avis pour la pondération
+        recipe_ids (np.ndarray, optionnel): Recettes à classer
+        backend (ComputeBackend, optionnel): Moteur de calcul du classement
+        parquet_dir (Path, optionnel): Dossier du bundle de la table des recettes
+
+    Returns:
+        pd.DataFrame: même format que compute_recipe_stats
+    """
+    recipe_stats = buckets.window_stats(start_month, end_month)
+    if backend is not None:
+        return backend.rank_recipes(
+            recipe_stats, recipe_df, m=m, recipe_ids=recipe_ids, parquet_dir=parquet_dir
+        )
+    return rank_recipe_stats(recipe_stats, recipe_df, m=m, recipe_ids=recipe_ids)
+
+
+def rank_recipe_stats(
+    recipe_stats: pd.DataFrame,
+    recipe_df: pd.DataFrame,
+    m: int = 10,
+    recipe_ids: Optional[np.ndarray] = None,
+) -> pd.DataFrame:
+    """
+    Calcule la note pondérée à partir des agrégats par recette et trie.
+
+    Args:
+        recipe_stats (pd.DataFrame): recipe_id, avg_rating et n_reviews
+        recipe_df (pd.DataFrame): DataFrame des recettes
+        m (int): Nombre minimal d'avis pour la pondération
+        recipe_ids (np.ndarray, optionnel): Si fourni, seules ces recettes sont
+            classées (la note moyenne globale C reste calculée sur toutes)
+
+    Returns:
+        pd.DataFrame: DataFrame avec recipe_id, nom, avg_rating, n_reviews et
+        weighted_rating
+    """
+    recipe_stats = add_weighted_rating(recipe_stats, m=m)
+
+    # Restriction aux recettes retenues par les filtres (ex. index de plages)
+    if recipe_ids is not None:
+        recipe_stats = recipe_stats[recipe_stats["recipe_id"].isin(recipe_ids)]
 
     # Fusion avec le DataFrame recipe pour récupérer le nom
     recipe_stats_with_name = pd.merge(
@@ -79,7 +234,7 @@ def compute_recipe_stats(
     ).reset_index(drop=True)
 
     return recipe_stats_with_name[
-        ["name", "avg_rating", "n_reviews", "weighted_rating"]
+        ["recipe_id", "name", "avg_rating", "n_reviews", "weighted_rating"]
     ]
 
 
@@ -98,21 +253,37 @@ def plot_rating_distribution(interaction_df: pd.DataFrame, recipe_id: int) -> No
     plt.show()
 
 
-def recipe_reviews(recipe_id: int, interaction_df: pd.DataFrame) -> pd.DataFrame:
+def recipe_reviews(
+    recipe_id: int,
+    interaction_df: pd.DataFrame,
+    index: Optional[CsrIndex] = None,
+    backend: Optional["ComputeBackend"] = None,
+    store: Optional[ReviewStore] = None,
+) -> pd.DataFrame:
     """
     Récupère les avis pour une recette donnée.
 
     Args:
         recipe_id (int): ID de la recette
         interaction_df (pd.DataFrame): DataFrame des interactions
+        index (CsrIndex, optionnel): Index des interactions par recipe_id, trié
+            par date décroissante ; évite de parcourir toute la table
+        backend (ComputeBackend, optionnel): Moteur de calcul utilisé pour
+            parcourir la table en l'absence d'index
+        store (ReviewStore, optionnel): Textes des avis, si la table des
+            interactions n'a pas de colonne review (bundle) ; utilisé avec index
 
     Returns:
         pd.DataFrame: DataFrame contenant les avis pour la recette
     """
+    columns = ["user_id", "rating", "date", "review"]
+    if index is not None:
+        return select_reviews(interaction_df, index.rows(recipe_id), columns, store)
+    if backend is not None:
+        return backend.recipe_reviews(recipe_id, interaction_df)
+
     return (
-        interaction_df[interaction_df["recipe_id"] == recipe_id][
-            ["user_id", "rating", "date", "review"]
-        ]
+        interaction_df[interaction_df["recipe_id"] == recipe_id][columns]
         .sort_values("date", ascending=False)
         .reset_index(drop=True)
     )
@@ -0,0 +1,210 @@
+"""Index par plages sur les colonnes numériques des recettes.
+
+Chaque colonne indexée (``minutes``, ``n_steps``, ``n_ingredients`` et les
+valeurs nutritionnelles extraites de ``nutrition``) est stockée triée avec la
+position de ligne correspondante. Un prédicat ``bas <= valeur <= haut`` se
+résout alors par deux recherches dichotomiques, et plusieurs prédicats se
+combinent par un simple comptage sur un masque de lignes.
+"""
+
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Ordre des valeurs dans la colonne ``nutrition`` de RAW_recipes.csv
+NUTRITION_COLUMNS = [
+    "calories",
+    "total_fat",
+    "sugar",
+    "sodium",
+    "protein",
+    "saturated_fat",
+    "carbohydrates",
+]
+
+NUMERIC_COLUMNS = ["minutes", "n_steps", "n_ingredients"]
+
+RangeFilter = Tuple[Optional[float], Optional[float]]
+
+
+def parse_nutrition(nutrition: pd.Series) -> pd.DataFrame:
+    """
+    Convertit la colonne ``nutrition`` (chaînes "[a, b, ...]") en colonnes numériques.
+
+    Args:
+        nutrition: Série de chaînes au format de RAW_recipes.csv
+
+    Returns:
+        pd.DataFrame: une colonne par valeur de NUTRITION_COLUMNS (NaN si invalide)
+    """
+    parts = (
+        nutrition.astype(str)
+        .str.strip("[] ")
+        .str.split(",", n=len(NUTRITION_COLUMNS) - 1, expand=True)
+    )
+    parsed: pd.DataFrame = pd.DataFrame(index=nutrition.index)
+    for i, column in enumerate(NUTRITION_COLUMNS):
+        if i in parts.columns:
+            parsed[column] = pd.to_numeric(parts[i], errors="coerce").astype("float64")
+        else:
+            parsed[column] = np.nan
+    return parsed
+
+
+class NumericRangeIndex:
+    """Index trié par colonne permettant des requêtes de plage en O(log n)."""
+
+    def __init__(self, recipe_ids: np.ndarray, columns: Mapping[str, np.ndarray]):
+        """
+        Construit l'index.
+
+        Args:
+            recipe_ids: Identifiants des recettes (une valeur par ligne)
+            columns: Valeurs numériques par colonne, alignées sur recipe_ids
+        """
+        self.recipe_ids: np.ndarray = np.asarray(recipe_ids)
+        self._values: Dict[str, np.ndarray] = {}
+        self._rows: Dict[str, np.ndarray] = {}
+
+        for name, raw_values in columns.items():
+            values = np.asarray(raw_values, dtype="float64")
+            # Les valeurs manquantes ne satisfont jamais un prédicat
+            rows = np.flatnonzero(~np.isnan(values))
+            order = np.argsort(values[rows], kind="stable")
+            self._values[name] = values[rows][order]
+            self._rows[name] = rows[order].astype(np.int32)
+
+    @classmethod
+    def from_recipes(cls, recipe_df: pd.DataFrame) -> "NumericRangeIndex":
+        """
+        Construit l'index à partir du DataFrame des recettes.
+
+        Seules les colonnes présentes sont indexées.
+
+        Args:
+            recipe_df: DataFrame des recettes
+
+        Returns:
+            NumericRangeIndex: index sur les colonnes numériques disponibles
+        """
+        columns: Dict[str, np.ndarray] = {}
+        for column in NUMERIC_COLUMNS:
+            if column in recipe_df.columns:
+                columns[column] = pd.to_numeric(
+                    recipe_df[column], errors="coerce"
+                ).to_numpy(dtype="float64")
+
+        if "nutrition" in recipe_df.columns:
+            nutrition = parse_nutrition(recipe_df["nutrition"])
+            for column in NUTRITION_COLUMNS:
+                columns[column] = nutrition[column].to_numpy(dtype="float64")
+
+        return cls(recipe_df["id"].to_numpy(), columns)
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "NumericRangeIndex":
+        """Reconstruit l'index à partir de to_arrays (ex. bundle précalculé)."""
+        index = cls(arrays["recipe_ids"], {})
+        for name, values in arrays.items():
+            if name.startswith("values."):
+                column = name[len("values.") :]
+                index._values[column] = values
+                index._rows[column] = arrays[f"rows.{column}"]
+        return index
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Tableaux nécessaires pour reconstruire l'index."""
+        arrays = {"recipe_ids": self.recipe_ids}
+        for column in self._values:
+            arrays[f"values.{column}"] = self._values[column]
+            arrays[f"rows.{column}"] = self._rows[column]
+        return arrays
+
+    @property
+    def columns(self) -> List[str]:
+        """Colonnes indexées."""
+        return list(self._values)
+
+    def __len__(self) -> int:
+        return len(self.recipe_ids)
+
+    def bounds(self, column: str) -> Tuple[float, float]:
+        """
+        Retourne les valeurs minimale et maximale d'une colonne.
+
+        Args:
+            column: Nom de la colonne indexée
+
+        Returns:
+            Tuple[float, float]: (min, max), ou (nan, nan) si la colonne est vide
+        """
+        values = self._values[column]
+        if len(values) == 0:
+            return (float("nan"), float("nan"))
+        return (float(values[0]), float(values[-1]))
+
+    def query_rows(
+        self, column: str, low: Optional[float] = None, high: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Positions des lignes dont la valeur est dans [low, high] (bornes incluses).
+
+        Args:
+            column: Nom de la colonne indexée
+            low: Borne inférieure (None = pas de borne)
+            high: Borne supérieure (None = pas de borne)
+
+        Returns:
+            np.ndarray: positions des lignes, non triées
+        """
+        values = self._values[column]
+        start = 0 if low is None else int(np.searchsorted(values, low, side="left"))
+        stop = (
+            len(values)
+            if high is None
+            else int(np.searchsorted(values, high, side="right"))
+        )
+        return self._rows[column][start : max(start, stop)]
+
+    def query(
+        self, column: str, low: Optional[float] = None, high: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Identifiants des recettes dont la valeur est dans [low, high].
+
+        Args:
+            column: Nom de la colonne indexée
+            low: Borne inférieure (None = pas de borne)
+            high: Borne supérieure (None = pas de borne)
+
+        Returns:
+            np.ndarray: identifiants de recettes
+        """
+        ids: np.ndarray = self.recipe_ids[self.query_rows(column, low, high)]
+        return ids
+
+    def filter(self, ranges: Mapping[str, RangeFilter]) -> Optional[np.ndarray]:
+        """
+        Combine plusieurs prédicats de plage (ET logique).
+
+        Args:
+            ranges: {colonne: (bas, haut)} ; une plage (None, None) est ignorée
+
+        Returns:
+            Optional[np.ndarray]: identifiants des recettes satisfaisant tous les
+            prédicats, ou None si aucun prédicat n'est actif
+        """
+        active = [
+            (column, low, high)
+            for column, (low, high) in ranges.items()
+            if low is not None or high is not None
+        ]
+        if not active:
+            return None
+
+        hits = np.zeros(len(self.recipe_ids), dtype=np.uint8)
+        for column, low, high in active:
+            hits[self.query_rows(column, low, high)] += 1
+        ids: np.ndarray = self.recipe_ids[hits == len(active)]
+        return ids
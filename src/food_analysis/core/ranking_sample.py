@@ -0,0 +1,142 @@
+"""Échantillon d'interactions tiré une fois, pour les classements approchés.
+
+Sur un cache froid, le classement exact regroupe toutes les interactions.
+Un classement approché calculé sur un échantillon uniforme de taille fixe
+s'affiche en attendant, en un temps borné quelle que soit la taille des
+données : moyenne des notes de l'échantillon et nombre d'avis extrapolé
+(compte dans l'échantillon divisé par la fraction échantillonnée). La note
+pondérée de l'estimation porte sur le nombre d'avis réellement tirés (voir
+DataAnalyzer.get_approximate_ranking).
+
+L'échantillon est tiré avec une graine fixe : le même jeu de données donne
+toujours le même classement approché.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from food_analysis.core.rating_buckets import to_month
+from food_analysis.utils.config import Config
+
+
+class RankingSample:
+    """Recette, note et mois d'un échantillon uniforme d'interactions."""
+
+    def __init__(
+        self,
+        recipe_ids: np.ndarray,
+        ratings: np.ndarray,
+        months: np.ndarray,
+        n_total: int,
+    ) -> None:
+        """
+        Initialise l'échantillon.
+
+        Args:
+            recipe_ids: Identifiant de recette de chaque interaction tirée
+            ratings: Note de chaque interaction tirée (NaN = ignorée)
+            months: Numéro de mois de chaque interaction tirée (NaN si inconnu)
+            n_total: Nombre d'interactions de la table complète
+        """
+        self.recipe_ids = recipe_ids
+        self.ratings = np.asarray(ratings, dtype="float64")
+        self.months = np.asarray(months, dtype="float64")
+        self.n_total = n_total
+
+    @classmethod
+    def from_interactions(
+        cls,
+        interaction_df: pd.DataFrame,
+        size: Optional[int] = None,
+        seed: int = 0,
+    ) -> "RankingSample":
+        """
+        Tire l'échantillon dans la table des interactions.
+
+        Args:
+            interaction_df: DataFrame avec recipe_id, rating et éventuellement date
+            size: Nombre d'interactions tirées (défaut :
+                Config.RANKING_SAMPLE_SIZE ; toute la table si elle est plus petite)
+            seed: Graine du tirage
+
+        Returns:
+            RankingSample: échantillon
+        """
+        size = size or Config.RANKING_SAMPLE_SIZE
+        n_total = len(interaction_df)
+        rows = np.sort(
+            np.random.default_rng(seed).choice(
+                n_total, size=min(size, n_total), replace=False
+            )
+        )
+        sample = interaction_df.iloc[rows]
+        if "date" in sample.columns:
+            months = to_month(sample["date"])
+        else:
+            months = np.full(len(sample), np.nan)
+        return cls(
+            sample["recipe_id"].to_numpy(),
+            pd.to_numeric(sample["rating"], errors="coerce").to_numpy(
+                dtype="float64", na_value=np.nan
+            ),
+            months,
+            n_total,
+        )
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "RankingSample":
+        """Reconstruit l'échantillon à partir de to_arrays (ex. bundle précalculé)."""
+        return cls(
+            arrays["recipe_ids"],
+            arrays["ratings"],
+            arrays["months"],
+            int(arrays["n_total"]),
+        )
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Tableaux nécessaires pour reconstruire l'échantillon."""
+        return {
+            "recipe_ids": self.recipe_ids,
+            "ratings": self.ratings,
+            "months": self.months,
+            "n_total": np.array(self.n_total),
+        }
+
+    def __len__(self) -> int:
+        return len(self.recipe_ids)
+
+    @property
+    def fraction(self) -> float:
+        """Part des interactions présente dans l'échantillon."""
+        return len(self) / self.n_total if self.n_total else 1.0
+
+    def aggregates(self, period: Optional[Tuple[int, int]] = None) -> pd.DataFrame:
+        """
+        Estime la note moyenne et le nombre d'avis par recette.
+
+        Args:
+            period: (premier mois, dernier mois) des avis pris en compte, ou None
+
+        Returns:
+            pd.DataFrame: recipe_id, avg_rating et n_reviews (extrapolé à la
+            table complète), même format que compute_recipe_aggregates
+        """
+        selected = ~np.isnan(self.ratings)
+        if period is not None:
+            selected &= (self.months >= period[0]) & (self.months <= period[1])
+
+        recipe_ids, inverse = np.unique(self.recipe_ids[selected], return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(recipe_ids))
+        sums = np.bincount(
+            inverse, weights=self.ratings[selected], minlength=len(recipe_ids)
+        )
+        aggregates: pd.DataFrame = pd.DataFrame(
+            {
+                "recipe_id": recipe_ids,
+                "avg_rating": sums / np.maximum(counts, 1),
+                "n_reviews": np.rint(counts / self.fraction).astype(np.int64),
+            }
+        )
+        return aggregates
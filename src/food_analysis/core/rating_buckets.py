@@ -0,0 +1,314 @@
+"""Sommes et comptes de notes par recette et par mois.
+
+Les interactions sont agrégées une seule fois en seaux (recette, mois), triés
+par recette puis par mois, avec des sommes cumulées globales. Les statistiques
+d'une recette sur une fenêtre [début, fin] s'obtiennent alors par différence
+de deux positions dans les tableaux cumulés, sans relire les interactions.
+"""
+
+import math
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def to_month(dates: pd.Series) -> np.ndarray:
+    """
+    Convertit des dates en numéros de mois (année * 12 + mois - 1).
+
+    Args:
+        dates: Série de dates (chaînes ou datetime)
+
+    Returns:
+        np.ndarray: numéros de mois en float (NaN si la date est invalide)
+    """
+    parsed = pd.to_datetime(dates, errors="coerce")
+    months = parsed.dt.year * 12 + parsed.dt.month - 1
+    return months.to_numpy(dtype="float64", na_value=np.nan)
+
+
+def month_label(month: int) -> str:
+    """Libellé "AAAA-MM" d'un numéro de mois."""
+    return f"{month // 12:04d}-{month % 12 + 1:02d}"
+
+
+class MonthlyRatingBuckets:
+    """Seaux mensuels de notes par recette, stockés en ligne compressée (CSR).
+
+    Les mêmes seaux peuvent regrouper les interactions par utilisateur (voir
+    from_interactions) ; « recette » désigne alors un utilisateur.
+    """
+
+    def __init__(
+        self,
+        recipe_ids: np.ndarray,
+        months: np.ndarray,
+        ratings: np.ndarray,
+    ) -> None:
+        """
+        Agrège les notes par (recette, mois).
+
+        Args:
+            recipe_ids: Identifiant de recette de chaque interaction
+            months: Numéro de mois de chaque interaction (NaN = ignorée)
+            ratings: Note de chaque interaction (NaN = ignorée)
+        """
+        months = np.asarray(months, dtype="float64")
+        ratings = np.asarray(ratings, dtype="float64")
+        valid = ~(np.isnan(months) | np.isnan(ratings))
+        self._aggregate(
+            np.asarray(recipe_ids)[valid],
+            months[valid].astype(np.int64),
+            np.ones(int(valid.sum()), dtype=np.int64),
+            ratings[valid],
+        )
+
+    def _aggregate(
+        self,
+        recipe_ids: np.ndarray,
+        months: np.ndarray,
+        counts: np.ndarray,
+        sums: np.ndarray,
+    ) -> None:
+        """Regroupe des seaux (recette, mois), éventuellement répétés."""
+        self.recipe_ids, recipe_pos = np.unique(recipe_ids, return_inverse=True)
+
+        first_month = int(months.min()) if len(months) else 0
+        last_month = int(months.max()) if len(months) else -1
+        span = last_month - first_month + 1
+
+        # Clé composite triable : recette puis mois
+        keys = recipe_pos.astype(np.int64) * span + (months - first_month)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        self._set_state(
+            unique_keys,
+            np.bincount(inverse, weights=counts, minlength=len(unique_keys)).astype(
+                np.int64
+            ),
+            np.bincount(inverse, weights=sums, minlength=len(unique_keys)),
+            first_month,
+            last_month,
+        )
+
+    def _set_state(
+        self,
+        keys: np.ndarray,
+        counts: np.ndarray,
+        sums: np.ndarray,
+        first_month: int,
+        last_month: int,
+    ) -> None:
+        """Initialise les seaux et leurs sommes cumulées (recipe_ids déjà défini)."""
+        self.first_month = first_month
+        self.last_month = last_month
+        self._span = last_month - first_month + 1
+        self._keys = keys
+        self.counts = counts
+        self.sums = sums
+
+        self.indptr = np.searchsorted(
+            self._keys, np.arange(len(self.recipe_ids) + 1) * self._span
+        )
+        self._cum_counts = np.concatenate(([0], np.cumsum(self.counts)))
+        self._cum_sums = np.concatenate(([0.0], np.cumsum(self.sums)))
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "MonthlyRatingBuckets":
+        """Reconstruit les seaux à partir de to_arrays (ex. bundle précalculé)."""
+        buckets = cls.__new__(cls)
+        buckets.recipe_ids = arrays["recipe_ids"]
+        first_month, last_month = (int(m) for m in arrays["month_range"])
+        buckets._set_state(
+            arrays["keys"], arrays["counts"], arrays["sums"], first_month, last_month
+        )
+        return buckets
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Tableaux nécessaires pour reconstruire les seaux."""
+        return {
+            "recipe_ids": self.recipe_ids,
+            "keys": self._keys,
+            "counts": self.counts,
+            "sums": self.sums,
+            "month_range": np.array([self.first_month, self.last_month]),
+        }
+
+    @classmethod
+    def from_interactions(
+        cls, interaction_df: pd.DataFrame, key: str = "recipe_id"
+    ) -> "MonthlyRatingBuckets":
+        """
+        Construit les seaux depuis le DataFrame des interactions.
+
+        Args:
+            interaction_df: DataFrame avec la colonne key, rating et date
+            key: Colonne regroupée (recipe_id, ou user_id pour des seaux par
+                utilisateur ; recipe_ids contient alors des ID d'utilisateurs)
+
+        Returns:
+            MonthlyRatingBuckets: seaux mensuels (vides si pas de colonne date)
+        """
+        if "date" in interaction_df.columns:
+            months = to_month(interaction_df["date"])
+        else:
+            months = np.full(len(interaction_df), np.nan)
+        return cls(
+            interaction_df[key].to_numpy(),
+            months,
+            pd.to_numeric(interaction_df["rating"], errors="coerce").to_numpy(
+                dtype="float64", na_value=np.nan
+            ),
+        )
+
+    def merge(self, other: "MonthlyRatingBuckets") -> "MonthlyRatingBuckets":
+        """
+        Combine deux ensembles de seaux (ex. seaux existants et seaux des
+        interactions ajoutées depuis).
+
+        Le coût dépend du nombre de seaux, pas du nombre d'interactions.
+
+        Args:
+            other: Seaux à ajouter
+
+        Returns:
+            MonthlyRatingBuckets: seaux des deux ensembles d'interactions
+        """
+        parts = [self._bucket_arrays(), other._bucket_arrays()]
+        merged = MonthlyRatingBuckets.__new__(MonthlyRatingBuckets)
+        merged._aggregate(
+            *(np.concatenate([part[i] for part in parts]) for i in range(4))
+        )
+        return merged
+
+    def _bucket_arrays(
+        self,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Recette, mois, nombre d'avis et somme des notes de chaque seau."""
+        rows = np.repeat(np.arange(len(self.recipe_ids)), np.diff(self.indptr))
+        return self.recipe_ids[rows], self.months, self.counts, self.sums
+
+    @property
+    def months(self) -> np.ndarray:
+        """Numéro de mois de chaque seau."""
+        return self._keys % max(self._span, 1) + self.first_month
+
+    @property
+    def month_range(self) -> Tuple[int, int]:
+        """Premier et dernier mois couverts."""
+        return (self.first_month, self.last_month)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def window_stats(self, start_month: int, end_month: int) -> pd.DataFrame:
+        """
+        Note moyenne et nombre d'avis par recette sur une fenêtre de mois.
+
+        Args:
+            start_month: Premier mois inclus
+            end_month: Dernier mois inclus
+
+        Returns:
+            pd.DataFrame: recipe_id, avg_rating, n_reviews pour les recettes ayant
+            au moins un avis dans la fenêtre
+        """
+        counts, sums = self._window(start_month, end_month)
+        has_reviews = counts > 0
+
+        stats: pd.DataFrame = pd.DataFrame(
+            {
+                "recipe_id": self.recipe_ids[has_reviews],
+                "avg_rating": sums[has_reviews] / counts[has_reviews],
+                "n_reviews": counts[has_reviews],
+            }
+        )
+        return stats
+
+    def window_counts(self, start_month: int, end_month: int) -> np.ndarray:
+        """
+        Nombre d'avis par recette (ou utilisateur) sur une fenêtre de mois.
+
+        Args:
+            start_month: Premier mois inclus
+            end_month: Dernier mois inclus
+
+        Returns:
+            np.ndarray: nombre d'avis de chaque recette ayant au moins un avis
+            dans la fenêtre
+        """
+        counts, _ = self._window(start_month, end_month)
+        return counts[counts > 0]
+
+    def _window(
+        self, start_month: int, end_month: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Nombre d'avis et somme des notes de chaque recette sur la fenêtre."""
+        start = min(max(start_month - self.first_month, 0), self._span)
+        end = min(max(end_month - self.first_month, -1), self._span - 1)
+        if start > end:
+            n_recipes = len(self.recipe_ids)
+            return np.zeros(n_recipes, dtype=np.int64), np.zeros(n_recipes)
+
+        base = np.arange(len(self.recipe_ids), dtype=np.int64) * self._span
+        lo = np.searchsorted(self._keys, base + start, side="left")
+        hi = np.searchsorted(self._keys, base + end, side="right")
+        return (
+            self._cum_counts[hi] - self._cum_counts[lo],
+            self._cum_sums[hi] - self._cum_sums[lo],
+        )
+
+    def recipe_trend(self, recipe_id: Any, max_points: int = 60) -> pd.DataFrame:
+        """
+        Évolution de la note et du volume d'avis d'une recette.
+
+        Les seaux mensuels de la recette sont regroupés en au plus ``max_points``
+        intervalles de même durée, ce qui borne le coût de l'affichage même pour
+        les recettes ayant un long historique.
+
+        Args:
+            recipe_id: ID de la recette
+            max_points: Nombre maximal d'intervalles retournés
+
+        Returns:
+            pd.DataFrame: period (début de l'intervalle), n_reviews, avg_rating
+            (moyenne de l'intervalle) et cumulative_avg_rating (moyenne depuis le
+            premier avis) ; vide si la recette n'a pas d'avis daté
+        """
+        pos = int(np.searchsorted(self.recipe_ids, recipe_id))
+        if pos >= len(self.recipe_ids) or self.recipe_ids[pos] != recipe_id:
+            empty: pd.DataFrame = pd.DataFrame(
+                columns=["period", "n_reviews", "avg_rating", "cumulative_avg_rating"]
+            )
+            return empty
+
+        block = slice(self.indptr[pos], self.indptr[pos + 1])
+        months = self._keys[block] % self._span + self.first_month
+        first = int(months[0])
+        span = int(months[-1]) - first + 1
+        width = max(1, math.ceil(span / max(max_points, 1)))
+        n_bins = (span - 1) // width + 1
+
+        bins = (months - first) // width
+        counts = np.bincount(bins, weights=self.counts[block], minlength=n_bins)
+        sums = np.bincount(bins, weights=self.sums[block], minlength=n_bins)
+        cum_counts = np.cumsum(counts)
+
+        starts = first + np.arange(n_bins) * width
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg_rating = np.where(counts > 0, sums / counts, np.nan)
+            cumulative_avg = np.where(
+                cum_counts > 0, np.cumsum(sums) / cum_counts, np.nan
+            )
+
+        history: pd.DataFrame = pd.DataFrame(
+            {
+                "period": pd.to_datetime(
+                    {"year": starts // 12, "month": starts % 12 + 1, "day": 1}
+                ),
+                "n_reviews": counts.astype(np.int64),
+                "avg_rating": avg_rating,
+                "cumulative_avg_rating": cumulative_avg,
+            }
+        )
+        return history
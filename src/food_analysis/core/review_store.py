@@ -0,0 +1,366 @@
+"""Textes des avis compressés par blocs, en accès aléatoire.
+
+La colonne ``review`` représente l'essentiel de la mémoire des interactions,
+alors qu'une page n'affiche que quelques dizaines d'avis. Dans un bundle, les
+textes sont donc stockés sur disque (``reviews.bin``), compressés par blocs
+d'environ ``BLOCK_SIZE`` octets, dans l'ordre de l'index des avis (par
+recette, du plus récent au plus ancien) : les avis d'une recette occupent un
+ou quelques blocs consécutifs, et seuls ces blocs sont décompressés.
+
+Seuls restent en mémoire la position de chaque interaction dans le store
+(4 octets par ligne) et les offsets des blocs (``reviews.npz``). Le fichier
+est projeté en mémoire (mmap) : ses pages sont partagées entre les processus
+et le noyau peut les libérer à tout moment.
+
+Compression : zstd (``pip install "food-analysis-webapp[zstd]"``), sinon lz4
+s'il est installé, sinon zlib (bibliothèque standard). Le codec utilisé est
+enregistré avec le store.
+
+Format d'un bloc décompressé : nombre de textes n (uint32), n longueurs
+(int32, -1 pour un avis sans texte), puis les textes UTF-8 concaténés.
+"""
+
+import importlib
+import mmap
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from food_analysis.utils.config import Config
+
+REVIEWS_FILE = "reviews.bin"
+REVIEWS_INDEX_FILE = "reviews.npz"
+
+# Taille visée d'un bloc décompressé (octets)
+BLOCK_SIZE = 64 * 1024
+# Blocs décompressés gardés en mémoire (LRU)
+BLOCK_CACHE_SIZE = 32
+
+_HEADER = np.dtype("<u4")
+_LENGTHS = np.dtype("<i4")
+
+
+class Codec:
+    """Fonctions de compression d'un format."""
+
+    def __init__(
+        self,
+        name: str,
+        compress: Callable[[bytes], bytes],
+        decompress: Callable[[bytes], bytes],
+    ) -> None:
+        self.name = name
+        self.compress = compress
+        self.decompress = decompress
+
+
+def _zstd() -> Codec:
+    zstandard = importlib.import_module("zstandard")
+    return Codec(
+        "zstd",
+        zstandard.ZstdCompressor(level=6).compress,
+        zstandard.ZstdDecompressor().decompress,
+    )
+
+
+def _lz4() -> Codec:
+    frame = importlib.import_module("lz4.frame")
+    return Codec("lz4", frame.compress, frame.decompress)
+
+
+def _zlib() -> Codec:
+    return Codec("zlib", lambda data: zlib.compress(data, 6), zlib.decompress)
+
+
+# Codecs par ordre de préférence
+CODECS: Dict[str, Callable[[], Codec]] = {"zstd": _zstd, "lz4": _lz4, "zlib": _zlib}
+
+
+def get_codec(name: Optional[str] = None) -> Codec:
+    """
+    Retourne un codec de compression.
+
+    Args:
+        name: zstd, lz4, zlib ou auto (défaut : Config.REVIEW_CODEC) ; auto
+            choisit le premier codec installé
+
+    Returns:
+        Codec: codec demandé
+
+    Raises:
+        ValueError: Si le codec est inconnu
+        ImportError: Si le codec demandé n'est pas installé
+    """
+    name = (name or Config.REVIEW_CODEC).lower()
+    if name == "auto":
+        for factory in CODECS.values():
+            try:
+                return factory()
+            except ImportError:
+                continue
+    if name not in CODECS:
+        raise ValueError(
+            f"Codec inconnu : {name} (disponibles : auto, {', '.join(CODECS)})"
+        )
+    return CODECS[name]()
+
+
+def _encode_block(texts: Sequence[Optional[bytes]]) -> bytes:
+    lengths = np.array(
+        [-1 if text is None else len(text) for text in texts], dtype=_LENGTHS
+    )
+    header = np.array([len(texts)], dtype=_HEADER).tobytes()
+    return header + lengths.tobytes() + b"".join(t for t in texts if t is not None)
+
+
+class _Block:
+    """Bloc décompressé : textes décodés un par un, à la demande."""
+
+    def __init__(self, payload: bytes) -> None:
+        n = int(np.frombuffer(payload, dtype=_HEADER, count=1)[0])
+        self.lengths = np.frombuffer(
+            payload, dtype=_LENGTHS, count=n, offset=_HEADER.itemsize
+        )
+        data_start = _HEADER.itemsize + n * _LENGTHS.itemsize
+        self.ends = np.cumsum(np.maximum(self.lengths, 0)) + data_start
+        self.payload = payload
+
+    def text(self, i: int) -> Optional[str]:
+        length = int(self.lengths[i])
+        if length < 0:
+            return None
+        end = int(self.ends[i])
+        return self.payload[end - length : end].decode("utf-8")
+
+
+class ReviewStore:
+    """Textes des avis, lus par ligne d'interaction dans des blocs compressés."""
+
+    def __init__(
+        self,
+        path: Path,
+        codec: Codec,
+        block_offsets: np.ndarray,
+        block_starts: np.ndarray,
+        positions: np.ndarray,
+    ) -> None:
+        """
+        Ouvre le fichier des blocs.
+
+        Args:
+            path: Fichier des blocs compressés
+            codec: Codec des blocs
+            block_offsets: Offset de chaque bloc dans le fichier (n_blocs + 1)
+            block_starts: Position du premier texte de chaque bloc (n_blocs + 1)
+            positions: Position dans le store du texte de chaque interaction
+        """
+        self.path = path
+        self.codec = codec
+        self.block_offsets = block_offsets
+        self.block_starts = block_starts
+        self.positions = positions
+        # Projection ouverte dès maintenant : elle reste lisible même si le
+        # bundle est supprimé ensuite (voir bundle.prune_bundles)
+        with open(path, "rb") as f:
+            self._data = (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if block_offsets[-1] > 0
+                else b""
+            )
+        self._blocks: "OrderedDict[int, _Block]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @property
+    def n_blocks(self) -> int:
+        """Nombre de blocs compressés."""
+        return len(self.block_offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """Mémoire occupée par les tableaux d'index (hors blocs en cache)."""
+        return int(
+            self.block_offsets.nbytes + self.block_starts.nbytes + self.positions.nbytes
+        )
+
+    @classmethod
+    def write(
+        cls,
+        texts: pd.Series,
+        order: np.ndarray,
+        directory: Path,
+        codec: Optional[Codec] = None,
+        block_size: int = BLOCK_SIZE,
+    ) -> "ReviewStore":
+        """
+        Compresse les textes dans directory (REVIEWS_FILE et REVIEWS_INDEX_FILE).
+
+        Args:
+            texts: Texte de chaque interaction (valeurs manquantes permises)
+            order: Ordre de stockage des lignes (ex. review_index.order)
+            directory: Dossier de destination
+            codec: Codec (défaut : get_codec())
+            block_size: Taille visée d'un bloc décompressé (octets)
+
+        Returns:
+            ReviewStore: store ouvert sur les fichiers écrits
+        """
+        codec = codec or get_codec()
+        missing = texts.isna().to_numpy()[order]
+        values = texts.to_numpy(dtype=object)[order]
+
+        offsets, starts = [0], [0]
+        block: List[Optional[bytes]] = []
+        block_bytes = 0
+        with open(directory / REVIEWS_FILE, "wb") as f:
+
+            def flush() -> None:
+                nonlocal block, block_bytes
+                compressed = codec.compress(_encode_block(block))
+                f.write(compressed)
+                offsets.append(offsets[-1] + len(compressed))
+                starts.append(starts[-1] + len(block))
+                block, block_bytes = [], 0
+
+            for value, is_missing in zip(values, missing):
+                text = None if is_missing else str(value).encode("utf-8")
+                block.append(text)
+                block_bytes += len(text) if text is not None else 0
+                if block_bytes >= block_size:
+                    flush()
+            if block:
+                flush()
+
+        positions = np.empty(
+            len(order), dtype=np.int32 if len(order) < 2**31 else np.int64
+        )
+        positions[order] = np.arange(len(order), dtype=positions.dtype)
+        np.savez(
+            directory / REVIEWS_INDEX_FILE,
+            codec=np.array(codec.name),
+            block_offsets=np.array(offsets, dtype=np.int64),
+            block_starts=np.array(starts, dtype=np.int64),
+            positions=positions,
+        )
+        return cls.open(directory)
+
+    @classmethod
+    def open(cls, directory: Path) -> "ReviewStore":
+        """
+        Ouvre un store écrit par write.
+
+        Args:
+            directory: Dossier contenant REVIEWS_FILE et REVIEWS_INDEX_FILE
+
+        Returns:
+            ReviewStore: store prêt à être lu
+
+        Raises:
+            ImportError: Si le codec du store n'est pas installé
+        """
+        with np.load(directory / REVIEWS_INDEX_FILE) as npz:
+            return cls(
+                directory / REVIEWS_FILE,
+                get_codec(str(npz["codec"])),
+                npz["block_offsets"],
+                npz["block_starts"],
+                npz["positions"],
+            )
+
+    def _block(self, block: int) -> _Block:
+        """Bloc décompressé (au besoin, gardé en cache LRU)."""
+        with self._lock:
+            decoded = self._blocks.get(block)
+            if decoded is not None:
+                self._blocks.move_to_end(block)
+                return decoded
+        start, end = self.block_offsets[block], self.block_offsets[block + 1]
+        decoded = _Block(self.codec.decompress(self._data[start:end]))
+        with self._lock:
+            self._blocks[block] = decoded
+            while len(self._blocks) > BLOCK_CACHE_SIZE:
+                self._blocks.popitem(last=False)
+        return decoded
+
+    def texts(self, rows: np.ndarray) -> pd.Series:
+        """
+        Textes des avis de lignes d'interactions.
+
+        Args:
+            rows: Positions des lignes dans la table des interactions
+
+        Returns:
+            pd.Series: textes (NaN pour un avis sans texte), dans l'ordre de rows
+        """
+        positions = self.positions[np.asarray(rows, dtype=np.int64)]
+        blocks = np.searchsorted(self.block_starts, positions, side="right") - 1
+        values: List[Optional[str]] = []
+        decoded: Dict[int, _Block] = {}
+        for position, block in zip(positions.tolist(), blocks.tolist()):
+            if block not in decoded:
+                decoded[block] = self._block(block)
+            values.append(decoded[block].text(position - int(self.block_starts[block])))
+        return pd.Series(values, dtype="str", name="review")
+
+    def __repr__(self) -> str:
+        return (
+            f"ReviewStore({len(self)} avis, {self.n_blocks} blocs {self.codec.name}, "
+            f"{self.path})"
+        )
+
+
+def select_reviews(
+    interaction_df: pd.DataFrame,
+    rows: np.ndarray,
+    columns: List[str],
+    store: Optional[ReviewStore] = None,
+) -> pd.DataFrame:
+    """
+    Extrait des lignes d'interactions, texte des avis compris.
+
+    Args:
+        interaction_df: DataFrame des interactions
+        rows: Positions des lignes
+        columns: Colonnes retournées (dont éventuellement "review")
+        store: Store des textes ; sans store, la colonne review est lue dans
+            interaction_df
+
+    Returns:
+        pd.DataFrame: lignes demandées, index remis à zéro
+    """
+    if store is None or "review" not in columns:
+        plain: pd.DataFrame = interaction_df.iloc[rows][columns].reset_index(drop=True)
+        return plain
+    other = [column for column in columns if column != "review"]
+    selected = interaction_df.iloc[rows][other].reset_index(drop=True)
+    selected["review"] = store.texts(rows)
+    reviews: pd.DataFrame = selected[columns]
+    return reviews
+
+
+def split_review_text(
+    interaction_df: pd.DataFrame, order: np.ndarray, directory: Path
+) -> Tuple[pd.DataFrame, Optional[ReviewStore]]:
+    """
+    Écrit les textes des avis dans un store et les retire de la table.
+
+    Args:
+        interaction_df: DataFrame des interactions
+        order: Ordre de stockage (ordre de l'index des avis)
+        directory: Dossier du store
+
+    Returns:
+        Tuple[pd.DataFrame, Optional[ReviewStore]]: interactions sans la colonne
+        review et store ouvert (table inchangée et None sans colonne review)
+    """
+    if "review" not in interaction_df.columns:
+        return interaction_df, None
+    store = ReviewStore.write(interaction_df["review"], order, directory)
+    return interaction_df.drop(columns="review"), store
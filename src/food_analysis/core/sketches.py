@@ -0,0 +1,292 @@
+"""Esquisses fusionnables des interactions, par mois.
+
+Les indicateurs de la page d'accueil sur une période quelconque se calculent
+en combinant des seaux mensuels, sans relire les interactions :
+
+- une esquisse HyperLogLog estime un nombre d'éléments distincts
+  (utilisateurs, recettes) dans 2^precision octets, à ~1,04 / sqrt(2^precision)
+  près (HLL_RELATIVE_ERROR, 1,6 % avec la précision par défaut). Deux esquisses se fusionnent par
+  un maximum registre à registre : l'union des mois d'une période ne coûte
+  que (nombre de mois) x 4 Ko.
+- ``MonthlySketches`` tient, pour chaque mois, le nombre d'avis, la somme et
+  le nombre des notes > 0 et les esquisses des utilisateurs et des recettes.
+
+Les quantiles par entité (avis par recette, notes par utilisateur) ne
+s'obtiennent pas en fusionnant des esquisses de quantiles mensuelles : le
+nombre d'avis d'une recette sur une période est la somme de ses comptes
+mensuels. Ils sont calculés exactement à partir des seaux (recette, mois) et
+(utilisateur, mois) de rating_buckets.py, par différence de sommes cumulées.
+
+Toutes ces structures acceptent des interactions ajoutées (``update``,
+``MonthlyRatingBuckets.merge``) : seuls les nouveaux avis sont lus.
+"""
+
+import math
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from food_analysis.core.rating_buckets import to_month
+
+# Précision des esquisses HyperLogLog (2^12 registres d'un octet)
+HLL_PRECISION = 12
+# Erreur relative type d'une estimation à cette précision (~1,6 %)
+HLL_RELATIVE_ERROR = 1.04 / math.sqrt(1 << HLL_PRECISION)
+
+
+def hash64(values: Any) -> np.ndarray:
+    """
+    Hache des valeurs sur 64 bits (déterministe d'un processus à l'autre).
+
+    Args:
+        values: Tableau ou série de valeurs (entiers, chaînes...)
+
+    Returns:
+        np.ndarray: empreintes uint64
+    """
+    return pd.util.hash_array(np.asarray(values))
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Nombre de bits significatifs de chaque entier uint64 (0 pour 0)."""
+    values = values.copy()
+    lengths = np.zeros(len(values), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = values >= np.uint64(1 << shift)
+        lengths[high] += shift
+        values[high] >>= np.uint64(shift)
+    return lengths + (values > 0)
+
+
+def hll_positions(
+    hashes: np.ndarray, precision: int = HLL_PRECISION
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Registre et rang HyperLogLog de chaque empreinte.
+
+    Args:
+        hashes: Empreintes uint64 (voir hash64)
+        precision: Nombre de bits désignant le registre
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: indice du registre et rang (position
+        du premier bit à 1 des bits restants)
+    """
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    registers = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+    rest = hashes << np.uint64(precision)
+    # Bits restants tous nuls : rang maximal
+    ranks = np.where(rest == 0, 64 - precision + 1, 65 - _bit_length(rest))
+    return registers, ranks.astype(np.uint8)
+
+
+def hll_estimate(registers: np.ndarray) -> float:
+    """
+    Estime le nombre d'éléments distincts d'une esquisse HyperLogLog.
+
+    Args:
+        registers: Registres de l'esquisse (2^precision valeurs)
+
+    Returns:
+        float: estimation (comptage linéaire pour les petits effectifs)
+    """
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / float(np.sum(np.exp2(-registers.astype("float64"))))
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros:
+        return m * math.log(m / zeros)
+    return estimate
+
+
+class MonthlySketches:
+    """Compteurs et esquisses HyperLogLog des interactions, par mois."""
+
+    def __init__(
+        self,
+        months: np.ndarray,
+        n_reviews: np.ndarray,
+        n_rated: np.ndarray,
+        rating_sums: np.ndarray,
+        users: np.ndarray,
+        recipes: np.ndarray,
+    ) -> None:
+        """
+        Initialise les esquisses à partir de leurs tableaux.
+
+        Args:
+            months: Numéros de mois, croissants et contigus
+            n_reviews: Nombre d'avis de chaque mois
+            n_rated: Nombre d'avis notés (note > 0) de chaque mois
+            rating_sums: Somme des notes > 0 de chaque mois
+            users: Registres HyperLogLog des utilisateurs (un mois par ligne)
+            recipes: Registres HyperLogLog des recettes (un mois par ligne)
+        """
+        self.months = months
+        self.n_reviews = n_reviews
+        self.n_rated = n_rated
+        self.rating_sums = rating_sums
+        self.users = users
+        self.recipes = recipes
+
+    @classmethod
+    def from_interactions(
+        cls, interaction_df: pd.DataFrame, precision: int = HLL_PRECISION
+    ) -> "MonthlySketches":
+        """
+        Construit les esquisses depuis le DataFrame des interactions.
+
+        Args:
+            interaction_df: DataFrame avec user_id, recipe_id, rating et date
+            precision: Précision des esquisses HyperLogLog
+
+        Returns:
+            MonthlySketches: esquisses (vides si pas de colonne date)
+        """
+        if "date" in interaction_df.columns:
+            months = to_month(interaction_df["date"])
+        else:
+            months = np.full(len(interaction_df), np.nan)
+        valid = ~np.isnan(months)
+        months = months[valid].astype(np.int64)
+        ratings = pd.to_numeric(interaction_df["rating"], errors="coerce").to_numpy(
+            dtype="float64", na_value=np.nan
+        )[valid]
+
+        first_month = int(months.min()) if len(months) else 0
+        span = int(months.max()) - first_month + 1 if len(months) else 0
+        rows = months - first_month
+        rated = ratings > 0
+
+        def registers(column: str) -> np.ndarray:
+            table = np.zeros((span, 1 << precision), dtype=np.uint8)
+            positions, ranks = hll_positions(
+                hash64(interaction_df[column].to_numpy()[valid]), precision
+            )
+            np.maximum.at(table, (rows, positions), ranks)
+            return table
+
+        return cls(
+            np.arange(first_month, first_month + span),
+            np.bincount(rows, minlength=span),
+            np.bincount(rows[rated], minlength=span),
+            np.bincount(rows[rated], weights=ratings[rated], minlength=span),
+            registers("user_id"),
+            registers("recipe_id"),
+        )
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "MonthlySketches":
+        """Reconstruit les esquisses à partir de to_arrays (ex. bundle précalculé)."""
+        return cls(
+            arrays["months"],
+            arrays["n_reviews"],
+            arrays["n_rated"],
+            arrays["rating_sums"],
+            arrays["users"],
+            arrays["recipes"],
+        )
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Tableaux nécessaires pour reconstruire les esquisses."""
+        return {
+            "months": self.months,
+            "n_reviews": self.n_reviews,
+            "n_rated": self.n_rated,
+            "rating_sums": self.rating_sums,
+            "users": self.users,
+            "recipes": self.recipes,
+        }
+
+    def __len__(self) -> int:
+        return len(self.months)
+
+    @property
+    def month_range(self) -> Tuple[int, int]:
+        """Premier et dernier mois couverts."""
+        if not len(self):
+            return (0, -1)
+        return (int(self.months[0]), int(self.months[-1]))
+
+    def merge(self, other: "MonthlySketches") -> "MonthlySketches":
+        """
+        Combine deux ensembles d'esquisses (ex. esquisses existantes et
+        esquisses des interactions ajoutées depuis).
+
+        Args:
+            other: Esquisses à ajouter (même précision)
+
+        Returns:
+            MonthlySketches: esquisses de l'union des interactions
+        """
+        if not len(other):
+            return self
+        if not len(self):
+            return other
+        first_month = min(self.month_range[0], other.month_range[0])
+        last_month = max(self.month_range[1], other.month_range[1])
+        span = last_month - first_month + 1
+
+        def combine(name: str) -> np.ndarray:
+            mine, theirs = getattr(self, name), getattr(other, name)
+            shape = (span, *mine.shape[1:])
+            result = np.zeros(shape, dtype=np.result_type(mine, theirs))
+            for sketches, values in ((self, mine), (other, theirs)):
+                offset = sketches.month_range[0] - first_month
+                target = result[offset : offset + len(values)]
+                if values.ndim > 1:
+                    np.maximum(target, values, out=target)
+                else:
+                    target += values
+            return result
+
+        return MonthlySketches(
+            np.arange(first_month, last_month + 1),
+            *(
+                combine(name)
+                for name in ("n_reviews", "n_rated", "rating_sums", "users", "recipes")
+            ),
+        )
+
+    def update(self, interaction_df: pd.DataFrame) -> "MonthlySketches":
+        """
+        Ajoute des interactions (ex. avis ajoutés depuis la construction).
+
+        Args:
+            interaction_df: Nouvelles interactions uniquement
+
+        Returns:
+            MonthlySketches: esquisses mises à jour
+        """
+        precision = int(self.users.shape[1]).bit_length() - 1
+        return self.merge(
+            MonthlySketches.from_interactions(interaction_df, precision=precision)
+        )
+
+    def window(self, start_month: int, end_month: int) -> Dict[str, Any]:
+        """
+        Indicateurs d'une fenêtre de mois, par fusion des mois qu'elle couvre.
+
+        Args:
+            start_month: Premier mois inclus
+            end_month: Dernier mois inclus
+
+        Returns:
+            Dict[str, Any]: n_reviews, avg_rating (notes > 0, None sans note),
+            n_users et n_recipes (estimations HyperLogLog)
+        """
+        first_month = self.month_range[0]
+        lo = min(max(start_month - first_month, 0), len(self))
+        hi = min(max(end_month - first_month + 1, lo), len(self))
+        if hi == lo:
+            return {"n_reviews": 0, "avg_rating": None, "n_users": 0, "n_recipes": 0}
+        n_rated = int(self.n_rated[lo:hi].sum())
+        return {
+            "n_reviews": int(self.n_reviews[lo:hi].sum()),
+            "avg_rating": (
+                float(self.rating_sums[lo:hi].sum()) / n_rated if n_rated else None
+            ),
+            "n_users": int(round(hll_estimate(self.users[lo:hi].max(axis=0)))),
+            "n_recipes": int(round(hll_estimate(self.recipes[lo:hi].max(axis=0)))),
+        }
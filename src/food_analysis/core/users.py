@@ -0,0 +1,110 @@
+"""Statistiques par utilisateur.
+
+Les avis d'un utilisateur sont lus via un index CSR des interactions par
+user_id (voir csr_index.CsrIndex) : un utilisateur prolifique se consulte par
+une simple tranche, sans parcourir toute la table.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from food_analysis.core.csr_index import CsrIndex
+from food_analysis.core.review_store import ReviewStore, select_reviews
+
+
+def build_user_index(interaction_df: pd.DataFrame) -> CsrIndex:
+    """
+    Construit l'index des interactions par utilisateur (avis récents en premier).
+
+    Args:
+        interaction_df (pd.DataFrame): DataFrame des interactions
+
+    Returns:
+        CsrIndex: index des interactions par user_id
+    """
+    sort_by = interaction_df["date"] if "date" in interaction_df.columns else None
+    return CsrIndex.from_keys(
+        interaction_df["user_id"], sort_by=sort_by, descending=True
+    )
+
+
+def compute_user_stats(interaction_df: pd.DataFrame, index: CsrIndex) -> pd.DataFrame:
+    """
+    Calcule le nombre d'avis, la note moyenne et l'indulgence de chaque utilisateur.
+
+    Comme sur la page d'accueil, les notes 0 (avis sans note) sont exclues des
+    moyennes. L'indulgence est l'écart entre la moyenne de l'utilisateur et la
+    moyenne globale.
+
+    Args:
+        interaction_df (pd.DataFrame): DataFrame des interactions
+        index (CsrIndex): Index des interactions par user_id
+
+    Returns:
+        pd.DataFrame: user_id, n_reviews, n_rated, avg_rating et leniency
+    """
+    ratings = interaction_df["rating"].to_numpy(dtype="float64")[index.order]
+    rated = ratings > 0
+
+    if len(index) == 0:
+        sums = np.zeros(0)
+        n_rated = np.zeros(0, dtype=np.int64)
+    else:
+        starts = index.indptr[:-1]
+        sums = np.add.reduceat(np.where(rated, ratings, 0.0), starts)
+        n_rated = np.add.reduceat(rated.astype(np.int64), starts)
+
+    global_mean = ratings[rated].mean() if rated.any() else np.nan
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_rating = np.where(n_rated > 0, sums / n_rated, np.nan)
+
+    user_stats: pd.DataFrame = pd.DataFrame(
+        {
+            "user_id": index.keys,
+            "n_reviews": index.counts,
+            "n_rated": n_rated,
+            "avg_rating": avg_rating,
+            "leniency": avg_rating - global_mean,
+        }
+    )
+    return user_stats
+
+
+def top_reviewers(user_stats: pd.DataFrame, n: int = 20) -> pd.DataFrame:
+    """
+    Retourne les N utilisateurs ayant publié le plus d'avis.
+
+    Args:
+        user_stats (pd.DataFrame): Résultat de compute_user_stats
+        n (int): Nombre d'utilisateurs
+
+    Returns:
+        pd.DataFrame: les N lignes de user_stats avec le plus d'avis
+    """
+    top: pd.DataFrame = user_stats.nlargest(n, "n_reviews").reset_index(drop=True)
+    return top
+
+
+def user_reviews(
+    user_id: int,
+    interaction_df: pd.DataFrame,
+    index: CsrIndex,
+    store: Optional[ReviewStore] = None,
+) -> pd.DataFrame:
+    """
+    Récupère les avis d'un utilisateur, du plus récent au plus ancien.
+
+    Args:
+        user_id (int): ID de l'utilisateur
+        interaction_df (pd.DataFrame): DataFrame des interactions
+        index (CsrIndex): Index des interactions par user_id
+        store (ReviewStore, optionnel): Textes des avis, si la table des
+            interactions n'a pas de colonne review (bundle)
+
+    Returns:
+        pd.DataFrame: recipe_id, rating, date et review
+    """
+    columns = ["recipe_id", "rating", "date", "review"]
+    return select_reviews(interaction_df, index.rows(user_id), columns, store)
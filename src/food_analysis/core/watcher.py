@@ -0,0 +1,157 @@
+"""Surveillance des données et rechargement en arrière-plan.
+
+Le ``DatasetWatcher`` sert toujours un jeu de données complet : quand la
+version des données change (nouveaux CSV ou nouveau bundle publié), le
+nouveau jeu est construit dans un thread d'arrière-plan pendant que l'ancien
+continue d'être servi (stale-while-revalidate), puis la référence est
+remplacée d'un coup. Un rerun lit ``current()`` une fois au début et garde
+donc un jeu cohérent jusqu'à la fin.
+
+Pour ne pas lire un fichier en cours de copie, une nouvelle version n'est
+chargée qu'une fois observée identique sur deux vérifications successives.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from food_analysis.core.dataset import Dataset
+
+logger = logging.getLogger(__name__)
+
+
+class DatasetWatcher:
+    """Jeu de données courant, rechargé en arrière-plan quand sa version change."""
+
+    def __init__(
+        self,
+        load: Callable[[], Dataset],
+        version: Callable[[], str],
+        interval_s: float = 10.0,
+    ) -> None:
+        """
+        Initialise la surveillance (sans rien charger).
+
+        Args:
+            load: Charge le jeu de données de la version courante
+            version: Retourne la version courante des données (appel peu coûteux)
+            interval_s: Intervalle entre deux vérifications (0 : pas de thread)
+        """
+        self._load = load
+        self._version = version
+        self.interval_s = interval_s
+
+        self._dataset: Optional[Dataset] = None
+        self._pending: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.refreshing = False
+        self.last_check: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def start(self) -> "DatasetWatcher":
+        """
+        Charge le jeu de données (bloquant) puis lance la surveillance.
+
+        Returns:
+            DatasetWatcher: self
+
+        Raises:
+            FileNotFoundError: Si aucune donnée n'est disponible
+        """
+        if self._dataset is None:
+            self._dataset = self._load()
+        if self.interval_s > 0 and self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="dataset-watcher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Arrête le thread de surveillance."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def current(self) -> Dataset:
+        """
+        Retourne le jeu de données à servir (jamais en cours de construction).
+
+        Returns:
+            Dataset: dernier jeu de données complètement chargé
+        """
+        if self._dataset is None:
+            self.start()
+        assert self._dataset is not None
+        return self._dataset
+
+    def check(self) -> bool:
+        """
+        Vérifie la version des données et recharge si elle a changé.
+
+        Returns:
+            bool: True si un nouveau jeu de données a été mis en service
+        """
+        if not self._lock.acquire(blocking=False):
+            return False  # rechargement déjà en cours
+        try:
+            self.last_check = time.time()
+            try:
+                version = self._version()
+            except FileNotFoundError as e:
+                # Fichier en cours de remplacement : on garde l'ancien jeu
+                self.last_error = str(e)
+                return False
+
+            if self._dataset is not None and version == self._dataset.version:
+                self._pending = None
+                return False
+            if version != self._pending:
+                self._pending = version  # à confirmer au prochain passage
+                return False
+
+            self.refreshing = True
+            start = time.perf_counter()
+            try:
+                dataset = self._load()
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.exception("Échec du rechargement des données %s", version)
+                return False
+            finally:
+                self.refreshing = False
+
+            self._dataset = dataset
+            self._pending = None
+            self.last_error = None
+            logger.info(
+                "Données %s en service (chargées en %.1f s)",
+                dataset.version,
+                time.perf_counter() - start,
+            )
+            return True
+        finally:
+            self._lock.release()
+
+    @property
+    def status(self) -> Dict[str, Any]:
+        """État de la surveillance (version servie, rechargement, erreur)."""
+        return {
+            "version": self._dataset.version if self._dataset is not None else None,
+            "pending_version": self._pending,
+            "refreshing": self.refreshing,
+            "last_check": self.last_check,
+            "last_error": self.last_error,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Erreur de la surveillance des données")
@@ -0,0 +1,666 @@
+"""Test de charge : sessions simultanées contre un serveur local.
+
+Chaque session simulée se comporte comme un onglet de navigateur : elle ouvre
+une connexion WebSocket au serveur Streamlit (protocole du front-end : un
+``BackMsg`` par rerun, des ``ForwardMsg`` jusqu'à ``script_finished``), va sur
+la page des recettes les mieux notées, puis enchaîne des actions tirées au
+hasard : changer ``m``, changer le nombre de recettes, cliquer une recette
+(rerun du fragment du tableau), changer de page et revenir.
+
+AppTest ne convient pas ici : il remplace des singletons globaux de Streamlit
+à chaque exécution et ne supporte pas plusieurs sessions simultanées dans un
+processus.
+
+Le rapport JSON donne, globalement et par action, les percentiles p50/p95/p99
+de la latence des reruns, le débit et la mémoire du serveur (RSS après le
+préchauffage, en fin de test et pic). Le scénario, le jeu de données
+synthétique et le tirage des actions sont déterminés par la graine : deux
+rapports de commits différents sont comparables (``--compare``).
+
+Usage :
+    food-analysis loadtest [--sessions N] [--actions N] [--data synthetic|raw]
+                           [--url URL] [--compare RAPPORT.json]
+
+Nécessite le paquet ``websockets`` (``pip install "food-analysis-webapp[loadtest]"``).
+"""
+
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import food_analysis
+from food_analysis.utils.config import Config
+
+# Libellés des widgets pilotés (voir app.py et pages/recipe_ratings.py)
+PAGE_RADIO_LABEL = "Sélectionnez une page :"
+RATINGS_PAGE = "🏆 Recettes les Mieux Notées"
+OTHER_PAGES = ("🏠 Accueil", "👤 Profils Utilisateurs", "🧑‍🍳 Contributeurs")
+M_SLIDER_LABEL = "Nombre minimal d'avis (m)"
+N_RECIPES_SLIDER_LABEL = "Nombre de recettes à afficher"
+
+# Actions du scénario et poids du tirage
+ACTION_WEIGHTS = {
+    "change_m": 3,
+    "change_n_recipes": 2,
+    "click_recipe": 4,
+    "navigate": 1,
+}
+M_VALUES = range(5, 101, 5)
+N_RECIPES_VALUES = range(10, 101, 10)
+
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class LoadTestConfig:
+    """Paramètres d'un test de charge (enregistrés dans le rapport)."""
+
+    sessions: int = 10
+    actions: int = 20
+    seed: int = 0
+    data: str = "synthetic"  # synthetic | raw
+    n_recipes: int = 20_000
+    n_interactions: int = 200_000
+    think_time_s: float = 0.0
+    timeout_s: float = 60.0
+    url: Optional[str] = None  # serveur existant (sinon lancé par le test)
+
+
+@dataclass
+class RerunResult:
+    """Mesure d'un rerun."""
+
+    action: str
+    latency_s: float
+    ok: bool = True
+    error: Optional[str] = None
+
+
+def write_synthetic_dataset(
+    raw_path: Path, n_recipes: int, n_interactions: int, seed: int = 0
+) -> Path:
+    """
+    Écrit des CSV au format Food.com, déterministes pour une graine donnée.
+
+    Args:
+        raw_path: Dossier de destination
+        n_recipes: Nombre de recettes
+        n_interactions: Nombre d'interactions
+        seed: Graine du générateur
+
+    Returns:
+        Path: raw_path
+    """
+    rng = np.random.default_rng(seed)
+    raw_path.mkdir(parents=True, exist_ok=True)
+
+    ids = np.arange(n_recipes) + 1
+    calories = rng.gamma(2.0, 200.0, n_recipes).round(1)
+    recipes = pd.DataFrame(
+        {
+            "name": [f"recette {i}" for i in ids],
+            "id": ids,
+            "minutes": rng.integers(5, 240, n_recipes),
+            "contributor_id": rng.integers(1, max(2, n_recipes // 10), n_recipes),
+            "submitted": pd.Timestamp("2000-01-01")
+            + pd.to_timedelta(rng.integers(0, 6500, n_recipes), unit="D"),
+            "tags": "['easy']",
+            "nutrition": [f"[{c}, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0]" for c in calories],
+            "n_steps": rng.integers(1, 30, n_recipes),
+            "steps": "['mélanger']",
+            "description": "description",
+            "ingredients": "['sel']",
+            "n_ingredients": rng.integers(1, 20, n_recipes),
+        }
+    )
+    # Popularité très inégale, comme dans les données réelles
+    popularity = rng.zipf(1.5, n_interactions) % n_recipes
+    interactions = pd.DataFrame(
+        {
+            "user_id": rng.integers(1, max(2, n_interactions // 5), n_interactions),
+            "recipe_id": ids[popularity],
+            "date": pd.Timestamp("2000-01-01")
+            + pd.to_timedelta(rng.integers(0, 6900, n_interactions), unit="D"),
+            "rating": rng.choice(
+                6, n_interactions, p=[0.05, 0.01, 0.02, 0.05, 0.17, 0.7]
+            ),
+            "review": "très bonne recette, facile à faire",
+        }
+    )
+    recipes.to_csv(raw_path / "RAW_recipes.csv", index=False)
+    interactions.to_csv(raw_path / "RAW_interactions.csv", index=False)
+    return raw_path
+
+
+def plan_actions(rng: random.Random, n_actions: int) -> List[str]:
+    """
+    Tire la suite d'actions d'une session.
+
+    Args:
+        rng: Générateur de la session
+        n_actions: Nombre d'actions
+
+    Returns:
+        List[str]: actions (clés de ACTION_WEIGHTS)
+    """
+    names = list(ACTION_WEIGHTS)
+    return rng.choices(names, weights=[ACTION_WEIGHTS[a] for a in names], k=n_actions)
+
+
+class StreamlitSession:
+    """Session Streamlit pilotée sans navigateur (un onglet simulé)."""
+
+    def __init__(self, url: str, timeout_s: float = 60.0) -> None:
+        """
+        Initialise la session (sans se connecter).
+
+        Args:
+            url: URL de l'application (http://hôte:port)
+            timeout_s: Durée maximale d'un rerun
+        """
+        self.ws_url = url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+        self.timeout_s = timeout_s
+        self.widgets: Dict[str, Tuple[str, str]] = {}  # libellé -> (id, fragment)
+        self.states: Dict[str, Any] = {}  # id -> WidgetState
+        self._types: Dict[str, str] = {}  # id -> type d'élément
+        self._ws: Any = None
+
+    async def __aenter__(self) -> "StreamlitSession":
+        import websockets
+        from websockets.typing import Subprotocol
+
+        self._ws = await websockets.connect(
+            self.ws_url, subprotocols=[Subprotocol("streamlit")], max_size=None
+        )
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self._ws.close()
+
+    def set_value(self, label: str, **value: Any) -> str:
+        """
+        Modifie la valeur d'un widget pour les reruns suivants.
+
+        Args:
+            label: Libellé (ou identifiant) du widget
+            **value: Champ de WidgetState (ex. string_value="...")
+
+        Returns:
+            str: fragment du widget ("" hors fragment)
+        """
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        widget_id, fragment_id = self.widgets[label]
+        state = WidgetState(id=widget_id)
+        for name, val in value.items():
+            if name == "double_array_value":
+                state.double_array_value.data.extend(val)
+            else:
+                setattr(state, name, val)
+        self.states[widget_id] = state
+        return fragment_id
+
+    def widget_of_type(self, element_type: str) -> Optional[str]:
+        """Libellé du premier widget d'un type (ex. "dataframe")."""
+        for label, (widget_id, _) in self.widgets.items():
+            if self._types.get(widget_id) == element_type:
+                return label
+        return None
+
+    async def rerun(self, action: str, fragment_id: str = "") -> RerunResult:
+        """
+        Envoie un rerun avec l'état courant des widgets et attend sa fin.
+
+        Args:
+            action: Nom de l'action mesurée
+            fragment_id: Fragment à réexécuter ("" : script complet)
+
+        Returns:
+            RerunResult: latence et erreur éventuelle
+        """
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+
+        msg = BackMsg()
+        client_state = msg.rerun_script
+        client_state.query_string = ""
+        client_state.page_script_hash = ""
+        if fragment_id:
+            client_state.fragment_id = fragment_id
+        client_state.widget_states.widgets.extend(self.states.values())
+
+        start = time.perf_counter()
+        try:
+            await self._ws.send(msg.SerializeToString())
+            error = await asyncio.wait_for(self._receive_run(), self.timeout_s)
+        except asyncio.TimeoutError:
+            error = f"délai de {self.timeout_s:.0f} s dépassé"
+        return RerunResult(action, time.perf_counter() - start, error is None, error)
+
+    async def _receive_run(self) -> Optional[str]:
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        error: Optional[str] = None
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(await self._ws.recv())
+            kind = msg.WhichOneof("type")
+            if kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type is None:
+                    continue
+                inner = getattr(element, element_type)
+                if element_type == "exception":
+                    error = error or inner.message
+                widget_id = getattr(inner, "id", "")
+                if widget_id:
+                    label = getattr(inner, "label", "") or widget_id
+                    self.widgets[label] = (widget_id, msg.delta.fragment_id)
+                    self._types[widget_id] = element_type
+            elif kind == "script_finished":
+                if msg.script_finished not in (
+                    ForwardMsg.FINISHED_SUCCESSFULLY,
+                    ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY,
+                ):
+                    error = error or ForwardMsg.ScriptFinishedStatus.Name(
+                        msg.script_finished
+                    )
+                return error
+
+
+async def run_session(
+    url: str, config: LoadTestConfig, session_seed: int
+) -> List[RerunResult]:
+    """
+    Exécute le scénario d'une session.
+
+    Args:
+        url: URL de l'application
+        config: Paramètres du test
+        session_seed: Graine propre à la session
+
+    Returns:
+        List[RerunResult]: mesures de chaque rerun
+    """
+    rng = random.Random(session_seed)
+    results: List[RerunResult] = []
+    n_recipes = 20
+
+    async with StreamlitSession(url, timeout_s=config.timeout_s) as session:
+        results.append(await session.rerun("load"))
+        session.set_value(PAGE_RADIO_LABEL, string_value=RATINGS_PAGE)
+        results.append(await session.rerun("navigate"))
+
+        for action in plan_actions(rng, config.actions):
+            if config.think_time_s:
+                await asyncio.sleep(config.think_time_s)
+            if action == "change_m":
+                session.set_value(
+                    M_SLIDER_LABEL, double_array_value=[rng.choice(M_VALUES)]
+                )
+                results.append(await session.rerun(action))
+            elif action == "change_n_recipes":
+                n_recipes = rng.choice(N_RECIPES_VALUES)
+                session.set_value(
+                    N_RECIPES_SLIDER_LABEL, double_array_value=[n_recipes]
+                )
+                results.append(await session.rerun(action))
+            elif action == "click_recipe":
+                table = session.widget_of_type("dataframe")
+                if table is None:
+                    results.append(RerunResult(action, 0.0, False, "tableau absent"))
+                    continue
+                selection = {"rows": [rng.randrange(n_recipes)], "columns": []}
+                fragment_id = session.set_value(
+                    table, string_value=json.dumps({"selection": selection})
+                )
+                results.append(await session.rerun(action, fragment_id=fragment_id))
+            else:
+                session.set_value(
+                    PAGE_RADIO_LABEL, string_value=rng.choice(OTHER_PAGES)
+                )
+                results.append(await session.rerun(action))
+                session.set_value(PAGE_RADIO_LABEL, string_value=RATINGS_PAGE)
+                results.append(await session.rerun(action))
+    return results
+
+
+def summarize(latencies: List[float]) -> Dict[str, Any]:
+    """
+    Résume des latences (en secondes) en millisecondes.
+
+    Args:
+        latencies: Latences mesurées
+
+    Returns:
+        Dict[str, Any]: count, mean, p50, p95, p99 et max (ms)
+    """
+    if not latencies:
+        return {"count": 0}
+    values = np.asarray(latencies) * 1000
+    summary: Dict[str, Any] = {
+        "count": len(values),
+        "mean": round(float(values.mean()), 2),
+    }
+    for p in PERCENTILES:
+        summary[f"p{p}"] = round(float(np.percentile(values, p)), 2)
+    summary["max"] = round(float(values.max()), 2)
+    return summary
+
+
+def process_memory(pid: int) -> Dict[str, Optional[int]]:
+    """
+    Lit la mémoire résidente d'un processus (Linux, /proc).
+
+    Args:
+        pid: Identifiant du processus
+
+    Returns:
+        Dict[str, Optional[int]]: rss et peak en octets (None si indisponible)
+    """
+    memory: Dict[str, Optional[int]] = {"rss": None, "peak": None}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    memory["rss"] = int(line.split()[1]) * 1024
+                elif line.startswith("VmHWM:"):
+                    memory["peak"] = int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return memory
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return int(s.getsockname()[1])
+
+
+def _wait_ready(health_url: str, process: subprocess.Popen, timeout_s: float) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Le serveur s'est arrêté (code {process.returncode})")
+        try:
+            with urllib.request.urlopen(health_url, timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"Serveur non prêt après {timeout_s:.0f} s")
+
+
+def start_server(
+    raw_path: Path, processed_path: Path, timeout_s: float = 300.0
+) -> Tuple[subprocess.Popen, str]:
+    """
+    Lance ``food-analysis serve`` dans un sous-processus et attend qu'il soit prêt.
+
+    Args:
+        raw_path: Dossier des CSV
+        processed_path: Dossier des bundles
+        timeout_s: Attente maximale du préchauffage
+
+    Returns:
+        Tuple[subprocess.Popen, str]: processus et URL de l'application
+    """
+    port, health_port = _free_port(), _free_port()
+    src_path = str(Path(food_analysis.__file__).resolve().parents[1])
+    env = dict(os.environ)
+    env.update(
+        {
+            "PYTHONPATH": os.pathsep.join(
+                filter(None, [src_path, env.get("PYTHONPATH")])
+            ),
+            "DATA_MODE": "raw",
+            "DATA_RAW_PATH": str(raw_path),
+            "DATA_PROCESSED_PATH": str(processed_path),
+            "DATA_WATCH_INTERVAL_S": "0",
+            "HEALTH_PORT": str(health_port),
+        }
+    )
+    command = [
+        sys.executable,
+        "-m",
+        "food_analysis.cli",
+        "serve",
+        "--server.port",
+        str(port),
+        "--server.address",
+        "127.0.0.1",
+        "--server.headless",
+        "true",
+        "--browser.gatherUsageStats",
+        "false",
+    ]
+    process = subprocess.Popen(
+        command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        # Les sondes peuvent répondre avant que Streamlit écoute sur son port
+        _wait_ready(f"http://127.0.0.1:{health_port}/ready", process, timeout_s)
+        _wait_ready(f"{url}/_stcore/health", process, timeout_s)
+    except BaseException:
+        process.terminate()
+        process.wait()
+        raise
+    return process, url
+
+
+async def _run_sessions(url: str, config: LoadTestConfig) -> List[RerunResult]:
+    sessions = [
+        run_session(url, config, session_seed=config.seed * 10_000 + i)
+        for i in range(config.sessions)
+    ]
+    results: List[RerunResult] = []
+    for session_results in await asyncio.gather(*sessions):
+        results.extend(session_results)
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(food_analysis.__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_load_test(config: LoadTestConfig) -> Dict[str, Any]:
+    """
+    Exécute un test de charge et retourne son rapport.
+
+    Sans ``config.url``, un serveur est lancé sur le jeu de données choisi
+    (synthétique généré dans un dossier temporaire, ou DATA_RAW_PATH) et
+    arrêté à la fin ; sa mémoire est alors mesurée.
+
+    Args:
+        config: Paramètres du test
+
+    Returns:
+        Dict[str, Any]: rapport (meta, config, results, memory)
+    """
+    process: Optional[subprocess.Popen] = None
+    with tempfile.TemporaryDirectory(prefix="food-analysis-loadtest-") as tmp:
+        url = config.url
+        if url is None:
+            raw_path = Config.DATA_RAW_PATH
+            if config.data == "synthetic":
+                raw_path = write_synthetic_dataset(
+                    Path(tmp) / "raw",
+                    config.n_recipes,
+                    config.n_interactions,
+                    config.seed,
+                )
+            process, url = start_server(raw_path, Path(tmp) / "processed")
+
+        try:
+            memory_start = process_memory(process.pid) if process else {}
+            start = time.perf_counter()
+            results = asyncio.run(_run_sessions(url, config))
+            wall_s = time.perf_counter() - start
+            memory_end = process_memory(process.pid) if process else {}
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    ok = [r for r in results if r.ok]
+    by_action = {
+        action: summarize([r.latency_s for r in ok if r.action == action])
+        for action in ["load", *ACTION_WEIGHTS]
+    }
+    errors = [r.error for r in results if not r.ok]
+    rss_start, rss_end = memory_start.get("rss"), memory_end.get("rss")
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "pandas": pd.__version__,
+        },
+        "config": asdict(config),
+        "results": {
+            "reruns": len(results),
+            "errors": len(errors),
+            "error_samples": sorted(set(filter(None, errors)))[:5],
+            "wall_s": round(wall_s, 3),
+            "throughput_rps": round(len(ok) / wall_s, 2) if wall_s else None,
+            "latency_ms": summarize([r.latency_s for r in ok]),
+            "by_action": by_action,
+        },
+        "memory": {
+            "rss_start": rss_start,
+            "rss_end": rss_end,
+            "rss_peak": memory_end.get("peak"),
+            "growth": rss_end - rss_start
+            if rss_start is not None and rss_end is not None
+            else None,
+        },
+    }
+
+
+# Indicateurs comparés entre deux rapports : (chemin, plus petit = mieux)
+COMPARED_METRICS: List[Tuple[Tuple[str, ...], bool]] = [
+    (("results", "latency_ms", "p50"), True),
+    (("results", "latency_ms", "p95"), True),
+    (("results", "latency_ms", "p99"), True),
+    (("results", "throughput_rps"), False),
+    (("results", "errors"), True),
+    (("memory", "rss_peak"), True),
+    (("memory", "growth"), True),
+]
+
+
+def compare_reports(
+    report: Dict[str, Any], baseline: Dict[str, Any]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Compare un rapport à un rapport de référence.
+
+    Args:
+        report: Rapport courant
+        baseline: Rapport de référence (autre commit, mêmes paramètres)
+
+    Returns:
+        Dict[str, Dict[str, Any]]: par indicateur, baseline, current, change_pct
+        et better (None si non comparable)
+    """
+
+    def lookup(data: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+        for key in path:
+            data = data.get(key) if isinstance(data, dict) else None  # type: ignore[assignment]
+        return data
+
+    comparison: Dict[str, Dict[str, Any]] = {}
+    for path, lower_is_better in COMPARED_METRICS:
+        before, after = lookup(baseline, path), lookup(report, path)
+        change = None
+        if before and after is not None:
+            change = round((after - before) / abs(before) * 100, 1)
+        better = None
+        if before is not None and after is not None and after != before:
+            better = (after < before) == lower_is_better
+        comparison[".".join(path[1:])] = {
+            "baseline": before,
+            "current": after,
+            "change_pct": change,
+            "better": better,
+        }
+    if baseline.get("config") != report.get("config"):
+        comparison["config"] = {
+            "baseline": baseline.get("config"),
+            "current": report.get("config"),
+        }
+    return comparison
+
+
+def write_report(report: Dict[str, Any], out_dir: Path) -> Path:
+    """
+    Enregistre le rapport en JSON.
+
+    Args:
+        report: Rapport de run_load_test
+        out_dir: Dossier de destination
+
+    Returns:
+        Path: fichier écrit (loadtest-<commit>-<horodatage>.json)
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    path = out_dir / f"loadtest-{report['meta']['commit'] or 'local'}-{stamp}.json"
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    return path
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Résumé lisible d'un rapport (une ligne par action)."""
+    results = report["results"]
+    lines = [
+        f"{report['config']['sessions']} sessions × {report['config']['actions']} "
+        f"actions : {results['reruns']} reruns, {results['errors']} erreurs, "
+        f"{results['throughput_rps']} reruns/s",
+        f"{'action':<18}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}  (ms)",
+    ]
+    for action, stats in [
+        ("total", results["latency_ms"]),
+        *results["by_action"].items(),
+    ]:
+        if stats.get("count"):
+            lines.append(
+                f"{action:<18}{stats['count']:>6}{stats['p50']:>10.1f}"
+                f"{stats['p95']:>10.1f}{stats['p99']:>10.1f}"
+            )
+    memory = report["memory"]
+    if memory.get("rss_end") is not None:
+        lines.append(
+            f"Mémoire du serveur : {memory['rss_end'] / 1e6:.0f} Mo "
+            f"(pic {memory['rss_peak'] / 1e6:.0f} Mo, "
+            f"croissance {memory['growth'] / 1e6:+.1f} Mo)"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,163 @@
+# mypy: disable-error-code="attr-defined"
+
+import streamlit as st
+
+from food_analysis.core.dataset import Dataset
+
+# Critères de tri du classement (libellé -> colonne)
+SORT_OPTIONS = {
+    "Recettes publiées": "n_recipes",
+    "Avis reçus": "n_reviews",
+    "Note pondérée moyenne": "mean_weighted_rating",
+}
+
+
+def show_contributors_page(dataset: Dataset) -> None:
+    """
+    Affiche le classement des contributeurs de recettes.
+
+    Args:
+        dataset: Jeu de données servi
+    """
+    st.header("🧑‍🍳 Contributeurs")
+
+    if dataset.contributor_index is None:
+        st.warning("La colonne contributor_id est absente des recettes.")
+        return
+
+    # === SIDEBAR : Paramètres ===
+    with st.sidebar:
+        st.subheader("⚙️ Paramètres")
+
+        m = st.slider(
+            "Nombre minimal d'avis (m)",
+            min_value=5,
+            max_value=100,
+            value=10,
+            step=5,
+            key="contributors_m",
+            help="Paramètre de pondération bayésienne des notes des recettes",
+        )
+        sort_label = st.selectbox(
+            "Trier par", options=list(SORT_OPTIONS), key="contributors_sort"
+        )
+        min_recipes = st.number_input(
+            "Nombre minimal de recettes",
+            min_value=1,
+            value=5,
+            step=1,
+            key="contributors_min_recipes",
+        )
+        n_contributors = st.slider(
+            "Nombre de contributeurs à afficher",
+            min_value=10,
+            max_value=100,
+            value=20,
+            step=10,
+            key="contributors_n",
+        )
+
+    with st.spinner("Calcul des statistiques des contributeurs..."):
+        contributor_stats = dataset.contributor_stats(m)
+
+    sort_column = SORT_OPTIONS[sort_label or next(iter(SORT_OPTIONS))]
+    eligible = contributor_stats[contributor_stats["n_recipes"] >= min_recipes]
+    leaderboard = eligible.nlargest(int(n_contributors), sort_column)
+
+    # === MÉTRIQUES GLOBALES ===
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.metric("Contributeurs", f"{len(contributor_stats):,}")
+
+    with col2:
+        st.metric(
+            "Recettes par Contributeur",
+            f"{contributor_stats['n_recipes'].mean():.1f}",
+        )
+
+    with col3:
+        st.metric(
+            "Contributeurs Affichés",
+            f"{len(leaderboard)}",
+            help=f"Parmi ceux ayant publié au moins {min_recipes} recettes",
+        )
+
+    if leaderboard.empty:
+        st.warning("Aucun contributeur ne correspond aux critères.")
+        return
+
+    st.markdown("---")
+
+    # === CLASSEMENT ===
+    st.subheader("📋 Classement des Contributeurs")
+    display_df = leaderboard.reset_index(drop=True)
+    display_df.insert(0, "rank", range(1, len(display_df) + 1))
+
+    event = st.dataframe(
+        display_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "rank": st.column_config.NumberColumn("Rang", width="small"),
+            "contributor_id": st.column_config.NumberColumn(
+                "Contributeur", format="%d"
+            ),
+            "n_recipes": st.column_config.NumberColumn("Recettes", format="%d 🍳"),
+            "n_reviews": st.column_config.NumberColumn("Avis Reçus", format="%d 💬"),
+            "mean_weighted_rating": st.column_config.NumberColumn(
+                "Note Pondérée Moyenne", format="%.2f ⭐"
+            ),
+            "first_submitted": st.column_config.DateColumn("Première Recette"),
+            "last_submitted": st.column_config.DateColumn("Dernière Recette"),
+        },
+        on_select="rerun",
+        selection_mode="single-row",
+        key="contributor_table",
+    )
+
+    try:
+        selected_idx = event.selection.rows[0]  # type: ignore[attr-defined]
+    except (AttributeError, IndexError, TypeError):
+        selected_idx = 0
+    contributor_id = display_df.iloc[selected_idx]["contributor_id"]
+
+    st.markdown("---")
+    show_contributor_recipes(contributor_id, dataset, m=m)
+
+
+def show_contributor_recipes(
+    contributor_id: int, dataset: Dataset, m: int = 10
+) -> None:
+    """
+    Affiche les recettes d'un contributeur, triées par note pondérée.
+
+    Args:
+        contributor_id: ID du contributeur
+        dataset: Jeu de données servi
+        m: Paramètre de pondération
+    """
+    st.markdown(f"### 🧑‍🍳 Contributeur {contributor_id}")
+
+    assert dataset.contributor_index is not None
+    rows = dataset.contributor_index.rows(contributor_id)
+    recipes = dataset.recipes.iloc[rows][["id", "name"]]
+
+    recipe_stats = dataset.weighted_recipe_stats(m)
+    recipes = recipes.merge(
+        recipe_stats, left_on="id", right_on="recipe_id", how="left"
+    ).sort_values("weighted_rating", ascending=False, na_position="last")
+
+    st.dataframe(
+        recipes[["name", "n_reviews", "avg_rating", "weighted_rating"]],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "name": st.column_config.TextColumn("Recette", width="large"),
+            "n_reviews": st.column_config.NumberColumn("Avis", format="%d 💬"),
+            "avg_rating": st.column_config.NumberColumn("Note Moyenne", format="%.2f"),
+            "weighted_rating": st.column_config.NumberColumn(
+                "Note Pondérée", format="%.2f ⭐"
+            ),
+        },
+    )
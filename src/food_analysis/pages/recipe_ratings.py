@@ -1,22 +1,121 @@
 # mypy: disable-error-code="attr-defined"
 
+import io
+from concurrent.futures import CancelledError, wait
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
 import pandas as pd
-import plotly.express as px  # type: ignore[import-untyped]
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from food_analysis.core.analyzer import ApproximateRanking, DataAnalyzer
+from food_analysis.core.dataset import Dataset
+from food_analysis.core.export import EXPORT_FORMATS, frame_chunks, iter_export
+from food_analysis.core.range_index import NumericRangeIndex, RangeFilter
+from food_analysis.core.rating_buckets import MonthlyRatingBuckets, month_label
+from food_analysis.utils.config import Config
+from food_analysis.utils.fragments import fragment
+from food_analysis.utils.lazy_import import lazy_module
+
+# plotly n'est importé qu'au premier graphique de distribution
+px = lazy_module("plotly.express")
+
+# Filtres "valeur maximale" proposés dans la sidebar (colonne indexée -> libellé)
+RANGE_FILTER_LABELS = {
+    "minutes": "⏱️ Temps maximum (min)",
+    "calories": "🔥 Calories maximum",
+    "n_ingredients": "🥕 Ingrédients maximum",
+    "n_steps": "📝 Étapes maximum",
+}
+
+# Périodes prédéfinies (nombre de mois jusqu'au dernier mois des données)
+PERIOD_PRESETS: Dict[str, Optional[int]] = {
+    "Toutes les périodes": None,
+    "12 derniers mois": 12,
+    "2 dernières années": 24,
+    "5 dernières années": 60,
+}
+CUSTOM_PERIOD = "Personnalisée"
+
+# Nombre maximal de points du graphique d'évolution d'une recette
+TREND_MAX_POINTS = 60
+
+
+def show_period_filter(
+    buckets: MonthlyRatingBuckets, key: str = "period"
+) -> Optional[Tuple[int, int]]:
+    """
+    Affiche le choix de la période des avis pris en compte dans le classement.
 
-# Import temporaire (à changer quand les fonctions seront dans analyzer)
-from food_analysis.core.note_et_avis import compute_recipe_stats, recipe_reviews
+    Args:
+        buckets: Seaux mensuels des notes
+        key: Préfixe des clés des widgets (un par page)
 
+    Returns:
+        Optional[Tuple[int, int]]: (premier mois, dernier mois) inclus, ou None
+        pour toutes les périodes
+    """
+    first_month, last_month = buckets.month_range
+    choice = st.selectbox(
+        "📅 Période des avis",
+        options=[*PERIOD_PRESETS, CUSTOM_PERIOD],
+        index=0,
+        key=f"{key}_preset",
+    )
 
-def show_recipe_ratings_page(
-    recipe_df: pd.DataFrame, interaction_df: pd.DataFrame
-) -> None:
+    if choice == CUSTOM_PERIOD:
+        start, end = st.select_slider(
+            "Mois",
+            options=list(range(first_month, last_month + 1)),
+            value=(first_month, last_month),
+            format_func=month_label,
+            key=f"{key}_custom",
+        )
+        if (start, end) == (first_month, last_month):
+            return None
+        return (int(start), int(end))
+
+    if choice is None:
+        return None
+    n_months = PERIOD_PRESETS.get(choice)
+    if n_months is None:
+        return None
+    return (last_month - n_months + 1, last_month)
+
+
+def show_range_filters(range_index: NumericRangeIndex) -> Dict[str, RangeFilter]:
+    """
+    Affiche les filtres numériques disponibles et retourne les plages choisies.
+
+    Args:
+        range_index: Index de plages des recettes
+
+    Returns:
+        Dict[str, RangeFilter]: {colonne: (None, max)} pour les filtres renseignés
+    """
+    filters: Dict[str, RangeFilter] = {}
+    for column, label in RANGE_FILTER_LABELS.items():
+        if column not in range_index.columns:
+            continue
+        max_value = st.number_input(
+            label,
+            min_value=0,
+            value=None,
+            step=5,
+            key=f"range_filter_{column}",
+            help="Laisser vide pour ne pas filtrer",
+        )
+        if max_value is not None:
+            filters[column] = (None, float(max_value))
+    return filters
+
+
+def show_recipe_ratings_page(dataset: Dataset) -> None:
     """
     Affiche la page des recettes les mieux notées.
 
     Args:
-        recipe_df: DataFrame des recettes
-        interaction_df: DataFrame des interactions
+        dataset: Jeu de données servi
     """
     st.header("🏆 Recettes les Mieux Notées")
 
@@ -43,16 +142,58 @@ def show_recipe_ratings_page(
             step=10,
         )
 
-    # === CALCUL DES STATISTIQUES ===
-    with st.spinner("Calcul des statistiques des recettes..."):
-        recipe_stats = compute_recipe_stats(recipe_df, interaction_df, m=m)
+        # Filtres par plage (temps, calories, ...) résolus via l'index trié
+        range_index = dataset.range_index
+        if range_index.columns:
+            with st.expander("🔎 Filtres", expanded=False):
+                filters = show_range_filters(range_index)
+        else:
+            filters = {}
+
+        # Période des avis, résolue par différence de sommes cumulées mensuelles
+        rating_buckets = dataset.rating_buckets
+        period = show_period_filter(rating_buckets) if len(rating_buckets) else None
+
+        # Recettes quasi identiques (food-analysis dedup) : leurs avis peuvent
+        # être comptés ensemble, sur la recette du groupe qui en a le plus
+        duplicate_groups = dataset.duplicate_groups
+        merge_duplicates = duplicate_groups is not None and st.checkbox(
+            "🔗 Fusionner les recettes en double",
+            value=False,
+            key="merge_duplicates",
+            help=(
+                f"{duplicate_groups.n_recipes:,} recettes quasi identiques en "
+                f"{len(duplicate_groups):,} groupes : les avis de chaque groupe "
+                "sont attribués à la recette qui en a le plus"
+            ),
+        )
+        if duplicate_groups is None:
+            st.caption(
+                "🔗 Fusion des recettes en double indisponible : construisez le "
+                "bundle avec `food-analysis precompute --dedup` (ou "
+                "`food-analysis dedup`), puis redémarrez l'application."
+            )
 
-        if recipe_stats.empty or "weighted_rating" not in recipe_stats.columns:
-            st.error("Impossible de calculer les statistiques de recette.")
-            return
+    recipe_ids = range_index.filter(filters)
+    if recipe_ids is not None and len(recipe_ids) == 0:
+        st.warning("Aucune recette ne correspond aux filtres sélectionnés.")
+        return
 
-        # Garder seulement les N premières
-        top_recipes = recipe_stats.head(n_recipes)
+    # === CALCUL DES STATISTIQUES ===
+    # Classement calculé par l'analyseur du jeu de données, partagé entre les
+    # sessions pour une même version des données
+    analyzer = dataset.analyzer
+    top_recipes = compute_ranking(
+        analyzer,
+        m=m,
+        n_recipes=n_recipes,
+        filters=filters,
+        period=period,
+        merge_duplicates=merge_duplicates,
+    )
+    if top_recipes.empty or "weighted_rating" not in top_recipes.columns:
+        st.error("Impossible de calculer les statistiques de recette.")
+        return
 
     # === MÉTRIQUES GLOBALES ===
     col1, col2, col3, col4 = st.columns(4)
@@ -60,15 +201,17 @@ def show_recipe_ratings_page(
     with col1:
         st.metric(
             "Total Recettes",
-            f"{len(recipe_df):,}",
+            f"{len(dataset.recipes):,}",
             help="Nombre total de recettes dans la base",
         )
 
     with col2:
-        st.metric("Total Avis", f"{len(interaction_df):,}", help="Nombre total d'avis")
+        st.metric(
+            "Total Avis", f"{len(dataset.interactions):,}", help="Nombre total d'avis"
+        )
 
     with col3:
-        avg_rating = interaction_df[interaction_df["rating"] > 0]["rating"].mean()
+        avg_rating = analyzer.get_average_rating()
         st.metric(
             "Note Moyenne Globale",
             f"{avg_rating:.2f}/5",
@@ -84,7 +227,197 @@ def show_recipe_ratings_page(
 
     st.markdown("---")
 
+    # === EXPORT DU CLASSEMENT COMPLET ===
+    with st.expander("📥 Exporter le classement complet", expanded=False):
+        st.caption(
+            f"Toutes les recettes retenues par les filtres et la période, classées "
+            f"avec m = {m}. Le fichier est généré au clic."
+        )
+        show_download_buttons(
+            "Classement",
+            f"classement_m{m}",
+            lambda fmt: iter_export(
+                frame_chunks(
+                    analyzer.get_full_ranking(
+                        m=m,
+                        filters=filters,
+                        period=period,
+                        merge_duplicates=merge_duplicates,
+                    )
+                ),
+                fmt,
+            ),
+            key="export_ranking",
+        )
+
     # === TABLEAU INTERACTIF DES RECETTES ===
+    # Fragment : un clic sur une ligne ne relance pas le calcul du classement
+    show_ranking_table(top_recipes, dataset)
+
+
+def compute_ranking(
+    analyzer: DataAnalyzer,
+    m: int,
+    n_recipes: int,
+    filters: Dict[str, RangeFilter],
+    period: Optional[Tuple[int, int]],
+    merge_duplicates: bool = False,
+) -> pd.DataFrame:
+    """
+    Calcule le classement exact, en affichant un classement approché s'il tarde.
+
+    Le classement exact est calculé en arrière-plan. S'il n'est pas prêt après
+    Config.PROGRESSIVE_RANKING_DELAY_S, un classement approché (voir
+    DataAnalyzer.get_approximate_ranking) est affiché à sa place, puis effacé
+    dès que le classement exact est disponible. Un calcul encore en attente est
+    annulé si la session relance la page avec d'autres paramètres.
+
+    Args:
+        analyzer: Analyseur du jeu de données
+        m: Nombre minimal d'avis pour la pondération
+        n_recipes: Nombre de recettes à afficher
+        filters: Filtres par plage sur les recettes
+        period: (premier mois, dernier mois) des avis pris en compte, ou None
+        merge_duplicates: Regroupe les avis des recettes en double
+
+    Returns:
+        pd.DataFrame: classement exact (DataAnalyzer.get_ranking)
+    """
+    params: Dict[str, Any] = {
+        "m": m,
+        "n_recipes": n_recipes,
+        "filters": filters,
+        "period": period,
+        "merge_duplicates": merge_duplicates,
+    }
+    if not Config.PROGRESSIVE_RANKING:
+        with st.spinner("Calcul des statistiques des recettes..."):
+            return analyzer.get_ranking(**params)
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    future = analyzer.submit_ranking(
+        **params, session_key=None if ctx is None else ctx.session_id
+    )
+    try:
+        done, _ = wait([future], timeout=Config.PROGRESSIVE_RANKING_DELAY_S)
+        if done:
+            return future.result()
+
+        placeholder = st.empty()
+        approximate = analyzer.get_approximate_ranking(**params)
+        if approximate is not None:
+            with placeholder.container():
+                show_approximate_ranking(approximate)
+        with st.spinner("Calcul du classement exact..."):
+            top_recipes = future.result()
+        placeholder.empty()
+        return top_recipes
+    except CancelledError:
+        # Remplacé par le calcul d'un rerun plus récent de la session
+        st.stop()
+
+
+def show_approximate_ranking(approximate: ApproximateRanking) -> None:
+    """
+    Affiche un classement approché, non cliquable, en attendant l'exact.
+
+    Args:
+        approximate: Classement approché (DataAnalyzer.get_approximate_ranking)
+    """
+    if approximate.source == "stale":
+        source = "calculé sur la version précédente des données"
+    else:
+        source = (
+            f"estimé sur un échantillon de {approximate.sample_fraction:.1%} des avis"
+        )
+    st.warning(
+        f"⏳ Classement approximatif ({source}). Il sera remplacé par le "
+        "classement exact dès la fin du calcul."
+    )
+
+    ranking = approximate.ranking
+    st.dataframe(
+        pd.DataFrame(
+            {
+                "rank": range(1, len(ranking) + 1),
+                "name": ranking["name"],
+                "weighted_rating": ranking["weighted_rating"].round(2),
+                "n_reviews": ranking["n_reviews"],
+            }
+        ),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "rank": st.column_config.NumberColumn("Rang", width="small"),
+            "name": st.column_config.TextColumn("Nom de la Recette", width="large"),
+            "weighted_rating": st.column_config.NumberColumn(
+                "Note Pondérée (approx.)", format="%.2f ⭐"
+            ),
+            "n_reviews": st.column_config.NumberColumn(
+                "Nombre d'Avis (approx.)", format="%d 💬"
+            ),
+        },
+    )
+
+
+def show_download_buttons(
+    label: str,
+    file_stem: str,
+    export: Callable[[str], Iterator[bytes]],
+    key: str,
+) -> None:
+    """
+    Affiche un bouton de téléchargement par format d'export.
+
+    Le fichier n'est généré qu'au clic (hors du script de la page), morceau
+    par morceau : seul le fichier produit est gardé en mémoire, jamais une
+    copie formatée de la table entière.
+
+    Args:
+        label: Libellé des boutons
+        file_stem: Nom du fichier téléchargé, sans extension
+        export: Fonction format -> morceaux du fichier (voir core/export.py)
+        key: Préfixe des clés des boutons
+    """
+    columns = st.columns(len(EXPORT_FORMATS))
+    for column, (fmt, mime) in zip(columns, EXPORT_FORMATS.items()):
+        with column:
+            st.download_button(
+                f"📥 {label} ({fmt.upper()})",
+                data=_deferred_download(export, fmt),
+                file_name=f"{file_stem}.{fmt}",
+                mime=mime,
+                on_click="ignore",
+                key=f"{key}_{fmt}",
+            )
+
+
+def _deferred_download(
+    export: Callable[[str], Iterator[bytes]], fmt: str
+) -> Callable[[], io.BytesIO]:
+    """Génération au clic du fichier d'un bouton de téléchargement."""
+
+    def build() -> io.BytesIO:
+        buffer = io.BytesIO()
+        for part in export(fmt):
+            buffer.write(part)
+        return buffer
+
+    return build
+
+
+@fragment
+def show_ranking_table(top_recipes: pd.DataFrame, dataset: Dataset) -> None:
+    """
+    Affiche le tableau cliquable des recettes et les détails de la sélection.
+
+    Exécuté comme fragment : la sélection d'une ligne ne ré-exécute que ce bloc,
+    avec le classement calculé lors du dernier passage complet.
+
+    Args:
+        top_recipes: Recettes classées à afficher
+        dataset: Jeu de données servi
+    """
     st.subheader("📋 Top Recettes")
     st.caption("👆 Cliquez sur une ligne pour voir les détails et les avis")
 
@@ -142,53 +475,32 @@ def show_recipe_ratings_page(
     )
 
     # === AFFICHAGE DES DÉTAILS ===
-    # Vérifier s'il y a une sélection
-    selected_recipe_name: str
-
-    # Gestion de la sélection avec vérification de type
+    # Ligne sélectionnée, sinon la première recette du classement
     try:
-        # Type ignore car streamlit peut ne pas avoir les types à jour
-        if (
-            hasattr(event, "selection")
-            and hasattr(event.selection, "rows")
-            and event.selection.rows
-        ):  # type: ignore[attr-defined]
-            # Une ligne a été cliquée
-            selected_idx = event.selection.rows[0]  # type: ignore[attr-defined]
-            selected_recipe_name = str(display_df_show.iloc[selected_idx]["name"])
-        else:
-            # Aucune sélection : afficher la première recette par défaut
-            selected_recipe_name = str(display_df_show.iloc[0]["name"])
-    except (AttributeError, IndexError, KeyError):
-        # En cas d'erreur, afficher la première recette
-        selected_recipe_name = str(display_df_show.iloc[0]["name"])
-
-    if selected_recipe_name:
-        # Récupérer les infos de la recette sélectionnée
-        selected_recipe = top_recipes[top_recipes["name"] == selected_recipe_name].iloc[
-            0
-        ]
-
-        # Trouver l'ID de la recette dans recipe_df
-        recipe_id = recipe_df[recipe_df["name"] == selected_recipe_name]["id"].values[0]
-
-        # Afficher les détails de la recette
-        st.markdown("---")
-        show_recipe_details(
-            recipe_id=recipe_id,  # type: ignore[arg-type]
-            recipe_name=selected_recipe_name,
-            recipe_stats=selected_recipe,
-            recipe_df=recipe_df,
-            interaction_df=interaction_df,
-        )
+        selected_idx = event.selection.rows[0]  # type: ignore[attr-defined]
+    except (AttributeError, IndexError, TypeError):
+        selected_idx = 0
+
+    # La recette est identifiée par son ID : plusieurs recettes peuvent porter
+    # le même nom (ou aucun)
+    selected_recipe = top_recipes.iloc[selected_idx]
+    recipe_id = int(selected_recipe["recipe_id"])
+    name = selected_recipe["name"]
+
+    st.markdown("---")
+    show_recipe_details(
+        recipe_id=recipe_id,
+        recipe_name=str(name) if pd.notna(name) else f"Recette {recipe_id}",
+        recipe_stats=selected_recipe,
+        dataset=dataset,
+    )
 
 
 def show_recipe_details(
     recipe_id: int,
     recipe_name: str,
     recipe_stats: pd.Series,
-    recipe_df: pd.DataFrame,
-    interaction_df: pd.DataFrame,
+    dataset: Dataset,
 ) -> None:
     """
     Affiche les détails d'une recette sélectionnée.
@@ -197,161 +509,233 @@ def show_recipe_details(
         recipe_id: ID de la recette
         recipe_name: Nom de la recette
         recipe_stats: Statistiques de la recette (Series)
-        recipe_df: DataFrame des recettes
-        interaction_df: DataFrame des interactions
+        dataset: Jeu de données servi
     """
+    analyzer = dataset.analyzer
+
     # Container pour les détails
     with st.container():
-        st.markdown(f"### 🍳 {recipe_name}")
+        show_recipe_header(recipe_name, recipe_stats, analyzer.get_recipe(recipe_id))
 
-        # Informations de la recette depuis recipe_df
-        recipe_info = recipe_df[recipe_df["id"] == recipe_id].iloc[0]
+        # === AVIS ET COMMENTAIRES ===
+        st.subheader("💬 Avis et Commentaires")
 
-        # === INFORMATIONS PRINCIPALES ===
-        col1, col2, col3, col4 = st.columns(4)
+        # Récupérer les avis (tranche de l'index par recette)
+        reviews = analyzer.get_recipe_reviews(recipe_id)
 
-        with col1:
-            st.metric(
-                "⭐ Note Pondérée",
-                f"{recipe_stats['weighted_rating']:.2f}",
-                help="Note pondérée bayésienne - métrique principale",
-            )
+        if len(reviews) == 0:
+            st.warning("Aucun avis disponible pour cette recette.")
+            return
 
-        with col2:
-            st.metric(
-                "Note Moyenne Brute",
-                f"{recipe_stats['avg_rating']:.2f}",
-                help="Moyenne arithmétique simple des notes",
-            )
+        # Chaque section est un fragment : changer un filtre d'avis ne
+        # ré-exécute que la liste des avis
+        show_rating_distribution(analyzer.get_rating_distribution(recipe_id))
+        show_recipe_trend(recipe_id, dataset.rating_buckets)
+        show_review_list(recipe_id, reviews)
 
-        with col3:
-            st.metric(
-                "💬 Nombre d'Avis",
-                f"{int(recipe_stats['n_reviews'])}",
-                help="Total des avis reçus",
-            )
 
-        with col4:
-            if "minutes" in recipe_info and pd.notna(recipe_info["minutes"]):
-                minutes = recipe_info["minutes"]
-                if minutes < 60:
-                    time_str = f"{int(minutes)} min"
-                else:
-                    hours = minutes // 60
-                    mins = minutes % 60
-                    time_str = f"{int(hours)}h{int(mins):02d}"
-                st.metric("⏱️ Temps", time_str)
+@fragment
+def show_recipe_header(
+    recipe_name: str, recipe_stats: pd.Series, recipe_info: Optional[pd.Series]
+) -> None:
+    """
+    Affiche le titre et les métriques principales d'une recette.
 
-        st.markdown("---")
+    Args:
+        recipe_name: Nom de la recette
+        recipe_stats: Statistiques de la recette (Series)
+        recipe_info: Ligne de la recette dans la table des recettes
+    """
+    st.markdown(f"### 🍳 {recipe_name}")
 
-        # === AVIS ET COMMENTAIRES ===
-        st.subheader("💬 Avis et Commentaires")
+    # === INFORMATIONS PRINCIPALES ===
+    col1, col2, col3, col4 = st.columns(4)
 
-        # Récupérer les avis
-        reviews = recipe_reviews(recipe_id, interaction_df)
+    with col1:
+        st.metric(
+            "⭐ Note Pondérée",
+            f"{recipe_stats['weighted_rating']:.2f}",
+            help="Note pondérée bayésienne - métrique principale",
+        )
 
-        if len(reviews) == 0:
-            st.warning("Aucun avis disponible pour cette recette.")
-        else:
-            # Filtres pour les avis
-            col1, col2 = st.columns([2, 1])
+    with col2:
+        st.metric(
+            "Note Moyenne Brute",
+            f"{recipe_stats['avg_rating']:.2f}",
+            help="Moyenne arithmétique simple des notes",
+        )
+
+    with col3:
+        st.metric(
+            "💬 Nombre d'Avis",
+            f"{int(recipe_stats['n_reviews'])}",
+            help="Total des avis reçus",
+        )
+
+    with col4:
+        if (
+            recipe_info is not None
+            and "minutes" in recipe_info
+            and pd.notna(recipe_info["minutes"])
+        ):
+            minutes = recipe_info["minutes"]
+            if minutes < 60:
+                time_str = f"{int(minutes)} min"
+            else:
+                hours = minutes // 60
+                mins = minutes % 60
+                time_str = f"{int(hours)}h{int(mins):02d}"
+            st.metric("⏱️ Temps", time_str)
+
+    st.markdown("---")
+
+
+@fragment
+def show_rating_distribution(rating_counts: pd.Series) -> None:
+    """
+    Affiche la distribution des notes d'une recette.
+
+    Args:
+        rating_counts: Nombre d'avis par note (DataAnalyzer.get_rating_distribution)
+    """
+    with st.expander("📊 Distribution des Notes pour cette Recette", expanded=False):
+        rating_counts = rating_counts[rating_counts > 0].sort_index(ascending=False)
+
+        fig = px.bar(
+            x=rating_counts.values,
+            y=[f"⭐ {r}" if r > 0 else "❌ Sans note" for r in rating_counts.index],
+            orientation="h",
+            labels={"x": "Nombre d'Avis", "y": "Note"},
+            title="Distribution des Notes",
+            color=rating_counts.values,
+            color_continuous_scale="YlOrRd",
+        )
+        fig.update_layout(showlegend=False, height=300)
+        st.plotly_chart(fig, use_container_width=True)
+
+
+@fragment
+def show_review_list(recipe_id: int, reviews: pd.DataFrame) -> None:
+    """
+    Affiche les filtres d'avis et la liste des avis filtrés.
+
+    Les valeurs des filtres sont conservées dans la session (clés par recette).
+
+    Args:
+        recipe_id: ID de la recette
+        reviews: Avis de la recette (recipe_reviews)
+    """
+    # Filtres pour les avis
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        # Filtre par note
+        rating_filter = st.multiselect(
+            "Filtrer par note",
+            options=[5, 4, 3, 2, 1, 0],
+            default=[5, 4, 3, 2, 1, 0],
+            format_func=lambda x: f"⭐ {x}" if x > 0 else "❌ Sans note",
+            key=f"rating_filter_{recipe_id}",
+        )
+
+    with col2:
+        # Nombre d'avis à afficher
+        n_reviews_to_show = st.number_input(
+            "Nombre d'avis à afficher",
+            min_value=1,
+            max_value=max(len(reviews), 1),
+            value=min(10, max(len(reviews), 1)),
+            step=5,
+            key=f"n_reviews_{recipe_id}",
+        )
+
+    # Filtrer les avis
+    filtered_reviews = reviews[reviews["rating"].isin(rating_filter)].head(
+        n_reviews_to_show
+    )
+
+    st.info(
+        f"📊 Affichage de **{len(filtered_reviews)}** avis sur **{len(reviews)}** au total"
+    )
+
+    show_download_buttons(
+        "Tous les avis",
+        f"avis_recette_{recipe_id}",
+        lambda fmt: iter_export(frame_chunks(reviews), fmt),
+        key=f"export_reviews_{recipe_id}",
+    )
+
+    # Afficher les avis
+    for _idx, review in filtered_reviews.iterrows():
+        with st.container():
+            # Créer une carte pour chaque avis
+            col1, col2 = st.columns([4, 1])
 
             with col1:
-                # Filtre par note
-                rating_filter = st.multiselect(
-                    "Filtrer par note",
-                    options=[5, 4, 3, 2, 1, 0],
-                    default=[5, 4, 3, 2, 1, 0],
-                    format_func=lambda x: f"⭐ {x}" if x > 0 else "❌ Sans note",
-                    key=f"rating_filter_{recipe_id}",
+                # Afficher les étoiles
+                rating_stars = (
+                    "⭐" * int(review["rating"])
+                    if review["rating"] > 0
+                    else "❌ Sans note"
                 )
+                st.markdown(f"**{rating_stars}**")
 
             with col2:
-                # Nombre d'avis à afficher
-                n_reviews_to_show = st.number_input(
-                    "Nombre d'avis à afficher",
-                    min_value=5,
-                    max_value=len(reviews),
-                    value=min(10, len(reviews)),
-                    step=5,
-                    key=f"n_reviews_{recipe_id}",
-                )
-
-            # Filtrer les avis
-            filtered_reviews = reviews[reviews["rating"].isin(rating_filter)].head(
-                n_reviews_to_show
+                # Date de l'avis
+                if pd.notna(review["date"]):
+                    try:
+                        date = pd.to_datetime(review["date"])
+                        st.caption(f"📅 {date.strftime('%d/%m/%Y')}")
+                    except Exception:
+                        st.caption("📅 Date inconnue")
+
+            # Commentaire
+            if pd.notna(review["review"]) and str(review["review"]).strip():
+                review_text = str(review["review"]).strip()
+
+                # Utiliser un style de citation
+                if len(review_text) > 300:
+                    st.markdown(f"> {review_text[:300]}...")
+                    with st.expander("📖 Lire la suite"):
+                        st.markdown(f"> {review_text}")
+                else:
+                    st.markdown(f"> {review_text}")
+            else:
+                st.caption("_Aucun commentaire écrit_")
+
+            # Séparateur subtil
+            st.markdown(
+                "<hr style='margin: 10px 0; border: none; border-top: 1px solid #e0e0e0;'>",
+                unsafe_allow_html=True,
             )
 
-            st.info(
-                f"📊 Affichage de **{len(filtered_reviews)}** avis sur **{len(reviews)}** au total"
-            )
 
-            # === GRAPHIQUE : Distribution des notes ===
-            with st.expander(
-                "📊 Distribution des Notes pour cette Recette", expanded=False
-            ):
-                rating_counts = (
-                    reviews["rating"].value_counts().sort_index(ascending=False)
-                )
+@fragment
+def show_recipe_trend(recipe_id: int, buckets: MonthlyRatingBuckets) -> None:
+    """
+    Affiche l'évolution de la note et du volume d'avis d'une recette.
 
-                fig = px.bar(
-                    x=rating_counts.values,
-                    y=[
-                        f"⭐ {r}" if r > 0 else "❌ Sans note"
-                        for r in rating_counts.index
-                    ],
-                    orientation="h",
-                    labels={"x": "Nombre d'Avis", "y": "Note"},
-                    title="Distribution des Notes",
-                    color=rating_counts.values,
-                    color_continuous_scale="YlOrRd",
-                )
-                fig.update_layout(showlegend=False, height=300)
-                st.plotly_chart(fig, use_container_width=True)
-
-            # Afficher les avis
-            for _idx, review in filtered_reviews.iterrows():
-                with st.container():
-                    # Créer une carte pour chaque avis
-                    col1, col2 = st.columns([4, 1])
-
-                    with col1:
-                        # Afficher les étoiles
-                        rating_stars = (
-                            "⭐" * int(review["rating"])
-                            if review["rating"] > 0
-                            else "❌ Sans note"
-                        )
-                        st.markdown(f"**{rating_stars}**")
-
-                    with col2:
-                        # Date de l'avis
-                        if pd.notna(review["date"]):
-                            try:
-                                date = pd.to_datetime(review["date"])
-                                st.caption(f"📅 {date.strftime('%d/%m/%Y')}")
-                            except Exception:
-                                st.caption("📅 Date inconnue")
-
-                    # Commentaire
-                    if pd.notna(review["review"]) and str(review["review"]).strip():
-                        review_text = str(review["review"]).strip()
-
-                        # Utiliser un style de citation
-                        if len(review_text) > 300:
-                            st.markdown(f"> {review_text[:300]}...")
-                            with st.expander("📖 Lire la suite"):
-                                st.markdown(f"> {review_text}")
-                        else:
-                            st.markdown(f"> {review_text}")
-                    else:
-                        st.caption("_Aucun commentaire écrit_")
-
-                    # Séparateur subtil
-                    st.markdown(
-                        "<hr style='margin: 10px 0; border: none; border-top: 1px solid #e0e0e0;'>",
-                        unsafe_allow_html=True,
-                    )
+    La série est lue dans les seaux mensuels précalculés (déjà sous-échantillonnés),
+    sans regrouper les avis de la recette à chaque clic.
+
+    Args:
+        recipe_id: ID de la recette
+        buckets: Seaux mensuels des notes
+    """
+    trend = buckets.recipe_trend(recipe_id, max_points=TREND_MAX_POINTS)
+    if len(trend) < 2:
+        return
+
+    with st.expander("📈 Évolution des Notes dans le Temps", expanded=False):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.caption("Note moyenne cumulée")
+            st.line_chart(trend, x="period", y="cumulative_avg_rating", height=250)
+
+        with col2:
+            st.caption("Nombre d'avis par période")
+            st.bar_chart(trend, x="period", y="n_reviews", height=250)
 
 
 # Pour tester la page seule (optionnel)
@@ -360,8 +744,4 @@ if __name__ == "__main__":
 
     from food_analysis.core.data_loader import DataLoader
 
-    loader = DataLoader()
-    recipes = loader.load_recipes()
-    interactions = loader.load_interactions()
-
-    show_recipe_ratings_page(recipes, interactions)
+    show_recipe_ratings_page(DataLoader().load_dataset())
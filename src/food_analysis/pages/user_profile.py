@@ -0,0 +1,154 @@
+# mypy: disable-error-code="attr-defined"
+
+import pandas as pd
+import streamlit as st
+
+from food_analysis.core.dataset import Dataset
+from food_analysis.core.users import top_reviewers, user_reviews
+
+# Taille du classement des contributeurs d'avis
+N_TOP_REVIEWERS = 20
+
+
+def show_user_profile_page(dataset: Dataset) -> None:
+    """
+    Affiche le classement des utilisateurs et le profil de l'utilisateur choisi.
+
+    Args:
+        dataset: Jeu de données servi
+    """
+    st.header("👤 Profils Utilisateurs")
+
+    with st.spinner("Indexation des avis par utilisateur..."):
+        user_stats = dataset.user_stats
+
+    if len(user_stats) == 0:
+        st.warning("Aucun utilisateur dans les données.")
+        return
+
+    # === CLASSEMENT DES CONTRIBUTEURS D'AVIS ===
+    st.subheader("🏅 Top Contributeurs d'Avis")
+    leaderboard = top_reviewers(user_stats, n=N_TOP_REVIEWERS)
+    leaderboard.insert(0, "rank", range(1, len(leaderboard) + 1))
+
+    event = st.dataframe(
+        leaderboard[["rank", "user_id", "n_reviews", "avg_rating", "leniency"]],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "rank": st.column_config.NumberColumn("Rang", width="small"),
+            "user_id": st.column_config.NumberColumn("Utilisateur", format="%d"),
+            "n_reviews": st.column_config.NumberColumn("Nombre d'Avis", format="%d 💬"),
+            "avg_rating": st.column_config.NumberColumn("Note Moyenne", format="%.2f"),
+            "leniency": st.column_config.NumberColumn(
+                "Indulgence",
+                format="%+.2f",
+                help="Écart entre la note moyenne de l'utilisateur et la moyenne globale",
+            ),
+        },
+        on_select="rerun",
+        selection_mode="single-row",
+        key="reviewer_table",
+    )
+
+    # Utilisateur sélectionné dans le classement, sinon le premier
+    try:
+        selected_idx = event.selection.rows[0]  # type: ignore[attr-defined]
+    except (AttributeError, IndexError, TypeError):
+        selected_idx = 0
+    user_id = int(leaderboard.iloc[selected_idx]["user_id"])
+
+    # Une recherche explicite prime sur la sélection du classement
+    searched_user = st.number_input(
+        "🔍 Rechercher un utilisateur (user_id)",
+        min_value=0,
+        value=None,
+        step=1,
+        key="user_id_input",
+        help="Laisser vide pour afficher l'utilisateur sélectionné dans le classement",
+    )
+    if isinstance(searched_user, (int, float)):
+        user_id = int(searched_user)
+
+    st.markdown("---")
+    show_user_details(user_id, user_stats, dataset)
+
+
+def show_user_details(user_id: int, user_stats: pd.DataFrame, dataset: Dataset) -> None:
+    """
+    Affiche le profil d'un utilisateur : métriques, distribution et avis.
+
+    Args:
+        user_id: ID de l'utilisateur
+        user_stats: Agrégats par utilisateur (compute_user_stats)
+        dataset: Jeu de données servi
+    """
+    user_index = dataset.user_index
+    position = user_index.position(user_id)
+    if position is None:
+        st.warning(f"Aucun avis trouvé pour l'utilisateur {user_id}.")
+        return
+
+    # user_stats est aligné sur les clés de l'index
+    stats = user_stats.iloc[position]
+    reviews = user_reviews(
+        user_id, dataset.interactions, user_index, dataset.review_store
+    )
+
+    st.markdown(f"### 👤 Utilisateur {user_id}")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.metric("💬 Nombre d'Avis", f"{int(stats['n_reviews']):,}")
+
+    with col2:
+        avg = stats["avg_rating"]
+        st.metric(
+            "Note Moyenne Donnée",
+            f"{avg:.2f}/5" if pd.notna(avg) else "—",
+            help="Moyenne des notes données (avis sans note exclus)",
+        )
+
+    with col3:
+        leniency = stats["leniency"]
+        st.metric(
+            "Indulgence",
+            f"{leniency:+.2f}" if pd.notna(leniency) else "—",
+            help="Écart avec la note moyenne globale : positif = plus généreux",
+        )
+
+    # === DISTRIBUTION DES NOTES ===
+    rating_counts = dataset.analyzer.get_user_rating_distribution(user_id)
+    st.caption("Distribution des notes données (0 = sans note)")
+    st.bar_chart(rating_counts, height=250)
+
+    # === AVIS ===
+    st.subheader("💬 Avis de l'Utilisateur")
+
+    n_reviews_to_show = st.number_input(
+        "Nombre d'avis à afficher",
+        min_value=1,
+        max_value=max(len(reviews), 1),
+        value=min(10, max(len(reviews), 1)),
+        step=5,
+        key=f"user_reviews_{user_id}",
+    )
+    shown = reviews.head(int(n_reviews_to_show))
+
+    # Noms des recettes pour les seuls avis affichés
+    recipe_df = dataset.recipes
+    names = recipe_df.loc[recipe_df["id"].isin(shown["recipe_id"]), ["id", "name"]]
+    shown = shown.merge(names, left_on="recipe_id", right_on="id", how="left")
+
+    st.dataframe(
+        shown[["name", "rating", "date", "review"]],
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "name": st.column_config.TextColumn("Recette", width="medium"),
+            "rating": st.column_config.NumberColumn("Note", format="%d ⭐"),
+            "date": st.column_config.Column("Date", width="small"),
+            "review": st.column_config.TextColumn("Commentaire", width="large"),
+        },
+    )
@@ -0,0 +1,322 @@
+"""Démarrage du serveur : données partagées, préchauffage et disponibilité.
+
+Streamlit ne charge rien avant le premier rerun : sans préchauffage, le
+premier utilisateur après un déploiement paie le chargement des données et
+la construction des index. ``food-analysis serve`` lance Streamlit dans le
+même processus après avoir démarré :
+
+- le préchauffage (``warm_up``) dans un thread : jeu de données, index,
+  agrégats et, en option, la vue par défaut du classement (top 20, m = 10),
+  placée dans le cache des classements partagé (utils/result_cache.py) ;
+- un petit serveur HTTP de santé (``HEALTH_PORT``) pour les sondes :
+  ``/live`` répond dès le démarrage, ``/ready`` seulement une fois le
+  préchauffage terminé (503 avant). Un préchauffage en échec (ex. données
+  pas encore déposées) est relancé avec un délai croissant
+  (``warm_up_until_ready``) : /ready passe à 200 dès qu'il réussit.
+- si ``API_PORT`` est non nul, l'API JSON (api.py), qui partage ainsi le
+  jeu de données et les caches des sessions Streamlit.
+
+Le jeu de données est tenu par un ``DatasetWatcher`` unique par processus
+(``get_data_watcher``), partagé par le préchauffage et toutes les sessions.
+Ce module étant importé (et non exécuté comme script à chaque rerun), l'état
+survit aux reruns.
+"""
+
+import importlib
+import json
+import logging
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from food_analysis.core.bundle import current_version, ensure_bundle, load_bundle
+from food_analysis.core.data_loader import DataLoader
+from food_analysis.core.dataset import Dataset
+from food_analysis.core.watcher import DatasetWatcher
+from food_analysis.utils.config import Config
+from food_analysis.utils.result_cache import get_ranking_cache
+
+logger = logging.getLogger(__name__)
+
+# Vue affichée par défaut par la page des recettes les mieux notées
+DEFAULT_M = 10
+DEFAULT_N_RECIPES = 20
+# Délai maximal (secondes) entre deux tentatives de préchauffage
+WARMUP_RETRY_MAX_S = 300.0
+
+_watcher: Optional[DatasetWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def load_dataset() -> Dataset:
+    """
+    Charge le jeu de données courant selon Config.DATA_MODE.
+
+    Returns:
+        Dataset: bundle publié (bundle) ou bundle des CSV, construit au besoin
+            (raw ; en mémoire seulement si le dossier traité est en lecture seule)
+
+    Raises:
+        FileNotFoundError: Si aucune donnée n'est disponible
+    """
+    if Config.DATA_MODE == "bundle":
+        return load_bundle(Config.DATA_PROCESSED_PATH, verify=Config.BUNDLE_VERIFY)
+    return ensure_bundle(
+        Config.DATA_RAW_PATH,
+        Config.DATA_PROCESSED_PATH,
+        content_hash=Config.DATA_CONTENT_HASH,
+        verify=Config.BUNDLE_VERIFY,
+    )
+
+
+def data_version() -> str:
+    """
+    Retourne la version des données à servir.
+
+    Returns:
+        str: version du bundle publié (DATA_MODE=bundle) ou empreinte des CSV
+
+    Raises:
+        FileNotFoundError: Si aucune donnée n'est disponible
+    """
+    if Config.DATA_MODE == "bundle":
+        version = current_version(Config.DATA_PROCESSED_PATH)
+        if version is None:
+            raise FileNotFoundError(
+                f"Aucun bundle dans {Config.DATA_PROCESSED_PATH} : "
+                "lancez `food-analysis precompute`"
+            )
+        return version
+    return DataLoader(Config.DATA_RAW_PATH).fingerprint(
+        content_hash=Config.DATA_CONTENT_HASH
+    )
+
+
+def get_data_watcher() -> DatasetWatcher:
+    """
+    Retourne la surveillance des données du processus, chargée au premier appel.
+
+    Les appels simultanés attendent le même chargement.
+
+    Returns:
+        DatasetWatcher: surveillance démarrée
+
+    Raises:
+        FileNotFoundError: Si aucune donnée n'est disponible (réessayé à l'appel suivant)
+    """
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            watcher = DatasetWatcher(
+                load_dataset, data_version, interval_s=Config.DATA_WATCH_INTERVAL_S
+            )
+            _watcher = watcher.start()
+        return _watcher
+
+
+@dataclass
+class Readiness:
+    """État du préchauffage, exposé par /ready."""
+
+    status: str = "starting"  # starting | ready | failed
+    started_at: float = field(default_factory=time.time)
+    ready_at: Optional[float] = None
+    version: Optional[str] = None
+    error: Optional[str] = None
+    steps: Dict[str, float] = field(default_factory=dict)
+    attempt: int = 1
+    retry_at: Optional[float] = None
+
+    @property
+    def is_ready(self) -> bool:
+        """Indique si le serveur peut recevoir du trafic."""
+        return self.status == "ready"
+
+
+readiness = Readiness()
+
+
+def warm_up(prerender: bool = True, attempt: int = 1) -> Readiness:
+    """
+    Précharge le jeu de données et tout ce que le premier rerun utilise.
+
+    Args:
+        prerender: Calcule aussi la vue par défaut du classement (top 20, m = 10)
+            et importe les bibliothèques de graphiques
+        attempt: Numéro de la tentative (voir warm_up_until_ready)
+
+    Returns:
+        Readiness: état mis à jour (ready ou failed)
+    """
+    global readiness
+    state = readiness = Readiness(attempt=attempt)
+
+    def step(name: str, func: Any) -> Any:
+        start = time.perf_counter()
+        result = func()
+        state.steps[name] = round(time.perf_counter() - start, 3)
+        return result
+
+    try:
+        dataset = step("dataset", lambda: get_data_watcher().current())
+        step("indexes", dataset.build)
+        step("weighted_stats", lambda: dataset.weighted_recipe_stats(DEFAULT_M))
+        if prerender:
+            # Même requête que la vue par défaut de la page : placée dans le
+            # cache des classements partagé
+            step(
+                "default_ranking",
+                lambda: dataset.analyzer.get_ranking(
+                    m=DEFAULT_M, n_recipes=DEFAULT_N_RECIPES
+                ),
+            )
+            step("plotting", _import_plotting)
+    except Exception as e:
+        state.status = "failed"
+        state.error = f"{type(e).__name__}: {e}"
+        logger.exception("Échec du préchauffage")
+        return state
+
+    state.version = dataset.version
+    state.ready_at = time.time()
+    state.status = "ready"
+    logger.info(
+        "Préchauffage terminé en %.1f s (%s)",
+        state.ready_at - state.started_at,
+        state.steps,
+    )
+    return state
+
+
+def warm_up_until_ready(
+    prerender: bool = True,
+    retry_s: Optional[float] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Readiness:
+    """
+    Relance le préchauffage jusqu'à ce qu'il réussisse.
+
+    Le délai entre deux tentatives double à chaque échec, jusqu'à
+    WARMUP_RETRY_MAX_S ; /ready reste à 503 (status failed, retry_at) pendant
+    l'attente.
+
+    Args:
+        prerender: Voir warm_up
+        retry_s: Délai avant la deuxième tentative (défaut :
+            Config.WARMUP_RETRY_S ; 0 : une seule tentative)
+        sleep: Attente entre deux tentatives
+
+    Returns:
+        Readiness: état de la dernière tentative
+    """
+    delay = Config.WARMUP_RETRY_S if retry_s is None else retry_s
+    attempt = 1
+    while True:
+        state = warm_up(prerender, attempt=attempt)
+        if state.is_ready or delay <= 0:
+            return state
+        state.retry_at = time.time() + delay
+        logger.warning(
+            "Nouvelle tentative de préchauffage dans %.0f s (tentative %d)",
+            delay,
+            attempt + 1,
+        )
+        sleep(delay)
+        delay = min(delay * 2, WARMUP_RETRY_MAX_S)
+        attempt += 1
+
+
+def _import_plotting() -> None:
+    """Importe plotly (chargé à la demande par les pages) avant la première session."""
+    importlib.import_module("plotly.express")
+
+
+def readiness_report() -> Dict[str, Any]:
+    """État de disponibilité, des données et du cache des classements (JSON)."""
+    report = asdict(readiness)
+    if _watcher is not None:
+        report["data"] = _watcher.status
+    report["result_cache"] = get_ranking_cache().stats
+    return report
+
+
+class HealthHandler(BaseHTTPRequestHandler):
+    """Sondes /live (processus vivant) et /ready (préchauffage terminé)."""
+
+    def do_GET(self) -> None:
+        if self.path == "/live":
+            self._reply(200, {"status": "alive"})
+        elif self.path == "/ready":
+            self._reply(200 if readiness.is_ready else 503, readiness_report())
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def _reply(self, code: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # les sondes sont trop fréquentes pour être journalisées
+
+
+def start_health_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """
+    Lance le serveur de santé dans un thread.
+
+    Args:
+        port: Port d'écoute (0 : port libre choisi par le système)
+        host: Adresse d'écoute
+
+    Returns:
+        ThreadingHTTPServer: serveur démarré (server_address donne le port)
+    """
+    server = ThreadingHTTPServer((host, port), HealthHandler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="health-server", daemon=True
+    ).start()
+    return server
+
+
+def serve(streamlit_args: List[str]) -> int:
+    """
+    Démarre préchauffage et sondes, puis Streamlit dans le même processus.
+
+    Args:
+        streamlit_args: Options transmises à ``streamlit run``
+
+    Returns:
+        int: code de sortie de Streamlit
+    """
+    from streamlit.web import cli as streamlit_cli
+
+    if Config.HEALTH_PORT:
+        start_health_server(Config.HEALTH_PORT)
+        logger.info("Sondes de santé sur le port %d", Config.HEALTH_PORT)
+    if Config.API_PORT:
+        from food_analysis.api import start_api_server
+
+        start_api_server(Config.API_PORT)
+        logger.info("API JSON sur le port %d", Config.API_PORT)
+    threading.Thread(
+        target=warm_up_until_ready,
+        kwargs={"prerender": Config.WARMUP_PRERENDER},
+        name="warm-up",
+        daemon=True,
+    ).start()
+
+    app_path = Path(__file__).with_name("app.py")
+    sys.argv = ["streamlit", "run", str(app_path), *streamlit_args]
+    try:
+        streamlit_cli.main()
+    except SystemExit as e:
+        return int(e.code or 0)
+    return 0
@@ -62,6 +62,7 @@ def test_compute_recipe_stats_basic() -> None:
 
     # Vérifie la structure
     assert list(result.columns) == [
+        "recipe_id",
         "name",
         "avg_rating",
         "n_reviews",
@@ -5,6 +5,7 @@ from unittest.mock import MagicMock, patch
 import pandas as pd
 import pytest
 
+from food_analysis.core.dataset import Dataset
 from food_analysis.pages.recipe_ratings import (
     show_recipe_details,
     show_recipe_ratings_page,
@@ -62,7 +63,7 @@ def test_show_recipe_ratings_page_runs(
     mock_st.dataframe.return_value = MagicMock(selection=MagicMock(rows=[0]))
 
     # Exécute la fonction
-    show_recipe_ratings_page(recipe_df, interaction_df)
+    show_recipe_ratings_page(Dataset(recipe_df, interaction_df))
 
     # Vérifie que compute_recipe_stats a été appelé correctement
     mock_compute_stats.assert_called_once_with(recipe_df, interaction_df, m=10)
@@ -109,8 +110,7 @@ def test_show_recipe_details(
         recipe_id=1,
         recipe_name="Pasta",
         recipe_stats=recipe_stats,
-        recipe_df=recipe_df,
-        interaction_df=interaction_df,
+        dataset=Dataset(recipe_df, interaction_df),
     )
 
     # Vérifie que recipe_reviews a été appelé
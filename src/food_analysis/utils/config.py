@@ -1,24 +1,113 @@
 """Configuration module for the application.
 
-Ce module doit contenir :
-- Chargement des variables d'environnement (.env)
-- Configuration des chemins (data, logs, etc.)
-- Constantes de l'application
-- Création des dossiers nécessaires
-
-Exemple de structure :
-    class Config:
-        APP_NAME: str
-        DATA_RAW_PATH: Path
-        LOGS_PATH: Path
-
-        @classmethod
-        def create_directories(cls) -> None:
-            ...
-
-À DÉVELOPPER PAR L'ÉQUIPE
+Les valeurs sont lues dans les variables d'environnement (éventuellement
+chargées depuis un fichier ``.env``), avec des valeurs par défaut adaptées au
+développement local.
 """
 
-# TODO: Implémenter la classe Config
-# TODO: Utiliser python-dotenv pour charger .env
-# TODO: Définir les chemins avec pathlib.Path
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env_float(name: str, default: float) -> float:
+    """Lit une variable d'environnement numérique (défaut si absente ou invalide)."""
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    """Lit une variable d'environnement entière (défaut si absente ou invalide)."""
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class Config:
+    """Configuration de l'application."""
+
+    APP_NAME: str = os.getenv("APP_NAME", "Food Analysis WebApp")
+    APP_VERSION: str = os.getenv("APP_VERSION", "0.1.0")
+    ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
+
+    # Chemins
+    DATA_RAW_PATH: Path = Path(os.getenv("DATA_RAW_PATH", "data/raw"))
+    DATA_PROCESSED_PATH: Path = Path(os.getenv("DATA_PROCESSED_PATH", "data/processed"))
+    LOGS_PATH: Path = Path(os.getenv("LOGS_PATH", "logs"))
+
+    # Logging
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv(
+        "LOG_FORMAT", "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    # Source des données de l'application : "raw" (CSV de DATA_RAW_PATH) ou
+    # "bundle" (bundle précalculé de DATA_PROCESSED_PATH, voir
+    # `food-analysis precompute`)
+    DATA_MODE: str = os.getenv("DATA_MODE", "raw").lower()
+    # Vérifie les sommes de contrôle du bundle au chargement
+    BUNDLE_VERIFY: bool = os.getenv("BUNDLE_VERIFY", "true").lower() != "false"
+    # Version des données fondée sur le contenu des CSV (SHA-256) plutôt que
+    # sur leurs métadonnées (taille, date de modification)
+    DATA_CONTENT_HASH: bool = os.getenv("DATA_CONTENT_HASH", "false").lower() == "true"
+
+    # Intervalle (secondes) de vérification des fichiers de données ; les
+    # nouvelles données sont préparées en arrière-plan (0 : désactivé)
+    DATA_WATCH_INTERVAL_S: float = _env_float("DATA_WATCH_INTERVAL_S", 10.0)
+
+    # Serveur (food-analysis serve) : port des sondes /live et /ready (0 :
+    # désactivées), calcul de la vue par défaut pendant le préchauffage et
+    # délai (secondes, doublé à chaque échec) avant de relancer un préchauffage
+    # en échec (0 : pas de nouvelle tentative)
+    HEALTH_PORT: int = _env_int("HEALTH_PORT", 8502)
+    WARMUP_PRERENDER: bool = os.getenv("WARMUP_PRERENDER", "true").lower() != "false"
+    WARMUP_RETRY_S: float = _env_float("WARMUP_RETRY_S", 5.0)
+
+    # API JSON (voir api.py) : port de ``food-analysis api`` et, s'il est
+    # non nul, de l'API lancée avec ``food-analysis serve`` ; plafond mémoire
+    # (Mo) du cache des réponses sérialisées
+    API_PORT: int = _env_int("API_PORT", 0)
+    API_CACHE_MAX_MB: float = _env_float("API_CACHE_MAX_MB", 16.0)
+
+    # Moteur de calcul du classement et des agrégats : "pandas" (référence),
+    # "duckdb" ou "polars" (dépendances optionnelles, voir core/backends.py)
+    COMPUTE_BACKEND: str = os.getenv("COMPUTE_BACKEND", "pandas").lower()
+
+    # Plafond mémoire (Mo) du cache des classements partagé entre les sessions
+    # (0 : désactivé)
+    RESULT_CACHE_MAX_MB: float = _env_float("RESULT_CACHE_MAX_MB", 64.0)
+
+    # Classement progressif (page des recettes) : si le classement exact n'est
+    # pas prêt après PROGRESSIVE_RANKING_DELAY_S secondes, un classement
+    # approché (version précédente des données ou échantillon de
+    # RANKING_SAMPLE_SIZE avis) est affiché en attendant
+    PROGRESSIVE_RANKING: bool = (
+        os.getenv("PROGRESSIVE_RANKING", "true").lower() != "false"
+    )
+    PROGRESSIVE_RANKING_DELAY_S: float = _env_float("PROGRESSIVE_RANKING_DELAY_S", 0.3)
+    RANKING_SAMPLE_SIZE: int = _env_int("RANKING_SAMPLE_SIZE", 50_000)
+
+    # Profilage des reruns (voir utils/profiler.py) : "off" (défaut), "query"
+    # (paramètre ?profile=1, ouvert à tous les visiteurs) ou "always", et nombre
+    # de profils conservés dans logs/
+    PROFILING: str = os.getenv("PROFILING", "off").lower()
+    PROFILE_KEEP: int = _env_int("PROFILE_KEEP", 20)
+
+    # Compression des textes des avis dans les bundles : "auto" (zstd, sinon
+    # lz4, sinon zlib), "zstd", "lz4" ou "zlib" (voir core/review_store.py)
+    REVIEW_CODEC: str = os.getenv("REVIEW_CODEC", "auto").lower()
+
+    # Budget (secondes) du temps d'import de food_analysis.app
+    IMPORT_TIME_BUDGET_S: float = _env_float("IMPORT_TIME_BUDGET_S", 3.0)
+
+    @classmethod
+    def create_directories(cls) -> None:
+        """Crée les dossiers de données et de logs s'ils n'existent pas."""
+        for path in (cls.DATA_RAW_PATH, cls.DATA_PROCESSED_PATH, cls.LOGS_PATH):
+            path.mkdir(parents=True, exist_ok=True)
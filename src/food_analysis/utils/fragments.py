@@ -0,0 +1,36 @@
+"""Fragments Streamlit utilisables hors d'une exécution Streamlit.
+
+Un fragment (``st.fragment``) est ré-exécuté seul quand l'un de ses widgets
+change, sans relancer tout le script de la page. Hors d'une exécution
+Streamlit (tests unitaires, scripts), ``st.fragment`` n'exécute pas la
+fonction : le décorateur ci-dessous l'appelle alors directement.
+"""
+
+from functools import wraps
+from typing import Any, Callable, TypeVar, cast
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def fragment(func: F) -> F:
+    """
+    Décore une fonction d'affichage comme fragment Streamlit.
+
+    Args:
+        func: Fonction d'affichage
+
+    Returns:
+        La fonction, exécutée comme fragment lorsqu'un script Streamlit tourne
+    """
+    fragment_func = st.fragment(func)
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if get_script_run_ctx(suppress_warning=True) is None:
+            return func(*args, **kwargs)
+        return fragment_func(*args, **kwargs)
+
+    return cast(F, wrapper)
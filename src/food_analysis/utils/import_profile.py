@@ -0,0 +1,103 @@
+"""Profil du temps d'import de l'application.
+
+Lance ``python -X importtime`` dans un processus séparé (cache d'import vide)
+et résume les modules les plus coûteux.
+
+Usage :
+    python -m food_analysis.utils.import_profile [module] [--top N]
+"""
+
+import argparse
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List, Optional
+
+DEFAULT_MODULE = "food_analysis.app"
+
+
+@dataclass
+class ImportTiming:
+    """Temps d'import d'un module (en microsecondes)."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """
+    Analyse la sortie de ``python -X importtime``.
+
+    Args:
+        output: Sortie d'erreur du processus
+
+    Returns:
+        List[ImportTiming]: une entrée par module importé
+    """
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|")
+            timings.append(
+                ImportTiming(
+                    module=name.strip(),
+                    self_us=int(self_us),
+                    cumulative_us=int(cumulative_us),
+                    depth=(len(name) - len(name.lstrip()) - 1) // 2,
+                )
+            )
+        except ValueError:
+            continue
+    return timings
+
+
+def profile_imports(module: str = DEFAULT_MODULE) -> List[ImportTiming]:
+    """
+    Mesure le temps d'import d'un module et de ses dépendances.
+
+    Args:
+        module: Module à importer
+
+    Returns:
+        List[ImportTiming]: temps d'import par module
+
+    Raises:
+        RuntimeError: Si l'import échoue
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Échec de l'import de {module} :\n{result.stderr}")
+    return parse_importtime(result.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Affiche les modules les plus coûteux à importer."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("module", nargs="?", default=DEFAULT_MODULE)
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args(argv)
+
+    timings = profile_imports(args.module)
+    total = next((t for t in timings if t.module == args.module), None)
+    if total is not None:
+        print(f"Import de {args.module} : {total.cumulative_us / 1e6:.3f} s")
+
+    print(f"{'cumulé (ms)':>12} {'propre (ms)':>12}  module")
+    for t in sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[: args.top]:
+        print(
+            f"{t.cumulative_us / 1e3:12.1f} {t.self_us / 1e3:12.1f}  "
+            f"{'  ' * t.depth}{t.module}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Import différé des bibliothèques lourdes.
+
+``plt = lazy_module("matplotlib.pyplot")`` ne coûte rien à l'import du module
+appelant : le vrai module n'est importé qu'au premier accès à un attribut
+(``plt.hist``). Les tests peuvent toujours patcher ``module.plt.hist``.
+"""
+
+import importlib
+from types import ModuleType
+from typing import Any, Optional
+
+
+class LazyModule:
+    """Mandataire qui importe un module au premier accès à l'un de ses attributs."""
+
+    def __init__(self, name: str) -> None:
+        """
+        Initialise le mandataire.
+
+        Args:
+            name: Nom complet du module (ex. "plotly.express")
+        """
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self) -> ModuleType:
+        module: Optional[ModuleType] = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__dict__["_name"])
+            self.__dict__["_module"] = module
+        return module
+
+    @property
+    def is_loaded(self) -> bool:
+        """Indique si le module a déjà été importé."""
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    # Les écritures (ex. unittest.mock.patch) visent le vrai module, comme
+    # avec un import classique
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "chargé" if self.is_loaded else "non chargé"
+        return f"<LazyModule {self.__dict__['_name']} ({state})>"
+
+
+def lazy_module(name: str) -> Any:
+    """
+    Retourne un module importé seulement à la première utilisation.
+
+    Args:
+        name: Nom complet du module
+
+    Returns:
+        Mandataire se comportant comme le module
+    """
+    return LazyModule(name)
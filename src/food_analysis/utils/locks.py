@@ -0,0 +1,133 @@
+"""Verrous pour les constructions coûteuses (single-flight).
+
+- ``SingleFlight`` : dans un processus, les appels simultanés pour une même
+  clé n'exécutent la fonction qu'une fois ; les autres attendent et
+  reçoivent le même résultat (ou la même exception).
+- ``file_lock`` : verrou exclusif entre processus (plusieurs workers
+  Streamlit, CLI), posé sur un fichier de ``data/processed/``.
+
+Le schéma d'usage est le double contrôle : vérifier si le résultat existe,
+sinon prendre le verrou, revérifier, puis construire.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Generator, Hashable, Optional, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+T = TypeVar("T")
+
+
+class _Call:
+    """Calcul en cours partagé par les appelants d'une même clé."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Regroupe les appels simultanés d'une même clé en une seule exécution."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        """
+        Exécute func, sauf si un appel de même clé est déjà en cours.
+
+        Args:
+            key: Identifiant du calcul
+            func: Calcul à exécuter
+
+        Returns:
+            Résultat de func (calculé par cet appel ou par l'appel en cours)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[no-any-return]
+
+        try:
+            call.result = func()
+            return call.result  # type: ignore[no-any-return]
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Indique si un calcul est en cours pour cette clé."""
+        with self._lock:
+            return key in self._calls
+
+
+@contextmanager
+def file_lock(
+    path: Path, timeout_s: Optional[float] = None, poll_s: float = 0.1
+) -> Generator[None, None, None]:
+    """
+    Verrou exclusif entre processus (et entre threads) sur un fichier.
+
+    Args:
+        path: Fichier de verrou (créé au besoin, jamais supprimé)
+        timeout_s: Attente maximale (None : illimitée)
+        poll_s: Intervalle entre deux tentatives
+
+    Raises:
+        TimeoutError: Si le verrou n'est pas obtenu à temps
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    deadline = None if timeout_s is None else time.monotonic() + timeout_s
+    try:
+        while not _try_lock(fd):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Verrou non obtenu : {path}")
+            time.sleep(poll_s)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def _try_lock(fd: int) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
@@ -1,22 +1,42 @@
 """Logging configuration module.
 
-Ce module doit configurer le système de logging de l'application.
+Configure les loggers de l'application : affichage console et, si demandé,
+fichier dans ``logs/``, avec le niveau et le format définis dans config.py.
+"""
 
-Fonctionnalités attendues :
-- Configuration des loggers avec différents niveaux (INFO, DEBUG, ERROR)
-- Handler console (pour afficher dans le terminal)
-- Handler fichier (pour sauvegarder dans logs/)
-- Format personnalisé avec timestamp
+import logging
+from pathlib import Path
+from typing import Optional
 
-Exemple de fonction :
-    def setup_logger(name: str, log_file: Optional[Path] = None) -> logging.Logger:
-        '''Configure et retourne un logger.'''
-        ...
+from food_analysis.utils.config import Config
 
-À DÉVELOPPER PAR L'ÉQUIPE
-"""
 
-# TODO: Importer logging
-# TODO: Créer une fonction setup_logger()
-# TODO: Configurer les handlers (console + fichier)
-# TODO: Utiliser les configs de config.py
+def setup_logger(name: str, log_file: Optional[Path] = None) -> logging.Logger:
+    """
+    Configure et retourne un logger.
+
+    Args:
+        name: Nom du logger (ex. "food_analysis.cli")
+        log_file: Fichier de log, relatif à Config.LOGS_PATH (optionnel)
+
+    Returns:
+        logging.Logger: logger configuré (les handlers ne sont ajoutés qu'une fois)
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(Config.LOG_LEVEL)
+
+    if not logger.handlers:
+        formatter = logging.Formatter(Config.LOG_FORMAT)
+
+        console = logging.StreamHandler()
+        console.setFormatter(formatter)
+        logger.addHandler(console)
+
+        if log_file is not None:
+            path = Config.LOGS_PATH / log_file
+            path.parent.mkdir(parents=True, exist_ok=True)
+            file_handler = logging.FileHandler(path, encoding="utf-8")
+            file_handler.setFormatter(formatter)
+            logger.addHandler(file_handler)
+
+    return logger
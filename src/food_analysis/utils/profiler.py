@@ -0,0 +1,291 @@
+"""Profilage à la demande d'un rerun de l'application.
+
+Pour diagnostiquer une page lente signalée par un utilisateur, lancez
+l'application avec ``PROFILING=query`` et ajoutez ``?profile=1`` à l'URL : le
+rerun suivant de cette session est exécuté sous cProfile et sous un
+échantillonneur de pile, puis :
+
+- le profil cProfile est écrit dans ``logs/profiles/rerun-<date>.prof``
+  (lisible avec ``python -m pstats`` ou snakeviz) ;
+- les piles échantillonnées sont écrites au format « collapsed »
+  (``rerun-<date>.folded``), directement utilisable par flamegraph.pl,
+  speedscope ou inferno ;
+- les fonctions les plus coûteuses sont affichées dans un expander
+  d'administration de la barre latérale.
+
+``PROFILING`` choisit le mode : ``off`` (défaut), ``query`` (paramètre d'URL,
+que tout visiteur peut ajouter : à ne pas activer sur une instance publique)
+ou ``always`` (tous les reruns, en développement). Sans profilage demandé, le
+rerun est exécuté directement : ni cProfile ni thread d'échantillonnage ne
+sont créés, et ces modules ne sont même pas importés.
+"""
+
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from types import FrameType
+from typing import TYPE_CHECKING, Callable, Optional, Tuple, TypeVar
+
+import pandas as pd
+import streamlit as st
+
+from food_analysis.utils.config import Config
+
+if TYPE_CHECKING:
+    import pstats
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_STATE_KEY = "_rerun_profile"
+PROFILE_DIR_NAME = "profiles"
+
+# Période d'échantillonnage de la pile (secondes)
+SAMPLE_INTERVAL_S = 0.005
+
+
+@dataclass
+class RerunProfile:
+    """Résultat du profilage d'un rerun."""
+
+    started_at: str
+    duration_s: float
+    samples: int
+    profile_path: Path
+    stacks_path: Path
+    hotspots: pd.DataFrame
+
+
+class StackSampler:
+    """Échantillonne périodiquement la pile d'un thread (piles « collapsed »)."""
+
+    def __init__(self, thread_id: int, interval_s: float = SAMPLE_INTERVAL_S) -> None:
+        """
+        Prépare l'échantillonnage (sans le démarrer).
+
+        Args:
+            thread_id: Thread observé (threading.get_ident())
+            interval_s: Période d'échantillonnage
+        """
+        self.thread_id = thread_id
+        self.root: Optional[FrameType] = None
+        self.interval_s = interval_s
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+
+    def __enter__(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def call(self, func: Callable[[], T]) -> T:
+        """
+        Appelle une fonction dont seules les piles sont enregistrées.
+
+        Args:
+            func: Fonction observée (dans le thread thread_id)
+
+        Returns:
+            T: résultat de la fonction
+        """
+        # Les cadres appelants (dont l'arrêt de l'échantillonneur) sont ignorés
+        self.root = sys._getframe()
+        return func()
+
+    @property
+    def samples(self) -> int:
+        """Nombre d'échantillons enregistrés."""
+        return sum(self.stacks.values())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                stack = self._collapse(frame)
+                if stack:
+                    self.stacks[stack] += 1
+
+    def _collapse(self, frame: Optional[FrameType]) -> str:
+        names = []
+        while frame is not None and frame is not self.root:
+            code = frame.f_code
+            names.append(
+                f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+            )
+            frame = frame.f_back
+        if frame is None:
+            # Pile extérieure à la fonction observée (avant ou après l'appel)
+            return ""
+        return ";".join(reversed(names))
+
+    def write_collapsed(self, path: Path) -> None:
+        """
+        Écrit les piles au format « collapsed » (une ligne ``pile compte``).
+
+        Args:
+            path: Fichier de destination
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _hotspots(stats: "pstats.Stats", top_n: int) -> pd.DataFrame:
+    """Fonctions les plus coûteuses d'un pstats.Stats (temps propre décroissant)."""
+    rows = []
+    for (filename, line, function), (_, ncalls, tottime, cumtime, _) in (
+        stats.stats.items()  # type: ignore[attr-defined]
+    ):
+        rows.append(
+            {
+                "function": f"{function} ({Path(filename).name}:{line})",
+                "ncalls": ncalls,
+                "tottime_s": round(tottime, 4),
+                "cumtime_s": round(cumtime, 4),
+            }
+        )
+    columns = ["function", "ncalls", "tottime_s", "cumtime_s"]
+    if not rows:
+        empty: pd.DataFrame = pd.DataFrame(columns=columns)
+        return empty
+    top: pd.DataFrame = (
+        pd.DataFrame(rows, columns=columns)
+        .sort_values(["tottime_s", "cumtime_s"], ascending=False)
+        .head(top_n)
+        .reset_index(drop=True)
+    )
+    return top
+
+
+def _prune(directory: Path, keep: int) -> None:
+    """Ne garde que les `keep` derniers profils du dossier."""
+    profiles = sorted(directory.glob("rerun-*.prof"))
+    for old in profiles[: max(len(profiles) - keep, 0)]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".folded").unlink(missing_ok=True)
+
+
+def profile_call(
+    func: Callable[[], T],
+    out_dir: Optional[Path] = None,
+    top_n: int = 25,
+    keep: Optional[int] = None,
+) -> Tuple[T, RerunProfile]:
+    """
+    Exécute une fonction sous cProfile et sous l'échantillonneur de pile.
+
+    Les fichiers sont écrits même si la fonction lève une exception (par
+    exemple l'exception de rerun de Streamlit), qui est alors propagée.
+
+    Args:
+        func: Fonction à profiler (sans argument)
+        out_dir: Dossier des profils (défaut : Config.LOGS_PATH / "profiles")
+        top_n: Nombre de fonctions retenues dans les points chauds
+        keep: Nombre de profils conservés dans le dossier
+            (défaut : Config.PROFILE_KEEP)
+
+    Returns:
+        Tuple[T, RerunProfile]: résultat de la fonction et profil
+    """
+    import cProfile
+    import pstats
+
+    out_dir = out_dir or Config.LOGS_PATH / PROFILE_DIR_NAME
+    out_dir.mkdir(parents=True, exist_ok=True)
+    now = datetime.now()
+    stem = out_dir / f"rerun-{now.strftime('%Y%m%d-%H%M%S-%f')}"
+
+    profiler = cProfile.Profile()
+    sampler = StackSampler(threading.get_ident())
+    start = time.perf_counter()
+    try:
+        with sampler:
+            profiler.enable()
+            try:
+                result = sampler.call(func)
+            finally:
+                profiler.disable()
+    finally:
+        duration = time.perf_counter() - start
+        profile = RerunProfile(
+            started_at=now.isoformat(timespec="seconds"),
+            duration_s=round(duration, 4),
+            samples=sampler.samples,
+            profile_path=stem.with_suffix(".prof"),
+            stacks_path=stem.with_suffix(".folded"),
+            hotspots=_hotspots(pstats.Stats(profiler), top_n),
+        )
+        profiler.dump_stats(profile.profile_path)
+        sampler.write_collapsed(profile.stacks_path)
+        _prune(out_dir, Config.PROFILE_KEEP if keep is None else keep)
+        logger.info(
+            "Rerun profilé en %.3f s : %s", profile.duration_s, profile.profile_path
+        )
+    return result, profile
+
+
+def profiling_requested() -> bool:
+    """Indique si le rerun en cours doit être profilé (voir PROFILING)."""
+    mode = Config.PROFILING
+    if mode == "always":
+        return True
+    if mode != "query":
+        return False
+    return st.query_params.get(PROFILE_QUERY_PARAM, "").lower() in ("1", "true")
+
+
+def run_with_profiler(main: Callable[[], None]) -> None:
+    """
+    Exécute un rerun de l'application, profilé s'il est demandé.
+
+    Avec ``?profile=1``, seul le rerun courant est profilé : le paramètre est
+    retiré de l'URL et le profil reste affiché dans la barre latérale de la
+    session.
+
+    Args:
+        main: Point d'entrée de l'application
+    """
+    if not profiling_requested():
+        main()
+        show_profile(st.session_state.get(PROFILE_STATE_KEY))
+        return
+
+    if Config.PROFILING == "query":
+        del st.query_params[PROFILE_QUERY_PARAM]
+    # Si le rerun est interrompu (st.rerun, st.stop), le profil est tout de
+    # même écrit dans logs/
+    _, profile = profile_call(main)
+    st.session_state[PROFILE_STATE_KEY] = profile
+    show_profile(profile)
+
+
+def show_profile(profile: Optional[RerunProfile]) -> None:
+    """
+    Affiche le dernier profil de la session dans un expander d'administration.
+
+    Args:
+        profile: Profil à afficher (rien n'est affiché si None)
+    """
+    if profile is None:
+        return
+    with st.sidebar.expander("🛠️ Profil du rerun (admin)"):
+        st.caption(
+            f"{profile.started_at} · {profile.duration_s * 1000:.0f} ms · "
+            f"{profile.samples} échantillons"
+        )
+        st.dataframe(profile.hotspots, hide_index=True)
+        st.caption(f"Profil cProfile : `{profile.profile_path}`")
+        st.caption(f"Piles (flamegraph) : `{profile.stacks_path}`")
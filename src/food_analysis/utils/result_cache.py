@@ -0,0 +1,237 @@
+"""Cache de résultats partagé entre les sessions, borné en mémoire.
+
+Les utilisateurs demandent souvent les mêmes classements (m, nombre de
+recettes, filtres, période). Le ``ResultCache`` garde les résultats déjà
+calculés, indexés par les paramètres de la requête et la version des données :
+un nouveau jeu de données produit de nouvelles clés, et les anciennes entrées
+sortent d'elles-mêmes par l'éviction LRU.
+
+La taille de chaque entrée est estimée (``memory_usage(deep=True)`` pour un
+DataFrame) et les entrées les moins récemment utilisées sont évincées dès que
+le total dépasse le plafond (``RESULT_CACHE_MAX_MB``). Les compteurs (succès,
+échecs, évictions) sont exposés par ``stats`` et par la sonde /ready.
+"""
+
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from food_analysis.utils.config import Config
+from food_analysis.utils.locks import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estime l'occupation mémoire d'un résultat, en octets.
+
+    Args:
+        value: Résultat à mettre en cache
+
+    Returns:
+        int: taille estimée
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """Cache LRU thread-safe borné par la taille totale de ses entrées."""
+
+    def __init__(self, max_bytes: int, name: str = "results") -> None:
+        """
+        Initialise un cache vide.
+
+        Args:
+            max_bytes: Taille totale maximale des entrées (0 : cache désactivé)
+            name: Nom du cache dans les journaux
+        """
+        self.max_bytes = max_bytes
+        self.name = name
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Retourne le résultat en cache et le marque comme récemment utilisé.
+
+        Args:
+            key: Clé de la requête
+
+        Returns:
+            Résultat en cache, ou None (compté comme un échec)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def latest(self, match: Callable[[Hashable], bool]) -> Optional[Any]:
+        """
+        Retourne l'entrée la plus récemment utilisée dont la clé convient.
+
+        Ni les compteurs ni l'ordre d'éviction ne sont modifiés : sert à
+        retrouver un résultat voisin (ex. même requête sur une version
+        précédente des données).
+
+        Args:
+            match: Prédicat sur les clés
+
+        Returns:
+            Résultat trouvé, ou None
+        """
+        with self._lock:
+            for key in reversed(self._entries):
+                if match(key):
+                    return self._entries[key][0]
+        return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Ajoute un résultat puis évince les entrées les plus anciennes si besoin.
+
+        Un résultat plus gros que le plafond n'est pas conservé.
+
+        Args:
+            key: Clé de la requête
+            value: Résultat
+        """
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+        logger.debug("Cache %s : %d entrées, %d octets", self.name, len(self), size)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """
+        Retourne le résultat en cache ou le calcule (une seule fois par clé).
+
+        Les sessions qui demandent simultanément la même clé attendent le même
+        calcul.
+
+        Args:
+            key: Clé de la requête
+            compute: Calcul du résultat
+
+        Returns:
+            Résultat en cache ou calculé
+        """
+        value = self.get(key)
+        if value is not None:
+            return value  # type: ignore[no-any-return]
+
+        def compute_and_store() -> T:
+            result = compute()
+            self.put(key, result)
+            return result
+
+        return self._flights.do(key, compute_and_store)
+
+    def clear(self) -> None:
+        """Vide le cache (les compteurs sont conservés)."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Compteurs du cache (taux de succès, évictions, occupation)."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+            }
+
+
+def ranking_key(
+    version: str,
+    m: int,
+    n_recipes: int,
+    filters: Dict[str, Any],
+    period: Optional[Tuple[int, int]],
+    merge_duplicates: bool = False,
+) -> Tuple[Any, ...]:
+    """
+    Construit la clé d'un classement des recettes.
+
+    Args:
+        version: Version du jeu de données
+        m: Paramètre de pondération
+        n_recipes: Nombre de recettes affichées
+        filters: Filtres par plage {colonne: (min, max)}
+        period: (premier mois, dernier mois) ou None
+        merge_duplicates: Avis des recettes en double regroupés
+
+    Returns:
+        Tuple[Any, ...]: clé hachable, indépendante de l'ordre des filtres
+    """
+    return (
+        "ranking",
+        version,
+        m,
+        n_recipes,
+        tuple(sorted(filters.items())),
+        period,
+        merge_duplicates,
+    )
+
+
+_ranking_cache: Optional[ResultCache] = None
+_ranking_cache_lock = threading.Lock()
+
+
+def get_ranking_cache() -> ResultCache:
+    """Cache des classements du processus, partagé par toutes les sessions."""
+    global _ranking_cache
+    with _ranking_cache_lock:
+        if _ranking_cache is None:
+            _ranking_cache = ResultCache(
+                int(Config.RESULT_CACHE_MAX_MB * 1e6), name="ranking"
+            )
+        return _ranking_cache
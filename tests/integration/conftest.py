@@ -0,0 +1,27 @@
+from collections import defaultdict
+from typing import DefaultDict, List
+
+import pytest
+
+engine_timings_key = pytest.StashKey[DefaultDict[str, List[float]]]()
+
+
+@pytest.fixture(scope="session")
+def engine_timings(pytestconfig):
+    """Durées (s) des appels de chaque moteur de classement, par moteur."""
+    return pytestconfig.stash.setdefault(engine_timings_key, defaultdict(list))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    timings = config.stash.get(engine_timings_key, None)
+    if not timings:
+        return
+    terminalreporter.section("Temps des moteurs de classement")
+    terminalreporter.write_line(
+        f"{'moteur':<32}{'appels':>8}{'total (ms)':>12}{'max (ms)':>10}"
+    )
+    for engine, durations in sorted(timings.items()):
+        terminalreporter.write_line(
+            f"{engine:<32}{len(durations):>8}{sum(durations) * 1000:>12.1f}"
+            f"{max(durations) * 1000:>10.1f}"
+        )
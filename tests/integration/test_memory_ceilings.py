@@ -0,0 +1,236 @@
+"""Plafonds mémoire du chargement et du classement, à échelle fixe.
+
+Chaque étape (chargement par DataLoader, compute_recipe_stats, recipe_reviews,
+puis chargement du bundle et lecture des avis dans son store de textes) est
+mesurée dans un interpréteur neuf : pic tracemalloc (objets Python et
+tableaux numpy) et pic de mémoire résidente au-dessus de la RSS de départ
+(VmHWM remis à zéro avant l'étape, Linux). Une copie complète d'un DataFrame
+ajoutée dans le chemin critique fait dépasser le plafond enregistré de
+l'étape.
+
+Le pic tracemalloc est reproductible d'une exécution à l'autre ; le pic de
+RSS dépend de la disposition du tas (une même étape varie de 9 à 12 Mo) et
+reçoit une marge absolue en plus. Les plafonds sont dans
+memory_ceilings.json. Après une évolution voulue, réenregistrez-les (pire de
+RECORD_RUNS mesures + 25 % de marge, plus RSS_SLACK_MB pour la RSS) avec :
+
+    PYTHONPATH=src python tests/integration/test_memory_ceilings.py --record
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from food_analysis.core.bundle import ensure_bundle
+from food_analysis.loadtest import write_synthetic_dataset
+
+SRC_PATH = Path(__file__).resolve().parents[2] / "src"
+CEILINGS_PATH = Path(__file__).with_name("memory_ceilings.json")
+
+# Marge ajoutée aux mesures lors de l'enregistrement des plafonds
+RECORD_MARGIN = 1.25
+# Marge absolue de la RSS (Mo) : bien en dessous d'une copie de la table des
+# interactions (17 Mo à l'échelle enregistrée)
+RSS_SLACK_MB = 4.0
+# Mesures dont le pire est retenu lors de l'enregistrement
+RECORD_RUNS = 3
+
+STAGES = ("load", "recipe_stats", "recipe_reviews", "bundle_load", "bundle_reviews")
+
+MEASURE_PRELUDE = """
+import gc, json, sys, tracemalloc
+from pathlib import Path
+
+
+def rss():
+    memory = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(("VmRSS:", "VmHWM:")):
+                memory[line[:5]] = int(line.split()[1]) * 1024
+    return memory
+
+
+def reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def measure(stage, func):
+    gc.collect()
+    has_rss = reset_peak_rss()
+    before = rss()["VmRSS"]
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results[stage] = {
+        "tracemalloc_peak_mb": round(peak / 1e6, 2),
+        "rss_peak_mb": round((rss()["VmHWM"] - before) / 1e6, 2) if has_rss else None,
+    }
+    return result
+
+
+results = {}
+"""
+
+MEASURE_SCRIPT = (
+    MEASURE_PRELUDE
+    + """
+from food_analysis.core.data_loader import DataLoader
+from food_analysis.core.note_et_avis import compute_recipe_stats, recipe_reviews
+
+loader = DataLoader(Path(sys.argv[1]))
+dataset = measure("load", loader.load_dataset)
+recipes, interactions = dataset.recipes, dataset.interactions
+measure("recipe_stats", lambda: compute_recipe_stats(recipes, interactions, m=10))
+top_recipe = int(interactions["recipe_id"].value_counts().idxmax())
+measure("recipe_reviews", lambda: recipe_reviews(top_recipe, interactions))
+results["interactions_mb"] = round(
+    interactions.memory_usage(deep=True).sum() / 1e6, 2
+)
+print(json.dumps(results))
+"""
+)
+
+# Bundle : textes des avis dans le store compressé, hors de la table chargée
+BUNDLE_SCRIPT = (
+    MEASURE_PRELUDE
+    + """
+from food_analysis.core.bundle import load_bundle
+from food_analysis.core.note_et_avis import recipe_reviews
+
+dataset = measure("bundle_load", lambda: load_bundle(Path(sys.argv[1])))
+interactions, index, store = (
+    dataset.interactions,
+    dataset.review_index,
+    dataset.review_store,
+)
+top_recipe = int(interactions["recipe_id"].value_counts().idxmax())
+measure(
+    "bundle_reviews",
+    lambda: recipe_reviews(top_recipe, interactions, index=index, store=store),
+)
+results["bundle_load"]["interactions_mb"] = round(
+    interactions.memory_usage(deep=True).sum() / 1e6, 2
+)
+print(json.dumps(results))
+"""
+)
+
+
+def load_ceilings() -> Dict[str, Any]:
+    return json.loads(CEILINGS_PATH.read_text())
+
+
+def run_script(script: str, path: Path) -> Dict[str, Any]:
+    """Exécute un script de mesure dans un interpréteur neuf."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(SRC_PATH), env.get("PYTHONPATH")])
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script, str(path)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])  # type: ignore[no-any-return]
+
+
+def measure_stages(raw_path: Path, processed_path: Path) -> Dict[str, Any]:
+    """Mesure les étapes des CSV bruts, puis celles du bundle construit."""
+    results = run_script(MEASURE_SCRIPT, raw_path)
+    ensure_bundle(raw_path, processed_path)
+    results.update(run_script(BUNDLE_SCRIPT, processed_path))
+    return results
+
+
+def write_dataset(raw_path: Path, scale: Dict[str, int]) -> Path:
+    return write_synthetic_dataset(
+        raw_path, scale["n_recipes"], scale["n_interactions"], seed=scale["seed"]
+    )
+
+
+@pytest.fixture(scope="module")
+def measurements(tmp_path_factory):
+    if not Path("/proc/self/status").exists():
+        pytest.skip("Mesure de la mémoire résidente disponible sous Linux seulement")
+    root = tmp_path_factory.mktemp("memory")
+    raw_path = write_dataset(root / "raw", load_ceilings()["scale"])
+    return measure_stages(raw_path, root / "processed")
+
+
+@pytest.mark.parametrize("stage", STAGES)
+@pytest.mark.parametrize("metric", ["tracemalloc_peak_mb", "rss_peak_mb"])
+def test_stage_stays_under_memory_ceiling(measurements, stage, metric):
+    measured = measurements[stage][metric]
+    if measured is None:
+        pytest.skip("Pic de RSS non réinitialisable (/proc/self/clear_refs)")
+    ceiling = load_ceilings()["ceilings"][stage][metric]
+
+    assert measured <= ceiling, (
+        f"{stage} : {metric} = {measured} Mo > plafond {ceiling} Mo "
+        f"(interactions : {measurements['interactions_mb']} Mo). Une copie "
+        "complète a-t-elle été ajoutée ? Si la hausse est voulue, "
+        "réenregistrez les plafonds (voir l'en-tête de ce fichier)."
+    )
+
+
+def test_bundle_keeps_review_text_out_of_memory(measurements):
+    measured = measurements["bundle_load"]["interactions_mb"]
+    ceiling = load_ceilings()["ceilings"]["bundle_load"]["interactions_mb"]
+
+    assert measured <= ceiling, (
+        f"Table des interactions du bundle : {measured} Mo > plafond {ceiling} Mo. "
+        "Les textes des avis sont-ils de nouveau chargés en mémoire ?"
+    )
+    # Sans les textes, la table pèse bien moins que celle des CSV bruts
+    assert measured < measurements["interactions_mb"] / 2
+
+
+def record() -> None:
+    """Mesure les étapes et réécrit memory_ceilings.json avec une marge."""
+    ceilings = load_ceilings()
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_path = write_dataset(Path(tmp) / "raw", ceilings["scale"])
+        for i in range(RECORD_RUNS):
+            runs.append(measure_stages(raw_path, Path(tmp) / f"processed{i}"))
+    worst = {
+        stage: {
+            metric: max(run[stage][metric] for run in runs)
+            for metric, value in runs[0][stage].items()
+            if value is not None
+        }
+        for stage in STAGES
+    }
+    ceilings["ceilings"] = {
+        stage: {
+            metric: round(
+                value * RECORD_MARGIN
+                + (RSS_SLACK_MB if metric == "rss_peak_mb" else 0),
+                1,
+            )
+            for metric, value in measured.items()
+        }
+        for stage, measured in worst.items()
+    }
+    CEILINGS_PATH.write_text(json.dumps(ceilings, indent=2) + "\n")
+    print(json.dumps(worst, indent=2))
+
+
+if __name__ == "__main__":
+    if "--record" in sys.argv:
+        record()
@@ -0,0 +1,320 @@
+"""Tests différentiels des moteurs de classement contre la référence pandas.
+
+Toute implémentation plus rapide de ``compute_recipe_stats`` (agrégats
+précalculés, seaux mensuels, moteurs DuckDB/Polars en mémoire ou sur les
+fichiers Parquet d'un bundle, analyseur avec index de
+plages et cache, classement approché sur un échantillon couvrant toute la
+table) doit produire le même classement et les mêmes notes
+pondérées que ``compute_recipe_stats`` sans option.
+
+Les tables d'interactions sont tirées au hasard (graines fixes) et couvrent
+les cas limites : table vide, recettes sans avis, égalités de notes, notes
+nulles, noms de recettes en double, avis de recettes absentes de la table
+des recettes, m = 0. Les égalités de note pondérée peuvent être départagées
+différemment selon le moteur : seul l'ordre des notes pondérées est imposé,
+les lignes sont comparées une fois remises dans un ordre canonique.
+
+Les durées de chaque moteur sont affichées en fin de session.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from food_analysis.core import backends
+from food_analysis.core.dataset import Dataset
+from food_analysis.core.note_et_avis import (
+    compute_recipe_aggregates,
+    compute_recipe_stats,
+    compute_windowed_recipe_stats,
+)
+from food_analysis.core.ranking_sample import RankingSample
+from food_analysis.core.rating_buckets import MonthlyRatingBuckets
+
+RANKING_COLUMNS = ["recipe_id", "name", "avg_rating", "n_reviews", "weighted_rating"]
+NAMES = ["Tarte", "Soupe", "Gratin", "Salade", "Tarte aux pommes"]
+RATING_PROFILES = {
+    "réaliste": [0.05, 0.01, 0.02, 0.05, 0.17, 0.7],
+    "uniforme": [1 / 6] * 6,
+    "que des 5": [0, 0, 0, 0, 0, 1],
+    "beaucoup de 0": [0.6, 0, 0, 0, 0.2, 0.2],
+}
+SEEDS = range(40)
+RTOL = 1e-9
+
+Case = Tuple[pd.DataFrame, pd.DataFrame, int, Optional[Tuple[int, int]]]
+
+
+def random_case(seed: int) -> Case:
+    """
+    Tire des tables de recettes et d'interactions et des paramètres.
+
+    Returns:
+        Case: recettes, interactions, m et filtre sur minutes (ou None)
+    """
+    rng = np.random.default_rng(seed)
+    n_recipes = int(rng.integers(1, 40))
+    ids = rng.choice(np.arange(1, 1000), n_recipes, replace=False)
+    recipes = pd.DataFrame(
+        {
+            "id": ids,
+            "name": rng.choice(NAMES, n_recipes),
+            "minutes": rng.integers(0, 120, n_recipes),
+        }
+    )
+
+    # Une graine sur dix : aucune interaction
+    n_interactions = 0 if seed % 10 == 9 else int(rng.integers(1, 400))
+    # Environ un tiers des recettes sans avis, et quelques recettes inconnues
+    reviewed = ids[: max(1, (2 * n_recipes) // 3)]
+    unknown = np.arange(2000, 2000 + int(rng.integers(0, 3)))
+    profile = list(RATING_PROFILES.values())[seed % len(RATING_PROFILES)]
+    interactions = pd.DataFrame(
+        {
+            "user_id": rng.integers(1, 50, n_interactions),
+            "recipe_id": rng.choice(
+                np.concatenate([reviewed, unknown]), n_interactions
+            ),
+            "rating": rng.choice(6, n_interactions, p=profile),
+            "date": pd.Timestamp("2005-01-01")
+            + pd.to_timedelta(rng.integers(0, 3000, n_interactions), unit="D"),
+        }
+    )
+    m = int(rng.choice([0, 1, 5, 10, 50]))
+    minutes = None
+    if rng.random() < 0.5:
+        low = int(rng.integers(0, 60))
+        minutes = (low, low + int(rng.integers(0, 60)))
+    return recipes, interactions, m, minutes
+
+
+def reference(
+    recipes: pd.DataFrame,
+    interactions: pd.DataFrame,
+    m: int,
+    minutes: Optional[Tuple[int, int]],
+) -> pd.DataFrame:
+    """Classement de référence (pandas, sans option ni index)."""
+    recipe_ids = None
+    if minutes is not None:
+        selected = recipes["minutes"].between(*minutes)
+        recipe_ids = recipes.loc[selected, "id"].to_numpy()
+    return compute_recipe_stats(recipes, interactions, m=m, recipe_ids=recipe_ids)
+
+
+def _recipe_ids(
+    dataset: Dataset, minutes: Optional[Tuple[int, int]]
+) -> Optional[np.ndarray]:
+    return dataset.range_index.filter({"minutes": minutes} if minutes else {})
+
+
+def backend_engine(name: str) -> Callable[..., pd.DataFrame]:
+    def run(dataset: Dataset, m: int, minutes: Optional[Tuple[int, int]]):
+        return compute_recipe_stats(
+            dataset.recipes,
+            dataset.interactions,
+            m=m,
+            recipe_ids=_recipe_ids(dataset, minutes),
+            backend=backends.BACKENDS[name](),
+        )
+
+    return run
+
+
+def parquet_engine(name: str) -> Callable[..., pd.DataFrame]:
+    def run(dataset: Dataset, m: int, minutes: Optional[Tuple[int, int]]):
+        with tempfile.TemporaryDirectory() as tmp:
+            parquet_dir = Path(tmp)
+            dataset.recipes.to_parquet(parquet_dir / backends.RECIPES_FILE)
+            dataset.interactions.to_parquet(parquet_dir / backends.INTERACTIONS_FILE)
+            # Tables en mémoire vides : le moteur ne lit que les fichiers
+            return compute_recipe_stats(
+                dataset.recipes.iloc[:0],
+                dataset.interactions.iloc[:0],
+                m=m,
+                recipe_ids=_recipe_ids(dataset, minutes),
+                backend=backends.BACKENDS[name](),
+                parquet_dir=parquet_dir,
+            )
+
+    return run
+
+
+def aggregates_engine(dataset: Dataset, m: int, minutes: Optional[Tuple[int, int]]):
+    return compute_recipe_stats(
+        dataset.recipes,
+        dataset.interactions,
+        m=m,
+        recipe_ids=_recipe_ids(dataset, minutes),
+        aggregates=compute_recipe_aggregates(dataset.interactions),
+    )
+
+
+def buckets_engine(dataset: Dataset, m: int, minutes: Optional[Tuple[int, int]]):
+    # Fenêtre couvrant tous les mois : équivalente au classement complet
+    buckets = MonthlyRatingBuckets.from_interactions(dataset.interactions)
+    return compute_windowed_recipe_stats(
+        dataset.recipes,
+        buckets,
+        *buckets.month_range,
+        m=m,
+        recipe_ids=_recipe_ids(dataset, minutes),
+    )
+
+
+def analyzer_engine(dataset: Dataset, m: int, minutes: Optional[Tuple[int, int]]):
+    n_recipes = len(dataset.recipes) + len(dataset.interactions)
+    return dataset.analyzer.get_ranking(
+        m=m, n_recipes=n_recipes, filters={"minutes": minutes} if minutes else {}
+    )
+
+
+def sample_engine(dataset: Dataset, m: int, minutes: Optional[Tuple[int, int]]):
+    # Échantillon de toute la table : l'estimation doit être exacte
+    sample = RankingSample.from_interactions(
+        dataset.interactions, size=len(dataset.interactions) + 1
+    )
+    unversioned = Dataset(
+        dataset.recipes, dataset.interactions, artifacts={"ranking_sample": sample}
+    )
+    approximate = unversioned.analyzer.get_approximate_ranking(
+        m=m,
+        n_recipes=len(dataset.recipes) + len(dataset.interactions),
+        filters={"minutes": minutes} if minutes else {},
+    )
+    if approximate is None:
+        return pd.DataFrame(columns=RANKING_COLUMNS)
+    return approximate.ranking
+
+
+ENGINES: Dict[str, Callable[..., pd.DataFrame]] = {
+    "backend pandas": backend_engine("pandas"),
+    "backend duckdb": backend_engine("duckdb"),
+    "backend polars": backend_engine("polars"),
+    "parquet duckdb": parquet_engine("duckdb"),
+    "parquet polars": parquet_engine("polars"),
+    "agrégats précalculés": aggregates_engine,
+    "seaux mensuels": buckets_engine,
+    "analyseur": analyzer_engine,
+    "échantillon complet": sample_engine,
+}
+
+
+@pytest.fixture(params=list(ENGINES))
+def engine(request):
+    name = request.param
+    if name.startswith(("backend ", "parquet ")) and name != "backend pandas":
+        pytest.importorskip(name.split()[1])
+    return name, ENGINES[name]
+
+
+def canonical(ranking: pd.DataFrame) -> pd.DataFrame:
+    """Classement remis dans un ordre indépendant du départage des égalités."""
+    ranking = ranking.astype(
+        {
+            "recipe_id": "int64",
+            "name": object,
+            "avg_rating": "float64",
+            "n_reviews": "int64",
+        }
+    )
+    ranking["name"] = ranking["name"].where(ranking["name"].notna(), None)
+    return (
+        ranking.assign(_key=-ranking["weighted_rating"].round(9))
+        .sort_values(
+            ["_key", "name", "n_reviews", "avg_rating", "recipe_id"],
+            na_position="last",
+        )
+        .drop(columns="_key")
+        .reset_index(drop=True)
+    )
+
+
+def assert_same_ranking(result: pd.DataFrame, expected: pd.DataFrame) -> None:
+    """Même classement (aux égalités près) et mêmes valeurs, à RTOL près."""
+    assert list(result.columns) == RANKING_COLUMNS
+    assert len(result) == len(expected)
+    np.testing.assert_allclose(
+        result["weighted_rating"].to_numpy(dtype="float64"),
+        expected["weighted_rating"].to_numpy(dtype="float64"),
+        rtol=RTOL,
+    )
+    pd.testing.assert_frame_equal(
+        canonical(result), canonical(expected), check_dtype=False, rtol=RTOL
+    )
+
+
+def timed(engine_timings, name: str, func: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    start = time.perf_counter()
+    result = func()
+    engine_timings[name].append(time.perf_counter() - start)
+    return result
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_engine_matches_reference(engine, engine_timings, seed):
+    name, run = engine
+    recipes, interactions, m, minutes = random_case(seed)
+    dataset = Dataset(recipes, interactions, version=f"equivalence-{seed}")
+
+    expected = timed(
+        engine_timings,
+        "référence",
+        lambda: reference(recipes, interactions, m, minutes),
+    )
+    result = timed(engine_timings, name, lambda: run(dataset, m, minutes))
+
+    assert_same_ranking(result, expected)
+
+
+def test_engine_top_k_matches_reference(engine_timings):
+    # Le classement tronqué garde les mêmes notes pondérées que la référence
+    recipes, interactions, m, _ = random_case(3)
+    dataset = Dataset(recipes, interactions)
+
+    result = dataset.analyzer.get_ranking(m=m, n_recipes=5)
+    expected = reference(recipes, interactions, m, None).head(5)
+
+    np.testing.assert_allclose(
+        result["weighted_rating"], expected["weighted_rating"], rtol=RTOL
+    )
+
+
+def test_engine_matches_reference_at_scale(engine, engine_timings):
+    name, run = engine
+    rng = np.random.default_rng(0)
+    n_recipes, n_interactions = 20_000, 500_000
+    ids = np.arange(1, n_recipes + 1)
+    recipes = pd.DataFrame(
+        {
+            "id": ids,
+            "name": [f"recette {i % 5000}" for i in ids],
+            "minutes": rng.integers(0, 240, n_recipes),
+        }
+    )
+    interactions = pd.DataFrame(
+        {
+            "user_id": rng.integers(1, 100_000, n_interactions),
+            "recipe_id": ids[rng.zipf(1.5, n_interactions) % n_recipes],
+            "rating": rng.choice(6, n_interactions, p=RATING_PROFILES["réaliste"]),
+            "date": pd.Timestamp("2000-01-01")
+            + pd.to_timedelta(rng.integers(0, 6900, n_interactions), unit="D"),
+        }
+    )
+    dataset = Dataset(recipes, interactions, version="equivalence-scale")
+
+    expected = timed(
+        engine_timings,
+        "référence (échelle)",
+        lambda: reference(recipes, interactions, 10, (10, 60)),
+    )
+    result = timed(
+        engine_timings, f"{name} (échelle)", lambda: run(dataset, 10, (10, 60))
+    )
+
+    assert_same_ranking(result, expected)
@@ -1,4 +1,6 @@
 # tests/unit/test_data_analyzer.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
 import pandas as pd
@@ -59,3 +61,242 @@ def test_plot_rating_distribution_no_ratings() -> None:
         # Même sans données, plt.hist et plt.show doivent être appelés
         mock_plt.hist.assert_called_once()
         mock_plt.show.assert_called_once()
+
+
+@pytest.fixture
+def dataset():
+    from food_analysis.core.dataset import Dataset
+
+    recipes = pd.DataFrame(
+        {"id": [1, 2, 3], "name": ["Tarte", "Soupe", "Gratin"], "minutes": [30, 10, 60]}
+    )
+    interactions = pd.DataFrame(
+        {
+            "user_id": [10, 11, 12, 10, 13, 14],
+            "recipe_id": [1, 1, 1, 2, 2, 3],
+            "rating": [5, 4, 3, 5, 0, 2],
+            "date": pd.date_range("2024-01-01", periods=6),
+            "review": ["a", "b", "c", "d", "e", "f"],
+        }
+    )
+    return Dataset(recipes, interactions, version="v1")
+
+
+def test_analyzer_is_one_per_dataset(dataset):
+    assert dataset.analyzer is dataset.analyzer
+    assert dataset.analyzer.dataset is dataset
+
+
+def test_analyzer_without_dataset():
+    with pytest.raises(ValueError):
+        DataAnalyzer().get_basic_stats()
+
+
+def test_get_basic_stats(dataset):
+    stats = dataset.analyzer.get_basic_stats()
+
+    assert stats["total_recipes"] == 3
+    assert stats["total_interactions"] == 6
+    assert stats["total_users"] == 5
+    assert dataset.analyzer.get_average_rating() == pytest.approx(19 / 5)
+    # Mémorisé : le même objet est retourné
+    assert dataset.analyzer.get_basic_stats() is stats
+
+
+def test_get_activity_metrics(dataset):
+    metrics = dataset.analyzer.get_activity_metrics()
+
+    assert metrics["n_reviews"] == 6
+    assert metrics["avg_rating"] == pytest.approx(19 / 5)
+    assert metrics["n_users"] == 5
+    assert metrics["n_recipes"] == 3
+    assert metrics["reviews_per_recipe"][0.5] == 2.0
+    assert metrics["ratings_per_user"][0.5] == 1.0
+    # Période vide : aucun quantile
+    assert dataset.analyzer.get_activity_metrics((0, 1))["reviews_per_recipe"] == {}
+
+
+def test_get_top_recipes(dataset):
+    top = dataset.analyzer.get_top_recipes(n=2)
+
+    assert top["name"].tolist() == ["Tarte", "Soupe"]
+    assert top["n_reviews"].tolist() == [3, 2]
+
+
+def test_get_ranking_shared_through_result_cache(dataset, monkeypatch):
+    from food_analysis.utils import result_cache
+
+    cache = result_cache.ResultCache(10**6)
+    monkeypatch.setattr(result_cache, "_ranking_cache", cache)
+
+    first = dataset.analyzer.get_ranking(m=1, n_recipes=2)
+    second = dataset.analyzer.get_ranking(m=1, n_recipes=2)
+
+    assert second is first
+    assert len(first) == 2
+    assert first["weighted_rating"].is_monotonic_decreasing
+    assert cache.stats["hits"] == 1
+
+
+def test_get_ranking_with_filters(dataset):
+    ranking = dataset.analyzer.get_ranking(m=1, filters={"minutes": (None, 30.0)})
+
+    assert set(ranking["name"]) == {"Tarte", "Soupe"}
+
+
+def test_get_recipe(dataset):
+    assert dataset.analyzer.get_recipe(2)["name"] == "Soupe"
+    assert dataset.analyzer.get_recipe(99) is None
+
+
+def test_get_rating_distribution(dataset):
+    counts = dataset.analyzer.get_rating_distribution(1)
+
+    assert counts.index.tolist() == [0, 1, 2, 3, 4, 5]
+    assert counts.tolist() == [0, 0, 0, 1, 1, 1]
+    assert dataset.analyzer.get_rating_distribution(99).sum() == 0
+
+
+def test_get_recipe_reviews_newest_first(dataset):
+    reviews = dataset.analyzer.get_recipe_reviews(1)
+
+    assert reviews["review"].tolist() == ["c", "b", "a"]
+
+
+def test_get_recipe_reviews_page(dataset):
+    reviews = dataset.analyzer.get_recipe_reviews(1, offset=1, limit=1)
+
+    assert reviews["review"].tolist() == ["b"]
+    assert dataset.analyzer.get_recipe_reviews(1, offset=2)["review"].tolist() == ["a"]
+
+
+def test_get_user_rating_distribution(dataset):
+    counts = dataset.analyzer.get_user_rating_distribution(10)
+
+    assert counts.tolist() == [0, 0, 0, 0, 0, 2]
+
+
+def test_submit_ranking_runs_in_background(dataset):
+    future = dataset.analyzer.submit_ranking(m=1, n_recipes=2)
+
+    pd.testing.assert_frame_equal(
+        future.result(timeout=10), dataset.analyzer.get_ranking(m=1, n_recipes=2)
+    )
+
+
+def test_submit_ranking_cancels_superseded_requests(dataset, monkeypatch):
+    from food_analysis.core import analyzer
+
+    # Un seul thread, occupé : les demandes suivantes restent en attente
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(analyzer, "_executor", executor)
+    release = threading.Event()
+    executor.submit(release.wait)
+
+    first = dataset.analyzer.submit_ranking(m=1, session_key="a")
+    other = dataset.analyzer.submit_ranking(m=2, session_key="b")
+    second = dataset.analyzer.submit_ranking(m=3, session_key="a")
+    last = dataset.analyzer.submit_ranking(m=4, session_key="a")
+    release.set()
+
+    assert first.cancelled() and second.cancelled()
+    pd.testing.assert_frame_equal(
+        last.result(timeout=10), dataset.analyzer.get_ranking(m=4)
+    )
+    assert not other.result(timeout=10).empty
+    executor.shutdown()
+    assert "a" not in analyzer._pending and "b" not in analyzer._pending
+
+
+def test_approximate_ranking_from_sample(dataset, monkeypatch):
+    from food_analysis.utils import result_cache
+
+    monkeypatch.setattr(result_cache, "_ranking_cache", result_cache.ResultCache(0))
+
+    approximate = dataset.analyzer.get_approximate_ranking(m=1, n_recipes=2)
+
+    # Échantillon plus grand que la table : estimation exacte
+    assert approximate.source == "sample"
+    assert approximate.sample_fraction == 1.0
+    pd.testing.assert_frame_equal(
+        approximate.ranking,
+        dataset.analyzer.get_ranking(m=1, n_recipes=2),
+        check_dtype=False,
+    )
+
+
+def test_approximate_ranking_with_filters(dataset):
+    approximate = dataset.analyzer.get_approximate_ranking(
+        m=1, filters={"minutes": (None, 30.0)}
+    )
+
+    assert set(approximate.ranking["name"]) == {"Tarte", "Soupe"}
+
+
+def test_approximate_ranking_reuses_previous_version(dataset, monkeypatch):
+    from food_analysis.core.dataset import Dataset
+    from food_analysis.utils import result_cache
+
+    monkeypatch.setattr(result_cache, "_ranking_cache", result_cache.ResultCache(10**6))
+    previous = dataset.analyzer.get_ranking(m=1, n_recipes=2)
+    updated = Dataset(dataset.recipes, dataset.interactions, version="v2")
+
+    approximate = updated.analyzer.get_approximate_ranking(m=1, n_recipes=2)
+
+    assert approximate.source == "stale"
+    assert approximate.ranking is previous
+    # Autres paramètres : estimation sur l'échantillon
+    other = updated.analyzer.get_approximate_ranking(m=5, n_recipes=2)
+    assert other.source == "sample"
+
+
+def test_get_full_ranking_is_not_truncated(dataset):
+    full = dataset.analyzer.get_full_ranking(m=1)
+
+    assert len(full) == 3
+    pd.testing.assert_frame_equal(
+        full.head(2), dataset.analyzer.get_ranking(m=1, n_recipes=2)
+    )
+
+
+def test_ranking_merges_duplicates(dataset, monkeypatch):
+    from food_analysis.core.dataset import Dataset
+    from food_analysis.core.duplicates import DuplicateGroups
+    from food_analysis.utils import result_cache
+
+    monkeypatch.setattr(result_cache, "_ranking_cache", result_cache.ResultCache(10**6))
+    groups = DuplicateGroups(
+        pd.DataFrame({"recipe_id": [1, 2], "group_id": [1, 1], "similarity": 0.9})
+    )
+    deduplicated = Dataset(
+        dataset.recipes,
+        dataset.interactions,
+        version="v1-dedup",
+        artifacts={"duplicate_groups": groups},
+    )
+    analyzer = deduplicated.analyzer
+
+    ranking = analyzer.get_ranking(m=1, merge_duplicates=True)
+
+    # Les avis de Soupe sont comptés sur Tarte
+    assert ranking["name"].tolist() == ["Tarte", "Gratin"]
+    assert ranking["n_reviews"].tolist() == [5, 1]
+    assert ranking["avg_rating"].iloc[0] == pytest.approx(17 / 5)
+    assert len(analyzer.get_ranking(m=1)) == 3
+    # Même regroupement sur une période et dans le classement approché
+    period = deduplicated.rating_buckets.month_range
+    pd.testing.assert_frame_equal(
+        analyzer.get_full_ranking(m=1, period=period, merge_duplicates=True),
+        ranking,
+        check_dtype=False,
+    )
+    monkeypatch.setattr(result_cache, "_ranking_cache", result_cache.ResultCache(0))
+    approximate = analyzer.get_approximate_ranking(m=1, merge_duplicates=True)
+    assert approximate.ranking["n_reviews"].tolist() == [5, 1]
+
+
+def test_merge_duplicates_without_groups(dataset):
+    pd.testing.assert_frame_equal(
+        dataset.analyzer.get_ranking(m=1, merge_duplicates=True),
+        dataset.analyzer.get_ranking(m=1),
+    )
@@ -0,0 +1,271 @@
+import gzip
+import http.client
+import json
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from food_analysis import api, server
+from food_analysis.cli import main
+from food_analysis.core.dataset import Dataset
+from food_analysis.core.watcher import DatasetWatcher
+from food_analysis.utils import result_cache
+from food_analysis.utils.result_cache import ResultCache, ranking_key
+
+
+@pytest.fixture
+def dataset():
+    recipes = pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "name": ["Tarte", "Soupe", "Gratin"],
+            "minutes": [30, 10, 60],
+            "n_steps": [5, 2, 8],
+            "n_ingredients": [6, 3, 9],
+        }
+    )
+    interactions = pd.DataFrame(
+        {
+            "user_id": [10, 11, 12, 13, 14],
+            "recipe_id": [1, 1, 2, 3, 1],
+            "rating": [5, 4, 3, 2, 0],
+            "date": pd.to_datetime(
+                ["2020-01-05", "2021-03-01", "2019-06-01", "2021-02-01", "2020-07-01"]
+            ),
+            "review": ["Parfait", "Bon", "Bof", "Trop long", "Pas fait"],
+        }
+    )
+    return Dataset(recipes, interactions, version="v1")
+
+
+@pytest.fixture(autouse=True)
+def caches(monkeypatch):
+    monkeypatch.setattr(result_cache, "_ranking_cache", ResultCache(10**6))
+    monkeypatch.setattr(api, "_response_cache", ResultCache(10**6, name="api"))
+
+
+@pytest.fixture
+def watcher(dataset, monkeypatch):
+    watcher = DatasetWatcher(lambda: dataset, lambda: "v1", interval_s=0)
+    monkeypatch.setattr(server, "_watcher", watcher.start())
+    return watcher
+
+
+@pytest.fixture
+def connection(watcher):
+    api_server = api.start_api_server(0, host="127.0.0.1")
+    connection = http.client.HTTPConnection("127.0.0.1", api_server.server_address[1])
+    yield connection
+    connection.close()
+    api_server.shutdown()
+
+
+def request(connection, path, headers=None):
+    connection.request("GET", path, headers=headers or {})
+    response = connection.getresponse()
+    return response, response.read()
+
+
+def get_json(connection, path):
+    response, body = request(connection, path)
+    return response.status, json.loads(body)
+
+
+def test_ranking_page_and_pagination(connection):
+    status, body = get_json(connection, "/api/ranking?m=1&limit=2")
+
+    assert status == 200
+    assert body["version"] == "v1"
+    assert [item["rank"] for item in body["items"]] == [1, 2]
+    assert body["items"][0]["name"] == "Tarte"
+    assert body["items"][0]["recipe_id"] == 1
+    assert body["items"][0]["n_reviews"] == 3
+    assert body["next_offset"] == 2
+
+    status, body = get_json(connection, "/api/ranking?m=1&limit=2&offset=2")
+    assert [item["rank"] for item in body["items"]] == [3]
+    assert body["next_offset"] is None
+
+
+def test_ranking_ids_with_duplicate_names(connection, dataset, monkeypatch):
+    recipes = dataset.recipes.assign(name=["Tarte", "Tarte", "Gratin"])
+    twins = Dataset(recipes, dataset.interactions.copy(), version="v2")
+    watcher = DatasetWatcher(lambda: twins, lambda: "v2", interval_s=0)
+    monkeypatch.setattr(server, "_watcher", watcher.start())
+
+    _, body = get_json(connection, "/api/ranking?m=0")
+
+    reviews = {item["recipe_id"]: item["n_reviews"] for item in body["items"]}
+    assert reviews == {1: 3, 2: 1, 3: 1}
+    assert [item["name"] for item in body["items"]].count("Tarte") == 2
+
+
+def test_ranking_matches_page_engine(connection, dataset):
+    _, body = get_json(connection, "/api/ranking?m=5&minutes_max=40")
+
+    expected = dataset.analyzer.get_ranking(
+        m=5, n_recipes=20, filters={"minutes": (None, 40.0)}
+    )
+    assert [item["name"] for item in body["items"]] == expected["name"].tolist()
+    assert body["filters"] == {"minutes": {"min": None, "max": 40.0}}
+    # Même classement que la page, partagé dans le cache des classements
+    key = ranking_key("v1", 5, api.RANKING_BLOCK, {"minutes": (None, 40.0)}, None)
+    assert key in result_cache.get_ranking_cache()
+
+
+def test_ranking_period(connection):
+    _, body = get_json(
+        connection, "/api/ranking?m=1&period_start=2021-01&period_end=2021-12"
+    )
+
+    assert body["period"] == {"start": "2021-01", "end": "2021-12"}
+    assert {item["name"] for item in body["items"]} == {"Tarte", "Gratin"}
+
+    # Toute la plage des données : même requête que sans période
+    _, body = get_json(connection, "/api/ranking?period_start=2019-06")
+    assert body["period"] is None
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "m=abc",
+        "limit=0",
+        "limit=100000",
+        "offset=-1",
+        "minutes_max=beaucoup",
+        "period_start=2021-13",
+        "period_start=2021-06&period_end=2020-01",
+        "inconnu=1",
+    ],
+)
+def test_ranking_invalid_parameters(connection, query):
+    status, body = get_json(connection, f"/api/ranking?{query}")
+
+    assert status == 400
+    assert body["error"]
+
+
+def test_recipe_details(connection):
+    status, body = get_json(connection, "/api/recipes/1")
+
+    assert status == 200
+    assert body["recipe"]["name"] == "Tarte"
+    assert body["recipe"]["minutes"] == 30
+    assert body["n_reviews"] == 3
+    assert body["avg_rating"] == pytest.approx(3.0)
+    assert body["rating_distribution"] == {
+        "0": 1,
+        "1": 0,
+        "2": 0,
+        "3": 0,
+        "4": 1,
+        "5": 1,
+    }
+
+
+def test_recipe_reviews_paginated(connection):
+    status, body = get_json(connection, "/api/recipes/1/reviews?limit=2")
+
+    assert status == 200
+    assert body["total"] == 3
+    assert [item["review"] for item in body["items"]] == ["Bon", "Pas fait"]
+    assert body["items"][0]["date"].startswith("2021-03-01")
+    assert body["next_offset"] == 2
+
+    _, body = get_json(connection, "/api/recipes/1/reviews?limit=2&offset=2")
+    assert [item["review"] for item in body["items"]] == ["Parfait"]
+    assert body["next_offset"] is None
+
+
+def test_unknown_resources(connection):
+    assert get_json(connection, "/api/recipes/99")[0] == 404
+    assert get_json(connection, "/api/recipes/99/reviews")[0] == 404
+    assert get_json(connection, "/api/inconnu")[0] == 404
+
+
+def test_etag_and_conditional_request(connection):
+    response, _ = request(connection, "/api/version")
+    etag = response.getheader("ETag")
+    assert etag == 'W/"v1"'
+    assert response.getheader("Cache-Control") == "no-cache"
+
+    response, body = request(connection, "/api/ranking", {"If-None-Match": etag})
+    assert response.status == 304
+    assert body == b""
+
+    response, _ = request(connection, "/api/ranking", {"If-None-Match": 'W/"v0"'})
+    assert response.status == 200
+
+    # Pas d'ETag sur une erreur
+    response, _ = request(connection, "/api/recipes/99", {"If-None-Match": etag})
+    assert response.status == 404
+    assert response.getheader("ETag") is None
+
+
+def test_gzip_only_when_accepted_and_large(connection, monkeypatch):
+    monkeypatch.setattr(api, "GZIP_MIN_BYTES", 10)
+
+    response, body = request(connection, "/api/ranking", {"Accept-Encoding": "gzip"})
+    assert response.getheader("Content-Encoding") == "gzip"
+    assert response.getheader("Vary") == "Accept-Encoding"
+    assert json.loads(gzip.decompress(body))["items"]
+
+    response, body = request(connection, "/api/ranking")
+    assert response.getheader("Content-Encoding") is None
+    assert json.loads(body)["items"]
+
+    response, _ = request(connection, "/api/ranking", {"Accept-Encoding": "gzip;q=0"})
+    assert response.getheader("Content-Encoding") is None
+
+
+def test_keep_alive_reuses_connection(connection):
+    request(connection, "/api/version")
+    sock = connection.sock
+
+    response, _ = request(connection, "/api/version")
+
+    assert response.status == 200
+    assert connection.sock is sock
+
+
+def test_responses_cached_per_version(dataset):
+    with patch.object(api, "ranking_payload", wraps=api.ranking_payload) as payload:
+        first = api.get_response(dataset, "/api/ranking", "m=1&limit=2")
+        again = api.get_response(dataset, "/api/ranking", "limit=2&m=1")
+
+    assert again is first
+    assert payload.call_count == 1
+
+    other = Dataset(dataset.recipes.copy(), dataset.interactions.copy(), "v2")
+    assert api.get_response(other, "/api/ranking", "m=1&limit=2") is not first
+
+
+def test_missing_data_returns_503(monkeypatch):
+    monkeypatch.setattr(server, "_watcher", None)
+    api_server = api.start_api_server(0, host="127.0.0.1")
+    connection = http.client.HTTPConnection("127.0.0.1", api_server.server_address[1])
+    try:
+        with patch.object(
+            server, "load_dataset", side_effect=FileNotFoundError("absent")
+        ):
+            status, body = get_json(connection, "/api/version")
+    finally:
+        connection.close()
+        api_server.shutdown()
+
+    assert status == 503
+    assert "absent" in body["error"]
+
+
+def test_cli_api_port():
+    with (
+        patch.object(api, "serve_api", return_value=0) as mock_serve,
+        patch.object(api.Config, "API_PORT", 0),
+    ):
+        assert main(["api", "--host", "127.0.0.1"]) == 0
+        assert main(["api", "--port", "9000"]) == 0
+
+    assert mock_serve.call_args_list[0].args == ("127.0.0.1", api.DEFAULT_PORT)
+    assert mock_serve.call_args_list[1].args == ("0.0.0.0", 9000)
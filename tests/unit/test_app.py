@@ -7,6 +7,8 @@ import pytest
 sys.path.insert(0, "src")
 
 import food_analysis.app as main_module
+from food_analysis.core.dataset import Dataset
+from food_analysis.core.watcher import DatasetWatcher
 
 print(main_module.main)
 
@@ -36,16 +38,23 @@ def sample_interactions_df():
 
 
 def mock_load_data(recipes_df, interactions_df):
-    """Retourne une fonction qui renvoie les dataframes mockés"""
+    """Retourne une fonction qui renvoie un watcher servant les données mockées"""
 
     def inner():
-        return recipes_df, interactions_df
+        dataset = Dataset(recipes_df, interactions_df, version="v1")
+        return DatasetWatcher(lambda: dataset, lambda: "v1", interval_s=0).start()
 
     return inner
 
 
 def test_main_normal(sample_recipes_df, sample_interactions_df):
-    with patch("food_analysis.app.st") as mock_st:
+    with (
+        patch("food_analysis.app.st") as mock_st,
+        patch(
+            "food_analysis.app.get_data_watcher",
+            side_effect=mock_load_data(sample_recipes_df, sample_interactions_df),
+        ),
+    ):
         # Mock complet des contextes Streamlit
         mock_st.spinner.return_value.__enter__.return_value = None
         mock_st.sidebar.__enter__.return_value = mock_st.sidebar
@@ -58,11 +67,6 @@ def test_main_normal(sample_recipes_df, sample_interactions_df):
         mock_st.error.return_value = None
         mock_st.exception.return_value = None
 
-        # Mock de st.cache_data pour le chargement des données
-        mock_st.cache_data.return_value = mock_load_data(
-            sample_recipes_df, sample_interactions_df
-        )
-
         main_module.main()
 
         # Vérifications simples
@@ -73,7 +77,13 @@ def test_main_normal(sample_recipes_df, sample_interactions_df):
 
 
 def test_main_file_not_found():
-    with patch("food_analysis.app.st") as mock_st:
+    with (
+        patch("food_analysis.app.st") as mock_st,
+        patch(
+            "food_analysis.app.get_data_watcher",
+            side_effect=FileNotFoundError("Fichier manquant"),
+        ),
+    ):
         # Simule FileNotFoundError
         mock_st.spinner.return_value.__enter__.return_value = None
         mock_st.sidebar.__enter__.return_value = mock_st.sidebar
@@ -84,11 +94,6 @@ def test_main_file_not_found():
         mock_st.error.return_value = None
         mock_st.exception.return_value = None
 
-        def load_data_fail():
-            raise FileNotFoundError("Fichier manquant")
-
-        mock_st.cache_data.return_value = load_data_fail
-
         main_module.main()
 
         # Vérifie que st.error a été appelé
@@ -98,16 +103,37 @@ def test_main_file_not_found():
 
 def test_show_home_page(sample_recipes_df, sample_interactions_df):
     with patch("food_analysis.app.st") as mock_st:
-        mock_st.columns.return_value = [MagicMock(), MagicMock(), MagicMock()]
+        mock_st.columns.side_effect = lambda n: [MagicMock() for _ in range(n)]
         mock_st.metric.return_value = None
         mock_st.header.return_value = None
         mock_st.markdown.return_value = None
 
-        main_module.show_home_page(sample_recipes_df, sample_interactions_df)
+        main_module.show_home_page(Dataset(sample_recipes_df, sample_interactions_df))
 
         mock_st.header.assert_called_once()
-        mock_st.columns.assert_called_once()
+        # Indicateurs globaux, puis activité sur la période choisie
+        assert [c.args for c in mock_st.columns.call_args_list] == [(3,), (4,)]
         mock_st.metric.assert_called()
+        mock_st.dataframe.assert_called_once()
+
+
+def test_show_activity_metrics(sample_recipes_df, sample_interactions_df):
+    dataset = Dataset(sample_recipes_df, sample_interactions_df, version="v1")
+    with (
+        patch("food_analysis.app.st") as mock_st,
+        patch("food_analysis.app.show_period_filter", return_value=None),
+    ):
+        mock_st.columns.side_effect = lambda n: [MagicMock() for _ in range(n)]
+
+        main_module.show_activity_metrics(dataset.analyzer, dataset.rating_buckets)
+
+    values = [c.args[1] for c in mock_st.metric.call_args_list]
+    assert values == ["3", "4.00/5", "≈ 3", "≈ 2"]
+    quantiles = mock_st.dataframe.call_args.args[0]
+    assert quantiles.loc["Avis par recette", "Médiane"] == 1.5
+    assert quantiles.loc["Notes par utilisateur", "Médiane"] == 1.0
+    # Erreur annoncée tirée de la précision des esquisses
+    assert "~1,6 % près" in mock_st.caption.call_args.args[0]
 
 
 def test_show_about_page():
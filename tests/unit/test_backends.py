@@ -0,0 +1,124 @@
+import sys
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from food_analysis.core import backends
+from food_analysis.core.backends import PandasBackend, get_backend
+from food_analysis.core.note_et_avis import (
+    compute_recipe_aggregates,
+    compute_recipe_stats,
+    rank_recipe_stats,
+    recipe_reviews,
+)
+
+
+@pytest.fixture
+def recipe_df():
+    return pd.DataFrame(
+        {"id": [1, 2, 3, 4], "name": ["Tarte", "Soupe", "Gratin", "Salade"]}
+    )
+
+
+@pytest.fixture
+def interaction_df():
+    rng = np.random.default_rng(0)
+    n = 200
+    return pd.DataFrame(
+        {
+            "user_id": rng.integers(1, 50, n),
+            "recipe_id": rng.integers(1, 5, n),
+            "rating": rng.integers(0, 6, n),
+            "date": pd.Timestamp("2020-01-01")
+            + pd.to_timedelta(rng.permutation(n), unit="D"),
+            "review": [f"avis {i}" for i in range(n)],
+        }
+    )
+
+
+@pytest.fixture(params=["pandas", "duckdb", "polars"])
+def backend(request):
+    if request.param != "pandas":
+        pytest.importorskip(request.param)
+    return backends.BACKENDS[request.param]()
+
+
+def test_recipe_aggregates_match_reference(backend, interaction_df):
+    result = backend.recipe_aggregates(interaction_df)
+    expected = compute_recipe_aggregates(interaction_df)
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("recipe_ids", [None, np.array([2, 4])])
+def test_rank_recipes_match_reference(backend, recipe_df, interaction_df, recipe_ids):
+    aggregates = compute_recipe_aggregates(interaction_df)
+
+    result = backend.rank_recipes(aggregates, recipe_df, m=5, recipe_ids=recipe_ids)
+    expected = rank_recipe_stats(aggregates, recipe_df, m=5, recipe_ids=recipe_ids)
+
+    assert list(result.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_recipe_reviews_match_reference(backend, interaction_df):
+    result = backend.recipe_reviews(3, interaction_df)
+    expected = recipe_reviews(3, interaction_df)
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_compute_recipe_stats_with_backend(backend, recipe_df, interaction_df):
+    result = compute_recipe_stats(recipe_df, interaction_df, m=5, backend=backend)
+    expected = compute_recipe_stats(recipe_df, interaction_df, m=5)
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_engines_read_bundle_parquet(backend, recipe_df, interaction_df, tmp_path):
+    if backend.name == "pandas":
+        pytest.skip("La référence pandas travaille en mémoire")
+    recipe_df.to_parquet(tmp_path / backends.RECIPES_FILE, index=False)
+    interaction_df.to_parquet(tmp_path / backends.INTERACTIONS_FILE, index=False)
+
+    # Tables en mémoire vides : les résultats ne peuvent venir que des fichiers
+    aggregates = backend.recipe_aggregates(
+        interaction_df.iloc[:0], parquet_dir=tmp_path
+    )
+    ranking = backend.rank_recipes(
+        aggregates, recipe_df.iloc[:0], m=5, parquet_dir=tmp_path
+    )
+
+    expected = compute_recipe_stats(recipe_df, interaction_df, m=5)
+    pd.testing.assert_frame_equal(ranking, expected, check_dtype=False)
+
+
+def test_missing_parquet_falls_back_to_memory(backend, interaction_df, tmp_path):
+    # Bundle supprimé depuis son chargement (prune_bundles)
+    result = backend.recipe_aggregates(interaction_df, parquet_dir=tmp_path)
+
+    pd.testing.assert_frame_equal(
+        result, compute_recipe_aggregates(interaction_df), check_dtype=False
+    )
+
+
+def test_get_backend_defaults_to_config():
+    with patch.object(backends.Config, "COMPUTE_BACKEND", "pandas"):
+        assert isinstance(get_backend(), PandasBackend)
+
+
+def test_get_backend_unknown():
+    with pytest.raises(ValueError, match="inconnu"):
+        get_backend("spark")
+
+
+def test_get_backend_falls_back_to_pandas_when_not_installed(monkeypatch):
+    monkeypatch.setattr(backends, "_INSTANCES", {})
+    # Un module à None dans sys.modules fait échouer son import
+    with patch.dict(sys.modules, {"duckdb": None}):
+        backend = get_backend("duckdb")
+
+    assert isinstance(backend, PandasBackend)
+    assert get_backend("duckdb") is backend
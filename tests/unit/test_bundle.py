@@ -0,0 +1,299 @@
+import errno
+import json
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from food_analysis.cli import main
+from food_analysis.core import bundle as bundle_module
+from food_analysis.core import review_store
+from food_analysis.core.bundle import (
+    MANIFEST_FILE,
+    BundleError,
+    build_bundle,
+    bundle_path,
+    current_version,
+    ensure_bundle,
+    load_bundle,
+)
+from food_analysis.core.data_loader import DataLoader
+from food_analysis.utils.config import Config
+
+
+@pytest.fixture
+def raw_path(tmp_path):
+    path = tmp_path / "raw"
+    path.mkdir()
+    pd.DataFrame(
+        {
+            "name": ["Tarte", "Soupe", "Gratin"],
+            "id": [1, 2, 3],
+            "minutes": [30, 10, 60],
+            "contributor_id": [7, 7, 8],
+            "submitted": ["2010-01-01", "2011-02-02", "2012-03-03"],
+            "n_steps": [5, 2, 8],
+            "n_ingredients": [6, 3, 9],
+            "nutrition": ["[100.0, 1, 2, 3, 4, 5, 6]"] * 3,
+        }
+    ).to_csv(path / "RAW_recipes.csv", index=False)
+    pd.DataFrame(
+        {
+            "user_id": [10, 11, 10, 12, 11],
+            "recipe_id": [1, 1, 2, 3, 3],
+            "date": ["2020-01-01", "2021-01-01", "2020-06-01", "2019-01-01", None],
+            "rating": [5, 4, 0, 3, 5],
+            "review": ["Top", "Bien", "Bof", "Ok", "Parfait"],
+        }
+    ).to_csv(path / "RAW_interactions.csv", index=False)
+    return path
+
+
+def test_bundle_round_trip(raw_path, tmp_path):
+    processed = tmp_path / "processed"
+    directory = build_bundle(raw_path, processed)
+
+    assert current_version(processed) == directory.name
+
+    dataset = load_bundle(processed)
+    reference = DataLoader(raw_path).load_dataset()
+
+    assert dataset.version == directory.name
+    assert pd.api.types.is_datetime64_any_dtype(dataset.interactions["date"])
+    assert dataset.metrics == reference.metrics
+    pd.testing.assert_frame_equal(
+        dataset.recipe_aggregates, reference.recipe_aggregates, check_dtype=False
+    )
+    for recipe_id in (1, 2, 3):
+        assert list(dataset.review_index.rows(recipe_id)) == list(
+            reference.review_index.rows(recipe_id)
+        )
+    assert np.array_equal(
+        dataset.range_index.filter({"minutes": (None, 30)}),
+        reference.range_index.filter({"minutes": (None, 30)}),
+    )
+    pd.testing.assert_frame_equal(
+        dataset.rating_buckets.window_stats(0, 10**6),
+        reference.rating_buckets.window_stats(0, 10**6),
+        check_dtype=False,
+    )
+    assert list(dataset.contributor_index.rows(7)) == [0, 1]
+    pd.testing.assert_frame_equal(
+        dataset.ranking_sample.aggregates(),
+        reference.ranking_sample.aggregates(),
+        check_dtype=False,
+    )
+    assert dataset.activity_sketches.window(0, 10**6) == (
+        reference.activity_sketches.window(0, 10**6)
+    )
+    assert list(dataset.user_buckets.recipe_ids) == [10, 11, 12]
+
+
+@pytest.mark.parametrize("reload", [False, True])
+def test_bundle_keeps_review_text_out_of_the_table(raw_path, tmp_path, reload):
+    processed = tmp_path / "processed"
+    dataset = ensure_bundle(raw_path, processed)
+    if reload:
+        dataset = load_bundle(processed)
+    reference = DataLoader(raw_path).load_dataset()
+
+    assert "review" not in dataset.interactions.columns
+    assert dataset.review_store is not None
+    for recipe_id in (1, 2, 3):
+        columns = ["user_id", "rating", "review"]
+        pd.testing.assert_frame_equal(
+            dataset.analyzer.get_recipe_reviews(recipe_id)[columns],
+            reference.analyzer.get_recipe_reviews(recipe_id)[columns],
+            check_dtype=False,
+        )
+
+
+def test_load_bundle_with_missing_review_codec(raw_path, tmp_path, monkeypatch):
+    processed = tmp_path / "processed"
+    build_bundle(raw_path, processed)
+
+    def not_installed():
+        raise ImportError("codec absent")
+
+    monkeypatch.setitem(review_store.CODECS, "zlib", not_installed)
+    monkeypatch.setitem(review_store.CODECS, "zstd", not_installed)
+    monkeypatch.setitem(review_store.CODECS, "lz4", not_installed)
+
+    with pytest.raises(BundleError, match="Codec"):
+        load_bundle(processed)
+
+
+def test_rebuild_same_sources_reuses_version(raw_path, tmp_path):
+    processed = tmp_path / "processed"
+    first = build_bundle(raw_path, processed)
+    created_at = json.loads((first / MANIFEST_FILE).read_text())["created_at"]
+
+    assert build_bundle(raw_path, processed) == first
+    assert json.loads((first / MANIFEST_FILE).read_text())["created_at"] == created_at
+
+
+def test_ensure_bundle_survives_restart(raw_path, tmp_path):
+    processed = tmp_path / "processed"
+    built = ensure_bundle(raw_path, processed)
+    manifest = json.loads(
+        (bundle_path(processed, built.version) / MANIFEST_FILE).read_text()
+    )
+
+    # "Redémarrage" : même empreinte, le bundle est relu sans reconstruction
+    reloaded = ensure_bundle(raw_path, processed)
+    # Construit ou relu, le Dataset connaît les fichiers Parquet du bundle
+    assert (
+        built.parquet_dir
+        == reloaded.parquet_dir
+        == bundle_path(processed, built.version)
+    )
+
+    assert reloaded.version == built.version
+    assert "recipe_aggregates" in reloaded.__dict__
+    assert (
+        json.loads((bundle_path(processed, built.version) / MANIFEST_FILE).read_text())[
+            "created_at"
+        ]
+        == manifest["created_at"]
+    )
+
+
+def test_ensure_bundle_rebuilds_when_sources_change(raw_path, tmp_path):
+    processed = tmp_path / "processed"
+    first = ensure_bundle(raw_path, processed)
+
+    interactions = pd.read_csv(raw_path / "RAW_interactions.csv")
+    interactions.iloc[:2].to_csv(raw_path / "RAW_interactions.csv", index=False)
+    second = ensure_bundle(raw_path, processed)
+
+    assert second.version != first.version
+    assert current_version(processed) == second.version
+    assert len(second.interactions) == 2
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        PermissionError(errno.EACCES, "Permission refusée"),
+        OSError(errno.EROFS, "Système de fichiers en lecture seule"),
+        OSError(errno.ENOSPC, "Plus de place"),
+    ],
+)
+def test_ensure_bundle_unwritable_serves_in_memory(
+    raw_path, tmp_path, monkeypatch, caplog, error
+):
+    processed = tmp_path / "processed"
+
+    def unwritable(path, *args, **kwargs):
+        raise error
+
+    monkeypatch.setattr(bundle_module, "file_lock", unwritable)
+    with caplog.at_level(logging.WARNING, logger=bundle_module.__name__):
+        dataset = ensure_bundle(raw_path, processed)
+
+    # Rien n'est écrit, mais le jeu de données est servi (et signalé)
+    assert dataset.version == DataLoader(raw_path).fingerprint()
+    assert len(dataset.interactions) == 5
+    assert current_version(processed) is None
+    assert "en mémoire" in caplog.text
+
+
+def test_ensure_bundle_other_io_errors_propagate(raw_path, tmp_path, monkeypatch):
+    def broken(path, *args, **kwargs):
+        raise OSError(errno.EIO, "Erreur d'entrée-sortie")
+
+    monkeypatch.setattr(bundle_module, "file_lock", broken)
+
+    with pytest.raises(OSError, match="entrée-sortie"):
+        ensure_bundle(raw_path, tmp_path / "processed")
+
+
+def test_corrupted_bundle_rejected(raw_path, tmp_path):
+    processed = tmp_path / "processed"
+    directory = build_bundle(raw_path, processed)
+    with open(directory / "indexes.npz", "ab") as f:
+        f.write(b"x")
+
+    with pytest.raises(BundleError):
+        load_bundle(processed)
+
+
+def test_missing_bundle(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_bundle(tmp_path)
+
+
+def test_cli_precompute(raw_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "LOGS_PATH", tmp_path / "logs")
+    processed = tmp_path / "processed"
+
+    assert main(["precompute", "--raw", str(raw_path), "--out", str(processed)]) == 0
+    assert current_version(processed) is not None
+    assert main(["precompute", "--raw", str(tmp_path), "--out", str(processed)]) == 1
+
+
+def test_concurrent_ensure_bundle_builds_once(raw_path, tmp_path, monkeypatch):
+    calls = []
+    build = bundle_module._build
+
+    def counting_build(*args):
+        calls.append(1)
+        return build(*args)
+
+    monkeypatch.setattr(bundle_module, "_build", counting_build)
+    processed = tmp_path / "processed"
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(ensure_bundle(raw_path, processed))
+        )
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert len(results) == 4
+    assert all(r is results[0] for r in results)
+
+
+def test_cli_dedup_rebuilds_bundle_with_groups(raw_path, tmp_path, monkeypatch):
+    recipes = pd.read_csv(raw_path / "RAW_recipes.csv")
+    steps = "['mix the flour and the butter', 'bake until golden brown']"
+    recipes["ingredients"] = ["['flour', 'butter']", "['leek']", "['flour', 'butter']"]
+    recipes["steps"] = [steps, "['boil']", steps]
+    recipes.to_csv(raw_path / "RAW_recipes.csv", index=False)
+    processed = tmp_path / "processed"
+    monkeypatch.setattr(Config, "LOGS_PATH", tmp_path / "logs")
+    monkeypatch.setattr(Config, "DATA_MODE", "raw")
+    monkeypatch.setattr(Config, "DATA_RAW_PATH", raw_path)
+    monkeypatch.setattr(Config, "DATA_PROCESSED_PATH", processed)
+
+    ensure_bundle(raw_path, processed)
+    assert load_bundle(processed).duplicate_groups is None
+    assert main(["dedup", "--workers", "1"]) == 0
+
+    # Groupes rangés dans le bundle, sous le manifeste, et chargés avec lui
+    dataset = load_bundle(processed)
+    manifest = json.loads(
+        (bundle_path(processed, dataset.version) / MANIFEST_FILE).read_text()
+    )
+    assert "duplicates.parquet" in manifest["artifacts"]
+    groups = dataset.duplicate_groups
+    assert groups.groups["recipe_id"].tolist() == [1, 3]
+    assert set(groups.groups["group_id"]) == {1}
+
+    # Une reconstruction avec --dedup les conserve, sans --dedup les retire
+    args = ["precompute", "--raw", str(raw_path), "--out", str(processed)]
+    assert main([*args, "--force", "--dedup", "--workers", "1"]) == 0
+    assert load_bundle(processed).duplicate_groups is not None
+    assert main([*args, "--force"]) == 0
+    assert load_bundle(processed).duplicate_groups is None
+
+    monkeypatch.setattr(Config, "DATA_RAW_PATH", tmp_path / "absent")
+    monkeypatch.setattr(Config, "DATA_PROCESSED_PATH", tmp_path / "vide")
+    assert main(["dedup"]) == 1
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from food_analysis.core.contributors import compute_contributor_stats
+from food_analysis.core.note_et_avis import (
+    add_weighted_rating,
+    compute_recipe_aggregates,
+)
+
+
+@pytest.fixture
+def recipe_df():
+    return pd.DataFrame(
+        {
+            "id": [1, 2, 3, 4],
+            "name": ["A", "B", "C", "D"],
+            "contributor_id": [100, 100, 200, 100],
+            "submitted": ["2005-01-01", "2007-06-01", "2010-03-03", "2006-02-02"],
+        }
+    )
+
+
+@pytest.fixture
+def interaction_df():
+    return pd.DataFrame({"recipe_id": [1, 1, 2, 3], "rating": [5, 3, 4, 2]})
+
+
+def test_compute_contributor_stats(recipe_df, interaction_df):
+    recipe_stats = add_weighted_rating(compute_recipe_aggregates(interaction_df), m=1)
+
+    result = compute_contributor_stats(recipe_df, recipe_stats)
+
+    assert list(result["contributor_id"]) == [100, 200]
+    assert list(result["n_recipes"]) == [3, 1]
+    assert list(result["n_reviews"]) == [3, 1]
+
+    # La recette 4 (sans avis) n'entre pas dans la moyenne des notes pondérées
+    weighted = recipe_stats.set_index("recipe_id")["weighted_rating"]
+    assert result.loc[0, "mean_weighted_rating"] == pytest.approx(
+        (weighted[1] + weighted[2]) / 2
+    )
+    assert result.loc[0, "first_submitted"] == pd.Timestamp("2005-01-01")
+    assert result.loc[0, "last_submitted"] == pd.Timestamp("2007-06-01")
+
+
+def test_compute_contributor_stats_without_reviews(recipe_df):
+    recipe_stats = add_weighted_rating(
+        compute_recipe_aggregates(pd.DataFrame({"recipe_id": [], "rating": []}))
+    )
+
+    result = compute_contributor_stats(
+        recipe_df.drop(columns="submitted"), recipe_stats
+    )
+
+    assert list(result["n_reviews"]) == [0, 0]
+    assert result["mean_weighted_rating"].isna().all()
+    assert result["first_submitted"].isna().all()
+
+
+def test_add_weighted_rating_does_not_mutate():
+    aggregates = pd.DataFrame(
+        {"recipe_id": [1, 2], "avg_rating": [5.0, 3.0], "n_reviews": [1, 3]}
+    )
+
+    result = add_weighted_rating(aggregates, m=1)
+
+    assert "weighted_rating" not in aggregates.columns
+    # C = 4 ; (1/2) * 5 + (1/2) * 4 = 4.5
+    assert result["weighted_rating"].to_numpy() == pytest.approx(np.array([4.5, 3.25]))
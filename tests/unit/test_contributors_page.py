@@ -0,0 +1,53 @@
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from food_analysis.core.dataset import Dataset
+from food_analysis.pages import contributors
+
+
+@pytest.fixture
+def recipe_df():
+    return pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "name": ["Pizza", "Burger", "Salade"],
+            "contributor_id": [100, 100, 200],
+            "submitted": ["2005-01-01", "2006-01-01", "2007-01-01"],
+        }
+    )
+
+
+@pytest.fixture
+def interaction_df():
+    return pd.DataFrame({"recipe_id": [1, 2, 3], "rating": [5, 4, 3]})
+
+
+def _mock_st(mock_st, min_recipes):
+    mock_st.columns.side_effect = lambda n: [MagicMock() for _ in range(n)]
+    mock_st.slider.side_effect = [10, 20]
+    mock_st.selectbox.return_value = "Recettes publiées"
+    mock_st.number_input.return_value = min_recipes
+    mock_st.dataframe.return_value.selection.rows = []
+
+
+def test_show_contributors_page(recipe_df, interaction_df):
+    with patch("food_analysis.pages.contributors.st") as mock_st:
+        _mock_st(mock_st, min_recipes=1)
+
+        contributors.show_contributors_page(Dataset(recipe_df, interaction_df))
+
+        mock_st.markdown.assert_any_call("### 🧑‍🍳 Contributeur 100")
+        assert mock_st.dataframe.call_count == 2
+
+
+def test_show_contributors_page_no_eligible(recipe_df, interaction_df):
+    with patch("food_analysis.pages.contributors.st") as mock_st:
+        _mock_st(mock_st, min_recipes=50)
+
+        contributors.show_contributors_page(Dataset(recipe_df, interaction_df))
+
+        mock_st.warning.assert_called_once_with(
+            "Aucun contributeur ne correspond aux critères."
+        )
@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from food_analysis.core.csr_index import CsrIndex
+
+
+@pytest.fixture
+def interaction_df():
+    return pd.DataFrame(
+        {
+            "recipe_id": [3, 1, 3, 2, 1, 3],
+            "date": [
+                "2020-01-01",
+                "2019-05-05",
+                "2021-03-03",
+                "2018-01-01",
+                None,
+                "2020-06-06",
+            ],
+        }
+    )
+
+
+def test_rows_grouped_by_key(interaction_df):
+    index = CsrIndex.from_keys(interaction_df["recipe_id"])
+
+    assert list(index.keys) == [1, 2, 3]
+    assert list(index.counts) == [2, 1, 3]
+    assert sorted(index.rows(3)) == [0, 2, 5]
+    assert list(index.rows(2)) == [3]
+
+
+def test_rows_sorted_descending_with_missing_last(interaction_df):
+    index = CsrIndex.from_keys(
+        interaction_df["recipe_id"], sort_by=interaction_df["date"], descending=True
+    )
+
+    assert list(index.rows(3)) == [2, 5, 0]
+    assert list(index.rows(1)) == [1, 4]
+
+
+def test_missing_key(interaction_df):
+    index = CsrIndex.from_keys(interaction_df["recipe_id"])
+
+    assert 42 not in index
+    assert 1 in index
+    assert len(index.rows(42)) == 0
+    assert len(index.rows(0)) == 0
@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from food_analysis.core import dataset as dataset_module
+from food_analysis.core.backends import PandasBackend
+from food_analysis.core.dataset import Dataset
+
+
+@pytest.fixture
+def recipe_df():
+    return pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "name": ["Tarte", "Soupe", "Gratin"],
+            "minutes": [30, 10, 60],
+            "contributor_id": [7, 7, 8],
+        }
+    )
+
+
+@pytest.fixture
+def interaction_df():
+    return pd.DataFrame(
+        {
+            "user_id": [10, 11, 10, 12],
+            "recipe_id": [1, 1, 2, 3],
+            "rating": [5, 4, 0, 3],
+            "date": ["2020-01-01", "2021-01-01", "2020-06-01", "2019-01-01"],
+        }
+    )
+
+
+def test_artifacts_built_once(recipe_df, interaction_df):
+    dataset = Dataset(recipe_df, interaction_df)
+
+    assert dataset.recipe_aggregates is dataset.recipe_aggregates
+    assert dataset.weighted_recipe_stats(10) is dataset.weighted_recipe_stats(10)
+    assert list(dataset.review_index.rows(1)) == [1, 0]
+
+
+def test_metrics(recipe_df, interaction_df):
+    metrics = Dataset(recipe_df, interaction_df).metrics
+
+    assert metrics["avg_rating"] == pytest.approx(4.0)
+    assert metrics["avg_reviews_per_recipe"] == pytest.approx(4 / 3)
+    assert metrics["n_users"] == 3
+    assert metrics["rating_counts"] == {"0": 1, "3": 1, "4": 1, "5": 1}
+
+
+def test_prebuilt_artifacts_are_used(recipe_df, interaction_df):
+    aggregates = pd.DataFrame({"recipe_id": [1], "avg_rating": [5.0], "n_reviews": [1]})
+    dataset = Dataset(
+        recipe_df, interaction_df, artifacts={"recipe_aggregates": aggregates}
+    )
+
+    assert dataset.recipe_aggregates is aggregates
+
+    with pytest.raises(ValueError):
+        Dataset(recipe_df, interaction_df, artifacts={"inconnu": 1})
+
+
+def test_concurrent_access_builds_once(recipe_df, interaction_df, monkeypatch):
+    calls = []
+    backend = PandasBackend()
+    build = backend.recipe_aggregates
+
+    def slow_build(df, parquet_dir=None):
+        calls.append(1)
+        time.sleep(0.1)
+        return build(df, parquet_dir=parquet_dir)
+
+    monkeypatch.setattr(backend, "recipe_aggregates", slow_build)
+    monkeypatch.setattr(dataset_module, "get_backend", lambda: backend)
+    dataset = Dataset(recipe_df, interaction_df)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(dataset.recipe_aggregates))
+        for _ in range(6)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_concurrent_weighted_stats_computed_once(
+    recipe_df, interaction_df, monkeypatch
+):
+    calls = []
+    weigh = dataset_module.add_weighted_rating
+
+    def slow_weigh(df, m):
+        calls.append(m)
+        time.sleep(0.1)
+        return weigh(df, m=m)
+
+    monkeypatch.setattr(dataset_module, "add_weighted_rating", slow_weigh)
+    dataset = Dataset(recipe_df, interaction_df)
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(dataset.weighted_recipe_stats(5))
+        )
+        for _ in range(6)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == [5]
+    assert all(r is results[0] for r in results)
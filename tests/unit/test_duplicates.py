@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from food_analysis.core import duplicates
+from food_analysis.core.duplicates import (
+    DuplicateGroups,
+    candidate_pairs,
+    compute_signatures,
+    connected_components,
+    find_duplicate_groups,
+    shingle_hashes,
+)
+
+STEPS = (
+    "['preheat oven to 350 degrees', 'mix the flour sugar and butter in a bowl', "
+    "'bake for 30 minutes until golden brown']"
+)
+OTHER_STEPS = (
+    "['boil water in a large pot', 'add the pasta and cook for ten minutes', "
+    "'drain and serve with tomato sauce']"
+)
+
+
+@pytest.fixture
+def recipe_df():
+    return pd.DataFrame(
+        {
+            "id": [1, 2, 3, 4, 5],
+            "name": ["Sablés", "Sablés bis", "Pâtes", "Vide", "Sablés ter"],
+            "ingredients": [
+                "['flour', 'sugar', 'butter']",
+                "['Flour', 'sugar ', 'butter']",
+                "['pasta', 'water', 'salt']",
+                "['salt']",
+                "['flour', 'sugar', 'butter']",
+            ],
+            "steps": [
+                STEPS,
+                STEPS.replace("golden brown", "golden"),
+                OTHER_STEPS,
+                "['serve']",
+                STEPS,
+            ],
+        }
+    )
+
+
+@pytest.fixture
+def aggregates():
+    return pd.DataFrame(
+        {
+            "recipe_id": [1, 2, 3, 5],
+            "avg_rating": [4.0, 5.0, 3.0, 2.0],
+            "n_reviews": [1, 10, 4, 1],
+        }
+    )
+
+
+def test_shingles_group_ingredients_and_word_triplets():
+    hashes, counts = shingle_hashes(
+        ["['Salt', \"cook's  sugar\"]", None], ["['mix well', 'and bake']", "[]"]
+    )
+
+    # 2 ingrédients + 2 triplets ("mix well and", "well and bake")
+    assert counts.tolist() == [4, 0]
+    assert len(hashes) == 4
+    # Normalisation : casse et espaces des ingrédients ignorés
+    again, _ = shingle_hashes(["['salt', 'cook s sugar']"], ["['mix well and bake']"])
+    np.testing.assert_array_equal(np.sort(hashes), np.sort(again))
+
+
+def test_signatures_estimate_jaccard_similarity():
+    rng = np.random.default_rng(0)
+    words = [f"w{i}" for i in range(400)]
+    base = rng.choice(words, 300)
+    recipe_df = pd.DataFrame(
+        {
+            "ingredients": ["[]", "[]"],
+            "steps": [str(list(base)), str(list(base[:150]) + list(words[:150]))],
+        }
+    )
+    hashes, counts = shingle_hashes(recipe_df["ingredients"], recipe_df["steps"])
+    first, second = set(hashes[: counts[0]]), set(hashes[counts[0] :])
+    exact = len(first & second) / len(first | second)
+
+    signatures, _ = compute_signatures(recipe_df, num_perm=256)
+
+    assert (signatures[0] == signatures[1]).mean() == pytest.approx(exact, abs=0.1)
+
+
+def test_signatures_same_with_workers(recipe_df):
+    single, counts = compute_signatures(recipe_df, workers=1)
+    parallel, parallel_counts = compute_signatures(recipe_df, workers=2, chunk_size=2)
+
+    np.testing.assert_array_equal(single, parallel)
+    np.testing.assert_array_equal(counts, parallel_counts)
+
+
+def test_candidate_pairs_share_a_band():
+    signatures = np.array(
+        [[1, 2, 3, 4], [1, 2, 9, 9], [7, 7, 3, 4], [5, 6, 7, 8]], dtype=np.uint32
+    )
+
+    pairs = candidate_pairs(signatures, bands=2)
+
+    assert sorted(map(tuple, pairs.tolist())) == [(0, 1), (0, 2)]
+    with pytest.raises(ValueError):
+        candidate_pairs(signatures, bands=3)
+
+
+def test_candidate_pairs_all_pairs_of_small_buckets(monkeypatch):
+    signatures = np.array([[1, 2], [1, 3], [1, 4], [5, 6]], dtype=np.uint32)
+
+    # Seau {0, 1, 2} de la première bande : toutes ses paires
+    pairs = candidate_pairs(signatures, bands=2)
+    assert sorted(map(tuple, pairs.tolist())) == [(0, 1), (0, 2), (1, 2)]
+
+    # Seau trop grand : chaque recette n'est appariée qu'à sa voisine
+    monkeypatch.setattr(duplicates, "SMALL_BUCKET", 2)
+    pairs = candidate_pairs(signatures, bands=2)
+    assert sorted(map(tuple, pairs.tolist())) == [(0, 1), (1, 2)]
+
+
+def test_connected_components():
+    labels = connected_components(6, np.array([[4, 5], [1, 4], [2, 3]]))
+
+    assert labels.tolist() == [0, 1, 2, 2, 1, 1]
+    isolated = connected_components(3, np.zeros((0, 2), dtype=np.int64))
+    assert isolated.tolist() == [0, 1, 2]
+
+
+def test_find_duplicate_groups(recipe_df, aggregates):
+    groups = find_duplicate_groups(recipe_df, aggregates, workers=1)
+
+    assert len(groups) == 1
+    assert groups.n_recipes == 3
+    # Représentant : la recette qui a le plus d'avis
+    assert groups.groups["recipe_id"].tolist() == [1, 2, 5]
+    assert set(groups.groups["group_id"]) == {2}
+    assert groups.groups["similarity"].between(0.8, 1.0).all()
+
+
+def test_find_duplicate_groups_threshold(recipe_df, aggregates):
+    groups = find_duplicate_groups(recipe_df, aggregates, threshold=1.0, workers=1)
+
+    # Seules les copies exactes restent reliées ; à égalité d'avis, plus petit ID
+    assert groups.groups["recipe_id"].tolist() == [1, 5]
+    assert set(groups.groups["group_id"]) == {1}
+
+
+def test_find_duplicate_groups_drops_chained_members():
+    # A ~ B et B ~ C (Jaccard 0,82), mais A et C ne sont pas des doublons (0,66)
+    words = [f"mot{i}" for i in range(120)]
+    recipe_df = pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "ingredients": ["[]"] * 3,
+            "steps": [
+                str([" ".join(words[start : start + 100])]) for start in (0, 10, 20)
+            ],
+        }
+    )
+    aggregates = pd.DataFrame({"recipe_id": [1, 2, 3], "n_reviews": [10, 1, 1]})
+
+    groups = find_duplicate_groups(
+        recipe_df, aggregates, threshold=0.75, num_perm=256, bands=64, workers=1
+    )
+
+    # C n'est relié au représentant A que par B : il quitte le groupe
+    assert groups.groups["recipe_id"].tolist() == [1, 2]
+    assert set(groups.groups["group_id"]) == {1}
+
+
+def test_merge_aggregates(aggregates):
+    groups = DuplicateGroups(
+        pd.DataFrame({"recipe_id": [1, 2, 5], "group_id": [2, 2, 2], "similarity": 1.0})
+    )
+
+    merged = groups.merge_aggregates(aggregates).set_index("recipe_id")
+
+    assert merged.index.tolist() == [2, 3]
+    assert merged.loc[2, "n_reviews"] == 12
+    assert merged.loc[2, "avg_rating"] == pytest.approx((4 + 50 + 2) / 12)
+    assert merged.loc[3, "avg_rating"] == 3.0
+
+
+def test_save_and_load(tmp_path, recipe_df, aggregates):
+    groups = find_duplicate_groups(recipe_df, aggregates, workers=1)
+
+    groups.save(tmp_path)
+
+    pd.testing.assert_frame_equal(DuplicateGroups.load(tmp_path).groups, groups.groups)
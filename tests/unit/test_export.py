@@ -0,0 +1,103 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from food_analysis.core import export
+from food_analysis.core.dataset import build_review_index
+from food_analysis.core.export import (
+    frame_chunks,
+    iter_export,
+    review_chunks,
+    write_export,
+)
+from food_analysis.core.review_store import ReviewStore
+
+
+@pytest.fixture
+def ranking():
+    n = 2_500
+    return pd.DataFrame(
+        {
+            "name": [f"recette {i}, « gratinée »" for i in range(n)],
+            "avg_rating": np.linspace(5, 0, n),
+            "n_reviews": np.arange(n, dtype=np.int64),
+            "weighted_rating": np.linspace(4.9, 0.1, n),
+        }
+    )
+
+
+@pytest.fixture
+def interaction_df():
+    rng = np.random.default_rng(0)
+    n = 500
+    return pd.DataFrame(
+        {
+            "user_id": rng.integers(1, 50, n),
+            "recipe_id": rng.integers(1, 5, n),
+            "rating": rng.integers(0, 6, n),
+            "date": pd.Timestamp("2015-01-01")
+            + pd.to_timedelta(rng.integers(0, 1000, n), unit="D"),
+            "review": [f"avis {i}" if i % 7 else None for i in range(n)],
+        }
+    )
+
+
+def test_csv_export_matches_to_csv(ranking):
+    parts = list(iter_export(frame_chunks(ranking, chunk_rows=1_000), "csv"))
+
+    assert len(parts) == 3
+    assert b"".join(parts) == ranking.to_csv(index=False).encode("utf-8")
+
+
+def test_parquet_export_round_trip(ranking):
+    parts = list(iter_export(frame_chunks(ranking, chunk_rows=1_000), "parquet"))
+
+    assert len(parts) > 1
+    result = pd.read_parquet(io.BytesIO(b"".join(parts)))
+    pd.testing.assert_frame_equal(result, ranking, check_dtype=False)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_export_of_empty_table_keeps_columns(ranking, fmt):
+    out = io.BytesIO()
+
+    written = write_export(frame_chunks(ranking.head(0)), fmt, out)
+
+    assert written == len(out.getvalue()) > 0
+    if fmt == "csv":
+        assert out.getvalue().decode().strip() == ",".join(ranking.columns)
+    else:
+        assert list(pd.read_parquet(io.BytesIO(out.getvalue())).columns) == list(
+            ranking.columns
+        )
+
+
+def test_unknown_format(ranking):
+    with pytest.raises(ValueError):
+        list(iter_export(frame_chunks(ranking), "xlsx"))
+
+
+def test_review_chunks_read_text_from_store(interaction_df, tmp_path):
+    index = build_review_index(interaction_df)
+    store = ReviewStore.write(interaction_df["review"], index.order, tmp_path)
+    rows = index.rows(2)
+
+    chunks = list(
+        review_chunks(interaction_df.drop(columns="review"), rows, store, chunk_rows=40)
+    )
+
+    assert len(chunks) == -(-len(rows) // 40)
+    expected = interaction_df.iloc[rows][export.REVIEW_COLUMNS].reset_index(drop=True)
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks, ignore_index=True), expected, check_dtype=False
+    )
+
+
+def test_review_chunks_without_reviews(interaction_df):
+    chunks = list(review_chunks(interaction_df, np.array([], dtype=np.int64)))
+
+    assert len(chunks) == 1
+    assert list(chunks[0].columns) == export.REVIEW_COLUMNS
+    assert chunks[0].empty
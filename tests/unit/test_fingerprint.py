@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from food_analysis.core.fingerprint import dataset_fingerprint, describe_sources
+
+
+@pytest.fixture
+def raw_path(tmp_path):
+    (tmp_path / "RAW_recipes.csv").write_text("id,name\n1,Tarte\n")
+    (tmp_path / "RAW_interactions.csv").write_text("recipe_id,rating\n1,5\n")
+    return tmp_path
+
+
+def touch(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_metadata_fingerprint_changes_when_file_touched(raw_path):
+    before = dataset_fingerprint(raw_path)
+    assert dataset_fingerprint(raw_path) == before
+
+    touch(raw_path / "RAW_recipes.csv")
+
+    assert dataset_fingerprint(raw_path) != before
+
+
+def test_content_fingerprint_ignores_touch(raw_path):
+    before = dataset_fingerprint(raw_path, content_hash=True)
+
+    touch(raw_path / "RAW_recipes.csv")
+    assert dataset_fingerprint(raw_path, content_hash=True) == before
+
+    (raw_path / "RAW_recipes.csv").write_text("id,name\n1,Tarte\n2,Soupe\n")
+    assert dataset_fingerprint(raw_path, content_hash=True) != before
+
+
+def test_describe_sources(raw_path):
+    sources = describe_sources(raw_path, content_hash=True)
+
+    assert set(sources) == {"RAW_recipes.csv", "RAW_interactions.csv"}
+    assert sources["RAW_recipes.csv"]["bytes"] == len("id,name\n1,Tarte\n")
+    assert len(sources["RAW_recipes.csv"]["sha256"]) == 64
+    assert "sha256" not in describe_sources(raw_path)["RAW_recipes.csv"]
+
+
+def test_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError, match="RAW_recipes.csv"):
+        dataset_fingerprint(tmp_path)
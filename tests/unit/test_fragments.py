@@ -0,0 +1,15 @@
+from unittest.mock import MagicMock
+
+from food_analysis.utils.fragments import fragment
+
+
+def test_fragment_runs_directly_outside_streamlit():
+    """Hors exécution Streamlit, la fonction décorée est appelée normalement."""
+    body = MagicMock(return_value="ok")
+    body.__name__ = "body"
+    body.__qualname__ = "body"
+
+    wrapped = fragment(body)
+
+    assert wrapped(1, key="a") == "ok"
+    body.assert_called_once_with(1, key="a")
@@ -0,0 +1,26 @@
+import sys
+
+from food_analysis.utils.lazy_import import lazy_module
+
+
+def test_lazy_module_imports_on_first_access():
+    sys.modules.pop("colorsys", None)
+    colorsys = lazy_module("colorsys")
+
+    assert not colorsys.is_loaded
+    assert "colorsys" not in sys.modules
+
+    assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert colorsys.is_loaded
+    assert "colorsys" in sys.modules
+
+
+def test_lazy_module_attribute_writes_reach_real_module():
+    json_proxy = lazy_module("json")
+    import json
+
+    json_proxy.custom_attr = 42
+    assert json.custom_attr == 42
+
+    del json_proxy.custom_attr
+    assert not hasattr(json, "custom_attr")
@@ -0,0 +1,113 @@
+import os
+import random
+
+import pytest
+
+from food_analysis.core.data_loader import DataLoader
+from food_analysis.loadtest import (
+    ACTION_WEIGHTS,
+    LoadTestConfig,
+    compare_reports,
+    format_report,
+    plan_actions,
+    process_memory,
+    run_load_test,
+    summarize,
+    write_report,
+    write_synthetic_dataset,
+)
+
+
+def make_report(p95, throughput, config=None):
+    return {
+        "meta": {"commit": "abc123"},
+        "config": config or {"sessions": 2, "actions": 3},
+        "results": {
+            "reruns": 6,
+            "errors": 0,
+            "throughput_rps": throughput,
+            "latency_ms": {"count": 6, "p50": 10.0, "p95": p95, "p99": p95},
+            "by_action": {},
+        },
+        "memory": {"rss_end": None},
+    }
+
+
+def test_summarize_reports_percentiles_in_ms():
+    summary = summarize([i / 1000 for i in range(1, 101)])
+
+    assert summary["count"] == 100
+    assert summary["p50"] == pytest.approx(50.5)
+    assert summary["p99"] == pytest.approx(99.01)
+    assert summary["max"] == 100.0
+
+
+def test_summarize_empty():
+    assert summarize([]) == {"count": 0}
+
+
+def test_plan_actions_is_deterministic():
+    first = plan_actions(random.Random(3), 50)
+
+    assert first == plan_actions(random.Random(3), 50)
+    assert set(first) <= set(ACTION_WEIGHTS)
+
+
+def test_write_synthetic_dataset_is_loadable(tmp_path):
+    write_synthetic_dataset(tmp_path, n_recipes=50, n_interactions=400, seed=1)
+
+    loader = DataLoader(tmp_path)
+    recipes = loader.load_recipes()
+    interactions = loader.load_interactions()
+
+    assert len(recipes) == 50
+    assert len(interactions) == 400
+    assert interactions["recipe_id"].isin(recipes["id"]).all()
+
+
+def test_process_memory_of_current_process():
+    memory = process_memory(os.getpid())
+
+    if memory["rss"] is None:
+        pytest.skip("/proc indisponible")
+    assert memory["peak"] >= memory["rss"] > 0
+
+
+def test_compare_reports_flags_regressions():
+    comparison = compare_reports(make_report(150.0, 8.0), make_report(100.0, 10.0))
+
+    assert comparison["latency_ms.p95"]["change_pct"] == 50.0
+    assert comparison["latency_ms.p95"]["better"] is False
+    assert comparison["throughput_rps"]["better"] is False
+    assert "config" not in comparison
+
+
+def test_compare_reports_notes_config_mismatch():
+    comparison = compare_reports(
+        make_report(100.0, 10.0, {"sessions": 4}),
+        make_report(100.0, 10.0, {"sessions": 2}),
+    )
+
+    assert comparison["config"]["baseline"] == {"sessions": 2}
+
+
+def test_write_report_names_file_after_commit(tmp_path):
+    report = make_report(100.0, 10.0)
+
+    path = write_report(report, tmp_path / "loadtest")
+
+    assert path.name.startswith("loadtest-abc123-")
+    assert "6 reruns, 0 erreurs" in format_report(report)
+
+
+def test_run_load_test_end_to_end():
+    pytest.importorskip("websockets")
+    config = LoadTestConfig(
+        sessions=2, actions=3, n_recipes=300, n_interactions=3000, timeout_s=120
+    )
+
+    report = run_load_test(config)
+
+    assert report["results"]["errors"] == 0, report["results"]["error_samples"]
+    assert report["results"]["reruns"] >= 2 * 3
+    assert report["results"]["latency_ms"]["p95"] > 0
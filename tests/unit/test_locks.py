@@ -0,0 +1,96 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from food_analysis.utils.locks import SingleFlight, file_lock
+
+
+def run_concurrently(func, n=8):
+    barrier = threading.Barrier(n)
+    results, errors = [], []
+
+    def worker():
+        barrier.wait()
+        try:
+            results.append(func())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+def test_single_flight_runs_once():
+    flight = SingleFlight()
+    calls = []
+
+    def build():
+        calls.append(1)
+        time.sleep(0.2)
+        return object()
+
+    results, errors = run_concurrently(lambda: flight.do("k", build))
+
+    assert not errors
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert not flight.in_flight("k")
+
+
+def test_single_flight_shares_exception():
+    flight = SingleFlight()
+    calls = []
+
+    def build():
+        calls.append(1)
+        time.sleep(0.2)
+        raise ValueError("échec")
+
+    results, errors = run_concurrently(lambda: flight.do("k", build))
+
+    assert not results
+    assert len(calls) == 1
+    assert len(errors) == 8
+    assert all(isinstance(e, ValueError) for e in errors)
+
+
+def test_single_flight_recomputes_after_completion():
+    flight = SingleFlight()
+
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.do("k", lambda: 2) == 2
+
+
+def test_file_lock_excludes_other_process(tmp_path):
+    lock_path = tmp_path / ".build.lock"
+    holder = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import sys, time; from pathlib import Path;"
+            "from food_analysis.utils.locks import file_lock\n"
+            f"with file_lock(Path({str(lock_path)!r})):\n"
+            "    print('ok', flush=True); time.sleep(1.5)",
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+        env={**os.environ, "PYTHONPATH": "src"},
+    )
+    try:
+        assert holder.stdout.readline().strip() == "ok"
+        start = time.monotonic()
+        with pytest.raises(TimeoutError):
+            with file_lock(lock_path, timeout_s=0.3):
+                pass
+        with file_lock(lock_path, timeout_s=10):
+            assert time.monotonic() - start > 1.0
+    finally:
+        holder.wait()
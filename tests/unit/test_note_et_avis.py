@@ -1,10 +1,12 @@
 # tests/unit/test_note_et_avis.py
 from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
 import pytest
 
 import food_analysis.core.note_et_avis as nea
+from food_analysis.core.csr_index import CsrIndex
 
 # ---------------------------
 # Fixtures pour les données
@@ -67,7 +69,13 @@ def test_compute_recipe_stats(sample_recipes, sample_interactions):
     result = nea.compute_recipe_stats(sample_recipes, sample_interactions, m=1)
 
     # Vérifie les colonnes attendues
-    assert set(result.columns) == {"name", "avg_rating", "n_reviews", "weighted_rating"}
+    assert set(result.columns) == {
+        "recipe_id",
+        "name",
+        "avg_rating",
+        "n_reviews",
+        "weighted_rating",
+    }
 
     # Vérifie que le nombre de lignes correspond aux recettes avec interactions
     assert len(result) == 3
@@ -122,3 +130,31 @@ def test_recipe_reviews(sample_interactions):
 
     # Vérifie que le tri par date est correct (descendant)
     assert df_reviews.iloc[0]["date"] >= df_reviews.iloc[1]["date"]
+
+
+def test_compute_recipe_stats_restricted_to_recipe_ids(
+    sample_recipes, sample_interactions
+):
+    full = nea.compute_recipe_stats(sample_recipes, sample_interactions, m=1)
+    result = nea.compute_recipe_stats(
+        sample_recipes, sample_interactions, m=1, recipe_ids=np.array([1, 3])
+    )
+
+    assert list(result["name"]) == ["Pasta", "Salad"]
+    # La note pondérée ne dépend pas du filtre (C reste global)
+    expected = full.set_index("name").loc[["Pasta", "Salad"], "weighted_rating"]
+    assert list(result["weighted_rating"]) == pytest.approx(list(expected))
+
+
+def test_recipe_reviews_with_index_matches_scan(sample_interactions):
+    index = CsrIndex.from_keys(
+        sample_interactions["recipe_id"],
+        sort_by=sample_interactions["date"],
+        descending=True,
+    )
+
+    for recipe_id in [1, 2, 3, 42]:
+        pd.testing.assert_frame_equal(
+            nea.recipe_reviews(recipe_id, sample_interactions, index=index),
+            nea.recipe_reviews(recipe_id, sample_interactions),
+        )
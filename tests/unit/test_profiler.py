@@ -0,0 +1,103 @@
+import pstats
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from food_analysis.utils import profiler
+from food_analysis.utils.profiler import (
+    PROFILE_QUERY_PARAM,
+    PROFILE_STATE_KEY,
+    profile_call,
+    run_with_profiler,
+)
+
+
+def slow_page():
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        pass
+    return 42
+
+
+@pytest.fixture
+def mock_st():
+    with patch("food_analysis.utils.profiler.st") as mock_st:
+        mock_st.query_params = {}
+        mock_st.session_state = {}
+        yield mock_st
+
+
+def test_profile_call_writes_profile_and_stacks(tmp_path):
+    result, profile = profile_call(slow_page, out_dir=tmp_path)
+
+    assert result == 42
+    assert profile.duration_s >= 0.05
+    # Profil lisible par pstats, piles au format « collapsed »
+    assert pstats.Stats(str(profile.profile_path)).total_calls > 0
+    lines = profile.stacks_path.read_text().splitlines()
+    assert profile.samples > 0
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert all(line.startswith("slow_page (") for line in lines)
+    assert profile.hotspots["function"].str.startswith("slow_page").any()
+
+
+def test_profile_call_writes_profile_when_function_raises(tmp_path):
+    def failing():
+        raise RuntimeError("rerun")
+
+    with pytest.raises(RuntimeError):
+        profile_call(failing, out_dir=tmp_path)
+
+    assert len(list(tmp_path.glob("rerun-*.prof"))) == 1
+
+
+def test_profile_call_keeps_latest_profiles(tmp_path):
+    for _ in range(3):
+        profile_call(lambda: None, out_dir=tmp_path, keep=2)
+
+    assert len(list(tmp_path.glob("rerun-*.prof"))) == 2
+    assert len(list(tmp_path.glob("rerun-*.folded"))) == 2
+
+
+def test_run_with_profiler_disabled_does_not_profile(mock_st, monkeypatch):
+    monkeypatch.setattr(profiler.Config, "PROFILING", "off")
+    mock_st.query_params[PROFILE_QUERY_PARAM] = "1"
+    main = MagicMock()
+
+    with patch.object(profiler, "profile_call") as mock_profile_call:
+        run_with_profiler(main)
+
+    main.assert_called_once()
+    mock_profile_call.assert_not_called()
+    mock_st.sidebar.expander.assert_not_called()
+
+
+def test_run_with_profiler_without_query_param(mock_st, monkeypatch):
+    monkeypatch.setattr(profiler.Config, "PROFILING", "query")
+    main = MagicMock()
+
+    with patch.object(profiler, "profile_call") as mock_profile_call:
+        run_with_profiler(main)
+
+    main.assert_called_once()
+    mock_profile_call.assert_not_called()
+
+
+def test_run_with_profiler_profiles_single_rerun(mock_st, monkeypatch, tmp_path):
+    monkeypatch.setattr(profiler.Config, "PROFILING", "query")
+    monkeypatch.setattr(profiler.Config, "LOGS_PATH", tmp_path)
+    mock_st.query_params[PROFILE_QUERY_PARAM] = "1"
+
+    run_with_profiler(slow_page)
+
+    # Le paramètre est retiré : le rerun suivant n'est pas profilé
+    assert PROFILE_QUERY_PARAM not in mock_st.query_params
+    profile = mock_st.session_state[PROFILE_STATE_KEY]
+    assert profile.profile_path.parent == tmp_path / "profiles"
+    mock_st.sidebar.expander.assert_called_once()
+    mock_st.dataframe.assert_called_once()
+
+    # Le dernier profil reste affiché pour la session
+    run_with_profiler(MagicMock())
+    assert mock_st.sidebar.expander.call_count == 2
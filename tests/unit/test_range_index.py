@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from food_analysis.core.range_index import NumericRangeIndex, parse_nutrition
+
+
+@pytest.fixture
+def recipe_df():
+    return pd.DataFrame(
+        {
+            "id": [10, 20, 30, 40],
+            "name": ["A", "B", "C", "D"],
+            "minutes": [15, 45, 30, None],
+            "n_steps": [3, 10, 5, 7],
+            "n_ingredients": [4, 12, 6, 8],
+            "nutrition": [
+                "[250.0, 10.0, 5.0, 1.0, 2.0, 3.0, 4.0]",
+                "[800.0, 40.0, 5.0, 1.0, 2.0, 3.0, 4.0]",
+                "[399.9, 15.0, 5.0, 1.0, 2.0, 3.0, 4.0]",
+                "invalide",
+            ],
+        }
+    )
+
+
+def test_parse_nutrition(recipe_df):
+    parsed = parse_nutrition(recipe_df["nutrition"])
+
+    assert parsed.loc[0, "calories"] == pytest.approx(250.0)
+    assert parsed.loc[1, "total_fat"] == pytest.approx(40.0)
+    assert parsed.loc[2, "carbohydrates"] == pytest.approx(4.0)
+    assert np.isnan(parsed.loc[3, "calories"])
+
+
+def test_from_recipes_indexes_available_columns(recipe_df):
+    index = NumericRangeIndex.from_recipes(recipe_df)
+
+    assert {"minutes", "n_steps", "n_ingredients", "calories"} <= set(index.columns)
+    assert index.bounds("minutes") == (15.0, 45.0)
+
+
+def test_from_recipes_without_numeric_columns():
+    index = NumericRangeIndex.from_recipes(pd.DataFrame({"id": [1], "name": ["A"]}))
+
+    assert index.columns == []
+    assert index.filter({}) is None
+
+
+def test_query_inclusive_bounds(recipe_df):
+    index = NumericRangeIndex.from_recipes(recipe_df)
+
+    assert sorted(index.query("minutes", high=30)) == [10, 30]
+    assert sorted(index.query("minutes", low=30, high=45)) == [20, 30]
+    assert sorted(index.query("n_steps")) == [10, 20, 30, 40]
+    assert len(index.query("minutes", low=50)) == 0
+
+
+def test_filter_combines_ranges(recipe_df):
+    index = NumericRangeIndex.from_recipes(recipe_df)
+
+    result = index.filter({"minutes": (None, 30), "calories": (None, 400)})
+    assert sorted(result) == [10, 30]
+
+    result = index.filter({"minutes": (None, 30), "n_steps": (4, None)})
+    assert list(result) == [30]
+
+
+def test_filter_ignores_inactive_ranges(recipe_df):
+    index = NumericRangeIndex.from_recipes(recipe_df)
+
+    assert index.filter({"minutes": (None, None)}) is None
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from food_analysis.core.note_et_avis import compute_recipe_aggregates
+from food_analysis.core.ranking_sample import RankingSample
+from food_analysis.core.rating_buckets import to_month
+
+
+@pytest.fixture
+def interaction_df():
+    rng = np.random.default_rng(0)
+    n = 20_000
+    return pd.DataFrame(
+        {
+            "recipe_id": rng.choice([1, 2, 3, 4], n, p=[0.4, 0.3, 0.2, 0.1]),
+            "rating": rng.choice(6, n),
+            "date": pd.Timestamp("2010-01-01")
+            + pd.to_timedelta(rng.integers(0, 3650, n), unit="D"),
+        }
+    )
+
+
+def test_sample_of_whole_table_gives_exact_aggregates(interaction_df):
+    sample = RankingSample.from_interactions(
+        interaction_df, size=len(interaction_df) + 1
+    )
+
+    assert sample.fraction == 1.0
+    pd.testing.assert_frame_equal(
+        sample.aggregates(),
+        compute_recipe_aggregates(interaction_df),
+        check_dtype=False,
+    )
+
+
+def test_sample_estimates_aggregates(interaction_df):
+    sample = RankingSample.from_interactions(interaction_df, size=5_000)
+    expected = compute_recipe_aggregates(interaction_df)
+
+    estimated = sample.aggregates()
+
+    assert len(sample) == 5_000
+    assert sample.fraction == pytest.approx(0.25)
+    # Nombre d'avis extrapolé à la table complète
+    np.testing.assert_allclose(estimated["n_reviews"], expected["n_reviews"], rtol=0.1)
+    np.testing.assert_allclose(
+        estimated["avg_rating"], expected["avg_rating"], atol=0.15
+    )
+
+
+def test_sample_is_reproducible(interaction_df):
+    first = RankingSample.from_interactions(interaction_df, size=100)
+    second = RankingSample.from_interactions(interaction_df, size=100)
+
+    assert np.array_equal(first.recipe_ids, second.recipe_ids)
+    assert np.array_equal(first.ratings, second.ratings)
+
+
+def test_sample_aggregates_for_period(interaction_df):
+    sample = RankingSample.from_interactions(interaction_df, size=len(interaction_df))
+    months = to_month(interaction_df["date"])
+    period = (int(months.min()) + 12, int(months.min()) + 23)
+    in_period = interaction_df[(months >= period[0]) & (months <= period[1])]
+
+    pd.testing.assert_frame_equal(
+        sample.aggregates(period),
+        compute_recipe_aggregates(in_period),
+        check_dtype=False,
+    )
+
+
+def test_sample_round_trip_through_arrays(interaction_df):
+    sample = RankingSample.from_interactions(interaction_df, size=1_000)
+
+    restored = RankingSample.from_arrays(sample.to_arrays())
+
+    assert restored.n_total == len(interaction_df)
+    pd.testing.assert_frame_equal(restored.aggregates(), sample.aggregates())
+
+
+def test_empty_sample():
+    sample = RankingSample.from_interactions(
+        pd.DataFrame({"recipe_id": [], "rating": []}), size=10
+    )
+
+    assert len(sample) == 0
+    assert sample.aggregates().empty
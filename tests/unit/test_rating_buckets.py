@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from food_analysis.core.note_et_avis import (
+    compute_recipe_stats,
+    compute_windowed_recipe_stats,
+)
+from food_analysis.core.rating_buckets import (
+    MonthlyRatingBuckets,
+    month_label,
+    to_month,
+)
+
+
+@pytest.fixture
+def recipe_df():
+    return pd.DataFrame({"id": [1, 2, 3], "name": ["Pasta", "Pizza", "Salad"]})
+
+
+@pytest.fixture
+def interaction_df():
+    return pd.DataFrame(
+        {
+            "recipe_id": [1, 1, 1, 2, 2, 3, 3],
+            "rating": [5, 4, 0, 3, 5, 2, 4],
+            "date": [
+                "2016-01-15",
+                "2016-01-20",
+                "2017-06-01",
+                "2017-06-30",
+                "2018-12-01",
+                "2018-11-11",
+                "2018-12-24",
+            ],
+        }
+    )
+
+
+def test_to_month_and_label():
+    months = to_month(pd.Series(["2018-12-24", "pas une date"]))
+
+    assert months[0] == 2018 * 12 + 11
+    assert np.isnan(months[1])
+    assert month_label(int(months[0])) == "2018-12"
+
+
+def test_buckets_group_by_recipe_and_month(interaction_df):
+    buckets = MonthlyRatingBuckets.from_interactions(interaction_df)
+
+    # (1, 2016-01), (1, 2017-06), (2, 2017-06), (2, 2018-12), (3, 2018-11), (3, 2018-12)
+    assert len(buckets) == 6
+    assert list(buckets.counts) == [2, 1, 1, 1, 1, 1]
+    assert list(buckets.indptr) == [0, 2, 4, 6]
+    assert buckets.month_range == (2016 * 12, 2018 * 12 + 11)
+
+
+def test_full_window_matches_all_time_ranking(recipe_df, interaction_df):
+    buckets = MonthlyRatingBuckets.from_interactions(interaction_df)
+    first, last = buckets.month_range
+
+    expected = compute_recipe_stats(recipe_df, interaction_df, m=2)
+    result = compute_windowed_recipe_stats(recipe_df, buckets, first, last, m=2)
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_window_matches_filtered_interactions(recipe_df, interaction_df):
+    buckets = MonthlyRatingBuckets.from_interactions(interaction_df)
+    start, end = 2017 * 12 + 5, 2018 * 12 + 10
+
+    months = to_month(interaction_df["date"])
+    in_window = interaction_df[(months >= start) & (months <= end)]
+    expected = compute_recipe_stats(recipe_df, in_window, m=3)
+    result = compute_windowed_recipe_stats(recipe_df, buckets, start, end, m=3)
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_window_outside_data_is_empty(interaction_df):
+    buckets = MonthlyRatingBuckets.from_interactions(interaction_df)
+
+    assert buckets.window_stats(2000 * 12, 2010 * 12).empty
+    assert buckets.window_stats(2019 * 12, 2020 * 12).empty
+    assert buckets.window_stats(2018 * 12, 2017 * 12).empty
+
+
+def test_buckets_without_date_column():
+    buckets = MonthlyRatingBuckets.from_interactions(
+        pd.DataFrame({"recipe_id": [1, 2], "rating": [5, 4]})
+    )
+
+    assert len(buckets) == 0
+    assert buckets.window_stats(0, 10**6).empty
+
+
+def test_recipe_trend_monthly(interaction_df):
+    buckets = MonthlyRatingBuckets.from_interactions(interaction_df)
+
+    trend = buckets.recipe_trend(3)
+
+    assert list(trend["n_reviews"]) == [1, 1]
+    assert list(trend["avg_rating"]) == [2.0, 4.0]
+    assert list(trend["cumulative_avg_rating"]) == [2.0, 3.0]
+    assert trend["period"].iloc[0] == pd.Timestamp("2018-11-01")
+
+
+def test_recipe_trend_downsampled(interaction_df):
+    buckets = MonthlyRatingBuckets.from_interactions(interaction_df)
+
+    # 18 mois entre 2016-01 et 2017-06 -> 3 intervalles de 6 mois
+    trend = buckets.recipe_trend(1, max_points=3)
+
+    assert len(trend) == 3
+    assert list(trend["n_reviews"]) == [2, 0, 1]
+    assert np.isnan(trend["avg_rating"].iloc[1])
+    assert trend["cumulative_avg_rating"].iloc[-1] == pytest.approx(3.0)
+    assert trend["n_reviews"].sum() == 3
+
+
+def test_recipe_trend_unknown_recipe(interaction_df):
+    buckets = MonthlyRatingBuckets.from_interactions(interaction_df)
+
+    assert buckets.recipe_trend(99).empty
+
+
+def test_buckets_by_user_window_counts():
+    interactions = pd.DataFrame(
+        {
+            "user_id": [10, 10, 11, 10],
+            "rating": [5, 4, 3, 2],
+            "date": ["2016-01-15", "2016-02-01", "2016-02-10", "2017-01-01"],
+        }
+    )
+    buckets = MonthlyRatingBuckets.from_interactions(interactions, key="user_id")
+    first = to_month(pd.Series(["2016-01-01"]))[0]
+
+    assert list(buckets.recipe_ids) == [10, 11]
+    assert list(buckets.window_counts(first, first + 1)) == [2, 1]
+    assert list(buckets.window_counts(first + 12, first + 12)) == [1]
+    assert len(buckets.window_counts(first - 24, first - 1)) == 0
+
+
+def test_merge_matches_single_build(recipe_df, interaction_df):
+    # Interactions ajoutées après coup, y compris sur un mois plus récent
+    added = pd.DataFrame(
+        {"recipe_id": [2, 4], "rating": [1, 5], "date": ["2018-12-05", "2019-03-01"]}
+    )
+    merged = MonthlyRatingBuckets.from_interactions(interaction_df).merge(
+        MonthlyRatingBuckets.from_interactions(added)
+    )
+    full = MonthlyRatingBuckets.from_interactions(
+        pd.concat([interaction_df, added], ignore_index=True)
+    )
+
+    for name, values in full.to_arrays().items():
+        np.testing.assert_array_equal(merged.to_arrays()[name], values, err_msg=name)
+    pd.testing.assert_frame_equal(
+        merged.window_stats(*merged.month_range), full.window_stats(*full.month_range)
+    )
@@ -3,6 +3,7 @@ from unittest.mock import MagicMock, patch
 import pandas as pd
 import pytest
 
+from src.food_analysis.core.dataset import Dataset
 from src.food_analysis.pages import recipe_ratings
 
 
@@ -84,8 +85,7 @@ def test_show_recipe_details_no_reviews(mock_dataframes, mock_streamlit):
         recipe_id=recipe_id,
         recipe_name=recipe_name,
         recipe_stats=recipe_stats,
-        recipe_df=recipe_df,
-        interaction_df=interaction_df,
+        dataset=Dataset(recipe_df, interaction_df),
     )
 
     # Vérifie que le titre et l'avertissement sont bien affichés
@@ -138,8 +138,7 @@ def test_show_recipe_details_with_reviews(mock_px_bar, mock_streamlit, mock_data
         recipe_id=recipe_id,
         recipe_name=recipe_name,
         recipe_stats=recipe_stats,
-        recipe_df=recipe_df,
-        interaction_df=interaction_df,
+        dataset=Dataset(recipe_df, interaction_df),
     )
 
     # --- Vérifications de couverture ---
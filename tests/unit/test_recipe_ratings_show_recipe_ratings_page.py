@@ -1,11 +1,16 @@
 import sys
+import threading
+from concurrent.futures import Future
 from unittest.mock import MagicMock, patch
 
 import pandas as pd
 import pytest
 
 sys.path.insert(0, "src")
+from food_analysis.core.analyzer import ApproximateRanking
+from food_analysis.core.dataset import Dataset
 from food_analysis.pages import recipe_ratings
+from food_analysis.utils.config import Config
 
 
 @pytest.fixture
@@ -31,6 +36,7 @@ def recipe_stats_df(recipe_df):
     # Ce DataFrame simulera la sortie de compute_recipe_stats
     return pd.DataFrame(
         {
+            "recipe_id": [1, 2, 3],
             "name": ["Pizza", "Burger", "Salade"],
             "weighted_rating": [4.8, 4.2, 3.9],
             "avg_rating": [4.5, 4.0, 3.7],
@@ -40,7 +46,7 @@ def recipe_stats_df(recipe_df):
 
 
 @patch("food_analysis.pages.recipe_ratings.show_recipe_details")
-@patch("food_analysis.pages.recipe_ratings.compute_recipe_stats")
+@patch("food_analysis.core.analyzer.compute_recipe_stats")
 def test_show_recipe_ratings_page_basic(
     mock_compute, mock_show_details, recipe_df, interaction_df, recipe_stats_df
 ):
@@ -59,14 +65,14 @@ def test_show_recipe_ratings_page_basic(
         mock_st.spinner.__enter__.return_value = None
         mock_st.spinner.__exit__.return_value = None
 
-        recipe_ratings.show_recipe_ratings_page(recipe_df, interaction_df)
+        recipe_ratings.show_recipe_ratings_page(Dataset(recipe_df, interaction_df))
 
         mock_compute.assert_called_once()
         mock_show_details.assert_called_once()
 
 
 @patch("food_analysis.pages.recipe_ratings.show_recipe_details")
-@patch("food_analysis.pages.recipe_ratings.compute_recipe_stats")
+@patch("food_analysis.core.analyzer.compute_recipe_stats")
 def test_show_recipe_ratings_page_no_selection(
     mock_compute, mock_show_details, recipe_df, interaction_df, recipe_stats_df
 ):
@@ -84,13 +90,13 @@ def test_show_recipe_ratings_page_no_selection(
         mock_st.spinner.__enter__.return_value = None
         mock_st.spinner.__exit__.return_value = None
 
-        recipe_ratings.show_recipe_ratings_page(recipe_df, interaction_df)
+        recipe_ratings.show_recipe_ratings_page(Dataset(recipe_df, interaction_df))
 
         mock_show_details.assert_called_once()
 
 
 @patch("food_analysis.pages.recipe_ratings.show_recipe_details")
-@patch("food_analysis.pages.recipe_ratings.compute_recipe_stats")
+@patch("food_analysis.core.analyzer.compute_recipe_stats")
 def test_show_recipe_ratings_page_error_handling(
     mock_compute, mock_show_details, recipe_df, interaction_df, recipe_stats_df
 ):
@@ -109,7 +115,187 @@ def test_show_recipe_ratings_page_error_handling(
         mock_st.spinner.__exit__.return_value = None
 
         # Le test ne doit pas crasher
-        recipe_ratings.show_recipe_ratings_page(recipe_df, interaction_df)
+        recipe_ratings.show_recipe_ratings_page(Dataset(recipe_df, interaction_df))
 
         # Comme il y a une erreur dans dataframe, show_recipe_details ne doit pas être appelé
         mock_show_details.assert_not_called()
+
+
+@patch("food_analysis.pages.recipe_ratings.show_recipe_details")
+@patch("food_analysis.core.analyzer.compute_recipe_stats")
+def test_show_recipe_ratings_page_shares_ranking_between_sessions(
+    mock_compute,
+    mock_show_details,
+    recipe_df,
+    interaction_df,
+    recipe_stats_df,
+    monkeypatch,
+):
+    from food_analysis.utils import result_cache
+
+    cache = result_cache.ResultCache(10**6)
+    monkeypatch.setattr(result_cache, "_ranking_cache", cache)
+    mock_compute.return_value = recipe_stats_df
+    dataset = Dataset(recipe_df, interaction_df, version="v1")
+
+    with patch("food_analysis.pages.recipe_ratings.st") as mock_st:
+        mock_st.slider.return_value = 10
+        mock_st.selectbox.return_value = "Toutes les périodes"
+        mock_st.dataframe.return_value.selection.rows = [0]
+        mock_st.columns.return_value = [MagicMock() for _ in range(4)]
+
+        for _ in range(2):
+            recipe_ratings.show_recipe_ratings_page(dataset)
+
+    mock_compute.assert_called_once()
+    assert cache.stats["hits"] == 1
+
+
+@patch("food_analysis.pages.recipe_ratings.show_recipe_details")
+def test_show_ranking_table_selects_by_recipe_id(
+    mock_show_details, recipe_df, interaction_df
+):
+    top_recipes = pd.DataFrame(
+        {
+            "recipe_id": [3, 1, 2],
+            "name": ["Pizza", "Pizza", None],
+            "weighted_rating": [4.8, 4.2, 3.9],
+            "avg_rating": [4.5, 4.0, 3.7],
+            "n_reviews": [100, 50, 10],
+        }
+    )
+    dataset = Dataset(recipe_df, interaction_df)
+
+    with patch("food_analysis.pages.recipe_ratings.st") as mock_st:
+        for row, recipe_id, name in [(1, 1, "Pizza"), (2, 2, "Recette 2")]:
+            mock_st.dataframe.return_value.selection.rows = [row]
+            recipe_ratings.show_ranking_table(top_recipes, dataset)
+
+            # Même nom que la ligne 0 ou nom manquant : l'ID de la ligne prime
+            kwargs = mock_show_details.call_args.kwargs
+            assert kwargs["recipe_id"] == recipe_id
+            assert kwargs["recipe_name"] == name
+            assert (
+                kwargs["recipe_stats"]["n_reviews"] == top_recipes.loc[row, "n_reviews"]
+            )
+
+
+@pytest.mark.parametrize("with_groups", [True, False])
+@patch("food_analysis.pages.recipe_ratings.show_ranking_table")
+@patch("food_analysis.pages.recipe_ratings.compute_ranking")
+def test_merge_duplicates_option(
+    mock_compute, mock_table, recipe_df, interaction_df, recipe_stats_df, with_groups
+):
+    from food_analysis.core.duplicates import DuplicateGroups
+
+    mock_compute.return_value = recipe_stats_df
+    groups = DuplicateGroups(
+        pd.DataFrame({"recipe_id": [1, 2], "group_id": [1, 1], "similarity": 0.9})
+    )
+    dataset = Dataset(
+        recipe_df,
+        interaction_df,
+        version="v1",
+        artifacts={"duplicate_groups": groups if with_groups else None},
+    )
+
+    with patch("food_analysis.pages.recipe_ratings.st") as mock_st:
+        mock_st.slider.return_value = 10
+        mock_st.selectbox.return_value = "Toutes les périodes"
+        mock_st.checkbox.return_value = True
+        mock_st.columns.return_value = [MagicMock() for _ in range(4)]
+
+        recipe_ratings.show_recipe_ratings_page(dataset)
+
+    # Option proposée seulement si les doublons ont été calculés
+    assert mock_st.checkbox.called is with_groups
+    # Sinon, la page indique comment les calculer
+    hints = [str(c.args[0]) for c in mock_st.caption.call_args_list]
+    assert any("--dedup" in hint for hint in hints) is not with_groups
+    assert mock_compute.call_args.kwargs["merge_duplicates"] is with_groups
+
+
+def test_compute_ranking_shows_approximate_ranking_while_waiting(
+    recipe_stats_df, monkeypatch
+):
+    monkeypatch.setattr(Config, "PROGRESSIVE_RANKING_DELAY_S", 0.0)
+    future = Future()
+    analyzer = MagicMock()
+    analyzer.submit_ranking.return_value = future
+    analyzer.get_approximate_ranking.return_value = ApproximateRanking(
+        recipe_stats_df.head(2), "sample", 0.05
+    )
+    threading.Timer(0.05, future.set_result, [recipe_stats_df]).start()
+
+    with patch("food_analysis.pages.recipe_ratings.st") as mock_st:
+        result = recipe_ratings.compute_ranking(analyzer, 10, 20, {}, None)
+
+    assert result is recipe_stats_df
+    # Classement approché signalé, puis effacé au profit du classement exact
+    assert "approximatif" in mock_st.warning.call_args.args[0]
+    mock_st.dataframe.assert_called_once()
+    mock_st.empty.return_value.empty.assert_called_once()
+
+
+def test_compute_ranking_without_approximation_when_exact_is_fast(recipe_stats_df):
+    future = Future()
+    future.set_result(recipe_stats_df)
+    analyzer = MagicMock()
+    analyzer.submit_ranking.return_value = future
+
+    with patch("food_analysis.pages.recipe_ratings.st") as mock_st:
+        result = recipe_ratings.compute_ranking(analyzer, 10, 20, {}, None)
+
+    assert result is recipe_stats_df
+    analyzer.get_approximate_ranking.assert_not_called()
+    mock_st.empty.assert_not_called()
+
+
+def test_compute_ranking_stops_when_superseded():
+    future = Future()
+    future.cancel()
+    analyzer = MagicMock()
+    analyzer.submit_ranking.return_value = future
+    analyzer.get_approximate_ranking.return_value = None
+
+    with patch("food_analysis.pages.recipe_ratings.st") as mock_st:
+        recipe_ratings.compute_ranking(analyzer, 10, 20, {}, None)
+
+    mock_st.stop.assert_called_once()
+
+
+def test_compute_ranking_progressive_disabled(recipe_stats_df, monkeypatch):
+    monkeypatch.setattr(Config, "PROGRESSIVE_RANKING", False)
+    analyzer = MagicMock()
+    analyzer.get_ranking.return_value = recipe_stats_df
+
+    with patch("food_analysis.pages.recipe_ratings.st"):
+        result = recipe_ratings.compute_ranking(analyzer, 10, 20, {}, (1, 2))
+
+    assert result is recipe_stats_df
+    analyzer.submit_ranking.assert_not_called()
+    analyzer.get_ranking.assert_called_once_with(
+        m=10, n_recipes=20, filters={}, period=(1, 2), merge_duplicates=False
+    )
+
+
+def test_download_buttons_generate_file_on_click(recipe_stats_df):
+    export = MagicMock(side_effect=lambda fmt: iter([b"a,b\n", b"1,2\n"]))
+
+    with patch("food_analysis.pages.recipe_ratings.st") as mock_st:
+        mock_st.columns.return_value = [MagicMock(), MagicMock()]
+        recipe_ratings.show_download_buttons("Classement", "classement", export, "k")
+
+    calls = mock_st.download_button.call_args_list
+    assert [c.kwargs["file_name"] for c in calls] == [
+        "classement.csv",
+        "classement.parquet",
+    ]
+    assert all(c.kwargs["on_click"] == "ignore" for c in calls)
+    # Rien n'est généré avant le clic
+    export.assert_not_called()
+
+    data = calls[0].kwargs["data"]()
+
+    export.assert_called_once_with("csv")
+    assert data.getvalue() == b"a,b\n1,2\n"
@@ -0,0 +1,113 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+
+from food_analysis.utils.result_cache import ResultCache, estimate_size, ranking_key
+
+
+def frame(n_rows):
+    return pd.DataFrame({"x": np.arange(n_rows, dtype=np.int64)})
+
+
+def test_estimate_size_dataframe():
+    df = pd.DataFrame({"x": np.arange(100, dtype=np.int64), "name": ["a" * 50] * 100})
+    assert estimate_size(df) >= 100 * 8 + 100 * 50
+    assert estimate_size(np.zeros(10)) == 80
+    assert estimate_size((np.zeros(10), b"x" * 1000)) > 80 + 1000
+
+
+def test_get_or_compute_counts_hits_and_misses():
+    cache = ResultCache(10**6)
+    compute = MagicMock(return_value=frame(10))
+
+    first = cache.get_or_compute("k", compute)
+    second = cache.get_or_compute("k", compute)
+
+    assert second is first
+    compute.assert_called_once()
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+    assert cache.stats["hit_rate"] == 0.5
+
+
+def test_lru_eviction_respects_memory_cap():
+    size = estimate_size(frame(100))
+    cache = ResultCache(max_bytes=int(size * 2.5))
+
+    cache.put("a", frame(100))
+    cache.put("b", frame(100))
+    cache.get("a")  # "b" devient la moins récemment utilisée
+    cache.put("c", frame(100))
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.stats["evictions"] == 1
+    assert cache.bytes <= cache.max_bytes
+
+
+def test_oversized_result_not_stored():
+    cache = ResultCache(max_bytes=100)
+    result = cache.get_or_compute("gros", lambda: frame(1000))
+
+    assert len(result) == 1000
+    assert "gros" not in cache
+    assert cache.bytes == 0
+
+
+def test_replacing_entry_updates_size():
+    cache = ResultCache(10**6)
+    cache.put("k", frame(100))
+    cache.put("k", frame(10))
+
+    assert len(cache) == 1
+    assert cache.bytes == estimate_size(frame(10))
+
+
+def test_concurrent_misses_compute_once():
+    cache = ResultCache(10**6)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return frame(10)
+
+    threads = [
+        threading.Thread(target=cache.get_or_compute, args=("k", compute))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+
+
+def test_ranking_key_ignores_filter_order():
+    a = ranking_key(
+        "v1", 10, 20, {"minutes": (None, 30.0), "calories": (None, 500.0)}, None
+    )
+    b = ranking_key(
+        "v1", 10, 20, {"calories": (None, 500.0), "minutes": (None, 30.0)}, None
+    )
+
+    assert a == b
+    assert a != ranking_key("v2", 10, 20, {}, None)
+    hash(a)
+
+
+def test_latest_returns_most_recent_match_without_counting():
+    cache = ResultCache(10**6)
+    cache.put(("ranking", "v1", 10), "ancien")
+    cache.put(("ranking", "v2", 10), "récent")
+    cache.put(("ranking", "v2", 5), "autre")
+
+    found = cache.latest(lambda key: key[2] == 10)
+
+    assert found == "récent"
+    assert cache.latest(lambda key: key[1] == "v3") is None
+    assert cache.stats["hits"] == cache.stats["misses"] == 0
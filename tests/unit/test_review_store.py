@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from food_analysis.core import review_store
+from food_analysis.core.dataset import build_review_index
+from food_analysis.core.review_store import (
+    ReviewStore,
+    get_codec,
+    select_reviews,
+    split_review_text,
+)
+
+
+@pytest.fixture
+def interaction_df():
+    rng = np.random.default_rng(0)
+    n = 2000
+    reviews = pd.Series(
+        [
+            f"avis n°{i} : très bon, à refaire ✓ " * int(rng.integers(1, 8))
+            for i in range(n)
+        ],
+        dtype="str",
+    )
+    reviews[rng.choice(n, 100, replace=False)] = None
+    reviews[0] = ""
+    return pd.DataFrame(
+        {
+            "user_id": rng.integers(1, 100, n),
+            "recipe_id": rng.integers(1, 200, n),
+            "rating": rng.integers(0, 6, n),
+            "date": pd.Timestamp("2010-01-01")
+            + pd.to_timedelta(rng.integers(0, 3000, n), unit="D"),
+            "review": reviews,
+        }
+    )
+
+
+@pytest.fixture
+def store(interaction_df, tmp_path):
+    order = build_review_index(interaction_df).order
+    return ReviewStore.write(interaction_df["review"], order, tmp_path, block_size=4096)
+
+
+def test_texts_match_original_rows(store, interaction_df):
+    rows = np.random.default_rng(1).choice(len(interaction_df), 300)
+
+    result = store.texts(rows)
+
+    pd.testing.assert_series_equal(
+        result,
+        interaction_df["review"].iloc[rows].reset_index(drop=True),
+        check_dtype=False,
+    )
+    assert store.n_blocks > 10
+
+
+def test_recipe_reviews_decompress_only_their_blocks(store, interaction_df):
+    index = build_review_index(interaction_df)
+    decompressed = []
+    decompress = store.codec.decompress
+    store.codec.decompress = lambda data: decompressed.append(data) or decompress(data)
+
+    store.texts(index.rows(index.keys[0]))
+
+    assert 1 <= len(decompressed) <= 2
+
+
+def test_store_reopens_from_directory(store, interaction_df, tmp_path):
+    reopened = ReviewStore.open(tmp_path)
+
+    assert reopened.codec.name == store.codec.name
+    assert list(reopened.texts([5, 3])) == list(store.texts([5, 3]))
+
+
+def test_index_memory_is_an_order_of_magnitude_below_text(store, interaction_df):
+    text_bytes = interaction_df["review"].memory_usage(deep=True)
+
+    assert store.nbytes * 10 < text_bytes
+
+
+def test_select_reviews_with_store_matches_table(store, interaction_df):
+    rows = np.array([10, 2, 7])
+    columns = ["user_id", "rating", "review"]
+
+    pd.testing.assert_frame_equal(
+        select_reviews(interaction_df.drop(columns="review"), rows, columns, store),
+        select_reviews(interaction_df, rows, columns),
+        check_dtype=False,
+    )
+
+
+def test_split_review_text(interaction_df, tmp_path):
+    order = build_review_index(interaction_df).order
+
+    table, store = split_review_text(interaction_df, order, tmp_path)
+
+    assert "review" not in table.columns
+    assert store is not None and len(store) == len(interaction_df)
+    assert split_review_text(table, order, tmp_path) == (table, None)
+
+
+def test_empty_store(tmp_path):
+    store = ReviewStore.write(
+        pd.Series([], dtype="str"), np.array([], dtype=int), tmp_path
+    )
+
+    assert len(store.texts(np.array([], dtype=int))) == 0
+
+
+@pytest.mark.parametrize("name", ["zstd", "lz4"])
+def test_optional_codecs_round_trip(name, interaction_df, tmp_path):
+    pytest.importorskip({"zstd": "zstandard", "lz4": "lz4"}[name])
+    order = build_review_index(interaction_df).order
+
+    store = ReviewStore.write(
+        interaction_df["review"], order, tmp_path, codec=get_codec(name)
+    )
+
+    assert store.texts([1])[0] == interaction_df["review"][1]
+
+
+def test_get_codec_auto_falls_back_to_zlib(monkeypatch):
+    def not_installed():
+        raise ImportError
+
+    monkeypatch.setitem(review_store.CODECS, "zstd", not_installed)
+    monkeypatch.setitem(review_store.CODECS, "lz4", not_installed)
+
+    assert get_codec("auto").name == "zlib"
+
+
+def test_get_codec_unknown():
+    with pytest.raises(ValueError, match="inconnu"):
+        get_codec("brotli")
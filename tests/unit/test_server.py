@@ -0,0 +1,164 @@
+import json
+import urllib.error
+import urllib.request
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from food_analysis import server
+from food_analysis.cli import main
+from food_analysis.core.dataset import Dataset
+from food_analysis.core.watcher import DatasetWatcher
+from food_analysis.utils import result_cache
+from food_analysis.utils.result_cache import ResultCache, ranking_key
+
+
+@pytest.fixture
+def dataset():
+    recipes = pd.DataFrame({"id": [1, 2], "name": ["Tarte", "Soupe"]})
+    interactions = pd.DataFrame(
+        {
+            "user_id": [10, 11, 12],
+            "recipe_id": [1, 1, 2],
+            "rating": [5, 4, 3],
+            "date": ["2020-01-01", "2021-01-01", "2019-01-01"],
+        }
+    )
+    return Dataset(recipes, interactions, version="v1")
+
+
+@pytest.fixture
+def watcher(dataset, monkeypatch):
+    watcher = DatasetWatcher(lambda: dataset, lambda: "v1", interval_s=0)
+    monkeypatch.setattr(server, "_watcher", watcher.start())
+    return watcher
+
+
+@pytest.fixture
+def health_url():
+    http_server = server.start_health_server(0, host="127.0.0.1")
+    yield f"http://127.0.0.1:{http_server.server_address[1]}"
+    http_server.shutdown()
+
+
+def get(url):
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_load_dataset_without_data_files():
+    with (
+        patch.object(server.Config, "DATA_MODE", "raw"),
+        patch.object(server.Config, "DATA_RAW_PATH", Path("/nonexistent")),
+        pytest.raises(FileNotFoundError),
+    ):
+        server.load_dataset()
+
+
+def test_data_version_follows_raw_files(tmp_path):
+    (tmp_path / "RAW_recipes.csv").write_text("id\n1\n")
+    (tmp_path / "RAW_interactions.csv").write_text("recipe_id\n1\n")
+
+    with patch.object(server.Config, "DATA_RAW_PATH", tmp_path):
+        first = server.data_version()
+        assert server.data_version() == first
+
+        (tmp_path / "RAW_interactions.csv").write_text("recipe_id\n1\n2\n")
+        assert server.data_version() != first
+
+
+def test_warm_up_builds_everything(watcher, dataset, monkeypatch):
+    cache = ResultCache(10**6)
+    monkeypatch.setattr(result_cache, "_ranking_cache", cache)
+
+    state = server.warm_up(prerender=True)
+
+    assert state.is_ready
+    assert state.version == "v1"
+    assert set(state.steps) == {
+        "dataset",
+        "indexes",
+        "weighted_stats",
+        "default_ranking",
+        "plotting",
+    }
+    assert "review_index" in dataset.__dict__
+    # La vue par défaut de la page est servie depuis le cache partagé
+    assert ranking_key("v1", 10, 20, {}, None) in cache
+
+
+def test_warm_up_failure_reported(monkeypatch):
+    monkeypatch.setattr(server, "_watcher", None)
+    with patch.object(server, "load_dataset", side_effect=FileNotFoundError("absent")):
+        state = server.warm_up()
+
+    assert state.status == "failed"
+    assert "absent" in state.error
+
+
+def test_warm_up_retried_until_ready(dataset, monkeypatch):
+    monkeypatch.setattr(server, "_watcher", None)
+    monkeypatch.setattr(server.Config, "DATA_WATCH_INTERVAL_S", 0)
+    delays = []
+    failures = [FileNotFoundError("absent"), FileNotFoundError("absent")]
+
+    def load():
+        if failures:
+            raise failures.pop()
+        return dataset
+
+    def sleep(delay):
+        # Pendant l'attente, /ready signale l'échec et la prochaine tentative
+        assert server.readiness.status == "failed"
+        assert server.readiness.retry_at is not None
+        delays.append(delay)
+
+    with (
+        patch.object(server, "load_dataset", side_effect=load),
+        patch.object(server, "data_version", return_value="v1"),
+    ):
+        state = server.warm_up_until_ready(prerender=False, retry_s=1.0, sleep=sleep)
+
+    assert state.is_ready
+    assert state.attempt == 3
+    assert delays == [1.0, 2.0]
+
+
+def test_warm_up_not_retried_when_disabled(monkeypatch):
+    monkeypatch.setattr(server, "_watcher", None)
+    with patch.object(server, "load_dataset", side_effect=FileNotFoundError("absent")):
+        state = server.warm_up_until_ready(retry_s=0)
+
+    assert state.status == "failed"
+
+
+def test_health_endpoints(watcher, health_url, monkeypatch):
+    monkeypatch.setattr(server, "readiness", server.Readiness())
+
+    assert get(f"{health_url}/live") == (200, {"status": "alive"})
+    status, body = get(f"{health_url}/ready")
+    assert status == 503
+    assert body["status"] == "starting"
+
+    server.warm_up(prerender=False)
+
+    status, body = get(f"{health_url}/ready")
+    assert status == 200
+    assert body["version"] == "v1"
+    assert body["data"]["version"] == "v1"
+    assert "hit_rate" in body["result_cache"]
+    assert get(f"{health_url}/inconnu")[0] == 404
+
+
+def test_cli_serve_forwards_streamlit_args():
+    with patch.object(server, "serve", return_value=0) as mock_serve:
+        assert main(["serve", "--server.port=8601", "--server.headless=true"]) == 0
+
+    mock_serve.assert_called_once_with(["--server.port=8601", "--server.headless=true"])
+    with pytest.raises(SystemExit):
+        main(["precompute", "--server.port=8601"])
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from food_analysis.core.rating_buckets import to_month
+from food_analysis.core.sketches import (
+    MonthlySketches,
+    hash64,
+    hll_estimate,
+    hll_positions,
+)
+
+
+@pytest.fixture
+def interaction_df():
+    rng = np.random.default_rng(0)
+    n = 20_000
+    return pd.DataFrame(
+        {
+            "user_id": rng.integers(0, 5_000, n),
+            "recipe_id": rng.integers(0, 2_000, n),
+            "rating": rng.integers(0, 6, n),
+            "date": pd.Timestamp("2015-01-01")
+            + pd.to_timedelta(rng.integers(0, 3 * 365, n), unit="D"),
+        }
+    )
+
+
+def estimate(values, precision=12):
+    registers = np.zeros(1 << precision, dtype=np.uint8)
+    positions, ranks = hll_positions(hash64(values), precision)
+    np.maximum.at(registers, positions, ranks)
+    return hll_estimate(registers)
+
+
+@pytest.mark.parametrize("n_distinct", [1, 100, 3_000, 200_000])
+def test_hyperloglog_accuracy(n_distinct):
+    values = np.repeat(np.arange(n_distinct), 3)
+
+    assert estimate(values) == pytest.approx(n_distinct, rel=0.05)
+
+
+def test_hyperloglog_empty_and_hash_stable():
+    assert estimate(np.array([], dtype=np.int64)) == 0
+    np.testing.assert_array_equal(hash64([1, 2, 3]), hash64(np.array([1, 2, 3])))
+
+
+def test_window_matches_exact_metrics(interaction_df):
+    sketches = MonthlySketches.from_interactions(interaction_df)
+    months = to_month(interaction_df["date"])
+    start, end = int(months.min()) + 6, int(months.min()) + 17
+    window = interaction_df[(months >= start) & (months <= end)]
+
+    metrics = sketches.window(start, end)
+
+    assert metrics["n_reviews"] == len(window)
+    rated = window["rating"][window["rating"] > 0]
+    assert metrics["avg_rating"] == pytest.approx(rated.mean())
+    assert metrics["n_users"] == pytest.approx(window["user_id"].nunique(), rel=0.05)
+    assert metrics["n_recipes"] == pytest.approx(
+        window["recipe_id"].nunique(), rel=0.05
+    )
+
+
+def test_window_outside_data(interaction_df):
+    sketches = MonthlySketches.from_interactions(interaction_df)
+    first_month, _ = sketches.month_range
+
+    assert sketches.window(first_month - 24, first_month - 1) == {
+        "n_reviews": 0,
+        "avg_rating": None,
+        "n_users": 0,
+        "n_recipes": 0,
+    }
+
+
+def test_update_matches_single_build(interaction_df):
+    old, new = interaction_df.iloc[:15_000], interaction_df.iloc[15_000:]
+    # Avis ajoutés sur des mois plus récents
+    new = new.assign(date=new["date"] + pd.Timedelta(days=400))
+
+    updated = MonthlySketches.from_interactions(old).update(new)
+    full = MonthlySketches.from_interactions(pd.concat([old, new]))
+
+    for name, values in full.to_arrays().items():
+        np.testing.assert_array_equal(updated.to_arrays()[name], values, err_msg=name)
+
+
+def test_arrays_round_trip_and_no_dates(interaction_df):
+    sketches = MonthlySketches.from_interactions(interaction_df)
+    restored = MonthlySketches.from_arrays(sketches.to_arrays())
+
+    assert restored.window(*restored.month_range) == sketches.window(
+        *sketches.month_range
+    )
+    empty = MonthlySketches.from_interactions(interaction_df.drop(columns="date"))
+    assert len(empty) == 0
+    assert empty.window(0, 10**6)["n_reviews"] == 0
+    assert len(empty.merge(sketches)) == len(sketches)
@@ -0,0 +1,69 @@
+"""Budget de démarrage : temps d'import de l'application et imports différés."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from food_analysis.utils.config import Config
+from food_analysis.utils.import_profile import parse_importtime
+
+SRC_PATH = Path(__file__).resolve().parents[2] / "src"
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import food_analysis.app
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+@pytest.fixture(scope="module")
+def cold_import():
+    """Importe l'application dans un interpréteur neuf."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(SRC_PATH), env.get("PYTHONPATH")])
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_app_import_within_budget(cold_import):
+    assert cold_import["elapsed"] < Config.IMPORT_TIME_BUDGET_S, (
+        f"Import de food_analysis.app : {cold_import['elapsed']:.2f} s "
+        f"(budget {Config.IMPORT_TIME_BUDGET_S} s). "
+        "Profil : python -m food_analysis.utils.import_profile"
+    )
+
+
+def test_app_import_defers_plotting_libraries(cold_import):
+    modules = set(cold_import["modules"])
+
+    assert "matplotlib" not in modules
+    assert "plotly.express" not in modules
+
+
+def test_parse_importtime():
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     numpy.core\n"
+        "import time:      1500 |       1620 |   numpy\n"
+        "import time:       300 |       1920 | food_analysis.app\n"
+    )
+
+    timings = parse_importtime(output)
+
+    assert [t.module for t in timings] == ["numpy.core", "numpy", "food_analysis.app"]
+    assert timings[1].cumulative_us == 1620
+    assert [t.depth for t in timings] == [2, 1, 0]
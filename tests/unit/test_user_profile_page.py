@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from food_analysis.core.dataset import Dataset
+from food_analysis.pages import user_profile
+
+
+@pytest.fixture
+def recipe_df():
+    return pd.DataFrame({"id": [1, 2], "name": ["Pizza", "Burger"]})
+
+
+@pytest.fixture
+def interaction_df():
+    return pd.DataFrame(
+        {
+            "user_id": [10, 10, 20],
+            "recipe_id": [1, 2, 1],
+            "rating": [5, 4, 3],
+            "date": ["2024-01-01", "2024-01-02", "2024-01-03"],
+            "review": ["top", "bon", "ok"],
+        }
+    )
+
+
+def _mock_columns(arg):
+    count = arg if isinstance(arg, int) else len(arg)
+    return [MagicMock() for _ in range(count)]
+
+
+def test_show_user_profile_page_selected_reviewer(recipe_df, interaction_df):
+    with patch("food_analysis.pages.user_profile.st") as mock_st:
+        mock_st.columns.side_effect = _mock_columns
+        mock_st.dataframe.return_value.selection.rows = [0]
+        mock_st.number_input.side_effect = [None, 10]
+
+        user_profile.show_user_profile_page(Dataset(recipe_df, interaction_df))
+
+        mock_st.markdown.assert_any_call("### 👤 Utilisateur 10")
+        mock_st.bar_chart.assert_called_once()
+        # Classement + avis de l'utilisateur
+        assert mock_st.dataframe.call_count == 2
+
+
+def test_show_user_profile_page_unknown_user(recipe_df, interaction_df):
+    with patch("food_analysis.pages.user_profile.st") as mock_st:
+        mock_st.columns.side_effect = _mock_columns
+        mock_st.dataframe.return_value.selection.rows = []
+        mock_st.number_input.return_value = 999
+
+        user_profile.show_user_profile_page(Dataset(recipe_df, interaction_df))
+
+        mock_st.warning.assert_called_once_with(
+            "Aucun avis trouvé pour l'utilisateur 999."
+        )
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from food_analysis.core.users import (
+    build_user_index,
+    compute_user_stats,
+    top_reviewers,
+    user_reviews,
+)
+
+
+@pytest.fixture
+def interaction_df():
+    return pd.DataFrame(
+        {
+            "user_id": [10, 20, 10, 30, 10, 20],
+            "recipe_id": [1, 1, 2, 2, 3, 3],
+            "rating": [5, 2, 4, 0, 0, 4],
+            "date": [
+                "2020-01-01",
+                "2020-01-02",
+                "2021-01-01",
+                "2020-01-03",
+                "2019-01-01",
+                "2020-02-02",
+            ],
+            "review": ["a", "b", "c", "d", "e", "f"],
+        }
+    )
+
+
+def test_compute_user_stats(interaction_df):
+    stats = compute_user_stats(interaction_df, build_user_index(interaction_df))
+
+    assert list(stats["user_id"]) == [10, 20, 30]
+    assert list(stats["n_reviews"]) == [3, 2, 1]
+    assert list(stats["n_rated"]) == [2, 2, 0]
+    assert stats["avg_rating"].iloc[0] == pytest.approx(4.5)
+    assert np.isnan(stats["avg_rating"].iloc[2])
+
+    # Moyenne globale des notes > 0 : (5 + 2 + 4 + 4) / 4 = 3.75
+    assert stats["leniency"].iloc[0] == pytest.approx(0.75)
+    assert stats["leniency"].iloc[1] == pytest.approx(-0.75)
+
+
+def test_top_reviewers(interaction_df):
+    stats = compute_user_stats(interaction_df, build_user_index(interaction_df))
+
+    top = top_reviewers(stats, n=2)
+
+    assert list(top["user_id"]) == [10, 20]
+
+
+def test_user_reviews_most_recent_first(interaction_df):
+    index = build_user_index(interaction_df)
+
+    reviews = user_reviews(10, interaction_df, index)
+
+    assert list(reviews.columns) == ["recipe_id", "rating", "date", "review"]
+    assert list(reviews["recipe_id"]) == [2, 1, 3]
+    assert user_reviews(99, interaction_df, index).empty
+
+
+def test_compute_user_stats_empty():
+    empty = pd.DataFrame({"user_id": [], "rating": [], "date": []})
+
+    stats = compute_user_stats(empty, build_user_index(empty))
+
+    assert stats.empty
@@ -0,0 +1,98 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from food_analysis.core.dataset import Dataset
+from food_analysis.core.watcher import DatasetWatcher
+
+
+class FakeSource:
+    """Données dont la version change à la demande."""
+
+    def __init__(self):
+        self.version = "v1"
+        self.loads = 0
+        self.fail = False
+
+    def load(self):
+        if self.fail:
+            raise ValueError("CSV illisible")
+        self.loads += 1
+        frame = pd.DataFrame({"recipe_id": [self.loads]})
+        return Dataset(frame, frame.copy(), version=self.version)
+
+    def get_version(self):
+        return self.version
+
+
+@pytest.fixture
+def source():
+    return FakeSource()
+
+
+def test_start_loads_once(source):
+    watcher = DatasetWatcher(source.load, source.get_version, interval_s=0).start()
+
+    assert watcher.current().version == "v1"
+    assert not watcher.check()
+    assert source.loads == 1
+
+
+def test_new_version_swapped_after_confirmation(source):
+    watcher = DatasetWatcher(source.load, source.get_version, interval_s=0).start()
+    first = watcher.current()
+
+    source.version = "v2"
+    assert not watcher.check()  # première observation : à confirmer
+    assert watcher.current() is first
+    assert watcher.status["pending_version"] == "v2"
+
+    assert watcher.check()
+    assert watcher.current().version == "v2"
+    assert source.loads == 2
+
+
+def test_failed_reload_keeps_serving_current(source):
+    watcher = DatasetWatcher(source.load, source.get_version, interval_s=0).start()
+    source.version = "v2"
+    source.fail = True
+
+    watcher.check()
+    assert not watcher.check()
+
+    assert watcher.current().version == "v1"
+    assert "CSV illisible" in watcher.status["last_error"]
+
+
+def test_missing_file_during_replacement(source):
+    watcher = DatasetWatcher(source.load, source.get_version, interval_s=0).start()
+
+    def missing():
+        raise FileNotFoundError("RAW_recipes.csv")
+
+    watcher._version = missing
+
+    assert not watcher.check()
+    assert watcher.current().version == "v1"
+
+
+def test_background_thread_swaps(source):
+    swapped = threading.Event()
+    watcher = DatasetWatcher(source.load, source.get_version, interval_s=0.01)
+    original_check = watcher.check
+
+    def check():
+        if original_check():
+            swapped.set()
+        return True
+
+    watcher.check = check
+    watcher.start()
+    source.version = "v2"
+    try:
+        assert swapped.wait(timeout=5)
+    finally:
+        watcher.stop()
+
+    assert watcher.current().version == "v2"